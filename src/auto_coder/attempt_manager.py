@@ -277,6 +277,37 @@ def group_attempts_by_status(attempts: List[AttemptInfo]) -> Dict[str, List[Atte
     return grouped
 
 
+def current_attempt_from_comments(comments: List[Dict[str, Any]]) -> int:
+    """Return the highest attempt number recorded in issue comments (0 if none).
+
+    Args:
+        comments: Comment dicts with "body" and "created_at"
+
+    Returns:
+        The current attempt number
+    """
+    attempt_numbers: List[int] = []
+    comments_data = []
+    for comment in comments:
+        body = comment.get("body", "")
+        attempt_number = extract_attempt_number(body)
+        if attempt_number is not None:
+            attempt_numbers.append(attempt_number)
+        comments_data.append(
+            {
+                "body": body,
+                "created_at": comment.get("created_at"),
+            }
+        )
+
+    # Fallback to counting attempt comments when numbers are unavailable
+    if not attempt_numbers:
+        attempts = extract_attempts_from_comments(comments_data)
+        attempt_numbers = [idx + 1 for idx, _ in enumerate(attempts)]
+
+    return max(attempt_numbers) if attempt_numbers else 0
+
+
 def get_current_attempt(repo_name: str, issue_number: int) -> int:
     """Get the current attempt number for an issue.
 
@@ -296,27 +327,7 @@ def get_current_attempt(repo_name: str, issue_number: int) -> int:
         client = GitHubClient.get_instance()
         # Get all comments for the issue
         comments = client.get_issue_comments(repo_name, issue_number)
-
-        attempt_numbers: List[int] = []
-        comments_data = []
-        for comment in comments:
-            body = comment.get("body", "")
-            attempt_number = extract_attempt_number(body)
-            if attempt_number is not None:
-                attempt_numbers.append(attempt_number)
-            comments_data.append(
-                {
-                    "body": body,
-                    "created_at": comment.get("created_at"),
-                }
-            )
-
-        # Fallback to counting attempt comments when numbers are unavailable
-        if not attempt_numbers:
-            attempts = extract_attempts_from_comments(comments_data)
-            attempt_numbers = [idx + 1 for idx, _ in enumerate(attempts)]
-
-        current_attempt = max(attempt_numbers) if attempt_numbers else 0
+        current_attempt = current_attempt_from_comments(comments)
 
         logger.info(f"Found {current_attempt} attempt(s) for issue #{issue_number}")
         return current_attempt
@@ -773,8 +773,8 @@ class Candidate:
     Provides type-safe structure for candidate data with required and optional fields.
     """
 
-    type: str  # "issue" or "pr"
-    data: Dict[str, Any]  # issue_data or pr_data
+    type: str  # "issue", "pr" or "merge_train"
+    data: Dict[str, Any]  # issue_data, pr_data or merge train data (base, prs)
     priority: int
     branch_name: Optional[str] = None
     related_issues: List[int] = field(default_factory=list)
@@ -826,6 +826,28 @@ class EmptyPRResult:
     issue_numbers: List[int] = field(default_factory=list)
 
 
+@dataclass
+class MergeTrainResult:
+    """Result of running a merge train.
+
+    Attributes:
+        merged: PRs merged, in merge order
+        failed: PRs whose own CI run failed when bisecting a red train
+        excluded: PRs left out of the train (conflicts with the train, unresolved
+            review threads, already being processed)
+        deferred: PRs left for individual processing (CI timed out or the merge was refused)
+        ci_runs: Number of train branches CI was run on
+        actions: Human-readable actions taken
+    """
+
+    merged: List[int] = field(default_factory=list)
+    failed: List[int] = field(default_factory=list)
+    excluded: List[int] = field(default_factory=list)
+    deferred: List[int] = field(default_factory=list)
+    ci_runs: int = 0
+    actions: List[str] = field(default_factory=list)
+
+
 @dataclass
 class StaleJulesIssueResult:
     """Result of the stale Jules issue-session check.
@@ -5,12 +5,16 @@ Main automation engine for Auto-Coder.
 import asyncio
 import json
 import os
+import time
+from dataclasses import asdict
 from datetime import datetime, timedelta, timezone
 from typing import Any, Dict, List, Optional, Union, cast
 
 from . import fix_to_pass_tests_runner as fix_to_pass_tests_runner_module
 from .automation_config import AutomationConfig, Candidate, CandidateProcessingResult, ProcessResult
+from .backend_concurrency import get_backend_concurrency_governor
 from .backend_manager import LLMBackendManager, get_llm_backend_manager, run_llm_prompt
+from .conflict_scanner import ConflictScanResult, scan_pr_conflicts
 from .fix_to_pass_tests_runner import fix_to_pass_tests
 from .git_branch import extract_number_from_branch, git_commit_with_retry, git_pull
 from .git_commit import git_push
@@ -21,8 +25,19 @@ from .issue_processor import create_feature_issues
 from .jules_client import invalidate_jules_sessions_cache
 from .jules_engine import check_and_resume_or_archive_sessions, check_and_start_recurrent_jules_tasks
 from .label_manager import LabelManager
-from .llm_backend_config import get_process_issues_empty_sleep_time_from_config, get_process_issues_sleep_time_from_config
+from .llm_backend_config import (
+    get_conflict_scanner_enabled_from_config,
+    get_merge_train_enabled_from_config,
+    get_merge_train_max_size_from_config,
+    get_process_issues_empty_sleep_time_from_config,
+    get_process_issues_sleep_time_from_config,
+    get_warm_restart_enabled_from_config,
+    get_warm_restart_max_age_seconds_from_config,
+)
 from .logger_config import get_logger
+from .merge_train import MergeTrainYard, plan_merge_trains, requires_up_to_date_branches, run_merge_train, train_branch_name
+from .mergeability import MergeabilityResolver
+from .metrics import get_metrics_registry
 from .pr_processor import _create_pr_analysis_prompt as _engine_pr_prompt
 from .pr_processor import _get_pr_diff as _pr_get_diff
 from .pr_processor import _should_skip_waiting_for_jules, process_pull_request
@@ -30,12 +45,15 @@ from .progress_footer import ProgressStage
 from .prompt_loader import render_prompt
 from .test_log_utils import extract_important_errors
 from .test_result import TestResult
+from .test_watcher_client import shutdown_shared_test_watcher_client
 from .trace_logger import get_trace_logger
 from .update_manager import check_for_updates_and_restart
 from .util.gh_cache import GitHubClient, get_ghapi_client
 from .util.github_action import check_and_handle_closed_state, get_github_actions_logs_from_url, is_item_closed_on_github
 from .util.github_cache import get_github_cache
 from .utils import CommandExecutor, get_target_container, log_action
+from .warm_restart import register_state_provider, set_handoff_repo, take_handoff, unregister_state_provider
+from .workflow_monitor import get_workflow_monitor_service
 
 logger = get_logger(__name__)
 
@@ -80,6 +98,48 @@ class AutomationEngine:
             logger.error(f"Error handling stale Jules issue sessions: {e}")
             return []
 
+    def export_restart_state(self, repo_name: str) -> Dict[str, Any]:
+        """Return the queue, snapshots and caches to hand over across an auto-update restart."""
+        # Items being processed are lost with the process, so they go first in the queue
+        in_flight = [c for c in self.active_workers.values() if c is not None]
+        queued = list(self.queue._queue) if hasattr(self.queue, "_queue") else []
+        return {
+            "repo_name": repo_name,
+            "queue": [asdict(c) for c in in_flight + queued],
+            "open_prs_snapshot": self.open_prs_snapshot,
+            "open_issues_snapshot": self.open_issues_snapshot,
+            "open_issues_cache": self.github.export_open_issues_cache(),
+            "trace_logs": get_trace_logger().get_logs(limit=len(get_trace_logger().logs)),
+        }
+
+    def restore_restart_state(self, repo_name: str, state: Dict[str, Any]) -> bool:
+        """Rehydrate export_restart_state() output left by the previous process.
+
+        Returns:
+            False if the state belongs to another repository and was ignored
+        """
+        if state.get("repo_name") != repo_name:
+            logger.info(f"Ignoring restart handoff for {state.get('repo_name')} (running for {repo_name})")
+            return False
+
+        # Build every candidate before touching the queue, so a bad entry leaves a cold start
+        candidates: Dict[Any, Candidate] = {}
+        for item in state.get("queue") or []:
+            candidate = Candidate(**item)
+            candidates.setdefault((candidate.type, candidate.data.get("number")), candidate)
+        for candidate in candidates.values():
+            self.queue.put_nowait(candidate)
+        self.open_prs_snapshot = state.get("open_prs_snapshot") or []
+        self.open_issues_snapshot = state.get("open_issues_snapshot") or []
+        if state.get("open_issues_cache"):
+            self.github.restore_open_issues_cache(state["open_issues_cache"])
+        if state.get("trace_logs"):
+            get_trace_logger().restore(state["trace_logs"])
+
+        logger.info(f"Restored {self.queue.qsize()} queued item(s), {len(self.open_prs_snapshot)} open PR(s) and {len(self.open_issues_snapshot)} open issue(s) from the restart handoff")
+        get_health_monitor().record_event("warm_restart", f"restored {self.queue.qsize()} queued item(s)", repo_name)
+        return True
+
     async def start_automation(self, repo_name: str, concurrency: Optional[int] = None) -> None:
         """Start the automation engine with event-driven architecture."""
         if concurrency is None:
@@ -95,12 +155,49 @@ class AutomationEngine:
         get_health_monitor().start()
         heartbeat("engine:start", repo_name)
 
+        # Pick up where the process left off before an auto-update restart
+        warm_restart = get_warm_restart_enabled_from_config()
+        if warm_restart:
+            handoff = take_handoff(max_age_seconds=get_warm_restart_max_age_seconds_from_config(), repo_name=repo_name)
+            if handoff and handoff.get("engine"):
+                try:
+                    self.restore_restart_state(repo_name, handoff["engine"])
+                except Exception as e:
+                    logger.warning(f"Failed to restore restart handoff, starting cold: {e}")
+            set_handoff_repo(repo_name)
+            register_state_provider("engine", lambda: self.export_restart_state(repo_name))
+
         # Start producer
         producer_task = asyncio.create_task(self._producer_loop(repo_name), name="producer")
 
         # Start workers
         workers = [asyncio.create_task(self._worker_loop(repo_name, i), name=f"worker-{i}") for i in range(concurrency)]
 
+        # Track dispatched CI runs (including ones persisted by a previous run) on this loop
+        monitor_service = get_workflow_monitor_service()
+        if monitor_service is not None:
+            monitor_service.restore(repo_name)
+        monitor_task = asyncio.create_task(monitor_service.run(), name="workflow-monitor") if monitor_service is not None else None
+
+        # Workers hand PRs with unknown mergeability to the resolver, which re-queues them once GitHub settles
+        loop = asyncio.get_running_loop()
+        resolver = MergeabilityResolver.get_instance()
+
+        def requeue_resolved_pr(resolved_repo: str, pr_number: int, state: Dict[str, Any]) -> None:
+            asyncio.run_coroutine_threadsafe(self._requeue_pr(resolved_repo, pr_number), loop)
+
+        resolver.callbacks.append(requeue_resolved_pr)
+        resolver_task = asyncio.create_task(resolver.run(), name="mergeability-resolver")
+
+        # Merge trains park in the yard while CI runs; the engine re-queues them once it finishes
+        yard = MergeTrainYard.get_instance()
+
+        def requeue_finished_train(train_repo: str, base_branch: str) -> None:
+            asyncio.run_coroutine_threadsafe(self._requeue_merge_train(train_repo, base_branch), loop)
+
+        yard.callbacks.append(requeue_finished_train)
+        yard_task = asyncio.create_task(yard.run(), name="merge-train-yard")
+
         try:
             # Wait for all tasks (they run forever until cancelled)
             await asyncio.gather(producer_task, *workers)
@@ -117,7 +214,42 @@ class AutomationEngine:
             get_health_monitor().record_event("engine_stop", f"unhandled error: {type(e).__name__}: {e}", "")
             raise
         finally:
+            if warm_restart:
+                unregister_state_provider("engine")
+                set_handoff_repo(None)
+            if monitor_task is not None:
+                monitor_task.cancel()
+            resolver_task.cancel()
+            resolver.callbacks.remove(requeue_resolved_pr)
+            yard_task.cancel()
+            yard.callbacks.remove(requeue_finished_train)
             get_health_monitor().log_snapshot(reason="engine_stop")
+            shutdown_shared_test_watcher_client()
+
+    async def _requeue_pr(self, repo_name: str, pr_number: int) -> None:
+        """Put a PR back on the queue unless it is already queued or being processed."""
+        queued = list(self.queue._queue) if hasattr(self.queue, "_queue") else []
+        in_flight = [c for c in self.active_workers.values() if c is not None]
+        if any(c.type == "pr" and c.data.get("number") == pr_number for c in queued + in_flight):
+            return
+        if pr_number in MergeTrainYard.get_instance().riding(repo_name):
+            return
+        candidate = await asyncio.to_thread(self._create_candidate_from_single, repo_name, "pr", pr_number)
+        if candidate is None:
+            return
+        await self.queue.put(candidate)
+        logger.info(f"Re-queued pr #{pr_number} after GitHub resolved its mergeability")
+        get_trace_logger().log("Queue", f"Re-queued pr #{pr_number}", item_type="pr", item_number=pr_number, details={"reason": "mergeability resolved"})
+
+    async def _requeue_merge_train(self, repo_name: str, base_branch: str) -> None:
+        """Put a merge train whose CI finished back on the queue."""
+        train = MergeTrainYard.get_instance().get(repo_name, base_branch)
+        if train is None:
+            return
+        candidate = self._merge_train_candidate(base_branch, train.prs)
+        await self.queue.put(candidate)
+        logger.info(f"Re-queued the merge train into {base_branch} after its CI finished")
+        get_trace_logger().log("Queue", f"Re-queued merge train into {base_branch}", item_type="pr", item_number=candidate.data["number"], details={"reason": "merge train CI finished"})
 
     async def _producer_loop(self, repo_name: str) -> None:
         """Producer loop that polls for candidates and adds them to the queue."""
@@ -219,6 +351,8 @@ class AutomationEngine:
             heartbeat(f"worker-{worker_id}:idle", f"queue={self.queue.qsize()}")
             candidate = await self.queue.get()
             item_number = candidate.data.get("number", "N/A")
+            item_started = time.perf_counter()
+            item_outcome = "exception"
 
             try:
                 self.active_workers[worker_id] = candidate
@@ -226,8 +360,9 @@ class AutomationEngine:
                 heartbeat(f"worker-{worker_id}:processing", f"{candidate.type} #{item_number}")
 
                 # Check if the item is already closed before processing
-                if is_item_closed_on_github(repo_name, candidate.type, item_number, self.github):
+                if candidate.type != "merge_train" and is_item_closed_on_github(repo_name, candidate.type, item_number, self.github):
                     logger.info(f"Worker {worker_id} skipping closed {candidate.type} #{item_number}")
+                    item_outcome = "skipped"
                     continue
 
                 get_trace_logger().log("Worker", f"Worker {worker_id} started processing {candidate.type} #{item_number}", item_type=candidate.type, item_number=item_number, details={"worker_id": worker_id})
@@ -235,6 +370,7 @@ class AutomationEngine:
                 # Process candidate
                 result = await asyncio.to_thread(self._process_single_candidate, repo_name, candidate)
 
+                item_outcome = "failure" if result.error else "success"
                 if result.error:
                     logger.error(f"Worker {worker_id} failed to process {candidate.type} #{item_number}: {result.error}")
                     get_trace_logger().log("Worker", f"Worker {worker_id} failed to process {candidate.type} #{item_number}", item_type=candidate.type, item_number=item_number, details={"worker_id": worker_id, "error": result.error})
@@ -249,6 +385,7 @@ class AutomationEngine:
                 # Or create a minimal report.
 
             except asyncio.CancelledError:
+                item_outcome = "cancelled"
                 logger.info(f"Worker {worker_id} cancelled")
                 get_health_monitor().record_event("worker_exit", f"worker {worker_id} cancelled", f"{candidate.type} #{item_number}")
                 raise
@@ -258,20 +395,31 @@ class AutomationEngine:
             finally:
                 self.active_workers[worker_id] = None
                 self.queue.task_done()
+                metrics = get_metrics_registry()
+                metrics.inc("auto_coder_items_processed_total", type=candidate.type, outcome=item_outcome)
+                metrics.observe("auto_coder_item_seconds", time.perf_counter() - item_started, type=candidate.type)
 
     def get_status(self) -> Dict[str, Any]:
         """Get the current status of the automation engine."""
         queue_items = list(self.queue._queue) if hasattr(self.queue, "_queue") else []
 
         # Helper to check if item is in queue or processing
+        def item_keys(c: Candidate) -> List[Any]:
+            # A merge train stands for every PR riding it
+            if c.type == "merge_train":
+                return [("pr", pr.get("number")) for pr in c.data.get("prs", [])]
+            return [(c.type, c.data.get("number"))]
+
         processing_map = {}  # (type, number) -> worker_id
         for wid, c in self.active_workers.items():
             if c:
-                processing_map[(c.type, c.data.get("number"))] = wid
+                for key in item_keys(c):
+                    processing_map[key] = wid
 
         queued_map = {}  # (type, number) -> priority
         for c in queue_items:
-            queued_map[(c.type, c.data.get("number"))] = c.priority
+            for key in item_keys(c):
+                queued_map[key] = c.priority
 
         open_items_status = []
 
@@ -340,6 +488,10 @@ class AutomationEngine:
             },
             "open_items": open_items_status,
         }
+        governor = get_backend_concurrency_governor()
+        if governor is not None:
+            # In-flight calls and admission wait times per backend/provider
+            status["backend_concurrency"] = governor.stats()
         return status
 
     def _check_and_handle_closed_branch(self, repo_name: str) -> bool:
@@ -423,13 +575,24 @@ class AutomationEngine:
             # Continue processing on error
             return True
 
+    def _scan_pr_conflicts(self, pr_data_list: List[Dict[str, Any]]) -> Dict[int, ConflictScanResult]:
+        """Run the merge-tree conflict scan over all open PRs when [conflict_scanner].enabled is on."""
+        if not pr_data_list or not get_conflict_scanner_enabled_from_config():
+            return {}
+        try:
+            return scan_pr_conflicts(pr_data_list)
+        except Exception as e:
+            logger.warning(f"Conflict scan failed: {e}")
+            return {}
+
     def _get_candidates(self, repo_name: str, max_items: Optional[int] = None) -> List[Candidate]:
         """Collect PR/Issue candidates with priority.
 
         Priority definitions:
         - 7: Breaking-change PR (breaking-change, breaking, api-change, deprecation, version-major)
         - 4: Urgent + unmergeable PR (highest priority after breaking-change)
-        - 3: Urgent + mergeable PR or urgent issue
+        - 3: Urgent + mergeable PR or urgent issue, or an unmergeable PR whose conflicts the
+             conflict scan found limited to dependency files (resolved without the LLM)
         - 2: Unmergeable PR needing conflict resolution
         - 1: PR requiring fixes (GH Actions failed but mergeable)
         - 0: Regular issues
@@ -448,6 +611,8 @@ class AutomationEngine:
 
         candidates: List[Candidate] = []
         candidates_count = 0
+        # Mergeable PRs with passing checks, which may ride a merge train
+        green_pr_numbers: set[int] = set()
         # Issues queued from the stale-Jules-PR path, to avoid queueing them twice
         requeued_issue_numbers: set[int] = set()
 
@@ -465,6 +630,7 @@ class AutomationEngine:
             pr_data_list.sort(key=lambda x: x.get("created_at", ""))
 
             preload_github_actions_status(repo_name, pr_data_list)
+            conflict_scans = self._scan_pr_conflicts(pr_data_list)
 
             # Lazy-load repository object if needed for Jules PRs
             repo = None
@@ -601,6 +767,13 @@ class AutomationEngine:
                     logger.info(f"Skipping PR #{pr_number} - waiting for Jules to fix CI failures")
                     continue
 
+                scan = conflict_scans.get(pr_number)
+                if scan is not None and scan.error is None:
+                    pr_data["conflict_scan"] = scan.to_dict()
+                    # GitHub reports null while it computes mergeability; the local merge knows already
+                    if pr_data.get("mergeable") is None:
+                        pr_data["mergeable"] = not scan.has_conflicts
+
                 mergeable = pr_data.get("mergeable", True)
 
                 # Handle dependency-bot PRs based on configuration
@@ -715,11 +888,15 @@ class AutomationEngine:
                     else:
                         pr_priority = 3  # Urgent + mergeable
                 elif not mergeable:
-                    pr_priority = 2  # Unmergeable PRs (elevated from priority 1)
+                    # Dependency-only conflicts go to the lockfile/package.json resolvers, so they clear quickly
+                    dependency_only = (pr_data.get("conflict_scan") or {}).get("dependency_only") and not is_dependency_bot
+                    pr_priority = 3 if dependency_only else 2  # Unmergeable PRs (elevated from priority 1)
                 elif not checks.success:
                     pr_priority = 1  # Fix-required but mergeable PRs
                 else:
                     pr_priority = 2  # Mergeable with successful checks (auto-merge candidate)
+                    if checks.ids:
+                        green_pr_numbers.add(pr_number)
 
                 candidates.append(
                     Candidate(
@@ -731,6 +908,9 @@ class AutomationEngine:
                     )
                 )
 
+            if self.config.AUTO_MERGE and get_merge_train_enabled_from_config():
+                candidates = self._form_merge_trains(repo_name, candidates, green_pr_numbers)
+
             # Collect issues if:
             # - max_items is set and we haven't reached it yet (respect the requested limit), OR
             # - we have no PR candidates, OR
@@ -891,6 +1071,49 @@ class AutomationEngine:
             # Clear the sub-issue cache when candidate acquisition is finished
             self.github.clear_sub_issue_cache()
 
+    def _form_merge_trains(self, repo_name: str, candidates: List[Candidate], green_pr_numbers: set[int]) -> List[Candidate]:
+        """Replace green PR candidates that share a base branch with merge train candidates.
+
+        PRs riding a train in flight are dropped. No second train is formed into
+        a base branch that already has one, and none into a base whose branch
+        protection requires up-to-date branches (GitHub would refuse PR 2..N).
+        """
+        yard = MergeTrainYard.get_instance()
+        riding = yard.riding(repo_name)
+        busy_bases = yard.bases(repo_name)
+        green = [c.data for c in candidates if c.type == "pr" and c.data.get("number") in green_pr_numbers and c.data.get("number") not in riding]
+        train_candidates: List[Candidate] = []
+        for train in plan_merge_trains(green, max_size=get_merge_train_max_size_from_config()):
+            base = train[0].get("base_branch") or train[0].get("base", {}).get("ref")
+            if base in busy_bases:
+                continue
+            if requires_up_to_date_branches(self.github, repo_name, base):
+                logger.debug(f"Branch protection of {base} requires up-to-date branches; merging its PRs one by one")
+                continue
+            numbers = [pr["number"] for pr in train]
+            riding.update(numbers)
+            logger.info(f"Forming merge train into {base}: {', '.join(f'#{n}' for n in numbers)}")
+            train_candidates.append(self._merge_train_candidate(base, train))
+        if not riding:
+            return candidates
+        return [c for c in candidates if not (c.type == "pr" and c.data.get("number") in riding)] + train_candidates
+
+    @staticmethod
+    def _merge_train_candidate(base: str, prs: List[Dict[str, Any]]) -> Candidate:
+        numbers = ", ".join(f"#{pr['number']}" for pr in prs)
+        return Candidate(
+            type="merge_train",
+            data={
+                "number": prs[0]["number"],
+                "title": f"Merge train into {base}: {numbers}",
+                "base": base,
+                "prs": prs,
+                "created_at": prs[0].get("created_at", ""),
+            },
+            priority=2,
+            branch_name=train_branch_name(base),
+        )
+
     def _is_issue_author_allowed(self, issue_data: Optional[Dict[str, Any]]) -> bool:
         """Check if the author of the issue is present in the issue allowlist."""
         from .automation_config import get_author_id, is_author_allowlisted
@@ -979,6 +1202,14 @@ class AutomationEngine:
             if item_number is None:
                 raise ValueError(f"Item number is missing for {item_type} #{candidate.data.get('number', 'N/A')}")
 
+            if item_type == "merge_train":
+                # Each PR's label and merge state are handled by the train itself
+                get_trace_logger().log("Dispatch", f"Dispatching {candidate.data.get('title')}", item_type="pr", item_number=item_number, details={"mode": "merge_train"})
+                train_result = run_merge_train(repo_name, candidate.data["base"], candidate.data["prs"], config, self.github)
+                result.actions = train_result.actions
+                result.success = True
+                return result
+
             # Check author allowlists before any processing or API actions
             if item_type == "pr" and not self._is_pr_author_allowed(candidate.data):
                 logger.info(f"Skipping PR #{item_number} - author not in PR allowlist")
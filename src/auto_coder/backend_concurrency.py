@@ -0,0 +1,183 @@
+"""Per-backend concurrency limiter with FIFO admission.
+
+With several workers, every worker thread can launch the same LLM CLI at once,
+which trips provider rate limits in bursts and sends every BackendManager into
+a rotation storm. BackendManager admits each call through a governor that caps
+in-flight calls per backend and per backend provider. Waiting calls are served
+in arrival order; when a backend already has max_queue calls waiting, a new call
+spills over to the next backend instead (unless it is the last one to try).
+
+The limiter is opt-in via [backend_concurrency].enabled in config.toml.
+Per-key overrides live in [backend_concurrency.limits], keyed by backend name
+or "backend:provider".
+"""
+
+import contextlib
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Iterator, List, Optional
+
+from .exceptions import AutoCoderBackendBusyError
+from .logger_config import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_MAX_IN_FLIGHT = 2
+DEFAULT_PROVIDER_MAX_IN_FLIGHT = 1
+DEFAULT_MAX_QUEUE = 4
+
+
+class _Gate:
+    """FIFO counting semaphore for one backend or backend:provider key."""
+
+    def __init__(self, limit: int):
+        self.limit = max(1, limit)
+        self.in_flight = 0
+        self.waiters: Deque[object] = deque()
+        self.admitted = 0
+        self.spilled = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+
+class BackendConcurrencyGovernor:
+    """Caps concurrent LLM calls per backend and per provider."""
+
+    _instance: Optional["BackendConcurrencyGovernor"] = None
+    _instance_lock = threading.Lock()
+
+    def __init__(
+        self,
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+        provider_max_in_flight: int = DEFAULT_PROVIDER_MAX_IN_FLIGHT,
+        max_queue: int = DEFAULT_MAX_QUEUE,
+        limits: Optional[Dict[str, int]] = None,
+    ):
+        self.max_in_flight = max_in_flight
+        self.provider_max_in_flight = provider_max_in_flight
+        self.max_queue = max_queue
+        self.limits = dict(limits or {})
+        self._cond = threading.Condition()
+        self._gates: Dict[str, _Gate] = {}
+        self._wait_started: Dict[object, float] = {}
+
+    @classmethod
+    def get_instance(cls) -> "BackendConcurrencyGovernor":
+        """Return the process-wide governor configured from config.toml."""
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    from .llm_backend_config import (
+                        get_backend_concurrency_limits_from_config,
+                        get_backend_concurrency_max_in_flight_from_config,
+                        get_backend_concurrency_max_queue_from_config,
+                        get_backend_concurrency_provider_max_in_flight_from_config,
+                    )
+
+                    cls._instance = cls(
+                        max_in_flight=get_backend_concurrency_max_in_flight_from_config(),
+                        provider_max_in_flight=get_backend_concurrency_provider_max_in_flight_from_config(),
+                        max_queue=get_backend_concurrency_max_queue_from_config(),
+                        limits=get_backend_concurrency_limits_from_config(),
+                    )
+        return cls._instance
+
+    @classmethod
+    def reset_instance(cls) -> None:
+        """Drop the singleton (used by tests)."""
+        with cls._instance_lock:
+            cls._instance = None
+
+    def _gate(self, key: str, default_limit: int) -> _Gate:
+        gate = self._gates.get(key)
+        if gate is None:
+            gate = self._gates[key] = _Gate(self.limits.get(key, default_limit))
+        return gate
+
+    def _acquire(self, key: str, default_limit: int, allow_spill: bool) -> None:
+        with self._cond:
+            gate = self._gate(key, default_limit)
+            if gate.in_flight < gate.limit and not gate.waiters:
+                gate.in_flight += 1
+                gate.admitted += 1
+                return
+            if allow_spill and len(gate.waiters) >= self.max_queue:
+                gate.spilled += 1
+                raise AutoCoderBackendBusyError(f"Admission queue for '{key}' is full ({len(gate.waiters)} waiting, {gate.in_flight} in flight)")
+
+            ticket = object()
+            started = time.monotonic()
+            gate.waiters.append(ticket)
+            self._wait_started[ticket] = started
+            try:
+                while gate.waiters[0] is not ticket or gate.in_flight >= gate.limit:
+                    self._cond.wait()
+            except BaseException:
+                gate.waiters.remove(ticket)
+                self._cond.notify_all()
+                raise
+            finally:
+                self._wait_started.pop(ticket, None)
+            gate.waiters.popleft()
+            gate.in_flight += 1
+            gate.admitted += 1
+            waited = time.monotonic() - started
+            gate.total_wait += waited
+            gate.max_wait = max(gate.max_wait, waited)
+            # The next waiter may fit as well when the limit is above one
+            self._cond.notify_all()
+        logger.debug(f"Admitted LLM call to '{key}' after waiting {waited:.1f}s")
+
+    def _release(self, key: str) -> None:
+        with self._cond:
+            self._gates[key].in_flight -= 1
+            self._cond.notify_all()
+
+    @contextlib.contextmanager
+    def admit(self, backend: str, provider: Optional[str] = None, allow_spill: bool = True) -> Iterator[None]:
+        """Hold a backend (and provider) slot for the duration of the block.
+
+        Raises:
+            AutoCoderBackendBusyError: If allow_spill is set and a queue is full
+        """
+        keys: List[str] = []
+        try:
+            self._acquire(backend, self.max_in_flight, allow_spill)
+            keys.append(backend)
+            if provider:
+                provider_key = f"{backend}:{provider}"
+                self._acquire(provider_key, self.provider_max_in_flight, allow_spill)
+                keys.append(provider_key)
+            yield
+        finally:
+            for key in reversed(keys):
+                self._release(key)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Return in-flight, queue and wait-time figures per backend/provider key."""
+        now = time.monotonic()
+        with self._cond:
+            result: Dict[str, Dict[str, Any]] = {}
+            for key, gate in self._gates.items():
+                waiting_since = [self._wait_started[t] for t in gate.waiters if t in self._wait_started]
+                result[key] = {
+                    "limit": gate.limit,
+                    "in_flight": gate.in_flight,
+                    "queued": len(gate.waiters),
+                    "admitted": gate.admitted,
+                    "spilled": gate.spilled,
+                    "avg_wait_seconds": round(gate.total_wait / gate.admitted, 3) if gate.admitted else 0.0,
+                    "max_wait_seconds": round(gate.max_wait, 3),
+                    "oldest_wait_seconds": round(now - min(waiting_since), 3) if waiting_since else 0.0,
+                }
+            return result
+
+
+def get_backend_concurrency_governor() -> Optional[BackendConcurrencyGovernor]:
+    """Return the process-wide governor, or None when [backend_concurrency].enabled is off."""
+    from .llm_backend_config import get_backend_concurrency_enabled_from_config
+
+    if not get_backend_concurrency_enabled_from_config():
+        return None
+    return BackendConcurrencyGovernor.get_instance()
@@ -0,0 +1,218 @@
+"""Cross-process registry of backends that hit a usage limit.
+
+When a backend (or one of its providers) raises AutoCoderUsageLimitError, the
+time it becomes usable again is parsed from the error message and recorded in
+a SQLite database shared by every BackendManager (general and no-edit) and
+every auto-coder process on the host. Backend selection consults the registry
+first, so a known-exhausted backend is skipped without launching its CLI and
+without sleeping inline.
+
+The registry is opt-in via [backend_cooldown].enabled in config.toml.
+"""
+
+import re
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .logger_config import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_COOLDOWN_SECONDS = 300
+
+_UNIT_SECONDS = {"d": 86400, "h": 3600, "m": 60, "s": 1}
+_RELATIVE_RE = re.compile(
+    r"(?:try again|retry|resets?|available)\s+(?:in|after)\s+((?:\d+(?:\.\d+)?\s*(?:days?|d|hours?|hrs?|h|minutes?|mins?|m|seconds?|secs?|s)\b[\s,]*(?:and\s+)?)+)",
+    re.IGNORECASE,
+)
+_DURATION_PART_RE = re.compile(r"(\d+(?:\.\d+)?)\s*([dhms])", re.IGNORECASE)
+_ISO_RE = re.compile(r"(?:resets?|until|available)\s+(?:at\s+)?(\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?(?:Z|[+-]\d{2}:?\d{2})?)", re.IGNORECASE)
+_CLOCK_RE = re.compile(r"(?:resets?|try again)\s+(?:at\s+)?(\d{1,2})(?::(\d{2}))?\s*(am|pm)(?:\s*\(([^)]+)\))?", re.IGNORECASE)
+_RETRY_AFTER_RE = re.compile(r"retry-after:\s*(\d+)", re.IGNORECASE)
+
+
+def parse_unavailable_until(message: str, now: Optional[float] = None) -> Optional[float]:
+    """Parse the time a usage limit lifts from a CLI/API error message.
+
+    Understands relative forms ("try again in 2 hours 22 minutes", "retry in 60s"),
+    ISO timestamps ("resets at 2025-01-01T12:00:00Z"), clock times with an
+    optional IANA zone ("resets 2am (Asia/Tokyo)") and "Retry-After: 120".
+
+    Returns:
+        Epoch seconds when the backend should be usable again, or None if unknown
+    """
+    now = time.time() if now is None else now
+    text = message or ""
+
+    match = _RELATIVE_RE.search(text)
+    if match:
+        seconds = sum(float(value) * _UNIT_SECONDS[unit[0].lower()] for value, unit in _DURATION_PART_RE.findall(match.group(1)))
+        if seconds > 0:
+            return now + seconds
+
+    match = _RETRY_AFTER_RE.search(text)
+    if match:
+        return now + int(match.group(1))
+
+    match = _ISO_RE.search(text)
+    if match:
+        try:
+            # Naive timestamps are taken as local time
+            return datetime.fromisoformat(match.group(1).replace("Z", "+00:00")).timestamp()
+        except ValueError:
+            pass
+
+    match = _CLOCK_RE.search(text)
+    if match:
+        hour = int(match.group(1)) % 12 + (12 if match.group(3).lower() == "pm" else 0)
+        minute = int(match.group(2) or 0)
+        tz = None
+        if match.group(4):
+            try:
+                from zoneinfo import ZoneInfo
+
+                tz = ZoneInfo(match.group(4).strip())
+            except Exception:
+                tz = None
+        current = datetime.fromtimestamp(now, tz) if tz else datetime.fromtimestamp(now)
+        resets_at = current.replace(hour=hour, minute=minute, second=0, microsecond=0)
+        if resets_at.timestamp() <= now:
+            resets_at += timedelta(days=1)
+        return resets_at.timestamp()
+
+    return None
+
+
+def get_backend_cooldown_db_path() -> Path:
+    """Return the path of the host-wide cooldown database (~/.auto-coder/backend_cooldowns.sqlite3)."""
+    return Path.home() / ".auto-coder" / "backend_cooldowns.sqlite3"
+
+
+class BackendCooldownRegistry:
+    """SQLite-backed map of (backend, provider) to "unavailable until" timestamps.
+
+    A provider of "" stands for the backend as a whole.
+    """
+
+    _instance: Optional["BackendCooldownRegistry"] = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, db_path: Optional[Path] = None, default_cooldown_seconds: int = DEFAULT_COOLDOWN_SECONDS):
+        self.db_path = db_path or get_backend_cooldown_db_path()
+        self.default_cooldown_seconds = default_cooldown_seconds
+        self._lock = threading.Lock()
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS cooldowns (backend TEXT NOT NULL, provider TEXT NOT NULL, until REAL NOT NULL, reason TEXT, PRIMARY KEY (backend, provider))")
+
+    @classmethod
+    def get_instance(cls) -> "BackendCooldownRegistry":
+        """Return the process-wide registry."""
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    from .llm_backend_config import get_backend_cooldown_default_seconds_from_config
+
+                    cls._instance = cls(default_cooldown_seconds=get_backend_cooldown_default_seconds_from_config())
+        return cls._instance
+
+    @classmethod
+    def reset_instance(cls) -> None:
+        """Drop the singleton (used by tests)."""
+        with cls._instance_lock:
+            cls._instance = None
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(str(self.db_path), timeout=10)
+
+    def mark_unavailable(
+        self,
+        backend: str,
+        provider: Optional[str] = None,
+        until: Optional[float] = None,
+        reason: str = "",
+        fallback_seconds: Optional[int] = None,
+    ) -> float:
+        """Record that backend/provider is unusable until the given time.
+
+        If until is not given it is parsed from reason, falling back to
+        fallback_seconds (or the registry default). An existing later expiry is kept.
+
+        Returns:
+            The recorded "unavailable until" timestamp
+        """
+        now = time.time()
+        if until is None:
+            until = parse_unavailable_until(reason, now)
+        if until is None or until <= now:
+            until = now + (fallback_seconds or self.default_cooldown_seconds)
+
+        with self._lock:
+            conn = self._connect()
+            try:
+                with conn:
+                    conn.execute(
+                        "INSERT INTO cooldowns (backend, provider, until, reason) VALUES (?, ?, ?, ?) "
+                        "ON CONFLICT(backend, provider) DO UPDATE SET until = MAX(until, excluded.until), reason = excluded.reason",
+                        (backend, provider or "", until, reason[:500]),
+                    )
+            finally:
+                conn.close()
+
+        label = f"{backend} (provider: {provider})" if provider else backend
+        logger.warning(f"Backend {label} hit a usage limit; skipping it until {datetime.fromtimestamp(until).isoformat(timespec='seconds')}")
+        return until
+
+    def unavailable_until(self, backend: str, provider: Optional[str] = None) -> Optional[float]:
+        """Return when backend/provider becomes available again, or None if it is available now."""
+        with self._lock:
+            conn = self._connect()
+            try:
+                row = conn.execute("SELECT until FROM cooldowns WHERE backend = ? AND provider = ?", (backend, provider or "")).fetchone()
+            finally:
+                conn.close()
+        if row is None or row[0] <= time.time():
+            return None
+        return float(row[0])
+
+    def is_available(self, backend: str, provider: Optional[str] = None) -> bool:
+        """Return True unless backend/provider is in an active cooldown."""
+        return self.unavailable_until(backend, provider) is None
+
+    def clear(self, backend: str, provider: Optional[str] = None) -> None:
+        """Remove the cooldown for backend/provider (e.g. after a successful call)."""
+        with self._lock:
+            conn = self._connect()
+            try:
+                with conn:
+                    conn.execute("DELETE FROM cooldowns WHERE backend = ? AND provider = ?", (backend, provider or ""))
+            finally:
+                conn.close()
+
+    def active_cooldowns(self) -> List[Dict[str, object]]:
+        """Return every active cooldown, soonest expiry first."""
+        with self._lock:
+            conn = self._connect()
+            try:
+                rows = conn.execute("SELECT backend, provider, until, reason FROM cooldowns WHERE until > ? ORDER BY until", (time.time(),)).fetchall()
+            finally:
+                conn.close()
+        return [{"backend": b, "provider": p or None, "until": u, "reason": r} for b, p, u, r in rows]
+
+
+def get_backend_cooldown_registry() -> Optional[BackendCooldownRegistry]:
+    """Return the host-wide cooldown registry, or None when [backend_cooldown].enabled is off."""
+    from .llm_backend_config import get_backend_cooldown_enabled_from_config
+
+    if not get_backend_cooldown_enabled_from_config():
+        return None
+    try:
+        return BackendCooldownRegistry.get_instance()
+    except Exception as e:
+        logger.warning(f"Backend cooldown registry unavailable: {e}")
+        return None
@@ -10,16 +10,24 @@ import json
 import re
 import threading
 import time
+from datetime import datetime
 from typing import Any, Callable, Dict, List, Optional, Tuple
 
+from .backend_concurrency import get_backend_concurrency_governor
+from .backend_cooldown import get_backend_cooldown_registry
 from .backend_provider_manager import BackendProviderManager
+from .backend_routing import OUTCOME_ERROR, OUTCOME_SUCCESS, OUTCOME_TIMEOUT, OUTCOME_USAGE_LIMIT, get_backend_routing_policy, get_backend_routing_stats
 from .backend_session_manager import BackendSessionManager, BackendSessionState, create_session_state
 from .backend_state_manager import BackendStateManager
-from .exceptions import AutoCoderTimeoutError, AutoCoderUsageLimitError
+from .exceptions import AutoCoderBackendBusyError, AutoCoderTimeoutError, AutoCoderUsageLimitError
 from .llm_backend_config import LLMBackendConfiguration, get_llm_config
 from .llm_client_base import LLMBackendManagerBase
+from .llm_response_cache import get_llm_response_cache, make_cache_key
 from .logger_config import get_logger, log_calls
+from .metrics import get_metrics_registry
+from .noedit_hedging import get_noedit_hedger
 from .progress_footer import ProgressStage
+from .utils import is_command_cancelled
 
 logger = get_logger(__name__)
 
@@ -50,6 +58,94 @@ __all__ = [
 ]
 
 
+def _format_timestamp(epoch: float) -> str:
+    """Format an epoch timestamp as local ISO time (parseable by backend_cooldown)."""
+    return datetime.fromtimestamp(epoch).isoformat(timespec="seconds")
+
+
+# "{" or "[" followed by something a JSON object or array can continue with;
+# any other bracket would fail to decode at once, so it is not tried at all
+_JSON_START_RE = re.compile(r'\{\s*["}]|\[\s*["{\[\]\-0-9tfnNI]')
+# First slice decoded per candidate; doubled while the value runs past its end
+_JSON_DECODE_WINDOW = 512
+_JSON_DECODER = json.JSONDecoder()
+
+
+def _parse_fenced_json(text: str) -> Any:
+    """Parse the first ```json fenced block (or the first plain ``` block) in text.
+
+    Raises:
+        json.JSONDecodeError, IndexError: If there is no fenced block or it is not valid JSON
+    """
+    fence = text.find("```json")
+    if fence >= 0:
+        body_start = fence + len("```json")
+    else:
+        fence = text.find("```")
+        if fence < 0:
+            raise IndexError("no fenced block")
+        body_start = fence + 3
+    body_end = text.find("```", body_start)
+    if body_end < 0:
+        body_end = len(text)
+    return json.loads(text[body_start:body_end].strip())
+
+
+def _decode_json_at(output: str, start: int) -> Tuple[Any, int]:
+    """Decode the JSON value at output[start] as raw_decode(output[start:]) would.
+
+    Decodes from a bounded slice, doubling it only while the value may continue
+    past its end. JSONDecodeError counts newlines from the start of the
+    document it was given, so decoding in place (or from output[start:]) made
+    every failed candidate cost O(len(output)).
+
+    Returns:
+        The decoded value and the index just past it in output
+
+    Raises:
+        json.JSONDecodeError: If no JSON value starts at start
+    """
+    window = _JSON_DECODE_WINDOW
+    while True:
+        chunk = output[start : start + window]
+        try:
+            value, consumed = _JSON_DECODER.raw_decode(chunk)
+            return value, start + consumed
+        except json.JSONDecodeError as e:
+            # An error well before the end of the slice is not caused by cutting it
+            if start + window >= len(output) or (e.pos < len(chunk) - 16 and not e.msg.startswith("Unterminated string")):
+                raise
+            window *= 2
+
+
+def _find_last_json_value(output: str) -> Any:
+    """Return the last JSON object or array decoded scanning output from left to right.
+
+    Each "{" or "[" is tried in turn; a value that decodes is taken whole and the
+    scan resumes after it, so brackets inside it (or inside its strings) are
+    never tried on their own. Failed candidates usually fail within a few
+    characters, and _decode_json_at keeps each attempt to a bounded slice.
+
+    Raises:
+        ValueError: If no JSON object or array could be decoded
+    """
+    found = False
+    last_value: Any = None
+    match = _JSON_START_RE.search(output)
+    while match:
+        start = match.start()
+        try:
+            last_value, end = _decode_json_at(output, start)
+            found = True
+        except json.JSONDecodeError:
+            end = start + 1
+        match = _JSON_START_RE.search(output, end)
+
+    if not found:
+        raise ValueError(f"Failed to parse output as JSON: No JSON object could be decoded\nOutput: {output}")
+    return last_value
+
+
 def parse_llm_output_as_json(output: str) -> Any:
     """
     Parse LLM output as JSON and extract content.
@@ -65,6 +161,9 @@ def parse_llm_output_as_json(output: str) -> Any:
     For list outputs (conversation history), extracts the content from the last message.
     For dict outputs, returns the dict directly.
 
+    Candidate blocks are decoded from bounded slices, so multi-megabyte agent
+    transcripts full of braces are handled without rescanning.
+
     Args:
         output: The raw LLM output string to parse
 
@@ -93,18 +192,9 @@ def parse_llm_output_as_json(output: str) -> Any:
 
     # First, try to handle markdown code blocks (common in LLM responses)
     stripped_output = output.strip()
-    if "```json" in stripped_output:
+    if "```" in stripped_output:
         try:
-            json_match = stripped_output.split("```json")[1].split("```")[0].strip()
-            parsed = json.loads(json_match)
-            return _extract_content(parsed)
-        except (json.JSONDecodeError, IndexError):
-            pass
-    elif "```" in stripped_output:
-        try:
-            json_match = stripped_output.split("```")[1].split("```")[0].strip()
-            parsed = json.loads(json_match)
-            return _extract_content(parsed)
+            return _extract_content(_parse_fenced_json(stripped_output))
         except (json.JSONDecodeError, IndexError):
             pass
 
@@ -115,28 +205,8 @@ def parse_llm_output_as_json(output: str) -> Any:
     except json.JSONDecodeError:
         pass
 
-    # Fall back to scanning for the last valid JSON block in the output
-    decoder = json.JSONDecoder()
-    json_candidates: List[Any] = []
-    search_pos = 0
-
-    while search_pos < len(output):
-        match = re.search(r"[\\[{]", output[search_pos:])
-        if not match:
-            break
-        start = search_pos + match.start()
-        try:
-            parsed_partial, end = decoder.raw_decode(output[start:])
-            json_candidates.append(parsed_partial)
-            search_pos = start + end
-        except json.JSONDecodeError:
-            search_pos = start + 1
-
-    if not json_candidates:
-        raise ValueError(f"Failed to parse output as JSON: No JSON object could be decoded\nOutput: {output}")
-
-    # Use the last successfully parsed JSON block (handles prompt + JSON scenarios)
-    parsed_json = _extract_content(json_candidates[-1])
+    # Fall back to the last valid JSON block in the output (handles prompt + JSON scenarios)
+    parsed_json = _extract_content(_find_last_json_value(output))
 
     # Special handling for agent runner output which wraps result in a "result" field
     # and sometimes that result is a string containing JSON that needs to be parsed again
@@ -146,15 +216,10 @@ def parse_llm_output_as_json(output: str) -> Any:
         if isinstance(inner_result, str):
             try:
                 # Check for markdown code blocks in the inner string
-                if "```json" in inner_result:
-                    inner_json_match = inner_result.split("```json")[1].split("```")[0].strip()
-                    return json.loads(inner_json_match)
-                elif "```" in inner_result:
-                    inner_json_match = inner_result.split("```")[1].split("```")[0].strip()
-                    return json.loads(inner_json_match)
-                else:
-                    # Try direct parsing
-                    return json.loads(inner_result.strip())
+                if "```" in inner_result:
+                    return _parse_fenced_json(inner_result)
+                # Try direct parsing
+                return json.loads(inner_result.strip())
             except (json.JSONDecodeError, IndexError):
                 # If parsing fails, return the original parsed_json
                 pass
@@ -232,6 +297,11 @@ class BackendManager(LLMBackendManagerBase):
         self._session_state_manager = BackendSessionManager()
         self._restore_session_state()
 
+        # Routing policy ranking backends by recorded latency/success ("order" keeps the rotation as is)
+        self._routing_policy = get_backend_routing_policy()
+        # Set when the caller rotated deliberately so the next call must not be re-routed
+        self._routing_hold = False
+
     @property
     def provider_manager(self) -> BackendProviderManager:
         """
@@ -322,6 +392,7 @@ class BackendManager(LLMBackendManagerBase):
         when the switch occurred, enabling the auto-reset feature to
         reset back to the default backend after 2 hours.
         """
+        get_metrics_registry().inc("auto_coder_llm_backend_rotations_total", backend=self._current_backend_name())
         self._switch_to_index(self._current_idx + 1)
         # Reset session ID when switching backends
         self._last_session_id = None
@@ -506,6 +577,21 @@ class BackendManager(LLMBackendManagerBase):
         else:
             logger.warning(f"Client for backend '{backend_name}' does not support set_extra_args")
 
+    def _route_to_best_backend(self, cooldowns: Any) -> None:
+        """Start from the best ranked backend that is not cooling down (score policy only)."""
+        if self._routing_hold:
+            self._routing_hold = False
+            return
+        if not self._routing_policy.dynamic:
+            return
+        for backend_name in self._routing_policy.rank(self._all_backends):
+            if cooldowns is not None and not cooldowns.is_available(backend_name):
+                continue
+            if backend_name != self._current_backend_name():
+                logger.info(f"Routing to backend '{backend_name}' ({self._routing_policy.name} policy)")
+                self._switch_to_index(self._all_backends.index(backend_name))
+            return
+
     # ---------- Direct Compatibility Methods ----------
     @log_calls  # type: ignore[misc]
     def _run_llm_cli(self, prompt: str) -> str:
@@ -520,11 +606,24 @@ class BackendManager(LLMBackendManagerBase):
         last_error: Optional[Exception] = None
         # Track retry attempts per backend
         retry_attempts: Dict[str, int] = {}
+        # Usage limits recorded by any manager or process on this host
+        cooldowns = get_backend_cooldown_registry()
+        self._route_to_best_backend(cooldowns)
 
         while attempts < len(self._all_backends):
             backend_name = self._current_backend_name()
             current_idx = self._current_idx
 
+            if cooldowns is not None:
+                until = cooldowns.unavailable_until(backend_name)
+                if until is not None:
+                    logger.info(f"Skipping backend '{backend_name}': usage limit cooldown until {_format_timestamp(until)}")
+                    tried.add(current_idx)
+                    last_error = AutoCoderUsageLimitError(f"Backend '{backend_name}' is cooling down until {_format_timestamp(until)}")
+                    self.switch_to_next_backend()
+                    attempts += 1
+                    continue
+
             # Check if this backend index has already been tried (for rotation tracking)
             # But allow retries of the same backend if configured and not exhausted
             if current_idx in tried:
@@ -576,11 +675,22 @@ class BackendManager(LLMBackendManagerBase):
                 last_error = exc
                 # Check if we should retry this backend
                 backend_config = get_llm_config().get_backend_config(backend_name)
+                if cooldowns is not None:
+                    # Record the limit for everyone and move on instead of sleeping inline
+                    cooldowns.mark_unavailable(
+                        backend_name,
+                        reason=str(exc),
+                        fallback_seconds=backend_config.usage_limit_retry_wait_seconds if backend_config else None,
+                    )
+                    self.switch_to_next_backend()
+                    attempts += 1
+                    continue
                 if backend_config and backend_config.usage_limit_retry_count > 0:
                     current_retries = retry_attempts.get(backend_name, 0)
                     if current_retries < backend_config.usage_limit_retry_count:
                         # Retry the same backend
                         retry_attempts[backend_name] = current_retries + 1
+                        get_metrics_registry().inc("auto_coder_llm_retries_total", backend=backend_name)
                         wait_seconds = backend_config.usage_limit_retry_wait_seconds
                         time.sleep(wait_seconds)
                         # Don't switch to next backend, retry on the same one
@@ -596,6 +706,12 @@ class BackendManager(LLMBackendManagerBase):
                 self.switch_to_next_backend()
                 attempts += 1
                 continue
+            except AutoCoderBackendBusyError as exc:
+                last_error = exc
+                logger.info(f"{exc}; spilling over to the next backend")
+                self.switch_to_next_backend()
+                attempts += 1
+                continue
             except Exception as exc:
                 last_error = exc
                 break
@@ -632,9 +748,22 @@ class BackendManager(LLMBackendManagerBase):
         backend_has_providers = self._provider_manager.has_providers(backend_name)
         provider_count = self._provider_manager.get_provider_count(backend_name)
         provider_attempts = 0
+        cooldowns = get_backend_cooldown_registry() if backend_has_providers else None
+        earliest_until: Optional[float] = None
+        governor = get_backend_concurrency_governor()
+        # The last backend in the rotation queues instead of spilling over
+        allow_spill = backend_attempt_number < len(self._all_backends)
 
         while True:
             provider_name = self._get_current_provider_name(backend_name)
+            if cooldowns is not None and provider_name:
+                until = cooldowns.unavailable_until(backend_name, provider_name)
+                if until is not None:
+                    earliest_until = until if earliest_until is None else min(earliest_until, until)
+                    if provider_attempts < provider_count - 1 and self._provider_manager.advance_to_next_provider(backend_name):
+                        provider_attempts += 1
+                        continue
+                    raise AutoCoderUsageLimitError(f"All providers for backend '{backend_name}' are cooling down until {_format_timestamp(earliest_until)}")
             env_vars = self._provider_manager.create_env_context(backend_name) if backend_has_providers else {}
             provider_context = f"{backend_name}"
             if provider_name:
@@ -642,12 +771,16 @@ class BackendManager(LLMBackendManagerBase):
             message = f"Running LLM: {provider_context}, attempt {backend_attempt_number}"
 
             env_context = temp_env_cls(env_vars) if env_vars else contextlib.nullcontext()
+            admission = governor.admit(backend_name, provider_name, allow_spill=allow_spill) if governor is not None else contextlib.nullcontext()
 
-            with ProgressStage(message), env_context:
+            with ProgressStage(message), env_context, admission:
+                started = time.perf_counter()
+                model_name = getattr(cli, "model_name", None)
                 try:
                     # Determine if this is a no-edit operation
                     is_noedit = getattr(self, "_is_noedit", False)
                     out: str = cli._run_llm_cli(prompt, is_noedit=is_noedit)
+                    self._record_call(backend_name, provider_name, model_name, started, OUTCOME_SUCCESS, prompt=prompt, response=out)
                     self._last_backend = backend_name
                     self._last_model = getattr(cli, "model_name", None)
                     self._provider_manager.mark_provider_used(backend_name, provider_name)
@@ -657,12 +790,51 @@ class BackendManager(LLMBackendManagerBase):
                     self._save_session_state(backend_name, self._last_session_id)
                     return out
                 except AutoCoderUsageLimitError as exc:
+                    self._record_call(backend_name, provider_name, model_name, started, OUTCOME_USAGE_LIMIT, prompt=prompt)
+                    if cooldowns is not None and provider_name:
+                        until = cooldowns.mark_unavailable(backend_name, provider_name, reason=str(exc))
+                        earliest_until = until if earliest_until is None else min(earliest_until, until)
                     if backend_has_providers and provider_count > 1 and provider_attempts < provider_count - 1:
                         rotated = self._provider_manager.advance_to_next_provider(backend_name)
                         if rotated:
                             provider_attempts += 1
                             continue
                     raise
+                except AutoCoderTimeoutError:
+                    self._record_call(backend_name, provider_name, model_name, started, OUTCOME_TIMEOUT, prompt=prompt)
+                    raise
+                except Exception:
+                    self._record_call(backend_name, provider_name, model_name, started, OUTCOME_ERROR, prompt=prompt)
+                    raise
+
+    def _record_call(
+        self,
+        backend_name: str,
+        provider_name: Optional[str],
+        model_name: Optional[str],
+        started: float,
+        outcome: str,
+        prompt: str = "",
+        response: Optional[str] = None,
+    ) -> None:
+        """Feed the outcome of one backend call into the routing statistics and metrics."""
+        if is_command_cancelled():
+            # A hedged call that lost the race says nothing about the backend
+            return
+        latency = time.perf_counter() - started
+        metrics = get_metrics_registry()
+        metrics.inc("auto_coder_llm_calls_total", backend=backend_name, outcome=outcome)
+        metrics.observe("auto_coder_llm_call_seconds", latency, backend=backend_name)
+        metrics.observe("auto_coder_llm_prompt_chars", len(prompt), backend=backend_name)
+        if response is not None:
+            metrics.observe("auto_coder_llm_response_chars", len(response), backend=backend_name)
+        if not self._routing_policy.dynamic:
+            # The "order" policy never reads the statistics
+            return
+        try:
+            get_backend_routing_stats().record_call(backend_name, provider_name, model_name, latency, outcome)
+        except Exception as exc:  # pragma: no cover - defensive
+            logger.debug(f"Failed to record routing stats for '{backend_name}': {exc}")
 
     # ---------- For apply_workspace_test_fix ----------
     @log_calls  # type: ignore[misc]
@@ -685,6 +857,7 @@ class BackendManager(LLMBackendManagerBase):
                 # If the same backend continued twice before, switch before the 3rd execution
                 if self._same_test_file_count >= 2:
                     self.switch_to_next_backend()
+                    self._routing_hold = True
                     self._same_test_file_count = 1
                 else:
                     self._same_test_file_count += 1
@@ -707,6 +880,7 @@ class BackendManager(LLMBackendManagerBase):
             except AutoCoderTimeoutError as exc:
                 logger.warning(f"Timeout error on backend '{active_backend}', switching to next backend")
                 self.switch_to_next_backend()
+                self._routing_hold = True
                 # Try again with the next backend
                 with ProgressStage(f"Running LLM: {self._current_backend_name()}"):
                     out = self._run_llm_cli(prompt)
@@ -1106,12 +1280,66 @@ def get_message_backend_manager(
     )
 
 
+def _run_noedit(manager: BackendManager, prompt: str) -> str:
+    """Run a no-edit prompt, hedging on a second backend when [llm_hedging] is enabled."""
+    hedger = get_noedit_hedger()
+    if hedger is None:
+        return manager._run_llm_cli(prompt)  # type: ignore[no-any-return]
+    return hedger.run(manager, prompt)
+
+
+def run_noedit_prompt_with(manager: BackendManager, prompt: str) -> str:
+    """
+    Run a no-edit prompt on a non-editing backend manager.
+
+    When [llm_response_cache] is enabled, an identical prompt sent to the same
+    backend, model and options is answered from the on-disk response cache
+    (see llm_response_cache.bypass_llm_response_cache to skip it). When
+    [llm_hedging] is enabled, a slow call is raced against a second backend.
+
+    Args:
+        manager: Non-editing backend manager (see get_noedit_backend_manager)
+        prompt: The prompt to send to the LLM
+
+    Returns:
+        str: The response from the LLM
+    """
+    # Mark this as a no-edit operation so clients use options_for_noedit
+    manager._is_noedit = True
+
+    cache = get_llm_response_cache()
+    if cache is None:
+        return _run_noedit(manager, prompt)
+
+    backend_name = manager._current_backend_name()
+    try:
+        cli = manager._get_or_create_client(backend_name)
+    except Exception:
+        cli = None
+    model_name = getattr(cli, "model_name", None)
+    cache_key = make_cache_key(backend_name, model_name, prompt, getattr(cli, "options", None))
+
+    cached = cache.get(cache_key)
+    if cached is not None:
+        logger.info(f"Using cached no-edit response from {backend_name} (hit rate {cache.stats()['hit_rate']:.0%})")
+        manager._last_backend = backend_name
+        manager._last_model = model_name
+        return cached
+
+    response = _run_noedit(manager, prompt)
+    # Only cache responses produced by the backend the key was computed for
+    if response and manager._last_backend == backend_name:
+        cache.put(cache_key, response)
+    return response  # type: ignore[no-any-return]
+
+
 def run_llm_noedit_prompt(prompt: str) -> str:
     """
     Run a prompt using the global non-editing backend manager.
 
     This is a convenience function that provides a simple way to execute non-editing
-    tasks (commit messages, PR messages) using the global non-editing backend manager singleton.
+    tasks (commit messages, PR messages) using the global non-editing backend manager
+    singleton, through the response cache and hedging (see run_noedit_prompt_with).
 
     Args:
         prompt: The prompt to send to the LLM
@@ -1125,9 +1353,7 @@ def run_llm_noedit_prompt(prompt: str) -> str:
     manager = LLMBackendManager.get_noedit_instance()
     if manager is None:
         raise RuntimeError("Non-editing backend manager not initialized. " "Call get_noedit_backend_manager() with initialization parameters first.")
-    # Mark this as a no-edit operation so clients use options_for_noedit
-    manager._is_noedit = True
-    return manager._run_llm_cli(prompt)  # type: ignore[no-any-return]
+    return run_noedit_prompt_with(manager, prompt)
 
 
 def run_llm_message_prompt(prompt: str) -> str:
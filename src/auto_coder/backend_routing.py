@@ -0,0 +1,260 @@
+"""Latency- and success-aware backend routing.
+
+BackendManager records the outcome of every LLM call (latency, timeout, usage
+limit, error) per backend/provider/model, and fix_to_pass_tests records whether
+the tests passed after each edit. A routing policy ranks the configured
+backends from these statistics:
+
+- "order" (default): the configured order, i.e. plain round-robin rotation.
+- "score": backends with fewer than min_samples calls first (so every backend
+  is measured), then ascending score, where the score is the EWMA latency of
+  successful calls inflated by the timeout and usage-limit rates and divided
+  by the call and task success rates.
+
+Statistics are only recorded while a policy that reads them is configured.
+They are kept per process and persisted to
+~/.auto-coder/backend_routing_stats.json so a restart does not lose them.
+"""
+
+import json
+import os
+import tempfile
+import threading
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .logger_config import get_logger
+
+logger = get_logger(__name__)
+
+OUTCOME_SUCCESS = "success"
+OUTCOME_TIMEOUT = "timeout"
+OUTCOME_USAGE_LIMIT = "usage_limit"
+OUTCOME_ERROR = "error"
+
+DEFAULT_EWMA_ALPHA = 0.3
+DEFAULT_MIN_SAMPLES = 3
+
+
+@dataclass
+class BackendStats:
+    """Call and task outcome counters for one backend/provider/model."""
+
+    calls: int = 0
+    successes: int = 0
+    timeouts: int = 0
+    usage_limits: int = 0
+    errors: int = 0
+    ewma_latency: Optional[float] = None
+    task_successes: int = 0
+    task_failures: int = 0
+
+    @property
+    def success_rate(self) -> float:
+        # Laplace smoothing keeps a single failure from zeroing a backend out
+        return (self.successes + 1) / (self.calls + 2)
+
+    @property
+    def timeout_rate(self) -> float:
+        return self.timeouts / self.calls if self.calls else 0.0
+
+    @property
+    def usage_limit_rate(self) -> float:
+        return self.usage_limits / self.calls if self.calls else 0.0
+
+    @property
+    def task_success_rate(self) -> float:
+        return (self.task_successes + 1) / (self.task_successes + self.task_failures + 2)
+
+    def merge(self, other: "BackendStats") -> "BackendStats":
+        """Combine two stats, weighting EWMA latency by successful calls."""
+        latency: Optional[float] = None
+        if self.ewma_latency is not None and other.ewma_latency is not None:
+            weight = self.successes + other.successes
+            latency = (self.ewma_latency * self.successes + other.ewma_latency * other.successes) / weight if weight else self.ewma_latency
+        else:
+            latency = self.ewma_latency if self.ewma_latency is not None else other.ewma_latency
+        return BackendStats(
+            calls=self.calls + other.calls,
+            successes=self.successes + other.successes,
+            timeouts=self.timeouts + other.timeouts,
+            usage_limits=self.usage_limits + other.usage_limits,
+            errors=self.errors + other.errors,
+            ewma_latency=latency,
+            task_successes=self.task_successes + other.task_successes,
+            task_failures=self.task_failures + other.task_failures,
+        )
+
+
+def get_backend_routing_stats_path() -> Path:
+    """Return the path of the persisted routing statistics."""
+    return Path.home() / ".auto-coder" / "backend_routing_stats.json"
+
+
+def _stats_key(backend: str, provider: Optional[str], model: Optional[str]) -> str:
+    return f"{backend}|{provider or ''}|{model or ''}"
+
+
+class BackendRoutingStats:
+    """Thread-safe recorder of per backend/provider/model outcomes."""
+
+    _instance: Optional["BackendRoutingStats"] = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, path: Optional[Path] = None, ewma_alpha: float = DEFAULT_EWMA_ALPHA):
+        self.path = path or get_backend_routing_stats_path()
+        self.ewma_alpha = ewma_alpha
+        self._lock = threading.Lock()
+        self._stats: Dict[str, BackendStats] = {}
+        self._load()
+
+    @classmethod
+    def get_instance(cls) -> "BackendRoutingStats":
+        """Return the process-wide statistics recorder."""
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    from .llm_backend_config import get_backend_routing_ewma_alpha_from_config
+
+                    cls._instance = cls(ewma_alpha=get_backend_routing_ewma_alpha_from_config())
+        return cls._instance
+
+    @classmethod
+    def reset_instance(cls) -> None:
+        """Drop the singleton (used by tests)."""
+        with cls._instance_lock:
+            cls._instance = None
+
+    def _load(self) -> None:
+        try:
+            if self.path.exists():
+                data = json.loads(self.path.read_text())
+                self._stats = {key: BackendStats(**value) for key, value in data.items()}
+        except Exception as e:
+            logger.debug(f"Ignoring unreadable routing stats {self.path}: {e}")
+            self._stats = {}
+
+    def _save(self) -> None:
+        tmp_name: Optional[str] = None
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # A temporary file of its own, so concurrent processes never write to the same file
+            with tempfile.NamedTemporaryFile("w", dir=self.path.parent, prefix=f"{self.path.name}.", suffix=".tmp", delete=False) as tmp:
+                tmp_name = tmp.name
+                json.dump({key: asdict(value) for key, value in self._stats.items()}, tmp)
+            os.replace(tmp_name, self.path)
+        except Exception as e:
+            logger.debug(f"Failed to persist routing stats: {e}")
+            if tmp_name is not None:
+                try:
+                    os.unlink(tmp_name)
+                except OSError:
+                    pass
+
+    def record_call(self, backend: str, provider: Optional[str], model: Optional[str], latency: float, outcome: str) -> None:
+        """Record the outcome of one LLM call."""
+        with self._lock:
+            stats = self._stats.setdefault(_stats_key(backend, provider, model), BackendStats())
+            stats.calls += 1
+            if outcome == OUTCOME_SUCCESS:
+                stats.successes += 1
+                if stats.ewma_latency is None:
+                    stats.ewma_latency = latency
+                else:
+                    stats.ewma_latency = self.ewma_alpha * latency + (1 - self.ewma_alpha) * stats.ewma_latency
+            elif outcome == OUTCOME_TIMEOUT:
+                stats.timeouts += 1
+            elif outcome == OUTCOME_USAGE_LIMIT:
+                stats.usage_limits += 1
+            else:
+                stats.errors += 1
+            self._save()
+
+    def record_task_outcome(self, backend: str, provider: Optional[str], model: Optional[str], success: bool) -> None:
+        """Record whether the tests passed after an edit made by backend/provider/model."""
+        with self._lock:
+            stats = self._stats.setdefault(_stats_key(backend, provider, model), BackendStats())
+            if success:
+                stats.task_successes += 1
+            else:
+                stats.task_failures += 1
+            self._save()
+
+    def backend_stats(self, backend: str) -> BackendStats:
+        """Return stats aggregated over every provider and model of backend."""
+        prefix = f"{backend}|"
+        with self._lock:
+            total = BackendStats()
+            for key, stats in self._stats.items():
+                if key.startswith(prefix):
+                    total = total.merge(stats)
+        return total
+
+    def snapshot(self) -> Dict[str, Dict[str, object]]:
+        """Return a copy of every recorded entry keyed by "backend|provider|model"."""
+        with self._lock:
+            return {key: asdict(value) for key, value in self._stats.items()}
+
+
+class RoutingPolicy:
+    """Base policy: keep the configured backend order."""
+
+    name = "order"
+    # Dynamic policies rank from BackendRoutingStats; only they make recording worthwhile
+    dynamic = False
+
+    def rank(self, backends: List[str]) -> List[str]:
+        """Return backends from most to least preferred."""
+        return list(backends)
+
+
+class ScoreRoutingPolicy(RoutingPolicy):
+    """Prefer fast backends whose calls and edits succeed."""
+
+    name = "score"
+    dynamic = True
+
+    def __init__(self, stats: BackendRoutingStats, min_samples: int = DEFAULT_MIN_SAMPLES):
+        self.stats = stats
+        self.min_samples = min_samples
+
+    def score(self, backend: str) -> Optional[float]:
+        """Lower is better; None until the backend has min_samples calls."""
+        stats = self.stats.backend_stats(backend)
+        if stats.calls < self.min_samples:
+            return None
+        # A backend that never succeeded has no latency; rank it behind every measured one
+        latency = stats.ewma_latency if stats.ewma_latency is not None else float("inf")
+        penalty = 1 + stats.timeout_rate + stats.usage_limit_rate
+        return latency * penalty / (stats.success_rate * stats.task_success_rate)
+
+    def rank(self, backends: List[str]) -> List[str]:
+        scores = {backend: self.score(backend) for backend in backends}
+        unmeasured = [b for b in backends if scores[b] is None]
+        measured = sorted((b for b in backends if scores[b] is not None), key=lambda b: scores[b])  # type: ignore[arg-type, return-value]
+        return unmeasured + measured
+
+
+def get_backend_routing_stats() -> BackendRoutingStats:
+    """Return the process-wide routing statistics recorder."""
+    return BackendRoutingStats.get_instance()
+
+
+def backend_routing_uses_stats() -> bool:
+    """Whether the policy configured in [backend_routing].policy reads the routing statistics."""
+    from .llm_backend_config import get_backend_routing_policy_from_config
+
+    return get_backend_routing_policy_from_config() == ScoreRoutingPolicy.name
+
+
+def get_backend_routing_policy() -> RoutingPolicy:
+    """Return the routing policy configured in [backend_routing].policy."""
+    from .llm_backend_config import get_backend_routing_min_samples_from_config, get_backend_routing_policy_from_config
+
+    policy = get_backend_routing_policy_from_config()
+    if policy == ScoreRoutingPolicy.name:
+        return ScoreRoutingPolicy(get_backend_routing_stats(), min_samples=get_backend_routing_min_samples_from_config())
+    if policy != RoutingPolicy.name:
+        logger.warning(f"Unknown backend routing policy '{policy}', using configured order")
+    return RoutingPolicy()
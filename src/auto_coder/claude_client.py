@@ -16,6 +16,7 @@ from .claude_usage_checker import check_claude_usage_or_raise
 from .exceptions import AutoCoderTimeoutError, AutoCoderUsageLimitError
 from .llm_backend_config import get_llm_config
 from .llm_client_base import LLMClientBase
+from .llm_session_pool import current_session_followup, get_llm_session_pool
 from .logger_config import get_logger
 from .usage_marker_utils import has_usage_marker_match
 from .utils import CommandExecutor
@@ -201,12 +202,101 @@ class ClaudeClient(LLMClientBase):
         """Escape special characters that may confuse shell/CLI."""
         return prompt.replace("@", "\\@").strip()
 
+    def _subprocess_env(self) -> dict[str, str]:
+        """Return the environment for claude CLI processes."""
+        env = os.environ.copy()
+        if self.api_key:
+            env["CLAUDE_API_KEY"] = self.api_key
+        if self.base_url:
+            env["CLAUDE_BASE_URL"] = self.base_url
+        if self.openai_api_key:
+            env["OPENAI_API_KEY"] = self.openai_api_key
+        if self.openai_base_url:
+            env["OPENAI_BASE_URL"] = self.openai_base_url
+        if self.claude_code_oauth_token:
+            env["CLAUDE_CODE_OAUTH_TOKEN"] = self.claude_code_oauth_token
+        return env
+
+    def _get_usage_markers(self) -> List[str]:
+        """Return configured usage_markers, falling back to the known claude rate limit messages."""
+        if self.usage_markers:
+            return list(self.usage_markers)
+        # Default hardcoded usage markers
+        return [
+            '{\\"type\\":\\"error\\",\\"error\\":{\\"type\\":\\"rate_limit_error\\",',
+            "5-hour limit reached · resets",
+            '{"type":"assistant","error":"rate_limit"}',
+            '{"type":"error","error":{"type":"rate_limit_error"',
+            "rate_limit_error",
+            "5-hour limit reached",
+            "out of usage credits",
+            "usage credit cap is reached",
+        ]
+
+    def _session_command(self) -> List[str]:
+        """Build the command for a persistent stream-json claude session."""
+        override = os.environ.get("AUTOCODER_CLAUDE_CLI")
+        cmd = shlex.split(override) if override else ["claude"]
+        cmd += ["--print", "--input-format", "stream-json", "--output-format", "stream-json", "--verbose", "--model", self.model_name]
+        if isinstance(self.settings, str) and self.settings.strip():
+            cmd += ["--settings", self.settings]
+        options = self.options
+        if self.config_backend:
+            try:
+                options_dict = self.config_backend.replace_placeholders(model_name=self.model_name, settings=self.settings)
+                if isinstance(options_dict, dict):
+                    options = options_dict.get("options", [])
+            except (AttributeError, TypeError):
+                pass
+        # Flags the session command sets itself (or that make no sense for a live session)
+        skip_with_value = {"--model", "--settings", "--input-format", "--output-format", "--resume"}
+        skip_alone = {"--print", "-p", "--verbose"}
+        options = list(options or [])
+        i = 0
+        while i < len(options):
+            opt = str(options[i])
+            if opt in skip_with_value:
+                i += 2
+                continue
+            if opt not in skip_alone:
+                cmd.append(opt)
+            i += 1
+        return cmd
+
+    def _run_in_session(self, pool: Any, prompt: str) -> str:
+        """Run one fix-loop turn on the persistent session for this worker and item."""
+        # A live session already carries the conversation; resume flags are not needed
+        self.consume_extra_args()
+        usage_markers = self._get_usage_markers()
+        try:
+            output, session_id = pool.run_turn(
+                getattr(self, "backend_name", "claude"),
+                self._session_command(),
+                self._escape_prompt(prompt),
+                followup=current_session_followup(),
+                env=self._subprocess_env(),
+            )
+        except RuntimeError as e:
+            if has_usage_marker_match(str(e), usage_markers):
+                raise AutoCoderUsageLimitError(str(e))
+            raise
+        if session_id and self._is_valid_uuid(session_id):
+            self._last_session_id = session_id
+        self._last_output = output
+        if has_usage_marker_match(output, usage_markers):
+            raise AutoCoderUsageLimitError(output)
+        return output
+
     def _run_llm_cli(self, prompt: str, is_noedit: bool = False) -> str:
         """Run claude CLI with the given prompt and show real-time output."""
         check_claude_usage_or_raise(
             token=self.claude_code_oauth_token,
             backend_name=getattr(self, "backend_name", "claude"),
         )
+        if not is_noedit:
+            pool = get_llm_session_pool()
+            if pool is not None:
+                return self._run_in_session(pool, prompt)
         try:
             escaped_prompt = self._escape_prompt(prompt)
 
@@ -342,17 +432,7 @@ class ClaudeClient(LLMClientBase):
             cmd.append(escaped_prompt)
 
             # Prepare environment variables for subprocess
-            env = os.environ.copy()
-            if self.api_key:
-                env["CLAUDE_API_KEY"] = self.api_key
-            if self.base_url:
-                env["CLAUDE_BASE_URL"] = self.base_url
-            if self.openai_api_key:
-                env["OPENAI_API_KEY"] = self.openai_api_key
-            if self.openai_base_url:
-                env["OPENAI_BASE_URL"] = self.openai_base_url
-            if self.claude_code_oauth_token:
-                env["CLAUDE_CODE_OAUTH_TOKEN"] = self.claude_code_oauth_token
+            env = self._subprocess_env()
 
             logger.warning("LLM invocation: claude CLI is being called. Keep LLM calls minimized.")
             logger.debug(f"Running claude CLI with prompt length: {len(prompt)} characters")
@@ -361,21 +441,7 @@ class ClaudeClient(LLMClientBase):
             logger.info(f"🤖 Running: {cmd_str}")
             logger.info("=" * 60)
 
-            # Use configured usage_markers if available, otherwise fall back to defaults
-            if self.usage_markers:
-                usage_markers = self.usage_markers
-            else:
-                # Default hardcoded usage markers
-                usage_markers = [
-                    '{\\"type\\":\\"error\\",\\"error\\":{\\"type\\":\\"rate_limit_error\\",',
-                    "5-hour limit reached · resets",
-                    '{"type":"assistant","error":"rate_limit"}',
-                    '{"type":"error","error":{"type":"rate_limit_error"',
-                    "rate_limit_error",
-                    "5-hour limit reached",
-                    "out of usage credits",
-                    "usage credit cap is reached",
-                ]
+            usage_markers = self._get_usage_markers()
 
             def run_cli(command: list[str]) -> tuple[Any, str, str, bool]:
                 display_cmd = " ".join(command)
@@ -1,12 +1,11 @@
 """Command Line Interface for Auto-Coder."""
 
 import contextlib
+import importlib
 import os
 import sys
 from os import PathLike
-from typing import IO
-
-print(f"DEBUG: sys.executable = {sys.executable}", file=sys.stderr)
+from typing import IO, Any, Dict, List, Optional, Tuple
 
 import click
 
@@ -27,15 +26,6 @@ except ImportError:
 
 
 from . import __version__ as AUTO_CODER_VERSION
-from .cli_commands_config import config_group
-from .cli_commands_debug import debug
-from .cli_commands_health import health
-from .cli_commands_lock import lock_group, unlock
-from .cli_commands_main import create_feature_issues, fix_to_pass_tests_command, process_issues, serve
-from .cli_commands_mcp import mcp_group
-from .cli_commands_mcp_pdb import mcp_pdb_group
-from .cli_commands_utils import auth_status, get_actions_logs, migrate_branches
-from .cli_helpers import qwen_help_has_flags  # Re-export for tests
 from .cli_ui import print_lock_error
 from .lock_manager import LockManager
 from .update_manager import check_for_updates_and_restart, record_startup_options
@@ -47,7 +37,66 @@ from .update_manager import check_for_updates_and_restart, record_startup_option
 load_dotenv(override=False)
 
 
-class ForceAwareGroup(click.Group):
+# Subcommands are imported only when invoked (or listed by --help), so simple commands
+# such as `unlock` or `config` do not pay for importing AutomationEngine, PyGithub
+# and every LLM client. Maps command name -> (module, attribute).
+LAZY_COMMANDS: Dict[str, Tuple[str, str]] = {
+    # Main commands
+    "process-issues": ("cli_commands_main", "process_issues"),
+    "create-feature-issues": ("cli_commands_main", "create_feature_issues"),
+    "fix-to-pass-tests": ("cli_commands_main", "fix_to_pass_tests_command"),
+    "serve": ("cli_commands_main", "serve"),
+    # Commands and command groups
+    "config": ("cli_commands_config", "config_group"),
+    "lock": ("cli_commands_lock", "lock_group"),  # Keep for backward compatibility
+    "mcp": ("cli_commands_mcp", "mcp_group"),
+    "mcp-pdb": ("cli_commands_mcp_pdb", "mcp_pdb_group"),
+    # Top-level utility commands
+    "get-actions-logs": ("cli_commands_utils", "get_actions_logs"),
+    "auth-status": ("cli_commands_utils", "auth_status"),
+    "migrate-branches": ("cli_commands_utils", "migrate_branches"),
+    "unlock": ("cli_commands_lock", "unlock"),
+    "debug": ("cli_commands_debug", "debug"),
+    "health": ("cli_commands_health", "health"),
+}
+
+# Names that used to be imported into this module eagerly, kept importable from it
+_LAZY_ATTRIBUTES: Dict[str, Tuple[str, str]] = {
+    **{attr: (module, attr) for module, attr in LAZY_COMMANDS.values()},
+    "qwen_help_has_flags": ("cli_helpers", "qwen_help_has_flags"),  # Re-export for tests
+}
+
+
+def _load_attribute(module_name: str, attr: str) -> Any:
+    return getattr(importlib.import_module(f".{module_name}", __package__), attr)
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY_ATTRIBUTES:
+        return _load_attribute(*_LAZY_ATTRIBUTES[name])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+class LazyGroup(click.Group):
+    """Group that imports the module of a LAZY_COMMANDS subcommand on first use."""
+
+    def __init__(self, *args: Any, lazy_commands: Optional[Dict[str, Tuple[str, str]]] = None, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.lazy_commands = dict(lazy_commands or {})
+
+    def list_commands(self, ctx: click.Context) -> List[str]:
+        return sorted(set(super().list_commands(ctx)) | set(self.lazy_commands))
+
+    def get_command(self, ctx: click.Context, cmd_name: str) -> Optional[click.Command]:
+        if cmd_name not in self.commands and cmd_name in self.lazy_commands:
+            command = _load_attribute(*self.lazy_commands[cmd_name])
+            if not isinstance(command, click.Command):
+                raise TypeError(f"Lazy command {cmd_name!r} did not resolve to a click command")
+            self.commands[cmd_name] = command
+        return super().get_command(ctx, cmd_name)
+
+
+class ForceAwareGroup(LazyGroup):
     """Custom Group to handle global --force flag positioned after subcommand."""
 
     def invoke(self, ctx):
@@ -99,6 +148,7 @@ def lock_manager_context(force: bool = False):
 
 @click.group(
     cls=ForceAwareGroup,
+    lazy_commands=LAZY_COMMANDS,
     invoke_without_command=True,
     help="Auto-Coder: Automated application development using Antigravity CLI and GitHub integration.",
 )
@@ -177,26 +227,5 @@ def main(ctx: click.Context, force: bool) -> None:
 main.name = "auto-coder"
 
 
-# Register main commands
-main.add_command(process_issues)
-main.add_command(create_feature_issues)
-main.add_command(fix_to_pass_tests_command)
-main.add_command(serve)
-
-# Register commands and command groups
-main.add_command(config_group)
-main.add_command(lock_group)  # Keep for backward compatibility
-main.add_command(mcp_group)
-main.add_command(mcp_pdb_group)
-
-# Register top-level utility commands
-main.add_command(get_actions_logs)
-main.add_command(auth_status)
-main.add_command(migrate_branches)
-main.add_command(unlock)
-main.add_command(debug)
-main.add_command(health)
-
-
 if __name__ == "__main__":
     main()
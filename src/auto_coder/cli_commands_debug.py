@@ -6,8 +6,6 @@ import click
 
 from .auth_utils import get_github_token
 from .logger_config import setup_logger
-from .util.gh_cache import GitHubClient
-from .util.github_action import _get_playwright_artifact_logs
 
 
 @click.command()
@@ -18,6 +16,9 @@ def debug(github_action_log_summary: str) -> None:
     setup_logger(stream=sys.stderr)
 
     if github_action_log_summary:
+        from .util.gh_cache import GitHubClient
+        from .util.github_action import _get_playwright_artifact_logs
+
         # Ensure GitHub token is available and client is initialized
         token = get_github_token()
         if not token:
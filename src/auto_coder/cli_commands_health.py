@@ -1,15 +1,17 @@
-"""CLI command that summarizes the health logs of previous runs."""
+"""CLI commands that summarize the health logs and metrics of previous runs."""
 
 import json
 import sys
 from dataclasses import dataclass, field
+from datetime import datetime
 from pathlib import Path
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
 import click
 
 from .health_monitor import get_health_log_dir
 from .logger_config import setup_logger
+from .metrics import render_prometheus
 
 
 @dataclass
@@ -75,13 +77,16 @@ def _load_summary(path: Path, event_limit: int) -> HealthLogSummary:
     return summary
 
 
-@click.command(name="health")
+@click.group(name="health", invoke_without_command=True)
 @click.option("--log-dir", "log_dir_option", help="Directory holding health-*.jsonl files (default: ~/.auto-coder/logs)")
 @click.option("--days", default=1, type=int, help="Number of most recent health files to summarize (default: 1)")
 @click.option("--events", "event_limit", default=20, type=int, help="Number of recent events to display per file (default: 20)")
-def health(log_dir_option: Optional[str], days: int, event_limit: int) -> None:
+@click.pass_context
+def health(ctx: click.Context, log_dir_option: Optional[str], days: int, event_limit: int) -> None:
     """Summarize recorded resource usage and stop reasons of previous runs."""
 
+    if ctx.invoked_subcommand is not None:
+        return
     setup_logger(stream=sys.stderr)
 
     log_dir = Path(log_dir_option).expanduser() if log_dir_option else get_health_log_dir()
@@ -111,3 +116,60 @@ def health(log_dir_option: Optional[str], days: int, event_limit: int) -> None:
                 click.echo(f"  {line}")
         else:
             click.echo("Events: none recorded")
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    return "{" + ",".join(f"{k}={v}" for k, v in sorted(labels.items())) + "}" if labels else ""
+
+
+def _summarize_metrics(snapshot: Dict[str, Any]) -> List[str]:
+    """Return one readable line per metric series of a metrics snapshot."""
+
+    lines = []
+    for name, entry in snapshot.get("metrics", {}).items():
+        for series in entry.get("series", []):
+            labels = _format_labels(series.get("labels", {}))
+            if entry.get("type") == "histogram":
+                count = series.get("count", 0)
+                average = series.get("sum", 0.0) / count if count else 0.0
+                lines.append(f"{name}{labels} count={count} sum={series.get('sum', 0.0):.2f} avg={average:.2f}")
+            else:
+                lines.append(f"{name}{labels} {series.get('value', 0.0):g}")
+    return lines
+
+
+@health.command(name="metrics")
+@click.option("--url", help="Fetch live metrics from a running daemon instead (e.g. http://localhost:8000/metrics)")
+@click.option("--log-dir", "log_dir_option", help="Directory holding metrics.json (default: ~/.auto-coder/logs)")
+@click.option("--format", "output_format", type=click.Choice(["summary", "prometheus", "json"]), default="summary", show_default=True, help="Output format")
+def health_metrics(url: Optional[str], log_dir_option: Optional[str], output_format: str) -> None:
+    """Show LLM, GitHub, subprocess and pipeline-stage metrics of the last run."""
+
+    setup_logger(stream=sys.stderr)
+
+    if url:
+        import httpx
+
+        try:
+            response = httpx.get(url, timeout=10)
+            response.raise_for_status()
+        except httpx.HTTPError as exc:
+            raise click.ClickException(f"Failed to fetch {url}: {exc}")
+        click.echo(response.text, nl=False)
+        return
+
+    log_dir = Path(log_dir_option).expanduser() if log_dir_option else get_health_log_dir()
+    path = log_dir / "metrics.json"
+    if not path.exists():
+        click.echo(f"No metrics snapshot found at {path}")
+        return
+    snapshot = json.loads(path.read_text(encoding="utf-8"))
+
+    if output_format == "json":
+        click.echo(json.dumps(snapshot, indent=2))
+    elif output_format == "prometheus":
+        click.echo(render_prometheus(snapshot), nl=False)
+    else:
+        click.echo(f"Metrics of pid {snapshot.get('pid')} written {datetime.fromtimestamp(snapshot.get('timestamp', 0)):%Y-%m-%d %H:%M:%S}")
+        for line in _summarize_metrics(snapshot):
+            click.echo(f"  {line}")
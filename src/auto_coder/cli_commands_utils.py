@@ -8,12 +8,9 @@ import click
 
 from .auth_utils import get_auth_status, get_github_token
 from .automation_config import AutomationConfig
-from .automation_engine import AutomationEngine
 from .cli_ui import Spinner
 from .git_utils import get_current_repo_name, is_git_repository, migrate_pr_branches
 from .logger_config import setup_logger
-from .util.gh_cache import GitHubClient
-from .util.github_action import get_github_actions_logs_from_url
 
 
 def get_github_token_or_fail(provided_token: Optional[str]) -> str:
@@ -63,6 +60,9 @@ def get_repo_or_detect(repo: Optional[str]) -> str:
 def get_actions_logs(actions_url: str, github_token: Optional[str]) -> None:
     """Fetch error logs from a GitHub Actions job URL for debugging."""
     # Route log output to stderr to avoid polluting stdout which is piped to file
+    from .util.gh_cache import GitHubClient
+    from .util.github_action import get_github_actions_logs_from_url
+
     setup_logger(stream=sys.stderr)
     github_token_final = get_github_token_or_fail(github_token)
     # Initialize GitHubClient singleton with the token
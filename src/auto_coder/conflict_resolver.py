@@ -12,6 +12,7 @@ from auto_coder.backend_manager import run_llm_noedit_prompt, run_llm_prompt
 from .attempt_manager import build_pr_attempt_trigger, increment_attempt
 from .automation_config import AutomationConfig
 from .cli_helpers import create_high_score_backend_manager
+from .git_fetch import git_fetch
 from .git_utils import get_commit_log, git_commit_with_retry, git_push
 from .issue_context import extract_linked_issues_from_pr_body, get_linked_issues_context
 from .logger_config import get_logger
@@ -500,7 +501,7 @@ def _perform_base_branch_merge_and_conflict_resolution(
 
             if head_branch:
                 # Fetch and checkout using standard git
-                fetch_pr_result = cmd.run_command(["git", "fetch", "origin", head_branch])
+                fetch_pr_result = git_fetch([head_branch], run_command=cmd.run_command)
                 if not fetch_pr_result.success:
                     logger.error(f"Failed to fetch PR branch {head_branch}: {fetch_pr_result.stderr}")
                     return False
@@ -518,7 +519,7 @@ def _perform_base_branch_merge_and_conflict_resolution(
 
         # Step 2: Fetch the latest base branch
         logger.info(f"Fetching latest {base_branch} branch")
-        fetch_result = cmd.run_command(["git", "fetch", "origin", base_branch])
+        fetch_result = git_fetch([base_branch], run_command=cmd.run_command)
 
         if not fetch_result.success:
             logger.error(f"Failed to fetch {base_branch} branch: {fetch_result.stderr}")
@@ -573,12 +574,17 @@ def _perform_base_branch_merge_and_conflict_resolution(
                 cmd.run_command(["git", "merge", "--abort"])
                 return False
 
-            # Get conflict information
-            conflict_info = "\n".join(scan_conflict_markers())
-
             # Ensure pr_data has the base_branch
             pr_data = {**pr_data, "base_branch": base_branch}
 
+            # Lockfile and package.json dependency conflicts do not need the LLM
+            resolved = resolve_dependency_conflicts_without_llm(pr_data, base_branch, _get_merge_conflict_info(), config)
+            if resolved is not None:
+                return resolved
+
+            # Get conflict information
+            conflict_info = "\n".join(scan_conflict_markers())
+
             # Check if merge would degrade code quality before attempting resolution
             safe_to_merge = check_mergeability_with_llm(pr_data, conflict_info, config)
 
@@ -722,6 +728,30 @@ def is_package_lock_only_conflict(conflict_info: str) -> bool:
         return False
 
 
+PACKAGE_JSON_DEPENDENCY_SECTIONS = {
+    "dependencies",
+    "devDependencies",
+    "peerDependencies",
+    "optionalDependencies",
+}
+
+
+def package_json_differs_only_in_dependencies(ours: Optional[str], theirs: Optional[str]) -> bool:
+    """Return True if two package.json texts are identical outside their dependency sections."""
+    try:
+        ours_json = json.loads(ours or "{}")
+        theirs_json = json.loads(theirs or "{}")
+    except Exception:
+        return False
+    if not isinstance(ours_json, dict) or not isinstance(theirs_json, dict):
+        return False
+
+    def strip_dep_sections(d: Dict[str, Any]) -> Dict[str, Any]:
+        return {k: v for k, v in d.items() if k not in PACKAGE_JSON_DEPENDENCY_SECTIONS}
+
+    return strip_dep_sections(ours_json) == strip_dep_sections(theirs_json)
+
+
 def is_package_json_deps_only_conflict(conflict_info: str) -> bool:
     """Detect if conflicts only affect package.json dependency sections.
 
@@ -745,28 +775,12 @@ def is_package_json_deps_only_conflict(conflict_info: str) -> bool:
         if not conflicted_files:
             return False
 
-        dep_keys = {
-            "dependencies",
-            "devDependencies",
-            "peerDependencies",
-            "optionalDependencies",
-        }
-
         for path in conflicted_files:
             ours = cmd.run_command(["git", "show", f":2:{path}"])
             theirs = cmd.run_command(["git", "show", f":3:{path}"])
             if not (ours.success and theirs.success):
                 return False
-            try:
-                ours_json = json.loads(ours.stdout or "{}")
-                theirs_json = json.loads(theirs.stdout or "{}")
-            except Exception:
-                return False
-
-            def strip_dep_sections(d: Dict[str, Any]) -> Dict[str, Any]:
-                return {k: v for k, v in d.items() if k not in dep_keys}
-
-            if strip_dep_sections(ours_json) != strip_dep_sections(theirs_json):
+            if not package_json_differs_only_in_dependencies(ours.stdout, theirs.stdout):
                 return False
 
         return True
@@ -793,28 +807,13 @@ def get_deps_only_conflicted_package_json_paths(conflict_info: str) -> List[str]
         if not conflicted_paths:
             return []
 
-        dep_keys = {
-            "dependencies",
-            "devDependencies",
-            "peerDependencies",
-            "optionalDependencies",
-        }
         eligible: List[str] = []
         for path in conflicted_paths:
             ours = cmd.run_command(["git", "show", f":2:{path}"])
             theirs = cmd.run_command(["git", "show", f":3:{path}"])
             if not (ours.success and theirs.success):
                 continue
-            try:
-                ours_json = json.loads(ours.stdout or "{}")
-                theirs_json = json.loads(theirs.stdout or "{}")
-            except Exception:
-                continue
-
-            def strip_dep_sections(d: Dict[str, Any]) -> Dict[str, Any]:
-                return {k: v for k, v in d.items() if k not in dep_keys}
-
-            if strip_dep_sections(ours_json) == strip_dep_sections(theirs_json):
+            if package_json_differs_only_in_dependencies(ours.stdout, theirs.stdout):
                 eligible.append(path)
         return eligible
     except Exception as e:
@@ -1111,3 +1110,45 @@ def resolve_package_lock_conflicts(pr_data: Dict[str, Any], conflict_info: str,
         actions.append(f"Error resolving package-lock conflicts: {e}")
 
     return actions
+
+
+def resolve_dependency_conflicts_without_llm(pr_data: Dict[str, Any], base_branch: str, conflict_info: str, config: AutomationConfig) -> Optional[bool]:
+    """Resolve a merge whose conflicts are limited to lockfiles and package.json dependency sections.
+
+    Such conflicts (the ones the conflict scan reports as dependency_only) go to the
+    package.json and lockfile resolvers instead of the LLM; the merge is then
+    committed and pushed.
+
+    Args:
+        pr_data: PR data with at least the PR number
+        base_branch: Base branch being merged into the PR
+        conflict_info: git status --porcelain output of the conflicted merge
+
+    Returns:
+        None if some conflict needs the LLM, otherwise whether the resolution was pushed
+    """
+    pr_number = pr_data["number"]
+    conflicted = [line[3:].strip() for line in conflict_info.splitlines() if line.startswith("UU ")]
+    lockfiles = [path for path in conflicted if is_package_lock_only_conflict(f"UU {path}")]
+    package_jsons = get_deps_only_conflicted_package_json_paths(conflict_info)
+    if not conflicted or set(conflicted) - set(lockfiles) - set(package_jsons):
+        return None
+
+    logger.info(f"Conflicts of PR #{pr_number} are limited to dependency files, resolving them without the LLM")
+    actions: List[str] = []
+    if package_jsons:
+        actions.extend(resolve_package_json_dependency_conflicts(pr_data, conflict_info, config, eligible_paths=package_jsons))
+    if lockfiles:
+        actions.extend(resolve_package_lock_conflicts(pr_data, "\n".join(f"UU {path}" for path in lockfiles), config))
+    for action in actions:
+        logger.info(f"Conflict resolution action: {action}")
+    if any(action.startswith(("Failed", "Error", "Invalid", "No package.json")) for action in actions):
+        # A deleted but not regenerated lockfile must not be committed
+        logger.error(f"Failed to resolve dependency conflicts for PR #{pr_number}")
+        cmd.run_command(["git", "merge", "--abort"])
+        return False
+
+    finalize_actions = _finalize_merge_commit(pr_number, base_branch)
+    for action in finalize_actions:
+        logger.info(f"Conflict resolution action: {action}")
+    return "ACTION_FLAG:SKIP_ANALYSIS" in finalize_actions
@@ -0,0 +1,162 @@
+"""Detect merge conflicts for every open PR without checking anything out.
+
+The conflict handlers in pr_processor and conflict_resolver find conflicts by
+checking out the PR branch, fetching and running git merge in the working tree.
+scan_pr_conflicts() answers the same question for all open PRs at once:
+
+1. A single git fetch, made through the git_fetch coordinator, brings in every
+   base branch and every PR head (refs/pull/<n>/head, so fork PRs work too)
+   under refs/auto-coder/.
+2. git merge-tree --write-tree merges base into each PR head entirely in the
+   object database (git >= 2.38) and reports the conflicted paths and blobs.
+3. Conflicts limited to lockfiles or to package.json dependency sections are
+   flagged. _get_candidates queues such PRs ahead of other conflicted PRs, as
+   the conflict handlers resolve them without the LLM
+   (resolve_dependency_conflicts_without_llm).
+
+The working tree, index and HEAD are never touched, so the scan can run from
+the producer loop while workers are busy in the same checkout.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from .conflict_resolver import is_package_lock_only_conflict, package_json_differs_only_in_dependencies
+from .git_fetch import git_fetch
+from .logger_config import get_logger
+from .utils import CommandExecutor
+
+logger = get_logger(__name__)
+cmd = CommandExecutor()
+
+SCAN_REF_PREFIX = "refs/auto-coder/conflict-scan"
+
+
+@dataclass
+class ConflictScanResult:
+    """Outcome of merging a PR's base into its head with git merge-tree.
+
+    Attributes:
+        pr_number: PR number
+        base_branch: Base branch merged into the head
+        conflicted_paths: Paths git could not merge cleanly
+        lockfile_only: True if every conflicted path is a lockfile
+        package_json_deps_only: Conflicted package.json files that differ only in dependency sections
+        error: Why the PR could not be scanned, if it could not
+    """
+
+    pr_number: int
+    base_branch: str
+    conflicted_paths: List[str] = field(default_factory=list)
+    lockfile_only: bool = False
+    package_json_deps_only: List[str] = field(default_factory=list)
+    error: Optional[str] = None
+
+    @property
+    def has_conflicts(self) -> bool:
+        return bool(self.conflicted_paths)
+
+    @property
+    def dependency_only(self) -> bool:
+        """True if every conflict can be handled by the lockfile/package.json resolvers."""
+        if not self.conflicted_paths:
+            return False
+        if self.lockfile_only:
+            return True
+        deps_only = set(self.package_json_deps_only)
+        return all(path in deps_only or is_package_lock_only_conflict(f"UU {path}") for path in self.conflicted_paths)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "base_branch": self.base_branch,
+            "has_conflicts": self.has_conflicts,
+            "conflicted_paths": list(self.conflicted_paths),
+            "lockfile_only": self.lockfile_only,
+            "dependency_only": self.dependency_only,
+            "error": self.error,
+        }
+
+
+def _pr_head_ref(pr_number: int) -> str:
+    return f"{SCAN_REF_PREFIX}/pr/{pr_number}"
+
+
+def _base_ref(base_branch: str) -> str:
+    return f"{SCAN_REF_PREFIX}/base/{base_branch}"
+
+
+def _parse_merge_tree_output(stdout: str) -> Dict[str, Dict[int, str]]:
+    """Map each conflicted path to its {stage: blob oid} from `git merge-tree --write-tree --no-messages`."""
+    stages: Dict[str, Dict[int, str]] = {}
+    # First line is the tree OID; "<mode> <oid> <stage>\t<path>" lines follow
+    for line in stdout.splitlines()[1:]:
+        if "\t" not in line:
+            continue
+        info, path = line.split("\t", 1)
+        parts = info.split()
+        if len(parts) != 3 or not parts[2].isdigit():
+            continue
+        stages.setdefault(path, {})[int(parts[2])] = parts[1]
+    return stages
+
+
+def _read_blob(oid: str, cwd: Optional[str]) -> Optional[str]:
+    result = cmd.run_command(["git", "cat-file", "blob", oid], cwd=cwd)
+    return result.stdout if result.success else None
+
+
+def _scan_one(pr_number: int, base_branch: str, cwd: Optional[str]) -> ConflictScanResult:
+    scan = ConflictScanResult(pr_number=pr_number, base_branch=base_branch)
+    # Merge base into head, as _update_with_base_branch does: stage 2 is the PR, stage 3 the base
+    result = cmd.run_command(["git", "merge-tree", "--write-tree", "--no-messages", _pr_head_ref(pr_number), _base_ref(base_branch)], cwd=cwd)
+    if result.returncode == 0:
+        return scan
+    if result.returncode != 1:
+        scan.error = (result.stderr or result.stdout).strip() or f"git merge-tree exited with {result.returncode}"
+        return scan
+
+    stages = _parse_merge_tree_output(result.stdout)
+    scan.conflicted_paths = sorted(stages)
+    scan.lockfile_only = is_package_lock_only_conflict("\n".join(f"UU {path}" for path in scan.conflicted_paths))
+    for path in scan.conflicted_paths:
+        if not path.endswith("package.json") or 2 not in stages[path] or 3 not in stages[path]:
+            continue
+        if package_json_differs_only_in_dependencies(_read_blob(stages[path][2], cwd), _read_blob(stages[path][3], cwd)):
+            scan.package_json_deps_only.append(path)
+    return scan
+
+
+def scan_pr_conflicts(prs: List[Dict[str, Any]], remote: str = "origin", cwd: Optional[str] = None) -> Dict[int, ConflictScanResult]:
+    """Check every PR in prs for conflicts with its base branch after a single fetch.
+
+    Args:
+        prs: PR data as returned by GitHubClient.get_open_prs_json()
+            (number, and base_branch or base.ref)
+        remote: Remote holding the base branches and refs/pull/<n>/head
+        cwd: Repository to run git in (default: current directory)
+
+    Returns:
+        Scan result per PR number. PRs that could not be fetched or merged carry an error.
+    """
+    targets: Dict[int, str] = {}
+    for pr in prs:
+        number = pr.get("number")
+        base_branch = pr.get("base_branch") or (pr.get("base") or {}).get("ref")
+        if isinstance(number, int) and base_branch:
+            targets[number] = base_branch
+    if not targets:
+        return {}
+
+    refspecs = [f"+refs/heads/{base}:{_base_ref(base)}" for base in sorted(set(targets.values()))]
+    refspecs += [f"+refs/pull/{number}/head:{_pr_head_ref(number)}" for number in targets]
+    # Forced: every producer cycle needs the current heads, but a concurrent identical fetch is still joined
+    fetch = git_fetch(refspecs, remote=remote, cwd=cwd, extra_args=["--no-tags", "--quiet"], force=True, run_command=cmd.run_command)
+    if not fetch.success:
+        error = f"git fetch failed: {fetch.stderr.strip()}"
+        logger.warning(f"Conflict scan skipped: {error}")
+        return {number: ConflictScanResult(pr_number=number, base_branch=base, error=error) for number, base in targets.items()}
+
+    results = {number: _scan_one(number, base, cwd) for number, base in targets.items()}
+    conflicted = [number for number, scan in results.items() if scan.has_conflicts]
+    logger.info(f"Conflict scan: {len(conflicted)} of {len(results)} open PRs conflict with their base" + (f" ({', '.join(f'#{n}' for n in conflicted)})" if conflicted else ""))
+    return results
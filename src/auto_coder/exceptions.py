@@ -20,3 +20,12 @@ class AutoCoderTimeoutError(RuntimeError):
     """
 
     pass
+
+
+class AutoCoderBackendBusyError(RuntimeError):
+    """Raised when a backend's admission queue is full.
+
+    BackendManager catches this to spill the call over to the next backend.
+    """
+
+    pass
@@ -8,16 +8,20 @@ import sys
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 
 from .automation_config import AutomationConfig
+from .backend_routing import backend_routing_uses_stats, get_backend_routing_stats
 from .git_utils import get_commit_log, git_commit_with_retry, git_push, save_commit_failure_history
-from .llm_backend_config import get_isolate_single_test_on_failure_from_config
+from .llm_backend_config import get_isolate_single_test_on_failure_from_config, get_test_impact_coverage_json_from_config, get_test_impact_selection_from_config, get_test_shards_from_config
+from .llm_session_pool import get_llm_session_pool, session_followup, with_llm_session_scope
 from .logger_config import get_logger, log_calls
 from .progress_footer import ProgressStage
 from .prompt_loader import render_prompt
-from .test_log_utils import extract_first_failed_test, extract_important_errors, get_local_playwright_summary
+from .test_impact import get_changed_files, record_coverage_map, select_impacted_tests
+from .test_log_utils import extract_all_failed_tests, extract_first_failed_test, extract_important_errors, get_local_playwright_summary
 from .test_result import TestResult
+from .test_sharding import run_sharded_tests
 from .update_manager import check_for_updates_and_restart
 from .utils import CommandExecutor, change_fraction, get_target_container, log_action
 
@@ -29,6 +33,8 @@ cmd = CommandExecutor()
 
 # Test Watcher MCP integration flag
 USE_TEST_WATCHER_MCP = os.environ.get("USE_TEST_WATCHER_MCP", "true").lower() == "true"
+# How long to wait for an in-flight test_watcher run before running tests locally
+TEST_WATCHER_RESULT_WAIT_SECONDS = 120
 
 
 @dataclass
@@ -208,10 +214,11 @@ def cleanup_llm_task_file(path: str = "./llm_task.md") -> None:
         logger.warning(f"Failed to remove {path}: {exc}")
 
 
-def run_local_tests(config: AutomationConfig, test_file: Optional[str] = None) -> Dict[str, Any]:
+def run_local_tests(config: AutomationConfig, test_file: Optional[str] = None, test_files: Optional[List[str]] = None) -> Dict[str, Any]:
     """Run local tests using configured script or pytest fallback.
 
     If test_file is specified, only that test file will be run.
+    If test_files is specified, only those test files will be run (impact selection).
     Otherwise, all tests will be run.
 
     Returns a dict: {success, output, errors, return_code, test_file, stability_issue}
@@ -232,55 +239,60 @@ def run_local_tests(config: AutomationConfig, test_file: Optional[str] = None) -
         }
 
     # Try to use test_watcher MCP if enabled and available
-    if USE_TEST_WATCHER_MCP and not test_file:
+    if USE_TEST_WATCHER_MCP and not test_file and not test_files:
         try:
-            from .test_watcher_client import TestWatcherClient
+            from .test_watcher_client import get_shared_test_watcher_client
 
             mcp_server_path = os.environ.get("TEST_WATCHER_MCP_SERVER_PATH")
-            if mcp_server_path and Path(mcp_server_path).exists():
+            client = get_shared_test_watcher_client(mcp_server_path) if mcp_server_path and Path(mcp_server_path).exists() else None
+            if client is not None:
                 logger.info("Querying test results from test_watcher MCP")
 
-                with TestWatcherClient(mcp_server_path=mcp_server_path) as client:
-                    # Query all test results
-                    results = client.query_test_results(test_type="all")
+                # Query all test results, armed first so a run finishing right after is seen
+                client.expect_results()
+                results = client.query_test_results(test_type="all")
 
+                if results.get("status") == "running":
+                    logger.info("Tests are currently running in test_watcher, waiting for the run to finish...")
+                    client.wait_for_results(TEST_WATCHER_RESULT_WAIT_SECONDS)
+                    results = client.query_test_results(test_type="all")
                     if results.get("status") == "running":
-                        logger.info("Tests are currently running in test_watcher, waiting...")
-                        # Fall back to normal test execution
-                    elif results.get("status") == "completed":
-                        # Convert MCP results to expected format
-                        summary = results.get("summary", {})
-                        failed_tests = results.get("failed_tests", {}).get("tests", [])
-
-                        success = summary.get("failed", 0) == 0
-
-                        # Build output from test results
-                        output_lines = [
-                            f"Test Results (from test_watcher MCP):",
-                            f"Total: {summary.get('total', 0)}",
-                            f"Passed: {summary.get('passed', 0)}",
-                            f"Failed: {summary.get('failed', 0)}",
-                            f"Flaky: {summary.get('flaky', 0)}",
-                            f"Skipped: {summary.get('skipped', 0)}",
-                        ]
-
-                        if failed_tests:
-                            output_lines.append("\nFailed Tests:")
-                            for test in failed_tests:
-                                output_lines.append(f"  - {test.get('file', 'unknown')}: {test.get('title', '')}")
-                                if test.get("error"):
-                                    output_lines.append(f"    Error: {test['error']}")
-
-                        return {
-                            "success": success,
-                            "output": "\n".join(output_lines),
-                            "errors": ("" if success else "\n".join([t.get("error", "") for t in failed_tests if t.get("error")])),
-                            "return_code": 0 if success else 1,
-                            "command": "test_watcher_mcp_query",
-                            "test_file": None,
-                            "stability_issue": False,
-                            "mcp_results": results,
-                        }
+                        logger.info("test_watcher run did not finish in time, falling back to normal test execution")
+
+                if results.get("status") == "completed":
+                    # Convert MCP results to expected format
+                    summary = results.get("summary", {})
+                    failed_tests = results.get("failed_tests", {}).get("tests", [])
+
+                    success = summary.get("failed", 0) == 0
+
+                    # Build output from test results
+                    output_lines = [
+                        f"Test Results (from test_watcher MCP):",
+                        f"Total: {summary.get('total', 0)}",
+                        f"Passed: {summary.get('passed', 0)}",
+                        f"Failed: {summary.get('failed', 0)}",
+                        f"Flaky: {summary.get('flaky', 0)}",
+                        f"Skipped: {summary.get('skipped', 0)}",
+                    ]
+
+                    if failed_tests:
+                        output_lines.append("\nFailed Tests:")
+                        for test in failed_tests:
+                            output_lines.append(f"  - {test.get('file', 'unknown')}: {test.get('title', '')}")
+                            if test.get("error"):
+                                output_lines.append(f"    Error: {test['error']}")
+
+                    return {
+                        "success": success,
+                        "output": "\n".join(output_lines),
+                        "errors": ("" if success else "\n".join([t.get("error", "") for t in failed_tests if t.get("error")])),
+                        "return_code": 0 if success else 1,
+                        "command": "test_watcher_mcp_query",
+                        "test_file": None,
+                        "stability_issue": False,
+                        "mcp_results": results,
+                    }
         except Exception as e:
             logger.warning(f"Failed to query test_watcher MCP, falling back to normal test execution: {e}")
 
@@ -308,6 +320,29 @@ def run_local_tests(config: AutomationConfig, test_file: Optional[str] = None) -
                     "stability_issue": False,
                 }
 
+        # If a set of impacted test files is specified, run only those via TEST_SCRIPT_PATH
+        if test_files:
+            with ProgressStage(f"Running {len(test_files)} impacted test file(s) via script"):
+                logger.info(f"Running impacted test files via script: {', '.join(test_files)}")
+
+                target_container = get_target_container(config)
+                if target_container:
+                    cmd_list = ["docker", "exec", target_container, "bash", config.TEST_SCRIPT_PATH, *test_files]
+                else:
+                    cmd_list = ["bash", config.TEST_SCRIPT_PATH, *test_files]
+
+                result = cmd.run_command(cmd_list, timeout=cmd.DEFAULT_TIMEOUTS["test"])
+                return {
+                    "success": result.success,
+                    "output": result.stdout,
+                    "errors": result.stderr,
+                    "return_code": result.returncode,
+                    "command": " ".join(cmd_list),
+                    "test_file": None,
+                    "test_files": list(test_files),
+                    "stability_issue": False,
+                }
+
         # Always run via test script
         start_time = datetime.now().timestamp()
 
@@ -319,7 +354,15 @@ def run_local_tests(config: AutomationConfig, test_file: Optional[str] = None) -
             logger.info(f"Running local tests via script: {config.TEST_SCRIPT_PATH}")
             cmd_list = ["bash", config.TEST_SCRIPT_PATH]
 
-        result = cmd.run_command(cmd_list, timeout=cmd.DEFAULT_TIMEOUTS["test"])
+        # Split the suite into concurrent shards when [test].shards is configured
+        shard_count = get_test_shards_from_config()
+        sharded_result = run_sharded_tests(config, shard_count) if shard_count > 1 else None
+        if sharded_result is not None:
+            result = sharded_result
+            command_str = sharded_result.command
+        else:
+            result = cmd.run_command(cmd_list, timeout=cmd.DEFAULT_TIMEOUTS["test"])
+            command_str = " ".join(cmd_list)
         logger.info(f"Finished local tests. {'Passed' if result.success else 'Failed'}")
 
         # Check for local Playwright logs and append summary if found
@@ -333,6 +376,15 @@ def run_local_tests(config: AutomationConfig, test_file: Optional[str] = None) -
             else:
                 result.stdout = playwright_summary
 
+        # Record a coverage-derived test impact map from full runs when a fresh report exists
+        if get_test_impact_selection_from_config():
+            coverage_json = get_test_impact_coverage_json_from_config()
+            try:
+                if os.path.exists(coverage_json) and os.path.getmtime(coverage_json) >= start_time:
+                    record_coverage_map(coverage_json)
+            except Exception as e:
+                logger.warning(f"Failed to record test impact coverage map: {e}")
+
         # If the test run failed and isolate_single_test_on_failure is enabled in config.toml,
         # try to extract the first failed test file and run it via the script
         if not result.success and get_isolate_single_test_on_failure_from_config():
@@ -346,7 +398,7 @@ def run_local_tests(config: AutomationConfig, test_file: Optional[str] = None) -
                     "output": result.stdout,
                     "errors": result.stderr,
                     "return_code": result.returncode,
-                    "command": " ".join(cmd_list),
+                    "command": command_str,
                 }
 
                 # Run the isolated test
@@ -383,15 +435,19 @@ def run_local_tests(config: AutomationConfig, test_file: Optional[str] = None) -
                         "stability_issue": False,
                     }
 
-        return {
+        full_result = {
             "success": result.success,
             "output": result.stdout,
             "errors": result.stderr,
             "return_code": result.returncode,
-            "command": " ".join(cmd_list),
+            "command": command_str,
             "test_file": None,
             "stability_issue": False,
         }
+        if sharded_result is not None:
+            full_result["failed_tests"] = sharded_result.failed_tests
+            full_result["shard_count"] = sharded_result.shard_count
+        return full_result
     except Exception as e:
         logger.error(f"Local test execution failed: {e}")
         return {
@@ -526,9 +582,19 @@ def apply_workspace_test_fix(
             attempt_history=history_text,
         )
 
+        # A persistent session already holds the instructions and earlier attempts; send only the new failures
+        followup_prompt = None
+        if get_llm_session_pool() is not None:
+            followup_prompt = render_prompt(
+                "tests.workspace_fix_followup",
+                error_summary=error_summary[: config.MAX_PROMPT_SIZE],
+                test_command=test_result.get("command", "pytest -q --maxfail=1"),
+            )
+
         # Use the LLM backend manager to run the prompt
         logger.info(f"Requesting LLM workspace fix using backend {backend} provider {provider} " f"model {model} (custom prompt handler)")
-        response = llm_backend_manager.run_test_fix_prompt(fix_prompt, current_test_file=current_test_file)
+        with session_followup(followup_prompt):
+            response = llm_backend_manager.run_test_fix_prompt(fix_prompt, current_test_file=current_test_file)
 
         backend, provider, model = _extract_backend_model(llm_backend_manager)
         raw_response = response.strip() if response and response.strip() else None
@@ -557,6 +623,26 @@ def apply_workspace_test_fix(
         )
 
 
+def _select_attempt_test_targets(test_result: Dict[str, Any]) -> List[str]:
+    """Return the failing tests plus the tests impacted by the current attempt's diff.
+
+    Returns an empty list when the failing tests cannot be identified, so the caller
+    falls back to running the full suite instead of a set that might miss failures.
+    """
+    failed_tests = [path for path in extract_all_failed_tests(test_result.get("output", ""), test_result.get("errors", "")) if os.path.exists(path)]
+    if not failed_tests:
+        return []
+
+    try:
+        impacted_tests = select_impacted_tests(get_changed_files())
+    except Exception as e:
+        logger.warning(f"Failed to compute impacted tests; falling back to full suite: {e}")
+        return []
+
+    return sorted(set(failed_tests) | set(impacted_tests))
+
+
+@with_llm_session_scope
 def fix_to_pass_tests(
     config: AutomationConfig,
     llm_backend_manager: "BackendManager",
@@ -698,7 +784,14 @@ def fix_to_pass_tests(
         attempt += 1
         summary["attempts"] = attempt
         logger.info(f"Re-running local tests after LLM fix (attempt {attempt}/{attempts_limit})")
-        post_result = run_local_tests(config, test_file=current_test_file)
+        impact_targets: List[str] = []
+        if current_test_file is None and not config.JULES_ONLY_MODE and get_test_impact_selection_from_config():
+            impact_targets = _select_attempt_test_targets(test_result)
+        if impact_targets:
+            logger.info(f"Verifying fix with {len(impact_targets)} failing/impacted test file(s) before the full suite")
+            post_result = run_local_tests(config, test_files=impact_targets)
+        else:
+            post_result = run_local_tests(config, test_file=current_test_file)
 
         log_timestamp = datetime.now()
         backend_for_log = fix_response.backend
@@ -719,6 +812,12 @@ def fix_to_pass_tests(
             )
         except Exception:
             logger.warning("Failed to write LLM output log for fix-to-pass-tests", exc_info=True)
+        if backend_for_log and backend_routing_uses_stats():
+            try:
+                # Whether the edit made the tests pass feeds the backend routing score
+                get_backend_routing_stats().record_task_outcome(backend_for_log, provider_for_log, model_for_log, bool(post_result["success"]))
+            except Exception:
+                logger.debug("Failed to record backend task outcome", exc_info=True)
 
         post_full_output = f"{post_result.get('errors', '')}\n{post_result.get('output', '')}".strip()
         post_error_summary = extract_important_errors(_to_test_result(post_result))
@@ -810,6 +909,9 @@ def fix_to_pass_tests(
                 logger.info(f"Targeted test {current_test_file} passed after LLM fix; rerunning full suite")
                 current_test_file = None
                 continue
+            if impact_targets:
+                logger.info("Impacted tests passed after LLM fix; rerunning full suite")
+                continue
             summary["success"] = True
 
             # Push changes to remote
@@ -867,7 +969,13 @@ def generate_commit_message_via_llm(
 
         prompt = render_prompt("tests.commit_message", commit_log=commit_log or "(No commit history)")
 
-        response = manager._run_llm_cli(prompt)
+        if message_backend_manager is not None:
+            from .backend_manager import run_noedit_prompt_with
+
+            # No-edit call: goes through the response cache
+            response = run_noedit_prompt_with(message_backend_manager, prompt)
+        else:
+            response = manager._run_llm_cli(prompt)
         if not response:
             return ""
 
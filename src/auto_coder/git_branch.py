@@ -15,6 +15,7 @@ from auto_coder.automation_config import AutomationConfig
 from auto_coder.backend_manager import run_llm_prompt
 
 from .git_commit import git_push
+from .git_fetch import git_fetch
 from .git_info import check_unpushed_commits, get_current_branch
 from .logger_config import get_logger
 from .prompt_loader import render_prompt
@@ -690,7 +691,7 @@ def git_checkout_branch(
 
         # Always fetch latest refs before creating a new branch
         logger.info("Fetching 'origin' with --prune --tags before creating new branch...")
-        fetch_result = cmd.run_command(["git", "fetch", "origin", "--prune", "--tags"], cwd=cwd)
+        fetch_result = git_fetch(extra_args=["--prune", "--tags"], cwd=cwd, run_command=cmd.run_command)
 
         # After fetching, check if branch already exists locally or remotely
         # (Re-check local existence after fetch, as it might have been created remotely)
@@ -1021,7 +1022,8 @@ def reset_branch_to_remote(
 
     logger.warning(f"Falling back to a hard reset onto {remote}/{target_branch}")
 
-    fetch_result = cmd.run_command(["git", "fetch", remote, target_branch], cwd=cwd)
+    # Recovery must see the current remote state; only join a concurrent fetch
+    fetch_result = git_fetch([target_branch], remote=remote, cwd=cwd, force=True, run_command=cmd.run_command)
     if not fetch_result.success:
         logger.error(f"Failed to fetch {remote}/{target_branch}: {fetch_result.stderr}")
         return fetch_result
@@ -0,0 +1,183 @@
+"""Coordinated git fetches shared by every worker in the process.
+
+Updating a PR with its base, checking out PR branches, resolving conflicts and
+creating branches each ran their own `git fetch origin`, often several times
+per item and concurrently across workers. On a large repository each full
+fetch takes tens of seconds. GitFetchCoordinator puts those calls behind one
+entry point:
+
+- Single flight: a fetch of the same refspecs in the same repository that is
+  already running is joined instead of started again.
+- Freshness: refspecs fetched less than freshness_seconds ago are not fetched
+  again. A full fetch also counts as fresh for plain branch names, since it
+  updated their remote-tracking refs.
+- Narrow refspecs: callers pass only what they need (the base branch, the PR
+  head) instead of fetching every ref.
+- Optional partial clone: with [git_fetch].filter = "blob:none" fetches skip
+  blobs, and git downloads them on demand.
+
+Settings come from [git_fetch] in config.toml (freshness_seconds, filter).
+"""
+
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Optional, Sequence, Tuple
+
+from .logger_config import get_logger
+from .utils import CommandExecutor, CommandResult
+
+logger = get_logger(__name__)
+
+DEFAULT_FRESHNESS_SECONDS = 10
+
+# Stands for "every ref" in freshness bookkeeping (a fetch without refspecs)
+FULL_FETCH = "*"
+
+RunCommand = Callable[..., CommandResult]
+FlightKey = Tuple[str, str, Tuple[str, ...], Tuple[str, ...]]
+
+
+@dataclass
+class _Flight:
+    done: threading.Event = field(default_factory=threading.Event)
+    result: Optional[CommandResult] = None
+
+
+def _is_branch_refspec(refspec: str) -> bool:
+    """Whether refspec is a plain branch name, whose remote-tracking ref a full fetch also updates."""
+    return ":" not in refspec and not refspec.startswith(("+", "refs/", "pull/"))
+
+
+class GitFetchCoordinator:
+    """Deduplicates concurrent and recent git fetches per repository."""
+
+    _instance: Optional["GitFetchCoordinator"] = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, freshness_seconds: float = DEFAULT_FRESHNESS_SECONDS, partial_clone_filter: str = ""):
+        self.freshness_seconds = freshness_seconds
+        self.partial_clone_filter = partial_clone_filter
+        self.fetches = 0
+        self.joined = 0
+        self.skipped_fresh = 0
+        self._lock = threading.Lock()
+        self._in_flight: Dict[FlightKey, _Flight] = {}
+        self._fetched_at: Dict[Tuple[str, str, str], float] = {}
+
+    @classmethod
+    def get_instance(cls) -> "GitFetchCoordinator":
+        """Return the process-wide coordinator configured from config.toml."""
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    from .llm_backend_config import get_git_fetch_filter_from_config, get_git_fetch_freshness_seconds_from_config
+
+                    cls._instance = cls(
+                        freshness_seconds=get_git_fetch_freshness_seconds_from_config(),
+                        partial_clone_filter=get_git_fetch_filter_from_config(),
+                    )
+        return cls._instance
+
+    @classmethod
+    def reset_instance(cls) -> None:
+        """Drop the singleton (used by tests)."""
+        with cls._instance_lock:
+            cls._instance = None
+
+    def _is_fresh(self, repo: str, remote: str, refspecs: Sequence[str], now: float) -> bool:
+        if self.freshness_seconds <= 0:
+            return False
+        full_at = self._fetched_at.get((repo, remote, FULL_FETCH), float("-inf"))
+        for refspec in refspecs or (FULL_FETCH,):
+            fetched_at = self._fetched_at.get((repo, remote, refspec), float("-inf"))
+            if _is_branch_refspec(refspec):
+                fetched_at = max(fetched_at, full_at)
+            if now - fetched_at > self.freshness_seconds:
+                return False
+        return True
+
+    def fetch(
+        self,
+        refspecs: Sequence[str] = (),
+        remote: str = "origin",
+        cwd: Optional[str] = None,
+        extra_args: Sequence[str] = (),
+        force: bool = False,
+        run_command: Optional[RunCommand] = None,
+    ) -> CommandResult:
+        """Fetch refspecs from remote unless an equivalent fetch is running or recent.
+
+        Args:
+            refspecs: Refspecs to fetch; empty fetches the remote's configured refspecs
+            remote: Remote name
+            cwd: Repository directory (default: current directory)
+            extra_args: Additional git fetch options (e.g. --prune, --tags)
+            force: Ignore the freshness window (a concurrent identical fetch is still joined)
+            run_command: Command runner, CommandExecutor.run_command by default
+
+        Returns:
+            Result of the fetch that satisfied the request; a successful empty
+            result when it was skipped as fresh.
+        """
+        run = run_command or CommandExecutor.run_command
+        repo = os.path.realpath(cwd or os.getcwd())
+        key: FlightKey = (repo, remote, tuple(refspecs), tuple(extra_args))
+
+        with self._lock:
+            if not force and self._is_fresh(repo, remote, refspecs, time.monotonic()):
+                self.skipped_fresh += 1
+                logger.debug(f"Skipping git fetch {remote} {' '.join(refspecs) or '(all)'}: fetched within {self.freshness_seconds}s")
+                return CommandResult(success=True, stdout="", stderr="", returncode=0)
+            flight = self._in_flight.get(key)
+            leader = flight is None
+            if flight is None:
+                flight = self._in_flight[key] = _Flight()
+            else:
+                self.joined += 1
+
+        if not leader:
+            logger.debug(f"Joining in-flight git fetch {remote} {' '.join(refspecs) or '(all)'}")
+            flight.done.wait()
+            assert flight.result is not None
+            return flight.result
+
+        command = ["git", "fetch", remote, *extra_args]
+        if self.partial_clone_filter:
+            command.append(f"--filter={self.partial_clone_filter}")
+        command.extend(refspecs)
+        started = time.monotonic()
+        result = CommandResult(success=False, stdout="", stderr="git fetch was interrupted", returncode=-1)
+        try:
+            result = run(command, cwd=cwd) if cwd is not None else run(command)
+        except Exception as e:
+            result = CommandResult(success=False, stdout="", stderr=str(e), returncode=-1)
+        finally:
+            with self._lock:
+                self.fetches += 1
+                self._in_flight.pop(key, None)
+                if result.success:
+                    for refspec in refspecs or (FULL_FETCH,):
+                        self._fetched_at[(repo, remote, refspec)] = started
+            # Waiters must never hang, even if the runner raised
+            flight.result = result
+            flight.done.set()
+        return result
+
+    def stats(self) -> Dict[str, int]:
+        """Return fetch, join and freshness-skip counters."""
+        with self._lock:
+            return {"fetches": self.fetches, "joined": self.joined, "skipped_fresh": self.skipped_fresh}
+
+
+def git_fetch(
+    refspecs: Sequence[str] = (),
+    remote: str = "origin",
+    cwd: Optional[str] = None,
+    extra_args: Sequence[str] = (),
+    force: bool = False,
+    run_command: Optional[RunCommand] = None,
+) -> CommandResult:
+    """Fetch through the process-wide :class:`GitFetchCoordinator`."""
+    return GitFetchCoordinator.get_instance().fetch(refspecs, remote=remote, cwd=cwd, extra_args=extra_args, force=force, run_command=run_command)
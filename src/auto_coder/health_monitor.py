@@ -60,6 +60,7 @@ if TYPE_CHECKING:
     from asyncio import AbstractEventLoop
 
 from .logger_config import get_logger
+from .metrics import get_metrics_registry
 
 logger = get_logger(__name__)
 
@@ -600,6 +601,8 @@ class HealthMonitor:
             self.baseline_rss_mb = snapshot.rss_mb
         logger.info(snapshot.format_summary())
         self._write_record("snapshot", asdict(snapshot))
+        if self.enabled:
+            get_metrics_registry().write_snapshot(self.log_dir / "metrics.json")
         self._log_tracemalloc_top()
         self._check_thresholds(snapshot)
         return snapshot
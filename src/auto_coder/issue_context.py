@@ -1,10 +1,190 @@
 import re
-from typing import Any, Dict, List, Optional
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional
 
 from .logger_config import get_logger
 
 logger = get_logger(__name__)
 
+# Everything an issue prompt needs, fetched per issue in one GraphQL request
+_ISSUE_CONTEXT_FIELDS = """
+      number
+      title
+      body
+      state
+      comments(last: 100) {
+        pageInfo { hasPreviousPage startCursor }
+        nodes { body createdAt }
+      }
+      subIssues(first: 100) {
+        nodes { number title state }
+      }
+      parent { number title state body }
+      timelineItems(first: 100, itemTypes: [CONNECTED_EVENT, CROSS_REFERENCED_EVENT]) {
+        nodes {
+          ... on ConnectedEvent { subject { ... on PullRequest { number } } }
+          ... on CrossReferencedEvent { source { ... on PullRequest { number } } }
+        }
+      }
+"""
+
+_EARLIER_COMMENTS_QUERY = """
+query($owner: String!, $name: String!, $number: Int!, $before: String) {
+  repository(owner: $owner, name: $name) {
+    issue(number: $number) {
+      comments(last: 100, before: $before) {
+        pageInfo { hasPreviousPage startCursor }
+        nodes { body createdAt }
+      }
+    }
+  }
+}
+"""
+
+
+@dataclass
+class IssueContextBundle:
+    """Prompt data for one issue, loaded by load_issue_contexts().
+
+    Comments are dicts with "body" and "created_at"; sub-issues and the parent are
+    dicts with "number", "title" and "state" (lowercase, as in the REST API), and
+    the parent also carries "body".
+    """
+
+    number: int
+    title: str = ""
+    body: str = ""
+    state: str = ""
+    comments: List[Dict[str, Any]] = field(default_factory=list)
+    sub_issues: List[Dict[str, Any]] = field(default_factory=list)
+    parent: Optional[Dict[str, Any]] = None
+    linked_prs: List[int] = field(default_factory=list)
+
+    @property
+    def current_attempt(self) -> int:
+        from .attempt_manager import current_attempt_from_comments
+
+        return current_attempt_from_comments(self.comments)
+
+    @property
+    def has_sub_issues(self) -> bool:
+        return bool(self.sub_issues)
+
+    @property
+    def sub_issues_summary(self) -> str:
+        return "\n".join(f"- Sub-issue #{sub['number']}: {sub['title']} (state: {sub['state']})" for sub in self.sub_issues)
+
+    @property
+    def parent_body(self) -> Optional[str]:
+        return (self.parent or {}).get("body") or None
+
+    @property
+    def parent_resolved(self) -> bool:
+        """False when the body names a Parent-Issue that is not linked natively yet.
+
+        Callers then use GitHubClient.get_parent_issue_details(), which also
+        converts that marker into a native sub-issue link.
+        """
+        from .util.gh_cache import parse_parent_issue_number
+
+        return self.parent is not None or parse_parent_issue_number(self.body, current_issue_number=self.number) is None
+
+
+def _issue_ref(node: Any) -> Optional[Dict[str, Any]]:
+    if not isinstance(node, dict) or not isinstance(node.get("number"), int):
+        return None
+    ref = {"number": node["number"], "title": node.get("title") or "", "state": str(node.get("state") or "").lower()}
+    if "body" in node:
+        ref["body"] = node.get("body") or ""
+    return ref
+
+
+def _comment_nodes(connection: Any) -> List[Dict[str, Any]]:
+    nodes = connection.get("nodes") if isinstance(connection, dict) else None
+    return [{"body": c.get("body") or "", "created_at": c.get("createdAt")} for c in nodes or [] if isinstance(c, dict)]
+
+
+def _bundle_from_node(node: Dict[str, Any]) -> IssueContextBundle:
+    linked_prs: List[int] = []
+    for event in (node.get("timelineItems") or {}).get("nodes") or []:
+        pr = (event or {}).get("subject") or (event or {}).get("source") or {}
+        if isinstance(pr.get("number"), int) and pr["number"] not in linked_prs:
+            linked_prs.append(pr["number"])
+    sub_issues = [ref for ref in map(_issue_ref, (node.get("subIssues") or {}).get("nodes") or []) if ref and ref["number"] != node["number"]]
+    return IssueContextBundle(
+        number=node["number"],
+        title=node.get("title") or "",
+        body=node.get("body") or "",
+        state=str(node.get("state") or "").lower(),
+        comments=_comment_nodes(node.get("comments")),
+        sub_issues=sorted(sub_issues, key=lambda ref: ref["number"]),
+        parent=_issue_ref(node.get("parent")),
+        linked_prs=sorted(linked_prs),
+    )
+
+
+def _load_earlier_comments(github_client: Any, owner: str, repo: str, bundle: IssueContextBundle, cursor: Optional[str]) -> None:
+    while cursor:
+        response = github_client.graphql_query(_EARLIER_COMMENTS_QUERY, {"owner": owner, "name": repo, "number": bundle.number, "before": cursor})
+        connection = response["data"]["repository"]["issue"]["comments"]
+        bundle.comments[:0] = _comment_nodes(connection)
+        page_info = connection.get("pageInfo") or {}
+        cursor = page_info.get("startCursor") if page_info.get("hasPreviousPage") else None
+
+
+def _add_marker_sub_issues(github_client: Any, repo_name: str, bundle: IssueContextBundle) -> None:
+    """Add open issues linked to bundle only by a 'Parent Issue:' body marker, as get_all_sub_issues() does."""
+    known = {sub["number"] for sub in bundle.sub_issues}
+    cached = github_client.get_cached_marker_sub_issues(repo_name, bundle.number)
+    added = [ref for ref in map(_issue_ref, cached if isinstance(cached, list) else []) if ref and ref["number"] not in known]
+    if added:
+        bundle.sub_issues = sorted(bundle.sub_issues + added, key=lambda ref: ref["number"])
+
+
+def load_issue_contexts(github_client: Any, repo_name: str, issue_numbers: Iterable[int]) -> Dict[int, IssueContextBundle]:
+    """Load comments, sub-issues, parent and linked PRs of several issues in one GraphQL request.
+
+    Issues with more than 100 comments need one extra request each for the
+    older pages. Sub-issues linked only by a 'Parent Issue:' body marker are
+    taken from the client's open issues cache.
+
+    Returns:
+        Bundle per issue number; empty if the query fails (callers fall back to
+        the per-item REST calls).
+    """
+    numbers = list(dict.fromkeys(n for n in issue_numbers if isinstance(n, int)))
+    if not github_client or not numbers:
+        return {}
+    try:
+        owner, repo = repo_name.split("/")
+        aliases = "\n".join(f"    issue_{n}: issue(number: {n}) {{{_ISSUE_CONTEXT_FIELDS}    }}" for n in numbers)
+        query = f"query($owner: String!, $name: String!) {{\n  repository(owner: $owner, name: $name) {{\n{aliases}\n  }}\n}}"
+        response = github_client.graphql_query(query, {"owner": owner, "name": repo}, extra_headers={"GraphQL-Features": "sub_issues"})
+        repository = response.get("data", {}).get("repository") if isinstance(response, dict) else None
+        if not isinstance(repository, dict):
+            return {}
+
+        bundles: Dict[int, IssueContextBundle] = {}
+        for n in numbers:
+            node = repository.get(f"issue_{n}")
+            if not isinstance(node, dict):
+                continue
+            bundle = _bundle_from_node(node)
+            page_info = (node.get("comments") or {}).get("pageInfo") or {}
+            if page_info.get("hasPreviousPage"):
+                _load_earlier_comments(github_client, owner, repo, bundle, page_info.get("startCursor"))
+            _add_marker_sub_issues(github_client, repo_name, bundle)
+            bundles[n] = bundle
+        return bundles
+    except Exception as e:
+        logger.warning(f"Failed to load issue context for {repo_name} {numbers}: {e}")
+        return {}
+
+
+def load_issue_context(github_client: Any, repo_name: str, issue_number: int) -> Optional[IssueContextBundle]:
+    """Load the context bundle of a single issue (see load_issue_contexts)."""
+    return load_issue_contexts(github_client, repo_name, [issue_number]).get(issue_number)
+
 
 def extract_linked_issues_from_pr_body(pr_body: str) -> List[int]:
     """Extract issue numbers from PR body using GitHub's linking keywords.
@@ -88,8 +268,18 @@ def get_linked_issues_context(github_client: Any, repo_name: str, pr_body: str)
     try:
         linked_issues = extract_linked_issues_from_pr_body(pr_body)
         context_parts = []
+        bundles = load_issue_contexts(github_client, repo_name, linked_issues)
 
         for issue_number in linked_issues:
+            bundle = bundles.get(issue_number)
+            if bundle is not None and bundle.parent_resolved:
+                context_parts.append(f"Linked Issue #{issue_number}: {bundle.title}")
+                context_parts.append(f"Issue Description:\n{bundle.body}")
+                if bundle.parent and bundle.parent_body:
+                    context_parts.append(f"Parent Issue #{bundle.parent['number']} (of #{issue_number}): {bundle.parent['title'] or 'Unknown'}")
+                    context_parts.append(f"Parent Issue Description:\n{bundle.parent_body}")
+                continue
+
             try:
                 # Fetch linked issue details
                 issue = github_client.get_issue(repo_name, issue_number)
@@ -21,7 +21,7 @@ from .exceptions import AutoCoderUsageLimitError
 from .git_branch import branch_context, extract_attempt_from_branch
 from .git_commit import commit_and_push_changes
 from .git_info import get_commit_log, get_current_branch
-from .issue_context import get_linked_issues_context, validate_issue_references
+from .issue_context import get_linked_issues_context, load_issue_context, validate_issue_references
 from .jules_client import JulesClient
 from .jules_engine import get_session_pull_request, is_session_stopped, mark_session_stopped
 from .label_manager import LabelManager, LabelManagerContext, LabelOperationError, resolve_pr_labels_with_priority
@@ -920,8 +920,11 @@ def _apply_issue_actions_directly(
             logger.info(f"Switching to PR branch: {target_branch}")
         else:
             # For regular issues, determine work branch
+            # Comments, sub-issues and parent in one round trip; None falls back to the REST calls below
+            bundle = load_issue_context(github_client, repo_name, issue_number)
+
             # Get current attempt number from issue comments
-            current_attempt = get_current_attempt(repo_name, issue_number)
+            current_attempt = bundle.current_attempt if bundle is not None else get_current_attempt(repo_name, issue_number)
             logger.info(f"Current attempt for issue #{issue_number}: {current_attempt}")
 
             # Determine branch name based on attempt number
@@ -932,31 +935,37 @@ def _apply_issue_actions_directly(
             has_sub_issues = False
             sub_issues_summary = ""
             try:
-                sub_issues_list = github_client.get_all_sub_issues(repo_name, issue_number)
-                has_sub_issues = len(sub_issues_list) > 0
-                if has_sub_issues:
-                    sub_issue_lines = []
-                    for sub_num in sub_issues_list:
-                        sub_issue_obj = github_client.get_issue(repo_name, sub_num)
-                        if sub_issue_obj:
-                            title = getattr(sub_issue_obj, "title", None) or (sub_issue_obj.get("title") if isinstance(sub_issue_obj, dict) else "")
-                            state = getattr(sub_issue_obj, "state", None) or (sub_issue_obj.get("state") if isinstance(sub_issue_obj, dict) else "closed")
-                            sub_issue_lines.append(f"- Sub-issue #{sub_num}: {title} (state: {state})")
-                        else:
-                            sub_issue_lines.append(f"- Sub-issue #{sub_num}")
-                    sub_issues_summary = "\n".join(sub_issue_lines)
+                if bundle is not None:
+                    has_sub_issues = bundle.has_sub_issues
+                    sub_issues_summary = bundle.sub_issues_summary
+                else:
+                    sub_issues_list = github_client.get_all_sub_issues(repo_name, issue_number)
+                    has_sub_issues = len(sub_issues_list) > 0
+                    if has_sub_issues:
+                        sub_issue_lines = []
+                        for sub_num in sub_issues_list:
+                            sub_issue_obj = github_client.get_issue(repo_name, sub_num)
+                            if sub_issue_obj:
+                                title = getattr(sub_issue_obj, "title", None) or (sub_issue_obj.get("title") if isinstance(sub_issue_obj, dict) else "")
+                                state = getattr(sub_issue_obj, "state", None) or (sub_issue_obj.get("state") if isinstance(sub_issue_obj, dict) else "closed")
+                                sub_issue_lines.append(f"- Sub-issue #{sub_num}: {title} (state: {state})")
+                            else:
+                                sub_issue_lines.append(f"- Sub-issue #{sub_num}")
+                        sub_issues_summary = "\n".join(sub_issue_lines)
             except Exception as e:
                 logger.warning(f"Failed to check sub-issues for #{issue_number}: {e}")
 
-            # Check for parent issue
-            parent_issue_details = github_client.get_parent_issue_details(repo_name, issue_number)
-
-            # Fetch parent issue body for sub-issues
+            # Check for parent issue and fetch its body for sub-issues
             parent_issue_body = None
-            if parent_issue_details:
-                parent_issue_body = github_client.get_parent_issue_body(repo_name, issue_number)
-                if parent_issue_body:
-                    logger.info(f"Injecting parent issue #{parent_issue_details['number']} context into prompt for sub-issue #{issue_number}")
+            if bundle is not None and bundle.parent_resolved:
+                parent_issue_details = bundle.parent
+                parent_issue_body = bundle.parent_body
+            else:
+                parent_issue_details = github_client.get_parent_issue_details(repo_name, issue_number)
+                if parent_issue_details:
+                    parent_issue_body = github_client.get_parent_issue_body(repo_name, issue_number)
+            if parent_issue_details and parent_issue_body:
+                logger.info(f"Injecting parent issue #{parent_issue_details['number']} context into prompt for sub-issue #{issue_number}")
 
             base_branch = config.MAIN_BRANCH
             if parent_issue_details:
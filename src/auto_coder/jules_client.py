@@ -52,6 +52,12 @@ def invalidate_jules_sessions_cache() -> None:
     with _session_list_cache.lock:
         _session_list_cache.sessions = None
 
+    from .jules_session_registry import JulesSessionRegistry
+
+    registry = JulesSessionRegistry._instance
+    if registry is not None:
+        registry.mark_stale()
+
 
 class JulesClient(CloudTaskClientBase):
     """Jules HTTP API client that manages session-based AI interactions."""
@@ -7,12 +7,13 @@ import json
 import os
 import re
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import yaml
 from dateutil import parser
 
 from .jules_client import JulesClient
+from .jules_session_registry import JulesSessionRegistry, session_id_of
 from .llm_backend_config import get_jules_session_expiration_days_from_config
 from .logger_config import get_logger
 from .util.gh_cache import GitHubClient
@@ -101,7 +102,7 @@ def check_and_resume_or_archive_sessions(repo_name: Optional[str] = None) -> Non
     """
     try:
         jules_client = JulesClient()
-        sessions = jules_client.list_sessions(repo_name=repo_name)
+        sessions = JulesSessionRegistry.get_instance().refresh(jules_client, repo_name)
 
         # Load retry state
         retry_state = _load_state()
@@ -480,6 +481,53 @@ def _parse_prompt_file(file_path: str) -> tuple[dict, str]:
     return metadata, content
 
 
+def _metadata_names(metadata: dict) -> List[str]:
+    name_val = metadata.get("name", [])
+    if isinstance(name_val, str):
+        return [name_val.strip()]
+    if isinstance(name_val, list):
+        return [str(n).strip() for n in name_val]
+    return []
+
+
+def prompt_names(prompt: Optional[str]) -> List[str]:
+    """Return the names in a session prompt's frontmatter (empty if it has none)."""
+    if not prompt:
+        return []
+    metadata, _ = _parse_prompt_file_content(prompt)
+    return _metadata_names(metadata)
+
+
+def parse_session_pull_request(pull_request: Any) -> Tuple[Optional[str], Optional[int]]:
+    """Return (repo full name, PR number) of a Jules session's pull request output."""
+    repo_name_pr = None
+    pr_number = None
+    url = None
+
+    if isinstance(pull_request, dict):
+        pr_number = pull_request.get("number")
+        repository = pull_request.get("repository")
+        if isinstance(repository, dict):
+            repo_name_pr = repository.get("name") or repository.get("full_name")
+        url = pull_request.get("url")
+    elif isinstance(pull_request, str):
+        url = pull_request
+
+    if not repo_name_pr and isinstance(url, str) and "github.com" in url:
+        parts = url.split("/")
+        if "pull" in parts:
+            pull_idx = parts.index("pull")
+            if pull_idx > 2 and pull_idx + 1 < len(parts):
+                repo_name_pr = f"{parts[pull_idx-2]}/{parts[pull_idx-1]}"
+                if not pr_number:
+                    try:
+                        pr_number = int(parts[pull_idx + 1])
+                    except ValueError:
+                        pass
+
+    return repo_name_pr, pr_number
+
+
 def _normalize_tags(tags: Any) -> List[str]:
     """Normalize tags from frontmatter metadata into a list of lowercase strings."""
     if not tags:
@@ -498,6 +546,35 @@ def _normalize_tags(tags: Any) -> List[str]:
     return [str(tags).strip().lower()]
 
 
+def _recurrent_session_pr_closed(session: Dict[str, Any], session_id: str) -> bool:
+    """Return True if a completed session's PR is closed or merged on GitHub."""
+    pull_request = get_session_pull_request(session)
+    if session.get("state") != "COMPLETED" or not pull_request:
+        return False
+
+    try:
+        github_client = GitHubClient.get_instance()
+    except ValueError:
+        from .auth_utils import get_github_token
+
+        token = get_github_token()
+        if not token:
+            return False
+        github_client = GitHubClient.get_instance(token=token)
+
+    repo_name_pr, pr_number = parse_session_pull_request(pull_request)
+    if not (repo_name_pr and pr_number):
+        return False
+    try:
+        pr = github_client.get_pull_request(repo_name_pr, pr_number)
+        if pr and pr.get("state") == "closed":
+            logger.info(f"Session {session_id} has a closed/merged PR #{pr_number}. Not considering it as running.")
+            return True
+    except Exception as e:
+        logger.warning(f"Failed to check PR status for session {session_id}: {e}")
+    return False
+
+
 def check_and_start_recurrent_jules_tasks(repo_name: str) -> None:
     """Scan .auto-coder/prompts/*.md files and start recurrent Jules tasks if not already running."""
     try:
@@ -512,26 +589,19 @@ def check_and_start_recurrent_jules_tasks(repo_name: str) -> None:
             return
 
         jules_client = JulesClient()
+        registry = JulesSessionRegistry.get_instance()
         try:
-            sessions = jules_client.list_sessions(repo_name=repo_name)
+            registry.refresh(jules_client, repo_name)
+            # Sessions listed without a prompt can only be matched by name once their details are known
+            registry.fetch_missing_details(jules_client)
         except Exception as e:
             logger.error(f"Failed to list Jules sessions: {e}")
             return
 
         for file_path in md_files:
             metadata, full_prompt = _parse_prompt_file(file_path)
-            tags = metadata.get("tags", [])
-            name_val = metadata.get("name", [])
-
-            # Normalize tags and name
-            tag_list = _normalize_tags(tags)
-
-            if isinstance(name_val, str):
-                names = [name_val.strip()]
-            elif isinstance(name_val, list):
-                names = [str(n).strip() for n in name_val]
-            else:
-                names = []
+            tag_list = _normalize_tags(metadata.get("tags", []))
+            names = _metadata_names(metadata)
 
             if not ("jules" in tag_list and "recurrent" in tag_list):
                 continue
@@ -541,105 +611,13 @@ def check_and_start_recurrent_jules_tasks(repo_name: str) -> None:
                 continue
 
             is_running = False
-            for session in sessions:
-                session_id = session.get("name", "").split("/")[-1]
-                if not session_id:
-                    session_id = session.get("id")
-                if not session_id:
-                    continue
-
-                session_prompt = session.get("prompt")
-                if not session_prompt:
-                    try:
-                        full_session = jules_client.get_session(session_id)
-                        session_prompt = full_session.get("prompt")
-                        session = full_session
-                    except Exception as e:
-                        logger.warning(f"Failed to get full session for {session_id} to check prompt: {e}")
-
-                if not session_prompt:
+            for session in registry.sessions_named(names, repo_name):
+                session_id = session_id_of(session)
+                if _recurrent_session_pr_closed(session, session_id or ""):
                     continue
-
-                session_metadata, _ = _parse_prompt_file_content(session_prompt)
-                session_names_val = session_metadata.get("name", [])
-                if isinstance(session_names_val, str):
-                    session_names = [session_names_val.strip()]
-                elif isinstance(session_names_val, list):
-                    session_names = [str(n).strip() for n in session_names_val]
-                else:
-                    session_names = []
-
-                match_found = False
-                for n in names:
-                    for sn in session_names:
-                        if n.strip().lower() == sn.strip().lower():
-                            match_found = True
-                            break
-                    if match_found:
-                        break
-
-                if match_found:
-                    # Check if the session is completed and merged/closed on GitHub
-                    state = session.get("state")
-                    pull_request = get_session_pull_request(session)
-                    if state == "COMPLETED" and pull_request:
-                        try:
-                            github_client = GitHubClient.get_instance()
-                        except ValueError:
-                            from .auth_utils import get_github_token
-
-                            token = get_github_token()
-                            if token:
-                                github_client = GitHubClient.get_instance(token=token)
-                            else:
-                                github_client = None
-
-                        if github_client:
-                            repo_name_pr = None
-                            pr_number = None
-
-                            if isinstance(pull_request, dict):
-                                pr_number = pull_request.get("number")
-                                if "repository" in pull_request:
-                                    repo_name_pr = pull_request["repository"].get("name")
-                                    if not repo_name_pr and "full_name" in pull_request["repository"]:
-                                        repo_name_pr = pull_request["repository"]["full_name"]
-                                if not repo_name_pr and "url" in pull_request:
-                                    url = pull_request["url"]
-                                    if isinstance(url, str) and "github.com" in url:
-                                        parts = url.split("/")
-                                        if "pull" in parts:
-                                            pull_idx = parts.index("pull")
-                                            if pull_idx > 2 and pull_idx + 1 < len(parts):
-                                                repo_name_pr = f"{parts[pull_idx-2]}/{parts[pull_idx-1]}"
-                                                if not pr_number:
-                                                    try:
-                                                        pr_number = int(parts[pull_idx + 1])
-                                                    except ValueError:
-                                                        pass
-                            elif isinstance(pull_request, str) and "github.com" in pull_request:
-                                parts = pull_request.split("/")
-                                if "pull" in parts:
-                                    pull_idx = parts.index("pull")
-                                    if pull_idx > 2 and pull_idx + 1 < len(parts):
-                                        repo_name_pr = f"{parts[pull_idx-2]}/{parts[pull_idx-1]}"
-                                        try:
-                                            pr_number = int(parts[pull_idx + 1])
-                                        except ValueError:
-                                            pass
-
-                            if repo_name_pr and pr_number:
-                                try:
-                                    pr = github_client.get_pull_request(repo_name_pr, pr_number)
-                                    if pr and pr.get("state") == "closed":
-                                        logger.info(f"Session {session_id} has a closed/merged PR #{pr_number}. Not considering it as running.")
-                                        continue
-                                except Exception as e:
-                                    logger.warning(f"Failed to check PR status for session {session_id}: {e}")
-
-                    logger.info(f"Found active Jules session '{session_id}' matching name: {names}")
-                    is_running = True
-                    break
+                logger.info(f"Found active Jules session '{session_id}' matching name: {names}")
+                is_running = True
+                break
 
             if not is_running:
                 logger.info(f"No active Jules session found for recurrent prompt: {names}. Starting a new Jules session...")
@@ -665,25 +643,21 @@ def check_and_restart_recurrent_jules_task_for_pr(repo_name: str, pr_number: int
         jules_client = JulesClient()
         logger.info(f"Checking if merged PR #{pr_number} (session: {session_id}) was a recurrent task...")
 
-        try:
-            session = jules_client.get_session(session_id)
-        except Exception as e:
-            logger.warning(f"Failed to get session details for {session_id}: {e}")
-            return
+        # A session's prompt never changes, so a registered copy is as good as a fresh fetch
+        session = JulesSessionRegistry.get_instance().get(session_id)
+        if not session or not session.get("prompt"):
+            try:
+                session = jules_client.get_session(session_id)
+            except Exception as e:
+                logger.warning(f"Failed to get session details for {session_id}: {e}")
+                return
 
         session_prompt = session.get("prompt")
         if not session_prompt:
             logger.info(f"No startup prompt found in session {session_id}")
             return
 
-        session_metadata, _ = _parse_prompt_file_content(session_prompt)
-        session_names_val = session_metadata.get("name", [])
-        if isinstance(session_names_val, str):
-            session_names = [session_names_val.strip()]
-        elif isinstance(session_names_val, list):
-            session_names = [str(n).strip() for n in session_names_val]
-        else:
-            session_names = []
+        session_names = prompt_names(session_prompt)
 
         if not session_names:
             logger.info(f"No names found in frontmatter of session {session_id}'s prompt")
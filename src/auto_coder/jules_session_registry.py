@@ -0,0 +1,317 @@
+"""Local index of Jules sessions, refreshed incrementally.
+
+The recurrent task check walked every prompt file and, for each one, every
+Jules session, calling get_session() whenever a list entry lacked its prompt.
+Resume/archive handling and the per-PR "waiting for Jules" check then fetched
+the same sessions again. JulesSessionRegistry keeps one copy of each session:
+
+- refresh() merges the (per-iteration cached) session listing into the
+  registry. Prompts never change after a session starts, so a prompt learned
+  once is carried over and only unseen sessions need their details fetched.
+- fetch_missing_details() fetches those details concurrently.
+- Sessions are indexed by recurrent task name, prompt hash and PR, so "is a
+  recurrent task with this name running" and "session for PR N" are dict
+  lookups instead of scans.
+- The registry is persisted to ~/.auto-coder/jules_sessions.json, so details
+  fetched before a restart are not fetched again. Each save merges this
+  process's changes into the file, so engines for other repositories on the
+  host keep theirs.
+
+invalidate_jules_sessions_cache() marks the registry stale; until the next
+refresh() lookups should go to the Jules API instead (see is_fresh_for()).
+"""
+
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from .logger_config import get_logger
+from .util.json_state import read_json_file, update_json_file
+
+logger = get_logger(__name__)
+
+DEFAULT_DETAIL_WORKERS = 8
+
+
+def get_jules_sessions_path() -> Path:
+    """Return the path of the persisted session registry."""
+    return Path.home() / ".auto-coder" / "jules_sessions.json"
+
+
+def session_id_of(session: Dict[str, Any]) -> Optional[str]:
+    """Return the short session id of a Jules session resource."""
+    return (session.get("name") or "").split("/")[-1] or session.get("id")
+
+
+def prompt_hash(prompt: str) -> str:
+    return hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+
+
+def _session_source(session: Dict[str, Any]) -> Optional[str]:
+    source_context = session.get("sourceContext")
+    return source_context.get("source") if isinstance(source_context, dict) else None
+
+
+def _pr_key(repo_name: str, pr_number: int) -> str:
+    return f"{repo_name}#{pr_number}"
+
+
+class JulesSessionRegistry:
+    """Persisted Jules sessions keyed by id, with name, prompt hash and PR indexes."""
+
+    _instance: Optional["JulesSessionRegistry"] = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, path: Optional[Path] = None, detail_workers: int = DEFAULT_DETAIL_WORKERS):
+        self.path = path or get_jules_sessions_path()
+        self.detail_workers = detail_workers
+        self.refreshes = 0
+        self.detail_fetches = 0
+        self.is_fresh = False
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._fresh_scope: Optional[str] = None
+        self._sessions: Dict[str, Dict[str, Any]] = {}
+        self._by_name: Dict[str, Set[str]] = {}
+        self._by_prompt_hash: Dict[str, Set[str]] = {}
+        self._by_pr: Dict[str, str] = {}
+        # Per-session index keys, so a session can be unindexed without re-parsing its prompt
+        self._index_keys: Dict[str, Tuple[Optional[str], List[str], Optional[str]]] = {}
+        # Changes not yet merged into the persisted file
+        self._dirty: Set[str] = set()
+        self._removed: Set[str] = set()
+        self._load()
+
+    @classmethod
+    def get_instance(cls) -> "JulesSessionRegistry":
+        """Return the process-wide registry."""
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+        return cls._instance
+
+    @classmethod
+    def reset_instance(cls) -> None:
+        """Drop the singleton (used by tests)."""
+        with cls._instance_lock:
+            cls._instance = None
+
+    def _load(self) -> None:
+        data = read_json_file(self.path)
+        try:
+            for session in data if isinstance(data, list) else []:
+                session_id = session_id_of(session)
+                if session_id:
+                    self._put(session_id, session)
+        except Exception as e:
+            logger.debug(f"Ignoring unreadable Jules session registry {self.path}: {e}")
+            self._sessions.clear()
+            self._by_name.clear()
+            self._by_prompt_hash.clear()
+            self._by_pr.clear()
+            self._index_keys.clear()
+        self._dirty.clear()
+
+    def _save(self) -> None:
+        changed = {session_id: self._sessions[session_id] for session_id in self._dirty if session_id in self._sessions}
+        removed = set(self._removed)
+
+        def update(data: Any) -> List[Dict[str, Any]]:
+            sessions: Dict[str, Dict[str, Any]] = {}
+            for session in data if isinstance(data, list) else []:
+                session_id = session_id_of(session) if isinstance(session, dict) else None
+                if session_id and session_id not in removed:
+                    sessions[session_id] = session
+            sessions.update(changed)
+            return list(sessions.values())
+
+        try:
+            update_json_file(self.path, update)
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(f"Failed to persist Jules session registry: {e}")
+            return
+        self._dirty.clear()
+        self._removed.clear()
+
+    def _unindex(self, session_id: str) -> None:
+        keys = self._index_keys.pop(session_id, None)
+        if keys is None:
+            return
+        digest, names, pr = keys
+        if digest:
+            self._by_prompt_hash.get(digest, set()).discard(session_id)
+        for name in names:
+            self._by_name.get(name, set()).discard(session_id)
+        if pr and self._by_pr.get(pr) == session_id:
+            del self._by_pr[pr]
+
+    def _put(self, session_id: str, session: Dict[str, Any]) -> None:
+        from .jules_engine import get_session_pull_request, parse_session_pull_request, prompt_names
+
+        old_keys = self._index_keys.get(session_id)
+        self._unindex(session_id)
+        self._sessions[session_id] = session
+        self._dirty.add(session_id)
+        self._removed.discard(session_id)
+
+        prompt = session.get("prompt")
+        digest = prompt_hash(prompt) if isinstance(prompt, str) and prompt else None
+        if digest and old_keys and old_keys[0] == digest:
+            names = old_keys[1]
+        else:
+            names = [name.lower() for name in prompt_names(prompt)] if digest else []
+        repo_name, pr_number = parse_session_pull_request(get_session_pull_request(session))
+        pr = _pr_key(repo_name, pr_number) if repo_name and pr_number else None
+
+        self._index_keys[session_id] = (digest, names, pr)
+        if digest:
+            self._by_prompt_hash.setdefault(digest, set()).add(session_id)
+        for name in names:
+            self._by_name.setdefault(name, set()).add(session_id)
+        if pr:
+            self._by_pr[pr] = session_id
+
+    def _remove(self, session_id: str) -> None:
+        self._unindex(session_id)
+        self._sessions.pop(session_id, None)
+        self._dirty.discard(session_id)
+        self._removed.add(session_id)
+
+    def refresh(self, jules_client: Any, repo_name: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Merge the current session listing into the registry.
+
+        Sessions that left the listing (archived or deleted) are dropped. Known
+        prompts are carried over to list entries that omit them.
+
+        Args:
+            jules_client: JulesClient whose list_sessions() provides the listing
+            repo_name: Repository to list sessions for (default: all)
+
+        Returns:
+            The listed sessions, in listing order
+        """
+        with self._refresh_lock:
+            listing = jules_client.list_sessions(repo_name=repo_name)
+            expected_source = f"sources/github/{repo_name}" if repo_name else None
+            listed: List[Dict[str, Any]] = []
+            with self._lock:
+                seen: Set[str] = set()
+                for session in listing:
+                    if isinstance(session, list):
+                        try:
+                            session = dict(session)
+                        except (TypeError, ValueError):
+                            continue
+                    if not isinstance(session, dict):
+                        continue
+                    session_id = session_id_of(session)
+                    if not session_id:
+                        continue
+                    seen.add(session_id)
+                    known = self._sessions.get(session_id)
+                    if not session.get("prompt") and known and known.get("prompt"):
+                        session = {**session, "prompt": known["prompt"]}
+                    if session != known:
+                        self._put(session_id, session)
+                    listed.append(self._sessions[session_id])
+                for session_id in [sid for sid, s in self._sessions.items() if sid not in seen and (not expected_source or _session_source(s) in (expected_source, None))]:
+                    self._remove(session_id)
+                self.refreshes += 1
+                self.is_fresh = True
+                self._fresh_scope = repo_name
+                self._save()
+            logger.debug(f"Jules session registry refreshed: {len(listed)} listed, {len(self._sessions)} known")
+            return listed
+
+    def fetch_missing_details(self, jules_client: Any) -> int:
+        """Fetch, concurrently, the details of every known session whose prompt is unknown.
+
+        Returns:
+            Number of sessions whose details were fetched
+        """
+        with self._lock:
+            missing = [session_id for session_id, session in self._sessions.items() if not session.get("prompt")]
+        if not missing:
+            return 0
+
+        def fetch(session_id: str) -> Tuple[str, Optional[Dict[str, Any]]]:
+            try:
+                return session_id, jules_client.get_session(session_id)
+            except Exception as e:
+                logger.warning(f"Failed to get full session for {session_id} to check prompt: {e}")
+                return session_id, None
+
+        with ThreadPoolExecutor(max_workers=max(1, min(self.detail_workers, len(missing)))) as executor:
+            results = list(executor.map(fetch, missing))
+
+        fetched = 0
+        with self._lock:
+            for session_id, details in results:
+                if not isinstance(details, dict) or session_id not in self._sessions:
+                    continue
+                self._put(session_id, {**self._sessions[session_id], **details})
+                fetched += 1
+            self.detail_fetches += fetched
+            if fetched:
+                self._save()
+        logger.debug(f"Fetched details for {fetched} of {len(missing)} Jules session(s)")
+        return fetched
+
+    def mark_stale(self) -> None:
+        """Note that the listing may have changed since the last refresh()."""
+        with self._lock:
+            self.is_fresh = False
+
+    def is_fresh_for(self, repo_name: Optional[str]) -> bool:
+        """Whether the registry was refreshed for repo_name since it was last marked stale."""
+        with self._lock:
+            return self.is_fresh and self._fresh_scope in (repo_name, None)
+
+    def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._sessions.get(session_id)
+
+    def _lookup(self, ids: Iterable[str], repo_name: Optional[str] = None) -> List[Dict[str, Any]]:
+        sessions = [self._sessions[session_id] for session_id in sorted(ids) if session_id in self._sessions]
+        if repo_name:
+            # Sessions without a source are kept, as refresh() does when pruning
+            expected_source = f"sources/github/{repo_name}"
+            sessions = [s for s in sessions if _session_source(s) in (expected_source, None)]
+        return sessions
+
+    def sessions_named(self, names: Iterable[str], repo_name: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Return sessions whose prompt front matter has any of names (case-insensitive).
+
+        Args:
+            names: Names to look up
+            repo_name: Only return sessions of this repository (default: all)
+        """
+        with self._lock:
+            ids: Set[str] = set()
+            for name in names:
+                ids |= self._by_name.get(name.strip().lower(), set())
+            return self._lookup(ids, repo_name)
+
+    def sessions_with_prompt(self, prompt: str, repo_name: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Return sessions started with exactly this prompt, optionally only those of repo_name."""
+        with self._lock:
+            return self._lookup(self._by_prompt_hash.get(prompt_hash(prompt), set()), repo_name)
+
+    def session_for_pr(self, repo_name: str, pr_number: int) -> Optional[Dict[str, Any]]:
+        """Return the session whose outputs record the given pull request."""
+        with self._lock:
+            session_id = self._by_pr.get(_pr_key(repo_name, pr_number))
+            return self._sessions.get(session_id) if session_id else None
+
+    def stats(self) -> Dict[str, int]:
+        """Return session, refresh and detail fetch counters."""
+        with self._lock:
+            return {"sessions": len(self._sessions), "refreshes": self.refreshes, "detail_fetches": self.detail_fetches}
+
+
+def get_jules_session_registry() -> JulesSessionRegistry:
+    """Return the process-wide :class:`JulesSessionRegistry`."""
+    return JulesSessionRegistry.get_instance()
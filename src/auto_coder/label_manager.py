@@ -15,6 +15,7 @@ from typing import Any, Dict, Generator, List, Optional, Union
 from github.GithubException import GithubException
 
 from .automation_config import AutomationConfig
+from .lease_manager import LeaseManager, get_lease_manager, make_lease_key
 from .logger_config import get_logger
 from .util.gh_cache import GitHubClient
 
@@ -418,6 +419,8 @@ class LabelManager:
         self._label_added = False
         self._reentered = False
         self._context: Optional[LabelManagerContext] = None
+        self._lease_manager: Optional[LeaseManager] = None
+        self._lease_key: Optional[str] = None
 
     def __enter__(self) -> LabelManagerContext:
         """Enter the context manager - add label and return context object.
@@ -440,80 +443,112 @@ class LabelManager:
             LabelManager._active_items.add(item_key)
             logger.debug(f">>> Entering context (first time for this item in this thread) for {self.item_type} #{self.item_number}")
 
-        # Use lock to ensure thread-safe operations
-        with self._lock:
-            # Check if labels are disabled
-            if self._is_labels_disabled():
-                logger.debug(f"Labels disabled - proceeding without label management for {self.item_type} #{self.item_number}")
-                # In check-only mode, always return True when labels are disabled
-                if self.skip_label_add:
+        try:
+            # Use lock to ensure thread-safe operations
+            with self._lock:
+                # Check if labels are disabled
+                if self._is_labels_disabled():
+                    logger.debug(f"Labels disabled - proceeding without label management for {self.item_type} #{self.item_number}")
+                    # In check-only mode, always return True when labels are disabled
+                    if self.skip_label_add:
+                        self._context = LabelManagerContext(self, True)
+                        return self._context
                     self._context = LabelManagerContext(self, True)
                     return self._context
-                self._context = LabelManagerContext(self, True)
-                return self._context
-
-            # Check-only mode: only verify label existence without adding
-            if self.skip_label_add:
-                logger.debug(f"Check-only mode: verifying if '{self.label_name}' label exists on {self.item_type} #{self.item_number}")
-                # Use helper that fails-open (returns True to continue on errors)
-                should_process = self._check_label_exists()
-                self._context = LabelManagerContext(self, should_process)
-                return self._context
 
-            # Normal mode: add label with retry logic
-            # When check_labels=False (WIP mode), skip pre-check and proceed
-            if self.check_labels:
-                # First, pre-check if the label already exists to avoid redundant edits
-                try:
+                # Check-only mode: only verify label existence without adding
+                if self.skip_label_add:
+                    logger.debug(f"Check-only mode: verifying if '{self.label_name}' label exists on {self.item_type} #{self.item_number}")
+                    # Use helper that fails-open (returns True to continue on errors)
                     should_process = self._check_label_exists()
-                    if not should_process:
-                        logger.info(f"Skipping {self.item_type} #{self.item_number} - '{self.label_name}' label already exists")
-                        self._context = LabelManagerContext(self, False)
-                        return self._context
-                except Exception:
-                    # _check_label_exists() is defensive and should not raise, but guard anyway
-                    pass
-            else:
-                logger.debug(f"check_labels=False - skipping existing label check for {self.item_type} #{self.item_number}")
-
-            # Try to add the label with retry logic
-            for attempt in range(self.max_retries):
-                try:
-                    # Use the generic method for adding labels
-                    result = self.github_client.try_add_labels(
-                        self.repo_name,
-                        int(self.item_number),
-                        [self.label_name],
-                        item_type=self.item_type,
-                    )
-                    if result:
-                        self._label_added = True
-                        self._context = LabelManagerContext(self, True)
-                        return self._context
-                    elif not self.check_labels:
-                        # Explicitly requested work (--only / WIP resume): the label must not
-                        # gate processing. It is left untouched because this run does not own it.
-                        logger.info(f"Processing {self.item_type} #{self.item_number} despite the existing '{self.label_name}' label (check_labels=False)")
-                        self._context = LabelManagerContext(self, True)
-                        return self._context
-                    else:
-                        logger.info(f"Skipping {self.item_type} #{self.item_number} - '{self.label_name}' label was just added by another instance")
-                        self._context = LabelManagerContext(self, False)
-                        return self._context
-
-                except Exception as e:
-                    if attempt < self.max_retries - 1:
-                        logger.warning(f"Failed to add '{self.label_name}' label to {self.item_type} #{self.item_number} " f"(attempt {attempt + 1}/{self.max_retries}): {e}. Retrying in {self.retry_delay}s...")
-                        time.sleep(self.retry_delay)
-                    else:
-                        logger.error(f"Failed to add '{self.label_name}' label to {self.item_type} #{self.item_number} " f"after {self.max_retries} attempts: {e}")
-                        # On error, allow processing to continue
-                        self._context = LabelManagerContext(self, True)
-                        return self._context
+                    self._context = LabelManagerContext(self, should_process)
+                    return self._context
 
-            # Should not reach here, but just in case
-            self._context = LabelManagerContext(self, True)
-            return self._context
+                # Claim the item in the host-local lease registry first. Contention between
+                # workers/processes on this host is settled here without GitHub round trips.
+                if self.check_labels:
+                    lease_manager = get_lease_manager()
+                    if lease_manager is not None:
+                        lease_key = make_lease_key(self.repo_name, self.item_number)
+                        try:
+                            acquired = lease_manager.acquire(lease_key)
+                        except Exception as e:
+                            # A locked or read-only lease database must not stop processing
+                            logger.warning(f"Local lease unavailable for {self.item_type} #{self.item_number}, falling back to label-only locking: {e}")
+                        else:
+                            if not acquired:
+                                logger.info(f"Skipping {self.item_type} #{self.item_number} - claimed by another worker on this host (local lease)")
+                                self._context = LabelManagerContext(self, False)
+                                return self._context
+                            self._lease_manager = lease_manager
+                            self._lease_key = lease_key
+
+                # Normal mode: add label with retry logic
+                # When check_labels=False (WIP mode), skip pre-check and proceed
+                # While holding a local lease, try_add_labels below reports an existing label
+                # itself, so the separate pre-check round trip is only made when it is free
+                run_precheck = self._lease_key is None or self.known_labels is not None
+                if self.check_labels and run_precheck:
+                    # First, pre-check if the label already exists to avoid redundant edits
+                    try:
+                        should_process = self._check_label_exists()
+                        if not should_process:
+                            logger.info(f"Skipping {self.item_type} #{self.item_number} - '{self.label_name}' label already exists")
+                            self._release_lease()
+                            self._context = LabelManagerContext(self, False)
+                            return self._context
+                    except Exception:
+                        # _check_label_exists() is defensive and should not raise, but guard anyway
+                        pass
+                elif not self.check_labels:
+                    logger.debug(f"check_labels=False - skipping existing label check for {self.item_type} #{self.item_number}")
+
+                # Try to add the label with retry logic. While holding a local lease the
+                # outcome of a failed add is the same (proceed), so do not sleep and retry.
+                max_attempts = 1 if self._lease_key is not None else self.max_retries
+                for attempt in range(max_attempts):
+                    try:
+                        # Use the generic method for adding labels
+                        result = self.github_client.try_add_labels(
+                            self.repo_name,
+                            int(self.item_number),
+                            [self.label_name],
+                            item_type=self.item_type,
+                        )
+                        if result:
+                            self._label_added = True
+                            self._context = LabelManagerContext(self, True)
+                            return self._context
+                        elif not self.check_labels:
+                            # Explicitly requested work (--only / WIP resume): the label must not
+                            # gate processing. It is left untouched because this run does not own it.
+                            logger.info(f"Processing {self.item_type} #{self.item_number} despite the existing '{self.label_name}' label (check_labels=False)")
+                            self._context = LabelManagerContext(self, True)
+                            return self._context
+                        else:
+                            logger.info(f"Skipping {self.item_type} #{self.item_number} - '{self.label_name}' label was just added by another instance")
+                            self._release_lease()
+                            self._context = LabelManagerContext(self, False)
+                            return self._context
+
+                    except Exception as e:
+                        if attempt < max_attempts - 1:
+                            logger.warning(f"Failed to add '{self.label_name}' label to {self.item_type} #{self.item_number} " f"(attempt {attempt + 1}/{max_attempts}): {e}. Retrying in {self.retry_delay}s...")
+                            time.sleep(self.retry_delay)
+                        else:
+                            logger.error(f"Failed to add '{self.label_name}' label to {self.item_type} #{self.item_number} " f"after {max_attempts} attempts: {e}")
+                            # On error, allow processing to continue
+                            self._context = LabelManagerContext(self, True)
+                            return self._context
+
+                # Should not reach here, but just in case
+                self._context = LabelManagerContext(self, True)
+                return self._context
+        except BaseException:
+            # __exit__ will not run, so undo the bookkeeping here
+            LabelManager._active_items.discard(item_key)
+            self._release_lease()
+            raise
 
     def __exit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
         """Exit the context manager - remove label if it was added and not retained.
@@ -534,23 +569,38 @@ class LabelManager:
         # Always clean up thread tracking
         LabelManager._active_items.discard(item_key)
 
-        # In check-only mode, never remove labels
-        if self.skip_label_add:
-            logger.debug(f"Check-only mode: skipping label removal for {self.item_type} #{self.item_number}")
-            return
-
-        # Check if the context has the keep_label flag set
-        if hasattr(self, "_context") and self._context and not self._context._should_remove_label():
-            logger.debug(f"Keeping '{self.label_name}' label on exit as requested for {self.item_type} #{self.item_number}")
-            return
+        try:
+            # In check-only mode, never remove labels
+            if self.skip_label_add:
+                logger.debug(f"Check-only mode: skipping label removal for {self.item_type} #{self.item_number}")
+                return
 
-        # Use lock to ensure thread-safe operations
-        with self._lock:
-            # Only remove label if we added it and labels are not disabled
-            if not self._label_added or self._is_labels_disabled():
+            # Check if the context has the keep_label flag set
+            if hasattr(self, "_context") and self._context and not self._context._should_remove_label():
+                logger.debug(f"Keeping '{self.label_name}' label on exit as requested for {self.item_type} #{self.item_number}")
                 return
 
-            self._remove_label_internal()
+            # Use lock to ensure thread-safe operations
+            with self._lock:
+                # Only remove label if we added it and labels are not disabled
+                if not self._label_added or self._is_labels_disabled():
+                    return
+
+                self._remove_label_internal()
+        finally:
+            # The local lease only covers active processing; a kept label keeps the item claimed
+            self._release_lease()
+
+    def _release_lease(self) -> None:
+        """Release the host-local lease if this manager holds one."""
+        if self._lease_manager is None or self._lease_key is None:
+            return
+        try:
+            self._lease_manager.release(self._lease_key)
+        except Exception as e:
+            logger.warning(f"Failed to release local lease for {self.item_type} #{self.item_number}: {e}")
+        finally:
+            self._lease_key = None
 
     def remove_label(self) -> None:
         """Explicitly remove the managed label."""
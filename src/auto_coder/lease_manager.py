@@ -0,0 +1,177 @@
+"""Host-local lease registry for claiming issues and PRs.
+
+Workers and processes on the same host coordinate through TTL leases stored in
+a shared SQLite database, so contention between them is resolved locally
+without GitHub API round trips. The @auto-coder label is still applied by
+LabelManager when a lease is acquired, which keeps mutual exclusion across
+hosts.
+
+Leases held by this process are renewed by a single heartbeat thread; a lease
+whose owner crashed expires after its TTL and can be taken over.
+"""
+
+import os
+import socket
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+from .logger_config import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_LEASE_TTL_SECONDS = 600
+
+
+def get_lease_db_path() -> Path:
+    """Return the path of the host-wide lease database (~/.auto-coder/leases.sqlite3)."""
+    return Path.home() / ".auto-coder" / "leases.sqlite3"
+
+
+def make_lease_key(repo_name: str, item_number: int | str) -> str:
+    """Build the lease key for an issue or PR (they share a number space)."""
+    return f"{repo_name}#{item_number}"
+
+
+class LeaseManager:
+    """SQLite-backed TTL lease registry shared by all processes on a host."""
+
+    _instance: Optional["LeaseManager"] = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, db_path: Optional[Path] = None, ttl_seconds: int = DEFAULT_LEASE_TTL_SECONDS):
+        self.db_path = db_path or get_lease_db_path()
+        self.ttl_seconds = ttl_seconds
+        self._held: Dict[str, str] = {}
+        self._held_lock = threading.Lock()
+        self._heartbeat_thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS leases (key TEXT PRIMARY KEY, owner TEXT NOT NULL, expires_at REAL NOT NULL)")
+
+    @classmethod
+    def get_instance(cls) -> "LeaseManager":
+        """Return the process-wide lease manager."""
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    from .llm_backend_config import get_label_lease_ttl_seconds_from_config
+
+                    cls._instance = cls(ttl_seconds=get_label_lease_ttl_seconds_from_config())
+        return cls._instance
+
+    @classmethod
+    def reset_instance(cls) -> None:
+        """Drop the singleton (used by tests)."""
+        with cls._instance_lock:
+            if cls._instance is not None:
+                cls._instance.stop()
+            cls._instance = None
+
+    @staticmethod
+    def default_owner() -> str:
+        """Owner identity for the calling thread: host, process and thread."""
+        return f"{socket.gethostname()}:{os.getpid()}:{threading.get_ident()}"
+
+    def _connect(self) -> sqlite3.Connection:
+        # isolation_level=None lets us issue BEGIN IMMEDIATE for a write lock up front
+        return sqlite3.connect(str(self.db_path), timeout=10, isolation_level=None)
+
+    def acquire(self, key: str, owner: Optional[str] = None) -> bool:
+        """Try to acquire (or renew) the lease for key.
+
+        Returns:
+            True if the caller now holds the lease, False if another live owner holds it.
+        """
+        owner = owner or self.default_owner()
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute("SELECT owner, expires_at FROM leases WHERE key = ?", (key,)).fetchone()
+            if row is not None and row[0] != owner and row[1] > now:
+                conn.execute("ROLLBACK")
+                logger.debug(f"Lease {key} is held by {row[0]} for another {row[1] - now:.0f}s")
+                return False
+            conn.execute(
+                "INSERT INTO leases (key, owner, expires_at) VALUES (?, ?, ?) ON CONFLICT(key) DO UPDATE SET owner = excluded.owner, expires_at = excluded.expires_at",
+                (key, owner, now + self.ttl_seconds),
+            )
+            conn.execute("COMMIT")
+        finally:
+            conn.close()
+
+        with self._held_lock:
+            self._held[key] = owner
+        self._ensure_heartbeat()
+        return True
+
+    def release(self, key: str, owner: Optional[str] = None) -> None:
+        """Release the lease for key if it is held by owner."""
+        owner = owner or self._held.get(key) or self.default_owner()
+        with self._held_lock:
+            self._held.pop(key, None)
+        conn = self._connect()
+        try:
+            conn.execute("DELETE FROM leases WHERE key = ? AND owner = ?", (key, owner))
+        finally:
+            conn.close()
+
+    def holder(self, key: str) -> Optional[str]:
+        """Return the owner of a live lease for key, or None."""
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT owner FROM leases WHERE key = ? AND expires_at > ?", (key, time.time())).fetchone()
+        finally:
+            conn.close()
+        return row[0] if row else None
+
+    def heartbeat(self) -> None:
+        """Extend the expiry of every lease held by this process."""
+        with self._held_lock:
+            held = dict(self._held)
+        if not held:
+            return
+        expires_at = time.time() + self.ttl_seconds
+        conn = self._connect()
+        try:
+            for key, owner in held.items():
+                conn.execute("UPDATE leases SET expires_at = ? WHERE key = ? AND owner = ?", (expires_at, key, owner))
+        finally:
+            conn.close()
+
+    def _ensure_heartbeat(self) -> None:
+        if self._heartbeat_thread is not None and self._heartbeat_thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._heartbeat_thread = threading.Thread(target=self._heartbeat_loop, name="LeaseHeartbeat", daemon=True)
+        self._heartbeat_thread.start()
+
+    def _heartbeat_loop(self) -> None:
+        interval = max(1.0, self.ttl_seconds / 3)
+        while not self._stop_event.wait(interval):
+            try:
+                self.heartbeat()
+            except Exception as e:
+                logger.warning(f"Lease heartbeat failed: {e}")
+
+    def stop(self) -> None:
+        """Stop the heartbeat thread."""
+        self._stop_event.set()
+
+
+def get_lease_manager() -> Optional[LeaseManager]:
+    """Return the host-wide lease manager, or None when [label_lease].enabled is off."""
+    from .llm_backend_config import get_label_lease_enabled_from_config
+
+    if not get_label_lease_enabled_from_config():
+        return None
+    try:
+        return LeaseManager.get_instance()
+    except Exception as e:
+        logger.warning(f"Local lease registry unavailable, falling back to label-only locking: {e}")
+        return None
@@ -1041,6 +1041,709 @@ def get_isolate_single_test_on_failure_from_config(config_path: Optional[str] =
     )
 
 
+def get_test_impact_selection_from_config(config_path: Optional[str] = None) -> bool:
+    """Get impact_selection setting from [test] section in config.toml.
+
+    When enabled, each fix attempt in fix_to_pass_tests verifies the edit by running
+    only the failing tests plus the tests impacted by the attempt's diff, and the
+    full suite is run only once that targeted set passes.
+
+    Args:
+        config_path: Optional explicit path to config.toml file.
+
+    Returns:
+        True if impact selection is enabled, False otherwise (default: False)
+    """
+    return _get_config_value(
+        section="test",
+        key="impact_selection",
+        default=False,
+        config_path=config_path,
+        value_type=bool,
+    )
+
+
+def get_test_impact_coverage_json_from_config(config_path: Optional[str] = None) -> str:
+    """Get the coverage JSON report path from [test].impact_coverage_json in config.toml.
+
+    The report (``coverage json --show-contexts``) is read after full test runs to
+    record a coverage-derived source -> test map.
+
+    Args:
+        config_path: Optional explicit path to config.toml file.
+
+    Returns:
+        Path to the coverage JSON report (default: "coverage.json")
+    """
+    return _get_config_value(
+        section="test",
+        key="impact_coverage_json",
+        default="coverage.json",
+        config_path=config_path,
+        value_type=str,
+    )
+
+
+def get_test_shards_from_config(config_path: Optional[str] = None) -> int:
+    """Get the number of parallel test shards from [test].shards in config.toml.
+
+    When greater than 1, full local test runs split the discovered test files into
+    that many shards (balanced by recorded durations) and run them concurrently.
+
+    Args:
+        config_path: Optional explicit path to config.toml file.
+
+    Returns:
+        Number of shards (default: 0, sharding disabled)
+    """
+    return _get_config_value(
+        section="test",
+        key="shards",
+        default=0,
+        config_path=config_path,
+        value_type=int,
+    )
+
+
+def get_label_lease_enabled_from_config(config_path: Optional[str] = None) -> bool:
+    """Get [label_lease].enabled from config.toml.
+
+    When enabled, workers and processes on the same host claim issues/PRs through a
+    local SQLite lease registry before touching the @auto-coder label on GitHub.
+
+    Args:
+        config_path: Optional explicit path to config.toml file.
+
+    Returns:
+        True if local leases are enabled, False otherwise (default: False)
+    """
+    return _get_config_value(
+        section="label_lease",
+        key="enabled",
+        default=False,
+        config_path=config_path,
+        value_type=bool,
+    )
+
+
+def get_label_lease_ttl_seconds_from_config(config_path: Optional[str] = None) -> int:
+    """Get the local lease TTL from [label_lease].ttl_seconds in config.toml.
+
+    Args:
+        config_path: Optional explicit path to config.toml file.
+
+    Returns:
+        Lease TTL in seconds (default: 600)
+    """
+    return _get_config_value(
+        section="label_lease",
+        key="ttl_seconds",
+        default=600,
+        config_path=config_path,
+        value_type=int,
+    )
+
+
+def get_llm_response_cache_enabled_from_config(config_path: Optional[str] = None) -> bool:
+    """Get [llm_response_cache].enabled from config.toml.
+
+    When enabled, responses to no-edit prompts (commit messages, mergeability
+    checks, PR analysis) are cached on disk and reused for identical prompts.
+
+    Args:
+        config_path: Optional explicit path to config.toml file.
+
+    Returns:
+        True if the response cache is enabled, False otherwise (default: False)
+    """
+    return _get_config_value(
+        section="llm_response_cache",
+        key="enabled",
+        default=False,
+        config_path=config_path,
+        value_type=bool,
+    )
+
+
+def get_llm_response_cache_ttl_seconds_from_config(config_path: Optional[str] = None) -> int:
+    """Get the response cache TTL from [llm_response_cache].ttl_seconds in config.toml.
+
+    Args:
+        config_path: Optional explicit path to config.toml file.
+
+    Returns:
+        Cache entry lifetime in seconds (default: 86400)
+    """
+    return _get_config_value(
+        section="llm_response_cache",
+        key="ttl_seconds",
+        default=86400,
+        config_path=config_path,
+        value_type=int,
+    )
+
+
+def get_llm_response_cache_max_mb_from_config(config_path: Optional[str] = None) -> int:
+    """Get the response cache size bound from [llm_response_cache].max_mb in config.toml.
+
+    Args:
+        config_path: Optional explicit path to config.toml file.
+
+    Returns:
+        Maximum cache size in megabytes (default: 64)
+    """
+    return _get_config_value(
+        section="llm_response_cache",
+        key="max_mb",
+        default=64,
+        config_path=config_path,
+        value_type=int,
+    )
+
+
+def get_backend_cooldown_enabled_from_config(config_path: Optional[str] = None) -> bool:
+    """Get [backend_cooldown].enabled from config.toml.
+
+    When enabled, usage-limited backends and providers are recorded in a host-wide
+    cooldown registry and skipped by every backend manager and process until the
+    limit lifts, instead of sleeping inline and retrying.
+
+    Args:
+        config_path: Optional explicit path to config.toml file.
+
+    Returns:
+        True if the cooldown registry is enabled, False otherwise (default: False)
+    """
+    return _get_config_value(
+        section="backend_cooldown",
+        key="enabled",
+        default=False,
+        config_path=config_path,
+        value_type=bool,
+    )
+
+
+def get_backend_cooldown_default_seconds_from_config(config_path: Optional[str] = None) -> int:
+    """Get [backend_cooldown].default_seconds from config.toml.
+
+    Used when the reset time cannot be parsed from the usage-limit error and the
+    backend has no usage_limit_retry_wait_seconds configured.
+
+    Args:
+        config_path: Optional explicit path to config.toml file.
+
+    Returns:
+        Cooldown length in seconds (default: 300)
+    """
+    return _get_config_value(
+        section="backend_cooldown",
+        key="default_seconds",
+        default=300,
+        config_path=config_path,
+        value_type=int,
+    )
+
+
+def get_backend_routing_policy_from_config(config_path: Optional[str] = None) -> str:
+    """Get the backend routing policy from [backend_routing].policy in config.toml.
+
+    "order" keeps the configured backend order (round-robin rotation); "score"
+    routes each call to the backend with the best latency/success score.
+
+    Args:
+        config_path: Optional explicit path to config.toml file.
+
+    Returns:
+        Policy name (default: "order")
+    """
+    return _get_config_value(
+        section="backend_routing",
+        key="policy",
+        default="order",
+        config_path=config_path,
+        value_type=str,
+    )
+
+
+def get_backend_routing_ewma_alpha_from_config(config_path: Optional[str] = None) -> float:
+    """Get the latency smoothing factor from [backend_routing].ewma_alpha in config.toml.
+
+    Args:
+        config_path: Optional explicit path to config.toml file.
+
+    Returns:
+        EWMA weight of the newest latency sample (default: 0.3)
+    """
+    return _get_config_value(
+        section="backend_routing",
+        key="ewma_alpha",
+        default=0.3,
+        config_path=config_path,
+        value_type=float,
+    )
+
+
+def get_backend_routing_min_samples_from_config(config_path: Optional[str] = None) -> int:
+    """Get [backend_routing].min_samples from config.toml.
+
+    Backends with fewer recorded calls are tried first so every backend gets measured.
+
+    Args:
+        config_path: Optional explicit path to config.toml file.
+
+    Returns:
+        Minimum number of calls before a backend is scored (default: 3)
+    """
+    return _get_config_value(
+        section="backend_routing",
+        key="min_samples",
+        default=3,
+        config_path=config_path,
+        value_type=int,
+    )
+
+
+def get_backend_concurrency_enabled_from_config(config_path: Optional[str] = None) -> bool:
+    """Check if the per-backend concurrency limiter is enabled via [backend_concurrency].enabled.
+
+    Args:
+        config_path: Optional explicit path to config.toml file.
+
+    Returns:
+        True if LLM calls must be admitted through the limiter (default: False)
+    """
+    return _get_config_value(
+        section="backend_concurrency",
+        key="enabled",
+        default=False,
+        config_path=config_path,
+        value_type=bool,
+    )
+
+
+def get_backend_concurrency_max_in_flight_from_config(config_path: Optional[str] = None) -> int:
+    """Get the default per-backend in-flight limit from [backend_concurrency].max_in_flight.
+
+    Args:
+        config_path: Optional explicit path to config.toml file.
+
+    Returns:
+        Maximum concurrent calls per backend (default: 2)
+    """
+    return _get_config_value(
+        section="backend_concurrency",
+        key="max_in_flight",
+        default=2,
+        config_path=config_path,
+        value_type=int,
+    )
+
+
+def get_backend_concurrency_provider_max_in_flight_from_config(config_path: Optional[str] = None) -> int:
+    """Get the default per-provider in-flight limit from [backend_concurrency].provider_max_in_flight.
+
+    Args:
+        config_path: Optional explicit path to config.toml file.
+
+    Returns:
+        Maximum concurrent calls per backend provider (default: 1)
+    """
+    return _get_config_value(
+        section="backend_concurrency",
+        key="provider_max_in_flight",
+        default=1,
+        config_path=config_path,
+        value_type=int,
+    )
+
+
+def get_backend_concurrency_max_queue_from_config(config_path: Optional[str] = None) -> int:
+    """Get the admission queue length from [backend_concurrency].max_queue.
+
+    When this many calls already wait for a backend, further calls spill over
+    to the next backend instead of queueing.
+
+    Args:
+        config_path: Optional explicit path to config.toml file.
+
+    Returns:
+        Maximum number of waiting calls per backend (default: 4)
+    """
+    return _get_config_value(
+        section="backend_concurrency",
+        key="max_queue",
+        default=4,
+        config_path=config_path,
+        value_type=int,
+    )
+
+
+def get_backend_concurrency_limits_from_config(config_path: Optional[str] = None) -> Dict[str, int]:
+    """Get per-backend/provider in-flight overrides from [backend_concurrency.limits].
+
+    Keys are backend names ("codex") or "backend:provider" ("qwen:qwen-azure").
+
+    Args:
+        config_path: Optional explicit path to config.toml file.
+
+    Returns:
+        Mapping of key to in-flight limit (default: empty)
+    """
+    limits = _get_config_value(
+        section="backend_concurrency",
+        key="limits",
+        default={},
+        config_path=config_path,
+    )
+    return {str(key): int(value) for key, value in limits.items()} if isinstance(limits, dict) else {}
+
+
+def get_llm_hedging_enabled_from_config(config_path: Optional[str] = None) -> bool:
+    """Check if hedged no-edit execution is enabled via [llm_hedging].enabled in config.toml.
+
+    Args:
+        config_path: Optional explicit path to config.toml file.
+
+    Returns:
+        True if slow no-edit prompts are also sent to a second backend (default: False)
+    """
+    return _get_config_value(
+        section="llm_hedging",
+        key="enabled",
+        default=False,
+        config_path=config_path,
+        value_type=bool,
+    )
+
+
+def get_llm_hedging_percentile_from_config(config_path: Optional[str] = None) -> float:
+    """Get the latency percentile used as hedge deadline from [llm_hedging].percentile.
+
+    Args:
+        config_path: Optional explicit path to config.toml file.
+
+    Returns:
+        Percentile of recent no-edit latencies, between 0 and 1 (default: 0.9)
+    """
+    return _get_config_value(
+        section="llm_hedging",
+        key="percentile",
+        default=0.9,
+        config_path=config_path,
+        value_type=float,
+    )
+
+
+def get_llm_hedging_min_delay_seconds_from_config(config_path: Optional[str] = None) -> float:
+    """Get the lower bound of the hedge deadline from [llm_hedging].min_delay_seconds.
+
+    Args:
+        config_path: Optional explicit path to config.toml file.
+
+    Returns:
+        Minimum seconds to wait before hedging (default: 5.0)
+    """
+    return _get_config_value(
+        section="llm_hedging",
+        key="min_delay_seconds",
+        default=5.0,
+        config_path=config_path,
+        value_type=float,
+    )
+
+
+def get_llm_hedging_initial_delay_seconds_from_config(config_path: Optional[str] = None) -> float:
+    """Get the hedge deadline used before enough latencies are known from [llm_hedging].initial_delay_seconds.
+
+    Args:
+        config_path: Optional explicit path to config.toml file.
+
+    Returns:
+        Seconds to wait before hedging while the latency history is short (default: 30.0)
+    """
+    return _get_config_value(
+        section="llm_hedging",
+        key="initial_delay_seconds",
+        default=30.0,
+        config_path=config_path,
+        value_type=float,
+    )
+
+
+def get_prompt_budget_enabled_from_config(config_path: Optional[str] = None) -> bool:
+    """Check if token-budgeted prompt assembly is enabled via [prompt_budget].enabled in config.toml.
+
+    Args:
+        config_path: Optional explicit path to config.toml file.
+
+    Returns:
+        True if large prompt fields are compacted to a token budget (default: False)
+    """
+    return _get_config_value(
+        section="prompt_budget",
+        key="enabled",
+        default=False,
+        config_path=config_path,
+        value_type=bool,
+    )
+
+
+def get_prompt_budget_max_tokens_from_config(config_path: Optional[str] = None) -> int:
+    """Get the token budget shared by the variable prompt fields from [prompt_budget].max_tokens.
+
+    Args:
+        config_path: Optional explicit path to config.toml file.
+
+    Returns:
+        Token budget (default: 12000)
+    """
+    return _get_config_value(
+        section="prompt_budget",
+        key="max_tokens",
+        default=12000,
+        config_path=config_path,
+        value_type=int,
+    )
+
+
+def get_llm_session_pool_enabled_from_config(config_path: Optional[str] = None) -> bool:
+    """Check if persistent LLM CLI sessions are enabled via [llm_session_pool].enabled in config.toml.
+
+    Args:
+        config_path: Optional explicit path to config.toml file.
+
+    Returns:
+        True if fix loops keep one CLI process per item and backend (default: False)
+    """
+    return _get_config_value(
+        section="llm_session_pool",
+        key="enabled",
+        default=False,
+        config_path=config_path,
+        value_type=bool,
+    )
+
+
+def get_llm_session_pool_idle_timeout_seconds_from_config(config_path: Optional[str] = None) -> int:
+    """Get [llm_session_pool].idle_timeout_seconds from config.toml.
+
+    Args:
+        config_path: Optional explicit path to config.toml file.
+
+    Returns:
+        Seconds an unused session is kept before its process is recycled (default: 600)
+    """
+    return _get_config_value(
+        section="llm_session_pool",
+        key="idle_timeout_seconds",
+        default=600,
+        config_path=config_path,
+        value_type=int,
+    )
+
+
+def get_llm_session_pool_max_turns_from_config(config_path: Optional[str] = None) -> int:
+    """Get [llm_session_pool].max_turns from config.toml.
+
+    Args:
+        config_path: Optional explicit path to config.toml file.
+
+    Returns:
+        Turns after which a session is restarted to bound its context (default: 20)
+    """
+    return _get_config_value(
+        section="llm_session_pool",
+        key="max_turns",
+        default=20,
+        config_path=config_path,
+        value_type=int,
+    )
+
+
+def get_workflow_monitor_enabled_from_config(config_path: Optional[str] = None) -> bool:
+    """Check if the central workflow monitor is enabled via [workflow_monitor].enabled in config.toml.
+
+    Args:
+        config_path: Optional explicit path to config.toml file.
+
+    Returns:
+        True if dispatched CI runs are tracked by one service on the engine's event loop
+        instead of a thread per PR (default: False)
+    """
+    return _get_config_value(
+        section="workflow_monitor",
+        key="enabled",
+        default=False,
+        config_path=config_path,
+        value_type=bool,
+    )
+
+
+def get_workflow_monitor_poll_interval_seconds_from_config(config_path: Optional[str] = None) -> int:
+    """Get [workflow_monitor].poll_interval_seconds from config.toml.
+
+    Args:
+        config_path: Optional explicit path to config.toml file.
+
+    Returns:
+        Seconds between polls of pending workflow runs (default: 15)
+    """
+    return _get_config_value(
+        section="workflow_monitor",
+        key="poll_interval_seconds",
+        default=15,
+        config_path=config_path,
+        value_type=int,
+    )
+
+
+def get_conflict_scanner_enabled_from_config(config_path: Optional[str] = None) -> bool:
+    """Check if open PRs are scanned for conflicts via [conflict_scanner].enabled in config.toml.
+
+    Args:
+        config_path: Optional explicit path to config.toml file.
+
+    Returns:
+        True if candidate collection runs git merge-tree for every open PR (default: False)
+    """
+    return _get_config_value(
+        section="conflict_scanner",
+        key="enabled",
+        default=False,
+        config_path=config_path,
+        value_type=bool,
+    )
+
+
+def get_git_fetch_freshness_seconds_from_config(config_path: Optional[str] = None) -> int:
+    """Get [git_fetch].freshness_seconds from config.toml.
+
+    Args:
+        config_path: Optional explicit path to config.toml file.
+
+    Returns:
+        Seconds a fetched ref is considered current before it is fetched again; 0 disables (default: 10)
+    """
+    return _get_config_value(
+        section="git_fetch",
+        key="freshness_seconds",
+        default=10,
+        config_path=config_path,
+        value_type=int,
+    )
+
+
+def get_git_fetch_filter_from_config(config_path: Optional[str] = None) -> str:
+    """Get [git_fetch].filter from config.toml.
+
+    Args:
+        config_path: Optional explicit path to config.toml file.
+
+    Returns:
+        Partial clone filter passed to git fetch, e.g. "blob:none"; empty disables (default: "")
+    """
+    return _get_config_value(
+        section="git_fetch",
+        key="filter",
+        default="",
+        config_path=config_path,
+        value_type=str,
+    )
+
+
+def get_warm_restart_enabled_from_config(config_path: Optional[str] = None) -> bool:
+    """Check if auto-update restarts hand state over via [warm_restart].enabled in config.toml.
+
+    Args:
+        config_path: Optional explicit path to config.toml file.
+
+    Returns:
+        True if the work queue and caches are written before an auto-update
+        restart and restored by the restarted process (default: False)
+    """
+    return _get_config_value(
+        section="warm_restart",
+        key="enabled",
+        default=False,
+        config_path=config_path,
+        value_type=bool,
+    )
+
+
+def get_warm_restart_max_age_seconds_from_config(config_path: Optional[str] = None) -> int:
+    """Get [warm_restart].max_age_seconds from config.toml.
+
+    Args:
+        config_path: Optional explicit path to config.toml file.
+
+    Returns:
+        Oldest restart handoff, in seconds, that is still restored (default: 600)
+    """
+    return _get_config_value(
+        section="warm_restart",
+        key="max_age_seconds",
+        default=600,
+        config_path=config_path,
+        value_type=int,
+    )
+
+
+def get_merge_train_enabled_from_config(config_path: Optional[str] = None) -> bool:
+    """Check if green PRs are merged in batches via [merge_train].enabled in config.toml.
+
+    Args:
+        config_path: Optional explicit path to config.toml file.
+
+    Returns:
+        True if mergeable PRs with passing checks that target the same base are
+        tested together on one combined branch and merged in order (default: False)
+    """
+    return _get_config_value(
+        section="merge_train",
+        key="enabled",
+        default=False,
+        config_path=config_path,
+        value_type=bool,
+    )
+
+
+def get_merge_train_max_size_from_config(config_path: Optional[str] = None) -> int:
+    """Get [merge_train].max_size from config.toml.
+
+    Args:
+        config_path: Optional explicit path to config.toml file.
+
+    Returns:
+        Most PRs tested together in one merge train (default: 8)
+    """
+    return _get_config_value(
+        section="merge_train",
+        key="max_size",
+        default=8,
+        config_path=config_path,
+        value_type=int,
+    )
+
+
+def get_merge_train_ci_timeout_seconds_from_config(config_path: Optional[str] = None) -> int:
+    """Get [merge_train].ci_timeout_seconds from config.toml.
+
+    Args:
+        config_path: Optional explicit path to config.toml file.
+
+    Returns:
+        How long, in seconds, to wait for CI on a merge train branch before the
+        PRs are left to be merged one by one (default: 3600)
+    """
+    return _get_config_value(
+        section="merge_train",
+        key="ci_timeout_seconds",
+        default=3600,
+        config_path=config_path,
+        value_type=int,
+    )
+
+
 def get_issue_allowlist_from_config(config_path: Optional[str] = None) -> Optional[List[int]]:
     """Get the issue author allowlist from config.toml [github].issue_allowlist.
 
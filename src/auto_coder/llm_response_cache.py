@@ -0,0 +1,203 @@
+"""On-disk response cache for no-edit LLM calls.
+
+Commit messages, PR messages and mergeability checks are frequently re-requested
+with an identical prompt when an item is reprocessed unchanged across poll
+cycles. Every prompt run on the no-edit backend manager through
+backend_manager.run_noedit_prompt_with goes through the cache; calls that edit
+the working tree are never cached. Responses are cached in a size-bounded SQLite database keyed by
+backend, model, prompt hash and client options, and expire after a TTL.
+
+The cache is opt-in via [llm_response_cache].enabled in config.toml and can be
+bypassed for a block of code with bypass_llm_response_cache() or for a whole
+process with AUTO_CODER_NO_LLM_CACHE=1.
+"""
+
+import contextlib
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+
+from .logger_config import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_TTL_SECONDS = 24 * 60 * 60
+DEFAULT_MAX_MB = 64
+
+_bypass = threading.local()
+
+
+def get_llm_response_cache_path() -> Path:
+    """Return the path of the response cache database (~/.auto-coder/llm_response_cache.sqlite3)."""
+    return Path.home() / ".auto-coder" / "llm_response_cache.sqlite3"
+
+
+def make_cache_key(backend: Optional[str], model: Optional[str], prompt: str, options: Any = None) -> str:
+    """Build the cache key for a rendered prompt sent to a backend/model with options."""
+    prompt_hash = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+    material = json.dumps([backend, model, prompt_hash, options], sort_keys=True, default=str)
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+@contextlib.contextmanager
+def bypass_llm_response_cache() -> Iterator[None]:
+    """Skip the response cache for no-edit calls made by this thread inside the block."""
+    previous = getattr(_bypass, "active", False)
+    _bypass.active = True
+    try:
+        yield
+    finally:
+        _bypass.active = previous
+
+
+def is_cache_bypassed() -> bool:
+    """Return True if the cache is bypassed for the calling thread or the whole process."""
+    return getattr(_bypass, "active", False) or os.environ.get("AUTO_CODER_NO_LLM_CACHE", "").lower() in ("1", "true")
+
+
+class LLMResponseCache:
+    """Size-bounded, TTL-expiring SQLite cache of LLM responses."""
+
+    _instance: Optional["LLMResponseCache"] = None
+    _instance_lock = threading.Lock()
+
+    def __init__(
+        self,
+        db_path: Optional[Path] = None,
+        ttl_seconds: int = DEFAULT_TTL_SECONDS,
+        max_bytes: int = DEFAULT_MAX_MB * 1024 * 1024,
+    ):
+        self.db_path = db_path or get_llm_response_cache_path()
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, response TEXT NOT NULL, size INTEGER NOT NULL, created_at REAL NOT NULL, accessed_at REAL NOT NULL)")
+
+    @classmethod
+    def get_instance(cls) -> "LLMResponseCache":
+        """Return the process-wide response cache configured from config.toml."""
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    from .llm_backend_config import get_llm_response_cache_max_mb_from_config, get_llm_response_cache_ttl_seconds_from_config
+
+                    cls._instance = cls(
+                        ttl_seconds=get_llm_response_cache_ttl_seconds_from_config(),
+                        max_bytes=get_llm_response_cache_max_mb_from_config() * 1024 * 1024,
+                    )
+        return cls._instance
+
+    @classmethod
+    def reset_instance(cls) -> None:
+        """Drop the singleton (used by tests)."""
+        with cls._instance_lock:
+            cls._instance = None
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(str(self.db_path), timeout=10)
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response for key, or None on a miss, expired entry or database error."""
+        now = time.time()
+        try:
+            conn = self._connect()
+            try:
+                with conn:
+                    row = conn.execute("SELECT response, created_at FROM responses WHERE key = ?", (key,)).fetchone()
+                    if row is not None and now - row[1] > self.ttl_seconds:
+                        conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                        row = None
+                    if row is not None:
+                        conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            # A locked or corrupt cache must not fail the call; it just runs uncached
+            logger.debug(f"LLM response cache lookup failed: {e}")
+            row = None
+
+        with self._lock:
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return row[0]  # type: ignore[no-any-return]
+
+    def put(self, key: str, response: str) -> None:
+        """Store a response, evicting least recently used entries beyond max_bytes.
+
+        Database errors are logged and otherwise ignored.
+        """
+        size = len(response.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        now = time.time()
+        try:
+            conn = self._connect()
+            try:
+                with conn:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO responses (key, response, size, created_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                        (key, response, size, now, now),
+                    )
+                    total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+                    if total > self.max_bytes:
+                        self._evict(conn, total - self.max_bytes)
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            logger.debug(f"LLM response cache store failed: {e}")
+
+    def _evict(self, conn: sqlite3.Connection, excess: int) -> None:
+        freed = 0
+        for key, size in conn.execute("SELECT key, size FROM responses ORDER BY accessed_at ASC").fetchall():
+            if freed >= excess:
+                break
+            conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            freed += size
+            with self._lock:
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Remove every cached response."""
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute("DELETE FROM responses")
+        finally:
+            conn.close()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and the hit rate for this process."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+def get_llm_response_cache() -> Optional[LLMResponseCache]:
+    """Return the response cache, or None when disabled in config or bypassed."""
+    from .llm_backend_config import get_llm_response_cache_enabled_from_config
+
+    if is_cache_bypassed() or not get_llm_response_cache_enabled_from_config():
+        return None
+    try:
+        return LLMResponseCache.get_instance()
+    except Exception as e:
+        logger.warning(f"LLM response cache unavailable: {e}")
+        return None
@@ -0,0 +1,325 @@
+"""Persistent LLM CLI sessions for multi-turn fix loops.
+
+Each fix_to_pass_tests attempt used to launch a fresh CLI process with the full
+prompt, paying process startup, authentication and context ingestion on every
+iteration. With the session pool enabled, a client that supports a streaming
+JSON protocol (currently the claude CLI with --input-format stream-json) keeps
+one process per worker thread, item and backend. The first turn sends the full
+prompt; later turns send only the follow-up registered with
+session_followup() (e.g. the new test failures). Sessions are recycled when the
+item finishes (the llm_session_scope exits), after max_turns turns, or when
+idle for longer than idle_timeout_seconds.
+
+The pool is opt-in via [llm_session_pool].enabled in config.toml.
+"""
+
+import atexit
+import contextlib
+import functools
+import json
+import os
+import queue
+import subprocess
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, TypeVar, cast
+
+from .exceptions import AutoCoderTimeoutError
+from .logger_config import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_IDLE_TIMEOUT_SECONDS = 600
+DEFAULT_MAX_TURNS = 20
+DEFAULT_TURN_TIMEOUT_SECONDS = 1800
+
+_scope = threading.local()
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+class StreamJSONSession:
+    """One long-lived CLI process speaking newline-delimited stream JSON."""
+
+    def __init__(self, command: List[str], env: Optional[Dict[str, str]] = None, cwd: Optional[str] = None):
+        self.command = command
+        self.turns = 0
+        self.session_id: Optional[str] = None
+        self.last_used = time.monotonic()
+        self._lines: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._stderr: List[str] = []
+        self.process = subprocess.Popen(
+            command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            bufsize=1,
+            env=env,
+            cwd=cwd,
+        )
+        threading.Thread(target=self._read_stdout, name="LLMSession-stdout", daemon=True).start()
+        threading.Thread(target=self._read_stderr, name="LLMSession-stderr", daemon=True).start()
+
+    def _read_stdout(self) -> None:
+        assert self.process.stdout is not None
+        for line in self.process.stdout:
+            self._lines.put(line)
+        self._lines.put(None)
+
+    def _read_stderr(self) -> None:
+        assert self.process.stderr is not None
+        for line in self.process.stderr:
+            # Keep the tail only; it is reported when the process dies
+            self._stderr.append(line)
+            del self._stderr[:-50]
+
+    def is_alive(self) -> bool:
+        return self.process.poll() is None
+
+    def send(self, prompt: str, timeout: float = DEFAULT_TURN_TIMEOUT_SECONDS) -> str:
+        """Send one user turn and return the text of the final result message.
+
+        Raises:
+            AutoCoderTimeoutError: If no output arrives for timeout seconds
+            RuntimeError: If the process exits or reports an error
+        """
+        if not self.is_alive() or self.process.stdin is None:
+            raise RuntimeError("LLM session process is not running")
+        message = {"type": "user", "message": {"role": "user", "content": [{"type": "text", "text": prompt}]}}
+        self.process.stdin.write(json.dumps(message) + "\n")
+        self.process.stdin.flush()
+        self.turns += 1
+        self.last_used = time.monotonic()
+
+        while True:
+            try:
+                line = self._lines.get(timeout=timeout)
+            except queue.Empty:
+                self.close()
+                raise AutoCoderTimeoutError(f"LLM session produced no output for {timeout}s")
+            if line is None:
+                raise RuntimeError(f"LLM session process exited with code {self.process.poll()}\n{''.join(self._stderr)}")
+            try:
+                event = json.loads(line)
+            except ValueError:
+                logger.debug(f"Ignoring non-JSON session output: {line.rstrip()}")
+                continue
+            if not isinstance(event, dict):
+                continue
+            self.session_id = event.get("session_id") or self.session_id
+            if event.get("type") != "result":
+                continue
+            self.last_used = time.monotonic()
+            result = str(event.get("result") or "")
+            if event.get("is_error") or event.get("subtype") not in (None, "success"):
+                raise RuntimeError(f"LLM session turn failed: {result or event.get('subtype')}")
+            return result
+
+    def close(self) -> None:
+        """Terminate the process."""
+        if self.process.poll() is not None:
+            return
+        try:
+            if self.process.stdin:
+                self.process.stdin.close()
+            self.process.terminate()
+            self.process.wait(timeout=5)
+        except Exception:
+            try:
+                self.process.kill()
+            except Exception:
+                pass
+
+
+SessionKey = Tuple[str, str, Tuple[str, ...]]
+
+
+class LLMSessionPool:
+    """Persistent CLI sessions keyed by session scope, backend and command."""
+
+    _instance: Optional["LLMSessionPool"] = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, idle_timeout_seconds: float = DEFAULT_IDLE_TIMEOUT_SECONDS, max_turns: int = DEFAULT_MAX_TURNS):
+        self.idle_timeout_seconds = idle_timeout_seconds
+        self.max_turns = max_turns
+        self.sessions_started = 0
+        self.turns_sent = 0
+        self._lock = threading.Lock()
+        self._sessions: Dict[SessionKey, StreamJSONSession] = {}
+
+    @classmethod
+    def get_instance(cls) -> "LLMSessionPool":
+        """Return the process-wide pool configured from config.toml."""
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    from .llm_backend_config import get_llm_session_pool_idle_timeout_seconds_from_config, get_llm_session_pool_max_turns_from_config
+
+                    cls._instance = cls(
+                        idle_timeout_seconds=get_llm_session_pool_idle_timeout_seconds_from_config(),
+                        max_turns=get_llm_session_pool_max_turns_from_config(),
+                    )
+        return cls._instance
+
+    @classmethod
+    def reset_instance(cls) -> None:
+        """Close every session and drop the singleton (used by tests)."""
+        with cls._instance_lock:
+            if cls._instance is not None:
+                cls._instance.close_all()
+            cls._instance = None
+
+    def _reap_idle(self) -> None:
+        now = time.monotonic()
+        with self._lock:
+            stale = [key for key, session in self._sessions.items() if not session.is_alive() or now - session.last_used > self.idle_timeout_seconds]
+            sessions = [self._sessions.pop(key) for key in stale]
+        for session in sessions:
+            session.close()
+
+    def run_turn(
+        self,
+        backend: str,
+        command: List[str],
+        prompt: str,
+        followup: Optional[str] = None,
+        env: Optional[Dict[str, str]] = None,
+        timeout: float = DEFAULT_TURN_TIMEOUT_SECONDS,
+    ) -> Tuple[str, Optional[str]]:
+        """Send a turn on the current scope's session for backend, starting it if needed.
+
+        Args:
+            backend: Backend name
+            command: CLI command that starts a stream-json session
+            prompt: Full prompt, used for the first turn of a session
+            followup: Shorter prompt used instead on later turns
+            env: Environment for a new process
+
+        Returns:
+            (response text, session id reported by the CLI)
+        """
+        scope = current_llm_session_scope()
+        if scope is None:
+            raise RuntimeError("run_turn() requires an active llm_session_scope")
+        self._reap_idle()
+        key: SessionKey = (scope, backend, tuple(command))
+        with self._lock:
+            session = self._sessions.get(key)
+            if session is not None and (not session.is_alive() or session.turns >= self.max_turns):
+                self._sessions.pop(key)
+                session.close()
+                session = None
+        if session is None:
+            logger.info(f"Starting persistent {backend} session")
+            session = StreamJSONSession(command, env=env, cwd=os.getcwd())
+            with self._lock:
+                self._sessions[key] = session
+                self.sessions_started += 1
+
+        text = followup if followup and session.turns > 0 else prompt
+        try:
+            response = session.send(text, timeout=timeout)
+        except Exception:
+            with self._lock:
+                self._sessions.pop(key, None)
+            session.close()
+            raise
+        with self._lock:
+            self.turns_sent += 1
+        return response, session.session_id
+
+    def release_scope(self, scope: str) -> None:
+        """Close every session opened under scope (the item is done)."""
+        with self._lock:
+            keys = [key for key in self._sessions if key[0] == scope]
+            sessions = [self._sessions.pop(key) for key in keys]
+        for session in sessions:
+            session.close()
+
+    def close_all(self) -> None:
+        """Close every session."""
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+        for session in sessions:
+            session.close()
+
+    def stats(self) -> Dict[str, int]:
+        """Return live session and turn counters."""
+        with self._lock:
+            return {"live_sessions": len(self._sessions), "sessions_started": self.sessions_started, "turns_sent": self.turns_sent}
+
+
+def current_llm_session_scope() -> Optional[str]:
+    """Return the session scope of the calling thread, if any."""
+    return getattr(_scope, "key", None)
+
+
+def current_session_followup() -> Optional[str]:
+    """Return the follow-up prompt registered by the caller for the next turn, if any."""
+    return getattr(_scope, "followup", None)
+
+
+@contextlib.contextmanager
+def llm_session_scope() -> Iterator[str]:
+    """Let LLM calls made by this thread inside the block share persistent sessions.
+
+    Sessions opened in the scope are closed when it exits. Nested scopes reuse
+    the outer one.
+    """
+    outer = current_llm_session_scope()
+    if outer is not None:
+        yield outer
+        return
+    key = f"{threading.get_ident()}:{uuid.uuid4().hex}"
+    _scope.key = key
+    try:
+        yield key
+    finally:
+        _scope.key = None
+        pool = LLMSessionPool._instance
+        if pool is not None:
+            pool.release_scope(key)
+
+
+def with_llm_session_scope(func: F) -> F:
+    """Decorator running func inside llm_session_scope()."""
+
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        with llm_session_scope():
+            return func(*args, **kwargs)
+
+    return cast(F, wrapper)
+
+
+@contextlib.contextmanager
+def session_followup(prompt: Optional[str]) -> Iterator[None]:
+    """Register a shorter prompt to send instead of the full one to an already primed session."""
+    previous = current_session_followup()
+    _scope.followup = prompt
+    try:
+        yield
+    finally:
+        _scope.followup = previous
+
+
+def get_llm_session_pool() -> Optional[LLMSessionPool]:
+    """Return the pool when [llm_session_pool].enabled is on and the thread is in a session scope."""
+    from .llm_backend_config import get_llm_session_pool_enabled_from_config
+
+    if current_llm_session_scope() is None or not get_llm_session_pool_enabled_from_config():
+        return None
+    return LLMSessionPool.get_instance()
+
+
+def _close_pool_at_exit() -> None:
+    pool = LLMSessionPool._instance
+    if pool is not None:
+        pool.close_all()
+
+
+atexit.register(_close_pool_at_exit)
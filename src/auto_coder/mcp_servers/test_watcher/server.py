@@ -2,9 +2,13 @@
 Test Watcher MCP Server - Provides continuous test monitoring via MCP.
 """
 
+import asyncio
+import functools
 import os
+import threading
 
 from mcp.server.fastmcp import FastMCP
+from pydantic import AnyUrl
 from test_watcher_tool import TestWatcherTool
 
 # Create an MCP server
@@ -15,6 +19,57 @@ mcp = FastMCP("Test Watcher", dependencies=["loguru"])
 project_root = os.getenv("TEST_WATCHER_PROJECT_ROOT")
 test_watcher = TestWatcherTool(project_root=project_root)
 
+STATUS_RESOURCE_URI = "test-watcher://status"
+
+# Sessions subscribed to test-watcher://status, with the event loop serving each
+_status_subscribers: dict = {}
+_status_subscribers_lock = threading.Lock()
+
+
+@mcp._mcp_server.subscribe_resource()
+async def subscribe_resource(uri: AnyUrl) -> None:
+    """Record a client session that wants to be notified when a test run finishes."""
+    if str(uri) == STATUS_RESOURCE_URI:
+        session = mcp._mcp_server.request_context.session
+        with _status_subscribers_lock:
+            _status_subscribers[session] = asyncio.get_running_loop()
+
+
+@mcp._mcp_server.unsubscribe_resource()
+async def unsubscribe_resource(uri: AnyUrl) -> None:
+    """Stop notifying a client session about finished test runs."""
+    if str(uri) == STATUS_RESOURCE_URI:
+        _drop_status_subscriber(mcp._mcp_server.request_context.session)
+
+
+def _drop_status_subscriber(session) -> None:
+    with _status_subscribers_lock:
+        _status_subscribers.pop(session, None)
+
+
+def _notify_status_subscribers() -> None:
+    """Send resources/updated to subscribed clients (called from the test runner thread).
+
+    Sessions whose loop has closed, or whose send fails (the client went away),
+    are dropped.
+    """
+    with _status_subscribers_lock:
+        subscribers = list(_status_subscribers.items())
+    for session, loop in subscribers:
+        if loop.is_closed():
+            _drop_status_subscriber(session)
+            continue
+        future = asyncio.run_coroutine_threadsafe(session.send_resource_updated(AnyUrl(STATUS_RESOURCE_URI)), loop)
+        future.add_done_callback(functools.partial(_drop_if_send_failed, session))
+
+
+def _drop_if_send_failed(session, future) -> None:
+    if future.cancelled() or future.exception() is not None:
+        _drop_status_subscriber(session)
+
+
+test_watcher.add_result_listener(_notify_status_subscribers)
+
 
 @mcp.tool()
 def start_watching() -> dict:
@@ -167,7 +222,7 @@ without requiring manual test execution.
 
 ## Available Resources
 
-1. **test-watcher://status** - Overall status and test results
+1. **test-watcher://status** - Overall status and test results (subscribe to be notified when a test run finishes)
 2. **test-watcher://help** - This help text
 
 ## Usage Example
@@ -209,3 +264,7 @@ stop_watching()
 - Playwright installed: `npm install -D @playwright/test`
 - Python packages: watchdog, pathspec
 """
+
+
+if __name__ == "__main__":
+    mcp.run()
@@ -4,18 +4,22 @@ Test Watcher Tool - Manages continuous test execution and result collection.
 
 import json
 import os
+import re
 import subprocess
 import threading
 import time
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional, Set
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 
 import pathspec
 from loguru import logger
 from watchdog.events import FileSystemEvent, FileSystemEventHandler
 from watchdog.observers import Observer
 
+# Playwright's spec naming convention (e2e/login.spec.ts, checkout.spec.mjs, ...)
+SPEC_FILE_RE = re.compile(r"\.spec\.[cm]?[jt]sx?$")
+
 
 class GitIgnoreFileHandler(FileSystemEventHandler):
     """File system event handler that respects .gitignore patterns."""
@@ -107,6 +111,24 @@ class TestWatcherTool:
         # Flag to prevent file events during shutdown
         self._stopping = False
 
+        # Callbacks invoked after every Playwright run (e.g. MCP resource notifications)
+        self._result_listeners: List[Callable[[], None]] = []
+
+        # Run scheduler: file events are coalesced until no change arrives for
+        # quiet_seconds (or max_delay_seconds after the first one), then a single
+        # thread runs one Playwright job at a time. Changes arriving during a run
+        # are kept pending and trigger exactly one follow-up run.
+        self.quiet_seconds = float(os.environ.get("TEST_WATCHER_QUIET_SECONDS", "1.0"))
+        self.max_delay_seconds = float(os.environ.get("TEST_WATCHER_MAX_DELAY_SECONDS", "10.0"))
+        self._schedule_cond = threading.Condition()
+        self._pending_changes: Set[str] = set()
+        self._first_change_at: Optional[float] = None
+        self._last_change_at = 0.0
+        self._full_run_requested = False
+        self._scheduler_thread: Optional[threading.Thread] = None
+        self._scheduler_stop = False
+        self._spec_imports: Dict[str, Tuple[float, str]] = {}
+
         try:
             logger.info(f"TestWatcherTool initialized with project root: {self.project_root}")
         except Exception:
@@ -196,6 +218,7 @@ class TestWatcherTool:
 
             # Set a flag to prevent new file events from processing
             self._stopping = True  # type: ignore[unreachable]
+            self._stop_scheduler()
 
             try:
                 self.observer.stop()
@@ -256,24 +279,154 @@ class TestWatcherTool:
                 pass
             return
 
-        # Normal path with logging and background threads
+        # Normal path: hand the change to the run scheduler
         try:
-            logger.info(f"File changed: {file_path}")
+            logger.debug(f"File changed: {file_path}")
         except Exception:
             # Silently ignore logging errors during shutdown
             pass
 
-        # Trigger Playwright test run
         try:
-            threading.Thread(
-                target=self._run_playwright_tests,
-                args=(True,),  # last_failed=True
-                daemon=True,
-            ).start()
+            self._schedule_run(file_path)
         except Exception:
             # Silently ignore thread creation errors during shutdown
             pass
 
+    def _schedule_run(self, file_path: Optional[str] = None, full: bool = False) -> None:
+        """
+        Queue a test run for a changed file (or a full-suite run).
+
+        Args:
+            file_path: Changed file, coalesced with other pending changes
+            full: Request a run of the whole suite
+        """
+        with self._schedule_cond:
+            now = time.monotonic()
+            if file_path is not None:
+                self._pending_changes.add(file_path)
+            self._full_run_requested = self._full_run_requested or full
+            if self._first_change_at is None:
+                self._first_change_at = now
+            self._last_change_at = now
+            self._schedule_cond.notify_all()
+
+            if self._scheduler_thread is None or not self._scheduler_thread.is_alive():
+                self._scheduler_stop = False
+                self._scheduler_thread = threading.Thread(target=self._scheduler_loop, name="test-watcher-scheduler", daemon=True)
+                self._scheduler_thread.start()
+
+    def _next_batch(self) -> Optional[Tuple[List[str], bool]]:
+        """
+        Block until a batch of changes has settled.
+
+        Returns:
+            (changed files, full run requested), or None when the scheduler is stopping
+        """
+        with self._schedule_cond:
+            while True:
+                if self._scheduler_stop:
+                    return None
+                if self._first_change_at is None:
+                    self._schedule_cond.wait()
+                    continue
+                deadline = min(self._last_change_at + self.quiet_seconds, self._first_change_at + self.max_delay_seconds)
+                remaining = deadline - time.monotonic()
+                if remaining > 0:
+                    self._schedule_cond.wait(remaining)
+                    continue
+                changes = sorted(self._pending_changes)
+                full = self._full_run_requested
+                self._pending_changes.clear()
+                self._full_run_requested = False
+                self._first_change_at = None
+                return changes, full
+
+    def _scheduler_loop(self) -> None:
+        """Body of the scheduler thread: run one Playwright job per settled batch."""
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            changes, full = batch
+            try:
+                if full:
+                    logger.info("Running full Playwright suite")
+                    self._run_playwright_tests(False)
+                    continue
+                spec_files = self._affected_spec_files(changes)
+                logger.info(f"{len(changes)} file change(s) settled; running {'affected specs ' + ', '.join(spec_files) if spec_files else 'Playwright tests'}")
+                self._run_playwright_tests(True, spec_files=spec_files)
+            except Exception as e:
+                try:
+                    logger.error(f"Scheduled Playwright run failed: {e}")
+                except Exception:
+                    pass
+
+    def _stop_scheduler(self) -> None:
+        """Stop the scheduler thread and drop pending changes."""
+        with self._schedule_cond:
+            self._scheduler_stop = True
+            self._pending_changes.clear()
+            self._full_run_requested = False
+            self._first_change_at = None
+            self._schedule_cond.notify_all()
+
+    def _find_spec_files(self) -> List[str]:
+        """Return Playwright spec files (``*.spec.*``) relative to the project root."""
+        specs: List[str] = []
+        for dirpath, dirnames, filenames in os.walk(self.project_root):
+            rel_dir = os.path.relpath(dirpath, self.project_root)
+            rel_dir = "" if rel_dir == "." else rel_dir + "/"
+            dirnames[:] = [d for d in dirnames if not self.gitignore_spec.match_file(f"{rel_dir}{d}/")]
+            for name in filenames:
+                if SPEC_FILE_RE.search(name) and not self.gitignore_spec.match_file(rel_dir + name):
+                    specs.append(rel_dir + name)
+        return specs
+
+    def _spec_references(self, spec: str, module: str) -> bool:
+        """Return True when spec imports or otherwise names module (cached by mtime)."""
+        path = self.project_root / spec
+        try:
+            mtime = path.stat().st_mtime
+            cached = self._spec_imports.get(spec)
+            if cached is None or cached[0] != mtime:
+                cached = (mtime, path.read_text(encoding="utf-8", errors="ignore"))
+                self._spec_imports[spec] = cached
+        except OSError:
+            return False
+        return re.search(rf"""[/'"]{re.escape(module)}(\.[cm]?[jt]sx?)?['"]""", cached[1]) is not None
+
+    def _affected_spec_files(self, changed_files: List[str]) -> Optional[List[str]]:
+        """
+        Map changed files to the spec files that exercise them.
+
+        A changed spec maps to itself; another file maps to specs named after it
+        (``login.ts`` -> ``login.spec.ts``) or importing it.
+
+        Returns:
+            Sorted spec paths relative to the project root, or None when some change
+            cannot be attributed (shared config, assets...) and the broader run is needed
+        """
+        specs = self._find_spec_files()
+        affected: Set[str] = set()
+        for file_path in changed_files:
+            try:
+                rel = Path(file_path).resolve().relative_to(self.project_root.resolve()).as_posix() if os.path.isabs(file_path) else Path(file_path).as_posix()
+            except ValueError:
+                return None
+            if SPEC_FILE_RE.search(os.path.basename(rel)):
+                affected.add(rel)
+                continue
+            name = os.path.basename(rel)
+            module = name.split(".", 1)[0]
+            if module == "index":
+                module = os.path.basename(os.path.dirname(rel)) or module
+            matches = {spec for spec in specs if os.path.basename(spec).split(".", 1)[0] == module or self._spec_references(spec, module)}
+            if not matches:
+                return None
+            affected |= matches
+        return sorted(affected)
+
     def _enhanced_debounce_files(self, files: List[str]) -> List[str]:
         """
         Enhanced debouncing that groups related file changes.
@@ -312,12 +465,33 @@ class TestWatcherTool:
         logger.debug(f"Enhanced debouncing: {len(files)} files -> {len(representative_files)} representative files")
         return representative_files
 
-    def _run_playwright_tests(self, last_failed: bool = False) -> None:
+    def add_result_listener(self, callback: Callable[[], None]) -> None:
+        """
+        Register a callback invoked whenever a test run finishes.
+
+        Args:
+            callback: Called with no arguments from the test runner thread
+        """
+        self._result_listeners.append(callback)
+
+    def _notify_result_listeners(self) -> None:
+        for callback in list(self._result_listeners):
+            try:
+                callback()
+            except Exception as e:
+                try:
+                    logger.warning(f"Test result listener failed: {e}")
+                except Exception:
+                    pass
+
+    def _run_playwright_tests(self, last_failed: bool = False, spec_files: Optional[List[str]] = None) -> None:
         """
         Run Playwright tests (one-shot execution).
 
         Args:
             last_failed: Whether to run only last failed tests
+            spec_files: Spec files affected by the latest changes, run together
+                with the last failed tests
         """
         with self.lock:
             # Kill existing Playwright process if running
@@ -383,10 +557,11 @@ class TestWatcherTool:
             # Build command
             cmd = ["npx", "playwright", "test", "--reporter=json"]
 
-            if last_failed and self.last_failed_tests:
+            targets = set(spec_files or [])
+            if last_failed:
                 # Add specific test files that failed
-                for test_file in self.last_failed_tests:
-                    cmd.append(test_file)
+                targets |= self.last_failed_tests
+            cmd.extend(sorted(targets))
 
             logger.info(f"Running Playwright tests: {' '.join(cmd)}")
 
@@ -427,7 +602,7 @@ class TestWatcherTool:
                     logger.info("All failed tests passed, running full test suite")
                     self.last_failed_tests.clear()
                     # Schedule full test run
-                    threading.Thread(target=self._run_playwright_tests, args=(False,), daemon=True).start()
+                    self._schedule_run(full=True)
                 elif report["failed"] > 0:
                     # Update failed tests list
                     self.last_failed_tests = {test["file"] for test in report["tests"] if test["status"] == "failed"}
@@ -447,6 +622,8 @@ class TestWatcherTool:
                     "tests": [],
                 }
                 self.playwright_process = None
+        finally:
+            self._notify_result_listeners()
 
     def _parse_playwright_json_report(self, json_output: str) -> Dict[str, Any]:
         """
@@ -669,6 +846,7 @@ class TestWatcherTool:
             return {
                 "file_watcher_running": self.observer is not None,
                 "playwright_running": (self.playwright_process is not None and self.playwright_process.poll() is None),
+                "pending_changes": len(self._pending_changes),
                 "project_root": str(self.project_root),
                 "test_results": {
                     "unit": {
@@ -0,0 +1,589 @@
+"""Batched merging of green PRs that target the same base branch.
+
+_merge_pr merges PRs one at a time. After each merge every other open PR is
+behind its base, so it is updated and retested on its own before it can be
+merged in turn. On repositories with many small (often generated) PRs that
+serializes the queue on CI. A merge train lands a group of mergeable PRs with
+passing checks at once:
+
+1. The PRs are merged one after another onto the current base tip entirely in
+   the object database (git merge-tree --write-tree and git commit-tree), so
+   the working tree is never touched. A PR that conflicts with the train so
+   far is left out.
+2. The combined commit is pushed to auto-coder/merge-train/<base> and CI runs
+   once for the whole batch.
+3. If CI passes, the PRs are merged through the API in train order, each
+   pinned to the head SHA that was tested.
+4. If CI fails, the train is split in half and each half is retried on the
+   then-current base, until the failing PRs are isolated.
+
+Only one train per base branch is in flight at a time (MergeTrainYard), so
+train branches and refs are never shared. While CI runs, the train is parked
+in the yard and the worker and PR labels are released; the yard polls CI on
+the engine's event loop and the engine re-queues the train once CI finishes.
+Without a running yard (single runs), the train waits for CI in-line.
+
+Merging PR 2..N after PR 1 requires that branch protection does not demand
+branches be up to date, so no train is formed into a base that does
+(requires_up_to_date_branches); when GitHub refuses a merge anyway the
+remaining PRs are left for the regular one-by-one flow.
+
+Merge trains are opt-in via [merge_train].enabled in config.toml.
+"""
+
+import asyncio
+import threading
+import time
+from contextlib import ExitStack
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+from .automation_config import AutomationConfig, MergeTrainResult
+from .git_fetch import git_fetch
+from .label_manager import LabelManager
+from .logger_config import get_logger
+from .trace_logger import get_trace_logger
+from .utils import CommandExecutor, log_action
+
+logger = get_logger(__name__)
+cmd = CommandExecutor()
+
+TRAIN_BRANCH_PREFIX = "auto-coder/merge-train"
+TRAIN_REF_PREFIX = "refs/auto-coder/merge-train"
+MIN_TRAIN_SIZE = 2
+DEFAULT_MAX_TRAIN_SIZE = 8
+# Same workflow _handle_pr_merge dispatches when a PR has no checks
+DEFAULT_CI_WORKFLOW = "ci.yml"
+DEFAULT_CI_TIMEOUT_SECONDS = 3600
+CI_POLL_INTERVAL_SECONDS = 30
+# How long to wait for push-triggered runs before dispatching the CI workflow
+CI_START_GRACE_SECONDS = 90
+
+
+def train_branch_name(base_branch: str) -> str:
+    return f"{TRAIN_BRANCH_PREFIX}/{base_branch}"
+
+
+def _base_branch(pr_data: Dict[str, Any]) -> Optional[str]:
+    return pr_data.get("base_branch") or (pr_data.get("base") or {}).get("ref")
+
+
+def _numbers(prs: Sequence[Dict[str, Any]]) -> str:
+    return ", ".join(f"#{pr['number']}" for pr in prs)
+
+
+def _label_names(pr_data: Dict[str, Any]) -> List[str]:
+    return [label.get("name", "") if isinstance(label, dict) else str(label) for label in pr_data.get("labels") or []]
+
+
+def requires_up_to_date_branches(github_client: Any, repo_name: str, base_branch: str) -> bool:
+    """Whether branch protection of base_branch requires PR branches to be up to date before merging.
+
+    Read through the repository metadata cache; an unreadable protection counts as not required.
+    """
+    try:
+        protection = github_client.repo_metadata.get_branch_protection(repo_name, base_branch)
+    except Exception as e:
+        logger.debug(f"Could not read branch protection of {base_branch}: {e}")
+        return False
+    if not isinstance(protection, dict):
+        return False
+    checks = protection.get("required_status_checks")
+    return isinstance(checks, dict) and bool(checks.get("strict"))
+
+
+def plan_merge_trains(prs: Sequence[Dict[str, Any]], max_size: int = DEFAULT_MAX_TRAIN_SIZE) -> List[List[Dict[str, Any]]]:
+    """Group green, mergeable PRs into at most one train per base branch.
+
+    PRs are ordered oldest first within a base and the oldest max_size form the
+    train; the rest wait for a later train, since trains into the same base
+    would each be tested without the other's PRs. Trains with fewer than
+    MIN_TRAIN_SIZE PRs are not returned: a single PR gains nothing from a train.
+
+    Args:
+        prs: PR data of PRs that are mergeable and whose checks passed
+        max_size: Most PRs per train
+
+    Returns:
+        Trains, each a list of PR data in merge order
+    """
+    by_base: Dict[str, List[Dict[str, Any]]] = {}
+    for pr in prs:
+        base = _base_branch(pr)
+        if base and isinstance(pr.get("number"), int) and (pr.get("head") or {}).get("sha"):
+            by_base.setdefault(base, []).append(pr)
+
+    trains: List[List[Dict[str, Any]]] = []
+    size = max(MIN_TRAIN_SIZE, max_size)
+    for base in sorted(by_base):
+        train = sorted(by_base[base], key=lambda pr: (pr.get("created_at") or "", pr["number"]))[:size]
+        if len(train) >= MIN_TRAIN_SIZE:
+            trains.append(train)
+    return trains
+
+
+@dataclass
+class TrainCI:
+    """CI run of a pushed train branch that the train is waiting on."""
+
+    tip: str
+    riders: List[Dict[str, Any]]
+    pushed_at: float
+    dispatched: bool = False
+    # "success", "failure", "timeout" or "error" once CI finished
+    outcome: Optional[str] = None
+
+
+class MergeTrain:
+    """Tests a batch of PRs on one combined branch and merges them in order."""
+
+    def __init__(
+        self,
+        repo_name: str,
+        base_branch: str,
+        config: AutomationConfig,
+        github_client: Any,
+        ci_workflow: str = DEFAULT_CI_WORKFLOW,
+        ci_timeout_seconds: float = DEFAULT_CI_TIMEOUT_SECONDS,
+        poll_interval_seconds: float = CI_POLL_INTERVAL_SECONDS,
+        cwd: Optional[str] = None,
+    ):
+        self.repo_name = repo_name
+        self.base_branch = base_branch
+        self.config = config
+        self.github = github_client
+        self.ci_workflow = ci_workflow
+        self.ci_timeout_seconds = ci_timeout_seconds
+        self.poll_interval_seconds = poll_interval_seconds
+        self.cwd = cwd
+        self.branch = train_branch_name(base_branch)
+        self.result = MergeTrainResult()
+        self.ci: Optional[TrainCI] = None
+        # Batches still to be tested, in order, with whether they came from bisecting
+        self._legs: List[Tuple[List[Dict[str, Any]], bool]] = []
+        self._labels: Dict[int, Any] = {}
+        self._refs: Set[str] = set()
+
+    @property
+    def key(self) -> str:
+        return f"{self.repo_name}:{self.base_branch}"
+
+    @property
+    def prs(self) -> List[Dict[str, Any]]:
+        """PRs still riding the train: the ones under CI, then the ones waiting to be tested."""
+        riding = list(self.ci.riders) if self.ci else []
+        for leg, _ in self._legs:
+            riding.extend(leg)
+        return riding
+
+    def _git(self, *args: str) -> Any:
+        return cmd.run_command(["git", *args], cwd=self.cwd)
+
+    def _action(self, message: str) -> None:
+        logger.info(message)
+        self.result.actions.append(message)
+
+    def run(self, prs: Sequence[Dict[str, Any]]) -> MergeTrainResult:
+        """Land prs: build the train, run CI once, merge on green, bisect on red.
+
+        Returns early with the train parked in the yard while CI runs, if the
+        yard is running; resume() continues once CI finished.
+        """
+        numbers = _numbers(prs)
+        self._action(f"Starting merge train for {self.base_branch}: {numbers}")
+        get_trace_logger().log("Merge Train", f"Starting merge train for {self.base_branch}: {numbers}", details={"base": self.base_branch, "prs": [pr["number"] for pr in prs]})
+
+        yard = MergeTrainYard.get_instance()
+        if not yard.claim(self):
+            self.result.deferred.extend(pr["number"] for pr in prs)
+            self._action(f"A merge train into {self.base_branch} is already in flight; leaving {numbers} for later")
+            return self.result
+        self._legs = [([pr for pr in prs if self._is_rideable(pr)], False)]
+        return self._advance(yard)
+
+    def resume(self) -> MergeTrainResult:
+        """Continue a parked train after the yard saw its CI run finish."""
+        self.result.actions = []
+        return self._advance(MergeTrainYard.get_instance())
+
+    def _advance(self, yard: "MergeTrainYard") -> MergeTrainResult:
+        """Test and land the pending batches until CI has to be waited on or nothing is left."""
+        parked = False
+        try:
+            with ExitStack() as labels:
+                self._take_labels(labels)
+                while self.ci is not None or self._legs:
+                    if self.ci is None:
+                        prs, bisecting = self._legs.pop(0)
+                        self._start(prs, bisecting)
+                        continue
+                    if self.ci.outcome is None:
+                        self.ci.outcome = self.check_ci()
+                    if self.ci.outcome is not None:
+                        self._finish()
+                    elif yard.running:
+                        # Leaving the with block releases the labels along with the worker
+                        parked = True
+                        yard.park(self)
+                        self._action(f"Waiting for CI on {self.branch} ({self.ci.tip[:8]}); the train resumes once it finishes")
+                        break
+                    else:
+                        time.sleep(self.poll_interval_seconds)
+        finally:
+            if not parked:
+                self._cleanup()
+                yard.release(self)
+                get_trace_logger().log("Merge Train", f"Merge train for {self.base_branch} finished", details={"merged": self.result.merged, "failed": self.result.failed, "deferred": self.result.deferred, "ci_runs": self.result.ci_runs})
+        return self.result
+
+    def _take_labels(self, labels: ExitStack) -> None:
+        """Hold the @auto-coder label on every PR riding the train, as the single-PR flow does."""
+        self._labels = {}
+        for pr in self.prs:
+            should_process = labels.enter_context(
+                LabelManager(self.github, self.repo_name, pr["number"], item_type="pr", config=self.config, check_labels=self.config.CHECK_LABELS, known_labels=pr.get("labels"))
+            )
+            if not should_process:
+                self._exclude(pr, "already being processed")
+                # A PR under CI stays in the tested batch; the merge stops short of it
+                self._legs = [([p for p in leg if p["number"] != pr["number"]], bisecting) for leg, bisecting in self._legs]
+                continue
+            self._labels[pr["number"]] = should_process
+
+    def _exclude(self, pr: Dict[str, Any], reason: str) -> None:
+        self.result.excluded.append(pr["number"])
+        self._action(f"Left PR #{pr['number']} out of the merge train ({reason})")
+
+    def _is_rideable(self, pr: Dict[str, Any]) -> bool:
+        from .pr_processor import has_unresolved_review_threads
+
+        if "disable-auto-merge" in _label_names(pr):
+            self._exclude(pr, "'disable-auto-merge' label")
+            return False
+        if has_unresolved_review_threads(self.github, self.repo_name, pr["number"]):
+            self._exclude(pr, "unresolved review threads")
+            return False
+        return True
+
+    def _start(self, prs: List[Dict[str, Any]], bisecting: bool) -> None:
+        """Build prs on the current base and push them for CI."""
+        if not prs:
+            return
+        built = self._build(prs)
+        if built is None:
+            self.result.deferred.extend(pr["number"] for pr in prs)
+            return
+        tip, riders = built
+        if not riders:
+            return
+        if len(riders) < MIN_TRAIN_SIZE and not bisecting:
+            # Everything else was left out; a lone PR goes through the regular merge flow
+            self.result.deferred.extend(pr["number"] for pr in riders)
+            self._action(f"Merge train for {self.base_branch} is down to {_numbers(riders)}; leaving it for individual merging")
+            return
+        if not self._push(tip, riders):
+            self.result.deferred.extend(pr["number"] for pr in riders)
+            return
+        self.result.ci_runs += 1
+        self.ci = TrainCI(tip, riders, pushed_at=time.time())
+
+    def _finish(self) -> None:
+        """Act on the finished CI run: merge if green, otherwise bisect."""
+        assert self.ci is not None and self.ci.outcome is not None
+        status, riders = self.ci.outcome, self.ci.riders
+        self.ci = None
+        if status == "success":
+            self._merge_in_order(riders)
+        elif status == "failure":
+            if len(riders) == 1:
+                self.result.failed.append(riders[0]["number"])
+                self._action(f"PR #{riders[0]['number']} fails CI on top of {self.base_branch}; leaving it for fixing")
+                return
+            middle = len(riders) // 2
+            self._action(f"Merge train CI failed; bisecting into {_numbers(riders[:middle])} and {_numbers(riders[middle:])}")
+            self._legs[:0] = [(riders[:middle], True), (riders[middle:], True)]
+        else:
+            self.result.deferred.extend(pr["number"] for pr in riders)
+            self._action(f"Merge train CI {status}; leaving {_numbers(riders)} for individual merging")
+
+    def _build(self, prs: List[Dict[str, Any]]) -> Optional[Tuple[str, List[Dict[str, Any]]]]:
+        """Merge prs onto the base tip in the object database, without a checkout.
+
+        Returns:
+            (train tip SHA, PRs in the train), or None if the train could not be built
+        """
+        base_ref = f"{TRAIN_REF_PREFIX}/base/{self.base_branch}"
+        pr_refs = {pr["number"]: f"{TRAIN_REF_PREFIX}/pr/{pr['number']}" for pr in prs}
+        self._refs.update([base_ref, *pr_refs.values()])
+        refspecs = [f"+refs/heads/{self.base_branch}:{base_ref}"] + [f"+refs/pull/{number}/head:{ref}" for number, ref in pr_refs.items()]
+        # The base moves with every merge the train makes, so never reuse a recent fetch
+        fetch = git_fetch(refspecs, cwd=self.cwd, extra_args=["--no-tags", "--quiet"], force=True)
+        if not fetch.success:
+            self._action(f"Could not fetch the merge train refs: {fetch.stderr.strip()}")
+            return None
+        rev = self._git("rev-parse", base_ref)
+        if not rev.success:
+            self._action(f"Could not resolve {self.base_branch}: {rev.stderr.strip()}")
+            return None
+
+        tip = rev.stdout.strip()
+        riders: List[Dict[str, Any]] = []
+        for pr in prs:
+            head_sha = pr["head"]["sha"]
+            fetched = self._git("rev-parse", pr_refs[pr["number"]])
+            if not fetched.success or fetched.stdout.strip() != head_sha:
+                self.result.deferred.append(pr["number"])
+                self._action(f"PR #{pr['number']} changed since its checks passed; leaving it out of the merge train")
+                continue
+            merged = self._git("merge-tree", "--write-tree", "--no-messages", tip, head_sha)
+            if merged.returncode == 1:
+                self._exclude(pr, "conflicts with the PRs ahead of it")
+                continue
+            if not merged.success:
+                self._action(f"git merge-tree failed for PR #{pr['number']}: {(merged.stderr or merged.stdout).strip()}")
+                return None
+            tree = merged.stdout.splitlines()[0].strip()
+            commit = self._git("commit-tree", tree, "-p", tip, "-p", head_sha, "-m", f"Merge train: PR #{pr['number']} into {self.base_branch}")
+            if not commit.success:
+                self._action(f"git commit-tree failed for PR #{pr['number']}: {commit.stderr.strip()}")
+                return None
+            tip = commit.stdout.strip()
+            riders.append(pr)
+        return tip, riders
+
+    def _push(self, tip: str, riders: List[Dict[str, Any]]) -> bool:
+        push = self._git("push", "--force", "--quiet", "origin", f"{tip}:refs/heads/{self.branch}")
+        if not push.success:
+            self._action(f"Could not push {self.branch}: {push.stderr.strip()}")
+            return False
+        self._action(f"Pushed {self.branch} ({tip[:8]}) with {_numbers(riders)}")
+        return True
+
+    def check_ci(self) -> Optional[str]:
+        """Check the CI run on the train branch once, without waiting.
+
+        Dispatches the CI workflow when no push-triggered run has started
+        within CI_START_GRACE_SECONDS.
+
+        Returns:
+            "success", "failure", "timeout" or "error", or None while CI is still running
+        """
+        from .util.github_action import _check_github_actions_status, trigger_workflow_dispatch
+
+        ci = self.ci
+        if ci is None:
+            return None
+        # Stand-in PR data so the PR check helpers look at the train tip
+        train_data = {"number": ci.riders[0]["number"], "head": {"sha": ci.tip, "ref": self.branch}}
+        elapsed = time.time() - ci.pushed_at
+        status = _check_github_actions_status(self.repo_name, train_data, self.config)
+        if status.error:
+            self._action(f"Could not read CI status of {self.branch}: {status.error}")
+            return "error"
+        if status.ids and not status.in_progress:
+            outcome = "success" if status.success else "failure"
+            self._action(f"Merge train CI on {ci.tip[:8]}: {outcome}")
+            return outcome
+        if elapsed > self.ci_timeout_seconds:
+            return "timeout"
+        if not status.ids and not ci.dispatched and elapsed >= CI_START_GRACE_SECONDS:
+            # No push-triggered runs: start CI on the train branch explicitly
+            ci.dispatched = True
+            if not trigger_workflow_dispatch(self.repo_name, self.ci_workflow, self.branch):
+                return "error"
+            self._action(f"Triggered {self.ci_workflow} on {self.branch}")
+        return None
+
+    def _merge_in_order(self, riders: List[Dict[str, Any]]) -> None:
+        from .pr_processor import _archive_jules_session, _close_linked_issues
+        from .util.gh_cache import get_ghapi_client
+
+        api = get_ghapi_client(self.github.token)
+        owner, repo = self.repo_name.split("/")
+        method = self.config.MERGE_METHOD.replace("--", "")
+        for index, pr in enumerate(riders):
+            number = pr["number"]
+            if number not in self._labels:
+                rest = [p["number"] for p in riders[index:]]
+                self.result.deferred.extend(rest)
+                self._action(f"PR #{number} is being processed elsewhere; leaving {', '.join(f'#{n}' for n in rest)} for individual merging")
+                return
+            try:
+                # Pinned to the tested head: a push after the train was built makes GitHub refuse the merge
+                merged = bool(api.pulls.merge(owner, repo, number, merge_method=method, sha=pr["head"]["sha"]).get("merged"))
+            except Exception as e:
+                logger.warning(f"Merge train could not merge PR #{number}: {e}")
+                merged = False
+            if not merged:
+                rest = [p["number"] for p in riders[index:]]
+                self.result.deferred.extend(rest)
+                self._action(f"GitHub refused to merge PR #{number}; leaving {', '.join(f'#{n}' for n in rest)} for individual merging")
+                return
+            self.result.merged.append(number)
+            # Retain the label on a merged PR, as the single-PR merge does
+            self._labels[number].keep_label()
+            log_action(f"Successfully merged PR #{number} (merge train, method: {self.config.MERGE_METHOD})")
+            get_trace_logger().log("Merging", f"Successfully merged PR #{number}", item_type="pr", item_number=number, details={"method": self.config.MERGE_METHOD, "merge_train": self.branch})
+            _close_linked_issues(self.repo_name, number)
+            _archive_jules_session(self.repo_name, number)
+
+    def _cleanup(self) -> None:
+        """Delete the train branch and the refs this train fetched."""
+        self._git("push", "--quiet", "origin", "--delete", self.branch)
+        for ref in sorted(self._refs):
+            self._git("update-ref", "-d", ref)
+        self._refs.clear()
+
+
+TrainCallback = Callable[[str, str], None]
+
+
+class MergeTrainYard:
+    """Merge trains in flight, at most one per base branch, and the CI runs they are parked on."""
+
+    _instance: Optional["MergeTrainYard"] = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, poll_interval_seconds: float = CI_POLL_INTERVAL_SECONDS, callbacks: Optional[List[TrainCallback]] = None):
+        self.poll_interval_seconds = poll_interval_seconds
+        self.callbacks: List[TrainCallback] = callbacks if callbacks is not None else []
+        self.running = False
+        self.polls = 0
+        self._lock = threading.Lock()
+        self._trains: Dict[str, MergeTrain] = {}
+        self._parked: Set[str] = set()
+        # Parked trains whose CI finished and that wait for a worker to resume them
+        self._ready: Set[str] = set()
+
+    @classmethod
+    def get_instance(cls) -> "MergeTrainYard":
+        """Return the process-wide yard."""
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+        return cls._instance
+
+    @classmethod
+    def reset_instance(cls) -> None:
+        """Drop the singleton (used by tests)."""
+        with cls._instance_lock:
+            cls._instance = None
+
+    def claim(self, train: MergeTrain) -> bool:
+        """Register train as the one train in flight into its base branch.
+
+        Returns:
+            False if another train into the same base is in flight
+        """
+        with self._lock:
+            if train.key in self._trains:
+                return False
+            self._trains[train.key] = train
+            return True
+
+    def release(self, train: MergeTrain) -> None:
+        with self._lock:
+            if self._trains.get(train.key) is train:
+                del self._trains[train.key]
+            self._parked.discard(train.key)
+            self._ready.discard(train.key)
+
+    def park(self, train: MergeTrain) -> None:
+        """Hold train until its CI run finishes."""
+        with self._lock:
+            self._parked.add(train.key)
+
+    def take_ready(self, repo_name: str, base_branch: str) -> Optional[MergeTrain]:
+        """Hand out the train into base_branch if its CI finished, at most once."""
+        key = f"{repo_name}:{base_branch}"
+        with self._lock:
+            if key not in self._ready:
+                return None
+            self._ready.discard(key)
+            return self._trains.get(key)
+
+    def get(self, repo_name: str, base_branch: str) -> Optional[MergeTrain]:
+        with self._lock:
+            return self._trains.get(f"{repo_name}:{base_branch}")
+
+    def bases(self, repo_name: str) -> Set[str]:
+        """Base branches of repo_name with a train in flight."""
+        with self._lock:
+            return {train.base_branch for train in self._trains.values() if train.repo_name == repo_name}
+
+    def riding(self, repo_name: str) -> Set[int]:
+        """Numbers of the PRs of repo_name riding a train in flight."""
+        with self._lock:
+            trains = [train for train in self._trains.values() if train.repo_name == repo_name]
+        return {pr["number"] for train in trains for pr in train.prs}
+
+    def stats(self) -> Dict[str, int]:
+        """Return train and CI poll counters."""
+        with self._lock:
+            return {"trains": len(self._trains), "parked": len(self._parked), "polls": self.polls}
+
+    def poll_once(self) -> int:
+        """Check CI of every parked train once and fire the callbacks for the finished ones.
+
+        Returns:
+            Number of trains whose CI finished
+        """
+        with self._lock:
+            parked = [self._trains[key] for key in self._parked if key in self._trains]
+        finished = 0
+        for train in parked:
+            try:
+                outcome = train.check_ci()
+            except Exception as e:
+                logger.warning(f"Failed to check CI of {train.branch}: {e}")
+                continue
+            with self._lock:
+                self.polls += 1
+                if outcome is None or train.ci is None:
+                    continue
+                train.ci.outcome = outcome
+                self._parked.discard(train.key)
+                self._ready.add(train.key)
+            finished += 1
+            for callback in self.callbacks:
+                try:
+                    callback(train.repo_name, train.base_branch)
+                except Exception as e:
+                    logger.error(f"Merge train callback {getattr(callback, '__name__', callback)} failed for {train.branch}: {e}")
+        return finished
+
+    async def run(self) -> None:
+        """Poll CI of parked trains until cancelled (runs on the engine's event loop)."""
+        self.running = True
+        try:
+            while True:
+                if self._parked:
+                    try:
+                        await asyncio.to_thread(self.poll_once)
+                    except Exception as e:
+                        logger.error(f"Merge train CI poll failed: {e}")
+                await asyncio.sleep(self.poll_interval_seconds)
+        finally:
+            self.running = False
+
+
+def run_merge_train(
+    repo_name: str,
+    base_branch: str,
+    prs: Sequence[Dict[str, Any]],
+    config: AutomationConfig,
+    github_client: Any,
+    cwd: Optional[str] = None,
+) -> MergeTrainResult:
+    """Land prs (all targeting base_branch) as one merge train, with settings from config.toml.
+
+    Resumes the parked train into base_branch instead when its CI finished.
+    """
+    from .llm_backend_config import get_merge_train_ci_timeout_seconds_from_config
+
+    parked = MergeTrainYard.get_instance().take_ready(repo_name, base_branch)
+    if parked is not None:
+        return parked.resume()
+    train = MergeTrain(repo_name, base_branch, config, github_client, ci_timeout_seconds=get_merge_train_ci_timeout_seconds_from_config(), cwd=cwd)
+    return train.run(prs)
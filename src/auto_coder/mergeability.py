@@ -0,0 +1,273 @@
+"""Non-blocking resolution of PR mergeability.
+
+GitHub computes mergeability in a background job after every push, and until
+that job finishes the mergeable field is null. Workers used to wait it out in
+sleep loops on pulls.get (_poll_pr_mergeable), one REST request per PR every
+few seconds, holding the worker the whole time.
+
+MergeabilityResolver keeps those PRs in one shared wait set instead:
+
+- A worker that finds the state unknown calls wait_for() and releases the item.
+- run() executes on the automation engine's event loop and, each cycle, asks for
+  mergeable/mergeStateStatus of every due PR of a repository in one GraphQL query.
+- PRs that are still unknown back off exponentially, so a slow background job
+  costs a handful of queries rather than one every few seconds.
+- Resolved PRs fire the callbacks, which the engine uses to re-queue them.
+
+Callers outside the engine (single PR runs) still wait in-line, but through
+wait_until_resolved(), which uses the same query and backoff.
+"""
+
+import asyncio
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from .logger_config import get_logger
+from .util.gh_cache import GitHubClient
+
+logger = get_logger(__name__)
+
+DEFAULT_INITIAL_DELAY_SECONDS = 2.0
+DEFAULT_MAX_DELAY_SECONDS = 60.0
+DEFAULT_GIVE_UP_SECONDS = 600.0
+
+# Aliased pullRequest fields per GraphQL query
+MAX_PRS_PER_QUERY = 50
+
+# MergeableState values; UNKNOWN maps to None
+_MERGEABLE = {"MERGEABLE": True, "CONFLICTING": False}
+
+
+@dataclass
+class PendingMergeability:
+    """A PR waiting for GitHub to compute its mergeability."""
+
+    repo_name: str
+    pr_number: int
+    registered_at: float
+    next_check_at: float
+    attempts: int = 0
+
+    @property
+    def key(self) -> str:
+        return f"{self.repo_name}#{self.pr_number}"
+
+
+ResolvedCallback = Callable[[str, int, Dict[str, Any]], None]
+
+
+def fetch_mergeability(repo_name: str, pr_numbers: Iterable[int], github_client: Optional[GitHubClient] = None) -> Dict[int, Dict[str, Any]]:
+    """Fetch the mergeability of several PRs with one GraphQL query per MAX_PRS_PER_QUERY PRs.
+
+    Args:
+        repo_name: Repository in owner/name form
+        pr_numbers: PR numbers to look up
+        github_client: Client to query with (default: the GitHubClient singleton)
+
+    Returns:
+        Mapping of PR number to {"mergeable", "merge_state_status", "head_sha"};
+        mergeable is None while GitHub is still computing it
+
+    Raises:
+        httpx.HTTPStatusError, ValueError: If the query fails
+    """
+    client = github_client or GitHubClient.get_instance()
+    owner, repo = repo_name.split("/")
+    numbers = sorted({int(n) for n in pr_numbers})
+    states: Dict[int, Dict[str, Any]] = {}
+    for start in range(0, len(numbers), MAX_PRS_PER_QUERY):
+        chunk = numbers[start : start + MAX_PRS_PER_QUERY]
+        fields = " ".join(f"pr{n}: pullRequest(number: {n}) {{ number mergeable mergeStateStatus headRefOid }}" for n in chunk)
+        query = f"query($owner: String!, $name: String!) {{ repository(owner: $owner, name: $name) {{ {fields} }} }}"
+        data = client.graphql_query(query, {"owner": owner, "name": repo})
+        repository = (data.get("data") or {}).get("repository") or {}
+        for n in chunk:
+            pr = repository.get(f"pr{n}")
+            if pr:
+                states[n] = {"mergeable": _MERGEABLE.get(pr.get("mergeable") or ""), "merge_state_status": pr.get("mergeStateStatus"), "head_sha": pr.get("headRefOid")}
+    return states
+
+
+def wait_until_resolved(
+    repo_name: str,
+    pr_number: int,
+    timeout_seconds: float,
+    initial_delay_seconds: float = DEFAULT_INITIAL_DELAY_SECONDS,
+    max_delay_seconds: float = DEFAULT_MAX_DELAY_SECONDS,
+    github_client: Optional[GitHubClient] = None,
+) -> Optional[Dict[str, Any]]:
+    """Block until GitHub resolves the mergeability of one PR, backing off between queries.
+
+    For callers without an engine loop; sleeps at most timeout_seconds in total.
+
+    Returns:
+        The resolved state (see fetch_mergeability), or None on timeout
+    """
+    delay = max(0.1, initial_delay_seconds)
+    waited = 0.0
+    while True:
+        try:
+            state = fetch_mergeability(repo_name, [pr_number], github_client).get(pr_number)
+            if state and state["mergeable"] is not None:
+                return state
+        except Exception as e:
+            logger.debug(f"Unable to fetch mergeability of PR #{pr_number}: {e}")
+        if waited >= timeout_seconds:
+            return None
+        step = min(delay, timeout_seconds - waited)
+        time.sleep(step)
+        waited += step
+        delay = min(delay * 2, max_delay_seconds)
+
+
+class MergeabilityResolver:
+    """Shared wait set of PRs whose mergeability GitHub has not computed yet."""
+
+    _instance: Optional["MergeabilityResolver"] = None
+    _instance_lock = threading.Lock()
+
+    def __init__(
+        self,
+        initial_delay_seconds: float = DEFAULT_INITIAL_DELAY_SECONDS,
+        max_delay_seconds: float = DEFAULT_MAX_DELAY_SECONDS,
+        give_up_seconds: float = DEFAULT_GIVE_UP_SECONDS,
+        callbacks: Optional[List[ResolvedCallback]] = None,
+        github_client: Optional[GitHubClient] = None,
+    ):
+        self.initial_delay_seconds = initial_delay_seconds
+        self.max_delay_seconds = max_delay_seconds
+        self.give_up_seconds = give_up_seconds
+        self.callbacks: List[ResolvedCallback] = callbacks if callbacks is not None else []
+        self.github_client = github_client
+        self.running = False
+        self.polls = 0
+        self.resolved = 0
+        self.gave_up = 0
+        self._lock = threading.Lock()
+        self._pending: Dict[str, PendingMergeability] = {}
+        # PRs GitHub did not resolve in time, so workers stop waiting on them for a while
+        self._given_up_at: Dict[str, float] = {}
+
+    @classmethod
+    def get_instance(cls) -> "MergeabilityResolver":
+        """Return the process-wide resolver."""
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+        return cls._instance
+
+    @classmethod
+    def reset_instance(cls) -> None:
+        """Drop the singleton (used by tests)."""
+        with cls._instance_lock:
+            cls._instance = None
+
+    def wait_for(self, repo_name: str, pr_number: int) -> bool:
+        """Add a PR to the wait set; callbacks fire once its mergeability is known.
+
+        Returns:
+            False if GitHub recently failed to resolve the PR in time, in which
+            case the caller should carry on without the state
+        """
+        now = time.time()
+        key = f"{repo_name}#{pr_number}"
+        with self._lock:
+            given_up_at = self._given_up_at.get(key)
+            if given_up_at is not None and now - given_up_at < self.give_up_seconds:
+                return False
+            self._given_up_at.pop(key, None)
+            if key in self._pending:
+                return True
+            self._pending[key] = PendingMergeability(repo_name, pr_number, registered_at=now, next_check_at=now + self.initial_delay_seconds)
+        logger.info(f"Waiting for GitHub to compute mergeability of PR #{pr_number}")
+        return True
+
+    def is_waiting(self, repo_name: str, pr_number: int) -> bool:
+        with self._lock:
+            return f"{repo_name}#{pr_number}" in self._pending
+
+    def pending(self) -> List[PendingMergeability]:
+        with self._lock:
+            return list(self._pending.values())
+
+    def stats(self) -> Dict[str, int]:
+        """Return wait set and query counters."""
+        with self._lock:
+            return {"pending": len(self._pending), "polls": self.polls, "resolved": self.resolved, "gave_up": self.gave_up}
+
+    def _finish(self, waiting: PendingMergeability, state: Dict[str, Any], now: float) -> None:
+        with self._lock:
+            if self._pending.pop(waiting.key, None) is None:
+                return
+            if state["mergeable"] is None:
+                self.gave_up += 1
+                self._given_up_at[waiting.key] = now
+            else:
+                self.resolved += 1
+        if state["mergeable"] is None:
+            logger.warning(f"GitHub did not compute mergeability of PR #{waiting.pr_number} within {self.give_up_seconds:.0f}s")
+        else:
+            logger.info(f"Mergeability of PR #{waiting.pr_number} resolved after {waiting.attempts + 1} check(s): {state['merge_state_status']}")
+        for callback in self.callbacks:
+            try:
+                callback(waiting.repo_name, waiting.pr_number, state)
+            except Exception as e:
+                logger.error(f"Mergeability callback {getattr(callback, '__name__', callback)} failed for PR #{waiting.pr_number}: {e}")
+
+    def poll_once(self, now: Optional[float] = None) -> int:
+        """Query every due PR with one GraphQL query per repository.
+
+        Returns:
+            Number of PRs that left the wait set
+        """
+        now = time.time() if now is None else now
+        by_repo: Dict[str, List[PendingMergeability]] = {}
+        for waiting in self.pending():
+            if waiting.next_check_at <= now:
+                by_repo.setdefault(waiting.repo_name, []).append(waiting)
+
+        finished = 0
+        for repo_name, waits in by_repo.items():
+            try:
+                states = fetch_mergeability(repo_name, [w.pr_number for w in waits], self.github_client)
+            except Exception as e:
+                logger.warning(f"Failed to query mergeability for {repo_name}: {e}")
+                states = {}
+            with self._lock:
+                self.polls += 1
+            for waiting in waits:
+                state = states.get(waiting.pr_number)
+                if state and state["mergeable"] is not None:
+                    self._finish(waiting, state, now)
+                elif now - waiting.registered_at >= self.give_up_seconds:
+                    self._finish(waiting, state or {"mergeable": None, "merge_state_status": None, "head_sha": None}, now)
+                else:
+                    waiting.attempts += 1
+                    waiting.next_check_at = now + min(self.initial_delay_seconds * 2**waiting.attempts, self.max_delay_seconds)
+                    continue
+                finished += 1
+        return finished
+
+    async def run(self) -> None:
+        """Resolve waiting PRs until cancelled (runs on the engine's event loop)."""
+        self.running = True
+        try:
+            while True:
+                if any(w.next_check_at <= time.time() for w in self.pending()):
+                    try:
+                        await asyncio.to_thread(self.poll_once)
+                    except Exception as e:
+                        logger.error(f"Mergeability poll failed: {e}")
+                # New PRs are first due after initial_delay_seconds; waking at that rate checks them on time
+                await asyncio.sleep(self.initial_delay_seconds)
+        finally:
+            self.running = False
+
+
+def get_mergeability_resolver() -> Optional[MergeabilityResolver]:
+    """Return the resolver when it is running on the engine's loop, otherwise None."""
+    resolver = MergeabilityResolver.get_instance()
+    return resolver if resolver.running else None
@@ -0,0 +1,370 @@
+"""In-process metrics registry with a Prometheus text exposition.
+
+LLMOutputLogger records raw prompts/responses and HealthMonitor records
+resource snapshots, but neither answers "where does cycle time go?". This
+module keeps counters and histograms that the hot paths update cheaply:
+
+- BackendManager: LLM call latency, prompt/response sizes, outcomes,
+  usage-limit retries and backend rotations;
+- GitHubClient: REST/GraphQL request latency, status and HTTP cache hits;
+- CommandExecutor: subprocess latency and exit status per program
+  (``git``/``gh`` are split by subcommand);
+- ProgressStage and the worker loop: time spent per pipeline stage and per item.
+
+Point-in-time figures owned by other components (response cache, cooldowns,
+concurrency governor, hedger, session pool, engine queue) are pulled in by
+collectors when the metrics are rendered, so they cost nothing in between.
+
+The registry is exposed at ``/metrics`` by the webhook daemon and written to
+``~/.auto-coder/logs/metrics.json`` with every health snapshot, which
+``auto-coder health metrics`` reads.
+
+Environment Variables
+---------------------
+
+AUTO_CODER_METRICS_ENABLED
+    "0"/"false"/"no"/"off" disables metric recording (default: enabled).
+"""
+
+import bisect
+import contextlib
+import json
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .logger_config import get_logger
+
+logger = get_logger(__name__)
+
+LATENCY_BUCKETS: Tuple[float, ...] = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800)
+SIZE_BUCKETS: Tuple[float, ...] = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+
+COUNTER = "counter"
+HISTOGRAM = "histogram"
+GAUGE = "gauge"
+
+
+@dataclass(frozen=True)
+class MetricSpec:
+    """Static description of a metric."""
+
+    name: str
+    kind: str
+    help: str
+    buckets: Tuple[float, ...] = LATENCY_BUCKETS
+
+
+# Every metric recorded through inc()/observe() is declared here so the
+# exposition carries HELP/TYPE lines and the catalogue doubles as documentation.
+METRICS: Dict[str, MetricSpec] = {
+    spec.name: spec
+    for spec in (
+        MetricSpec("auto_coder_llm_calls_total", COUNTER, "LLM CLI calls by backend and outcome."),
+        MetricSpec("auto_coder_llm_call_seconds", HISTOGRAM, "Wall time of one LLM CLI call."),
+        MetricSpec("auto_coder_llm_prompt_chars", HISTOGRAM, "Prompt size sent to an LLM backend, in characters.", SIZE_BUCKETS),
+        MetricSpec("auto_coder_llm_response_chars", HISTOGRAM, "Response size returned by an LLM backend, in characters.", SIZE_BUCKETS),
+        MetricSpec("auto_coder_llm_retries_total", COUNTER, "Usage-limit retries of the same LLM backend."),
+        MetricSpec("auto_coder_llm_backend_rotations_total", COUNTER, "Switches away from an LLM backend."),
+        MetricSpec("auto_coder_github_requests_total", COUNTER, "GitHub API requests by API, method, status class and cache result."),
+        MetricSpec("auto_coder_github_request_seconds", HISTOGRAM, "Wall time of one GitHub API request."),
+        MetricSpec("auto_coder_commands_total", COUNTER, "Subprocesses run through CommandExecutor by command and outcome."),
+        MetricSpec("auto_coder_command_seconds", HISTOGRAM, "Wall time of one subprocess run through CommandExecutor."),
+        MetricSpec("auto_coder_stage_seconds", HISTOGRAM, "Time spent in a ProgressStage."),
+        MetricSpec("auto_coder_items_processed_total", COUNTER, "Issues and PRs handled by the worker loop by outcome."),
+        MetricSpec("auto_coder_item_seconds", HISTOGRAM, "Time the worker loop spent on one issue or PR."),
+    )
+}
+
+Labels = Tuple[Tuple[str, str], ...]
+Sample = Tuple[str, Dict[str, str], float]
+Collector = Callable[[], List[Sample]]
+
+_STAGE_NUMBER_RE = re.compile(r"\d+")
+
+
+def _metrics_enabled() -> bool:
+    value = os.environ.get("AUTO_CODER_METRICS_ENABLED", "").strip().lower()
+    return value not in {"0", "false", "no", "off"}
+
+
+def get_metrics_snapshot_path() -> Path:
+    """Return the file written with every health snapshot."""
+    from .health_monitor import get_health_log_dir
+
+    return get_health_log_dir() / "metrics.json"
+
+
+def normalize_stage(stage: str) -> str:
+    """Reduce a free-form stage label to a low-cardinality metric label.
+
+    ``"Running LLM: codex (provider: x), attempt 2"`` becomes ``"Running LLM"``
+    and ``"Low-failure fix attempt 3"`` becomes ``"Low-failure fix attempt N"``.
+    """
+    return _STAGE_NUMBER_RE.sub("N", stage.split(":", 1)[0]).strip() or "unknown"
+
+
+def _labels_key(labels: Dict[str, object]) -> Labels:
+    return tuple(sorted((k, str(v)) for k, v in labels.items() if v is not None))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Sequence[Tuple[str, str]]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+@dataclass
+class _HistogramSeries:
+    counts: List[int]
+    total: float = 0.0
+    count: int = 0
+
+
+@dataclass
+class _Metric:
+    spec: MetricSpec
+    values: Dict[Labels, float] = field(default_factory=dict)
+    series: Dict[Labels, _HistogramSeries] = field(default_factory=dict)
+
+
+class MetricsRegistry:
+    """Thread-safe counters and histograms keyed by metric name and labels."""
+
+    _instance: Optional["MetricsRegistry"] = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, enabled: Optional[bool] = None):
+        self.enabled = _metrics_enabled() if enabled is None else enabled
+        self.started_at = time.time()
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: Dict[str, Collector] = {}
+
+    @classmethod
+    def get_instance(cls) -> "MetricsRegistry":
+        """Return the process-wide registry."""
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+        return cls._instance
+
+    @classmethod
+    def reset_instance(cls) -> None:
+        """Drop the singleton (used by tests)."""
+        with cls._instance_lock:
+            cls._instance = None
+
+    def _metric(self, name: str, kind: str) -> _Metric:
+        metric = self._metrics.get(name)
+        if metric is None:
+            spec = METRICS.get(name) or MetricSpec(name, kind, "")
+            metric = self._metrics[name] = _Metric(spec)
+        return metric
+
+    def inc(self, name: str, amount: float = 1.0, **labels: object) -> None:
+        """Add amount to a counter."""
+        if not self.enabled:
+            return
+        key = _labels_key(labels)
+        with self._lock:
+            values = self._metric(name, COUNTER).values
+            values[key] = values.get(key, 0.0) + amount
+
+    def observe(self, name: str, value: float, **labels: object) -> None:
+        """Record one histogram observation."""
+        if not self.enabled:
+            return
+        key = _labels_key(labels)
+        with self._lock:
+            metric = self._metric(name, HISTOGRAM)
+            series = metric.series.get(key)
+            if series is None:
+                series = metric.series[key] = _HistogramSeries(counts=[0] * (len(metric.spec.buckets) + 1))
+            series.counts[bisect.bisect_left(metric.spec.buckets, value)] += 1
+            series.total += value
+            series.count += 1
+
+    @contextlib.contextmanager
+    def time(self, name: str, **labels: object) -> Iterator[None]:
+        """Observe the wall time of the block in seconds."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, **labels)
+
+    def register_collector(self, name: str, collector: Collector) -> None:
+        """Register (or replace) a callable returning ``(metric, labels, value)`` gauge samples."""
+        with self._lock:
+            self._collectors[name] = collector
+
+    def unregister_collector(self, name: str) -> None:
+        with self._lock:
+            self._collectors.pop(name, None)
+
+    def _collect_gauges(self) -> List[Sample]:
+        with self._lock:
+            collectors = list(self._collectors.items())
+        samples: List[Sample] = []
+        for name, collector in [("components", _collect_components)] + collectors:
+            try:
+                samples.extend(collector())
+            except Exception as exc:  # a broken collector must not break /metrics
+                logger.debug(f"Metrics collector '{name}' failed: {exc}")
+        return samples
+
+    def snapshot(self) -> Dict[str, object]:
+        """Return every metric as plain data (the JSON form of the exposition)."""
+        gauges = self._collect_gauges()
+        with self._lock:
+            metrics: Dict[str, Dict[str, object]] = {}
+            for name, metric in sorted(self._metrics.items()):
+                entry: Dict[str, object] = {"type": metric.spec.kind, "help": metric.spec.help}
+                if metric.spec.kind == HISTOGRAM:
+                    entry["buckets"] = list(metric.spec.buckets)
+                    entry["series"] = [{"labels": dict(key), "counts": list(s.counts), "sum": s.total, "count": s.count} for key, s in sorted(metric.series.items())]
+                else:
+                    entry["series"] = [{"labels": dict(key), "value": value} for key, value in sorted(metric.values.items())]
+                metrics[name] = entry
+        for name, labels, value in gauges:
+            entry = metrics.setdefault(name, {"type": GAUGE, "help": "", "series": []})
+            series = entry["series"]
+            assert isinstance(series, list)
+            series.append({"labels": labels, "value": value})
+        return {"pid": os.getpid(), "started_at": self.started_at, "timestamp": time.time(), "metrics": metrics}
+
+    def render_prometheus(self) -> str:
+        """Return the registry in the Prometheus text exposition format."""
+        return render_prometheus(self.snapshot())
+
+    def write_snapshot(self, path: Optional[Path] = None) -> None:
+        """Write snapshot() as JSON, atomically replacing the previous file."""
+        if not self.enabled:
+            return
+        path = path or get_metrics_snapshot_path()
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+            tmp.write_text(json.dumps(self.snapshot(), default=str), encoding="utf-8")
+            os.replace(tmp, path)
+        except OSError as exc:  # pragma: no cover - defensive
+            logger.warning(f"Failed to write metrics snapshot: {exc}")
+
+
+def render_prometheus(snapshot: Dict[str, object]) -> str:
+    """Render a MetricsRegistry.snapshot() (possibly loaded from disk) as Prometheus text."""
+    lines: List[str] = []
+    metrics = snapshot.get("metrics") or {}
+    assert isinstance(metrics, dict)
+    for name, entry in metrics.items():
+        if entry.get("help"):
+            lines.append(f"# HELP {name} {entry['help']}")
+        lines.append(f"# TYPE {name} {entry['type']}")
+        for series in entry["series"]:
+            labels = sorted(series["labels"].items())
+            if entry["type"] != HISTOGRAM:
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(series['value'])}")
+                continue
+            cumulative = 0
+            for bound, count in zip(list(entry["buckets"]) + [float("inf")], series["counts"]):
+                cumulative += count
+                lines.append(f"{name}_bucket{_format_labels(labels + [('le', _format_value(bound))])} {cumulative}")
+            lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(series['sum'])}")
+            lines.append(f"{name}_count{_format_labels(labels)} {series['count']}")
+    return "\n".join(lines) + "\n"
+
+
+def _collect_components() -> List[Sample]:
+    """Gauges from components that keep their own statistics (only when already running)."""
+    from .backend_concurrency import BackendConcurrencyGovernor
+    from .backend_cooldown import BackendCooldownRegistry
+    from .git_fetch import GitFetchCoordinator
+    from .jules_session_registry import JulesSessionRegistry
+    from .llm_response_cache import LLMResponseCache
+    from .llm_session_pool import LLMSessionPool
+    from .merge_train import MergeTrainYard
+    from .mergeability import MergeabilityResolver
+    from .noedit_hedging import NoeditHedger
+    from .util.repo_metadata import RepoMetadataCache
+    from .workflow_monitor import WorkflowMonitorService
+
+    samples: List[Sample] = []
+    cache = LLMResponseCache._instance
+    if cache is not None:
+        for key, value in cache.stats().items():
+            samples.append((f"auto_coder_llm_response_cache_{key}", {}, float(value)))
+    cooldowns = BackendCooldownRegistry._instance
+    if cooldowns is not None:
+        now = time.time()
+        for cooldown in cooldowns.active_cooldowns():
+            labels = {"backend": str(cooldown["backend"]), "provider": str(cooldown["provider"] or "")}
+            samples.append(("auto_coder_backend_cooldown_remaining_seconds", labels, max(0.0, float(cooldown["until"]) - now)))  # type: ignore[arg-type]
+    governor = BackendConcurrencyGovernor._instance
+    if governor is not None:
+        for gate, stats in governor.stats().items():
+            for key in ("in_flight", "queued", "admitted", "spilled", "max_wait_seconds"):
+                samples.append((f"auto_coder_backend_gate_{key}", {"gate": gate}, float(stats[key])))
+    hedger = NoeditHedger._instance
+    if hedger is not None:
+        for key, value in hedger.stats().items():
+            samples.append((f"auto_coder_noedit_{key}", {}, float(value)))
+    pool = LLMSessionPool._instance
+    if pool is not None:
+        for key, value in pool.stats().items():
+            samples.append((f"auto_coder_llm_session_pool_{key}", {}, float(value)))
+    fetcher = GitFetchCoordinator._instance
+    if fetcher is not None:
+        for key, value in fetcher.stats().items():
+            samples.append((f"auto_coder_git_fetch_{key}", {}, float(value)))
+    registry = JulesSessionRegistry._instance
+    if registry is not None:
+        for key, value in registry.stats().items():
+            samples.append((f"auto_coder_jules_sessions_{key}", {}, float(value)))
+    repo_metadata = RepoMetadataCache._instance
+    if repo_metadata is not None:
+        for key, value in repo_metadata.stats().items():
+            samples.append((f"auto_coder_repo_metadata_{key}", {}, float(value)))
+    monitor = WorkflowMonitorService._instance
+    if monitor is not None:
+        for key, value in monitor.stats().items():
+            samples.append((f"auto_coder_workflow_monitor_{key}", {}, float(value)))
+    resolver = MergeabilityResolver._instance
+    if resolver is not None:
+        for key, value in resolver.stats().items():
+            samples.append((f"auto_coder_mergeability_{key}", {}, float(value)))
+    yard = MergeTrainYard._instance
+    if yard is not None:
+        for key, value in yard.stats().items():
+            samples.append((f"auto_coder_merge_train_{key}", {}, float(value)))
+    return samples
+
+
+def get_metrics_registry() -> MetricsRegistry:
+    """Return the process-wide :class:`MetricsRegistry`."""
+    return MetricsRegistry.get_instance()
+
+
+def inc(name: str, amount: float = 1.0, **labels: object) -> None:
+    """Convenience wrapper around :meth:`MetricsRegistry.inc`."""
+    MetricsRegistry.get_instance().inc(name, amount, **labels)
+
+
+def observe(name: str, value: float, **labels: object) -> None:
+    """Convenience wrapper around :meth:`MetricsRegistry.observe`."""
+    MetricsRegistry.get_instance().observe(name, value, **labels)
@@ -0,0 +1,221 @@
+"""Hedged execution of no-edit prompts across two backends.
+
+Commit messages, mergeability checks and issue labeling are short prompts whose
+latency is dominated by the occasional slow CLI run. When hedging is enabled,
+a no-edit prompt runs on the current backend as usual; if it has not answered
+by the configured percentile of that backend's recent no-edit latencies, the
+prompt is also sent to the next eligible backend. The first valid response
+wins and the other CLI process is killed.
+
+The hedge only goes to backends without provider rotation (providers are
+selected through process-wide environment variables, which cannot be switched
+for one thread) and never to a backend in a usage-limit cooldown.
+
+Hedging is opt-in via [llm_hedging].enabled in config.toml.
+"""
+
+import queue
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+
+from .backend_concurrency import get_backend_concurrency_governor
+from .backend_cooldown import get_backend_cooldown_registry
+from .exceptions import AutoCoderBackendBusyError
+from .logger_config import get_logger
+from .utils import command_cancel_scope
+
+logger = get_logger(__name__)
+
+DEFAULT_PERCENTILE = 0.9
+DEFAULT_MIN_DELAY_SECONDS = 5.0
+DEFAULT_INITIAL_DELAY_SECONDS = 30.0
+# Latencies needed before the percentile replaces the initial delay
+MIN_LATENCY_SAMPLES = 5
+LATENCY_WINDOW = 50
+# How long to wait for a cancelled call to unwind before touching manager state
+LOSER_JOIN_SECONDS = 5.0
+
+
+def _is_valid_response(response: Optional[str]) -> bool:
+    return bool(response and response.strip())
+
+
+class NoeditHedger:
+    """Runs a no-edit prompt on a second backend when the first is slow."""
+
+    _instance: Optional["NoeditHedger"] = None
+    _instance_lock = threading.Lock()
+
+    def __init__(
+        self,
+        percentile: float = DEFAULT_PERCENTILE,
+        min_delay_seconds: float = DEFAULT_MIN_DELAY_SECONDS,
+        initial_delay_seconds: float = DEFAULT_INITIAL_DELAY_SECONDS,
+    ):
+        self.percentile = min(max(percentile, 0.0), 1.0)
+        self.min_delay_seconds = min_delay_seconds
+        self.initial_delay_seconds = initial_delay_seconds
+        self.hedges_started = 0
+        self.hedges_won = 0
+        self._lock = threading.Lock()
+        self._latencies: Dict[str, Deque[float]] = {}
+
+    @classmethod
+    def get_instance(cls) -> "NoeditHedger":
+        """Return the process-wide hedger configured from config.toml."""
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    from .llm_backend_config import (
+                        get_llm_hedging_initial_delay_seconds_from_config,
+                        get_llm_hedging_min_delay_seconds_from_config,
+                        get_llm_hedging_percentile_from_config,
+                    )
+
+                    cls._instance = cls(
+                        percentile=get_llm_hedging_percentile_from_config(),
+                        min_delay_seconds=get_llm_hedging_min_delay_seconds_from_config(),
+                        initial_delay_seconds=get_llm_hedging_initial_delay_seconds_from_config(),
+                    )
+        return cls._instance
+
+    @classmethod
+    def reset_instance(cls) -> None:
+        """Drop the singleton (used by tests)."""
+        with cls._instance_lock:
+            cls._instance = None
+
+    def record_latency(self, backend: str, seconds: float) -> None:
+        """Remember how long a successful no-edit call on backend took."""
+        with self._lock:
+            self._latencies.setdefault(backend, deque(maxlen=LATENCY_WINDOW)).append(seconds)
+
+    def hedge_delay(self, backend: str) -> float:
+        """Seconds to wait for backend before hedging."""
+        with self._lock:
+            samples = sorted(self._latencies.get(backend, ()))
+        if len(samples) < MIN_LATENCY_SAMPLES:
+            return self.initial_delay_seconds
+        index = min(len(samples) - 1, int(self.percentile * len(samples)))
+        return max(self.min_delay_seconds, samples[index])
+
+    def _pick_hedge_backend(self, manager: Any, primary: str) -> Optional[str]:
+        cooldowns = get_backend_cooldown_registry()
+        start = manager._all_backends.index(primary) if primary in manager._all_backends else 0
+        rotation = manager._all_backends[start + 1 :] + manager._all_backends[:start]
+        for backend_name in manager._routing_policy.rank(rotation):
+            if manager._provider_manager.has_providers(backend_name):
+                continue
+            if cooldowns is not None and not cooldowns.is_available(backend_name):
+                continue
+            return backend_name  # type: ignore[no-any-return]
+        return None
+
+    def run(self, manager: Any, prompt: str, validate: Callable[[Optional[str]], bool] = _is_valid_response) -> str:
+        """Run prompt through manager, hedging on a second backend if it is slow.
+
+        Args:
+            manager: The no-edit BackendManager
+            prompt: Prompt to execute
+            validate: Predicate deciding whether a response may win the race
+
+        Returns:
+            The first valid response (or the primary response if none is valid)
+        """
+        primary = manager._current_backend_name()
+        hedge_backend = self._pick_hedge_backend(manager, primary)
+        if hedge_backend is None:
+            started = time.monotonic()
+            out: str = manager._run_llm_cli(prompt)
+            if manager._last_backend == primary:
+                self.record_latency(primary, time.monotonic() - started)
+            return out
+
+        results: "queue.Queue[Tuple[str, Optional[str], Optional[BaseException], float]]" = queue.Queue()
+        cancel_events = {"primary": threading.Event(), "hedge": threading.Event()}
+
+        def _run(tag: str, call: Callable[[], str]) -> None:
+            started = time.monotonic()
+            with command_cancel_scope(cancel_events[tag]):
+                try:
+                    response = call()
+                    results.put((tag, response, None, time.monotonic() - started))
+                except BaseException as exc:
+                    results.put((tag, None, exc, time.monotonic() - started))
+
+        threads = {"primary": threading.Thread(target=_run, args=("primary", lambda: manager._run_llm_cli(prompt)), name="NoeditHedge-primary", daemon=True)}
+        threads["primary"].start()
+
+        delay = self.hedge_delay(primary)
+        try:
+            tag, response, error, elapsed = results.get(timeout=delay)
+        except queue.Empty:
+            pass
+        else:
+            if error is not None:
+                raise error
+            if manager._last_backend == primary:
+                self.record_latency(primary, elapsed)
+            return response  # type: ignore[return-value]
+
+        hedge_cli = manager._get_or_create_client(hedge_backend)
+
+        def _hedge_call() -> str:
+            governor = get_backend_concurrency_governor()
+            if governor is None:
+                return hedge_cli._run_llm_cli(prompt, is_noedit=True)  # type: ignore[no-any-return]
+            with governor.admit(hedge_backend):
+                return hedge_cli._run_llm_cli(prompt, is_noedit=True)  # type: ignore[no-any-return]
+
+        logger.info(f"No-edit prompt on '{primary}' exceeded {delay:.1f}s; hedging on '{hedge_backend}'")
+        with self._lock:
+            self.hedges_started += 1
+        threads["hedge"] = threading.Thread(target=_run, args=("hedge", _hedge_call), name="NoeditHedge-hedge", daemon=True)
+        threads["hedge"].start()
+
+        outcomes: Dict[str, Tuple[Optional[str], Optional[BaseException]]] = {}
+        winner: Optional[str] = None
+        while len(outcomes) < len(threads):
+            tag, response, error, elapsed = results.get()
+            outcomes[tag] = (response, error)
+            if error is None and validate(response):
+                winner = tag
+                self.record_latency(primary if tag == "primary" else hedge_backend, elapsed)
+                break
+            if not isinstance(error, AutoCoderBackendBusyError):
+                logger.info(f"Hedged no-edit call on '{primary if tag == 'primary' else hedge_backend}' returned no valid response")
+
+        if winner is not None:
+            loser = "hedge" if winner == "primary" else "primary"
+            if loser not in outcomes:
+                cancel_events[loser].set()
+                threads[loser].join(LOSER_JOIN_SECONDS)
+            if winner == "hedge":
+                with self._lock:
+                    self.hedges_won += 1
+                logger.info(f"Hedged no-edit call won by '{hedge_backend}'")
+                manager._last_backend = hedge_backend
+                manager._last_model = getattr(hedge_cli, "model_name", None)
+            return outcomes[winner][0]  # type: ignore[return-value]
+
+        # Neither response was valid: behave as if the primary had run alone
+        response, error = outcomes["primary"]
+        if error is not None:
+            raise error
+        return response  # type: ignore[return-value]
+
+    def stats(self) -> Dict[str, int]:
+        """Return how many hedges were started and how many the hedge backend won."""
+        with self._lock:
+            return {"hedges_started": self.hedges_started, "hedges_won": self.hedges_won}
+
+
+def get_noedit_hedger() -> Optional[NoeditHedger]:
+    """Return the process-wide hedger, or None when [llm_hedging].enabled is off."""
+    from .llm_backend_config import get_llm_hedging_enabled_from_config
+
+    if not get_llm_hedging_enabled_from_config():
+        return None
+    return NoeditHedger.get_instance()
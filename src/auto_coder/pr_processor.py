@@ -25,16 +25,20 @@ from auto_coder.util.github_action import DetailedChecksResult, _check_github_ac
 from .attempt_manager import build_pr_attempt_trigger, get_current_attempt, increment_attempt
 from .automation_config import AutomationConfig, EmptyPRResult, ProcessedPRResult, StaleJulesPRResult
 from .branch_manager import BranchManager
-from .conflict_resolver import _get_merge_conflict_info, resolve_merge_conflicts_with_llm, resolve_pr_merge_conflicts
+from .conflict_resolver import _get_merge_conflict_info, resolve_dependency_conflicts_without_llm, resolve_merge_conflicts_with_llm, resolve_pr_merge_conflicts
 from .fix_to_pass_tests_runner import run_local_tests
 from .git_branch import branch_context, git_checkout_branch, git_commit_with_retry
 from .git_commit import commit_and_push_changes, git_push, save_commit_failure_history
+from .git_fetch import git_fetch
 from .git_info import get_commit_log
 from .issue_context import extract_linked_issues_from_pr_body, get_linked_issues_context, validate_issue_references
 from .label_manager import LabelManager, LabelOperationError
+from .llm_backend_config import get_prompt_budget_enabled_from_config
 from .logger_config import get_gh_logger, get_logger
+from .mergeability import fetch_mergeability, get_mergeability_resolver, wait_until_resolved
 from .progress_decorators import progress_stage
 from .progress_footer import ProgressStage, newline_progress
+from .prompt_budget import compact_diff, compact_log, diff_test_paths, get_prompt_budget
 from .prompt_loader import render_prompt
 from .test_log_utils import extract_all_failed_tests, extract_first_failed_test, extract_important_errors
 from .test_result import TestResult
@@ -375,13 +379,19 @@ def _should_skip_waiting_for_jules(github_client: Any, repo_name: str, pr_data:
             if session_id:
                 from auto_coder.jules_client import JulesClient
 
-                jules_client = JulesClient()
-                # Get specific session directly
-                try:
-                    target_session = jules_client.get_session(session_id)
-                except Exception:
-                    # If get_session fails (e.g. 404), treat as not found/no session
-                    target_session = None
+                from auto_coder.jules_session_registry import JulesSessionRegistry
+
+                # Reuse the registry when this loop iteration already refreshed it
+                registry = JulesSessionRegistry.get_instance()
+                target_session = registry.get(session_id) if registry.is_fresh_for(repo_name) else None
+                if target_session is None:
+                    jules_client = JulesClient()
+                    # Get specific session directly
+                    try:
+                        target_session = jules_client.get_session(session_id)
+                    except Exception:
+                        # If get_session fails (e.g. 404), treat as not found/no session
+                        target_session = None
 
                 if target_session:
                     from auto_coder.jules_engine import get_session_pull_request
@@ -818,17 +828,14 @@ def _get_mergeable_state(
     mergeable = pr_data.get("mergeable")
     merge_state_status = pr_data.get("mergeStateStatus")
 
-    # Refresh mergeability only when value is unknown
+    # Refresh mergeability only when value is unknown (REST never returns mergeStateStatus)
     if mergeable is None:
         try:
-            token = GitHubClient.get_instance().token
-            api = get_ghapi_client(token)
-            owner, repo = repo_name.split("/")
-
-            # API: api.pulls.get(owner, repo, pull_number)
-            pr_details = api.pulls.get(owner, repo, pull_number=pr_data.get("number"))
-            mergeable = pr_details.get("mergeable", mergeable)
-            merge_state_status = pr_details.get("mergeStateStatus", merge_state_status)
+            pr_number = pr_data.get("number")
+            state = fetch_mergeability(repo_name, [pr_number], GitHubClient.get_instance()).get(pr_number)  # type: ignore[list-item]
+            if state:
+                mergeable = state["mergeable"]
+                merge_state_status = state["merge_state_status"] or merge_state_status
         except Exception as e:
             logger.debug(f"Unable to refresh mergeable state for PR #{pr_data.get('number')}: {e}")
 
@@ -1004,7 +1011,9 @@ def _process_pr_for_merge(
             return processed_pr
 
         merge_result = _merge_pr(repo_name, pr_data["number"], {}, config, github_client=github_client)
-        if merge_result:
+        if merge_result is None:
+            processed_pr.actions_taken.append(f"Merge of PR #{pr_data['number']} deferred until GitHub resolves mergeability")
+        elif merge_result:
             processed_pr.actions_taken.append(f"Successfully merged PR #{pr_data['number']}")
             # Retain label on successful merge
             should_process.keep_label()
@@ -1214,8 +1223,6 @@ def _apply_pr_actions_directly(
 
                     if not push_res.success:
                         with ProgressStage("Retrying push"):
-                            import time
-
                             time.sleep(2)
                             retry_push_res = git_push()
                             if retry_push_res.success:
@@ -1257,13 +1264,21 @@ def _apply_pr_actions_directly(
 def _get_pr_diff(repo_name: str, pr_number: int, config: AutomationConfig) -> str:
     """Get PR diff for analysis."""
     try:
-        return GitHubClient.get_instance().get_pr_diff(repo_name, pr_number)[: config.MAX_PR_DIFF_SIZE]
+        diff = GitHubClient.get_instance().get_pr_diff(repo_name, pr_number)
+        if get_prompt_budget_enabled_from_config():
+            # Compacted structurally by _create_pr_analysis_prompt instead of cut mid-hunk
+            return diff  # type: ignore[no-any-return]
+        return diff[: config.MAX_PR_DIFF_SIZE]  # type: ignore[no-any-return]
 
     except Exception as e:
         logger.error(f"Failed to get PR diff via GhApi: {e}")
         return "Could not retrieve PR diff"
 
 
+# Share of the prompt budget per field; fields needing less hand their surplus to the others
+PR_PROMPT_BUDGET_WEIGHTS = {"pr_diff": 5.0, "linked_issues_context": 2.0, "pr_body": 1.5, "commit_log": 1.0}
+
+
 def _create_pr_analysis_prompt(repo_name: str, pr_data: Dict[str, Any], pr_diff: str, config: AutomationConfig, github_client: Optional[Any] = None, is_jules: bool = False) -> str:
     """Create a PR prompt that prioritizes direct code changes over comments with label-based selection."""
     pr_body = pr_data.get("body") or ""
@@ -1275,6 +1290,18 @@ def _create_pr_analysis_prompt(repo_name: str, pr_data: Dict[str, Any], pr_diff:
     commit_log = get_commit_log(base_branch=config.MAIN_BRANCH)
 
     body_text = pr_body[: config.MAX_PROMPT_SIZE]
+    diff_limit = config.MAX_PR_DIFF_SIZE
+    budget = get_prompt_budget(PR_PROMPT_BUDGET_WEIGHTS)
+    if budget is not None:
+        fitted = budget.fit(
+            {"pr_body": pr_body, "pr_diff": pr_diff, "commit_log": commit_log or "", "linked_issues_context": linked_issues_context},
+            compactors={
+                "pr_diff": lambda text, max_chars: compact_diff(text, max_chars, priority_paths=diff_test_paths(text)),
+                "commit_log": compact_log,
+            },
+        )
+        body_text, pr_diff, commit_log, linked_issues_context = fitted["pr_body"], fitted["pr_diff"], fitted["commit_log"], fitted["linked_issues_context"]
+        diff_limit = len(pr_diff)
     # Extract PR labels for label-based prompt selection
     pr_labels_list = pr_data.get("labels", []) or []
 
@@ -1288,7 +1315,7 @@ def _create_pr_analysis_prompt(repo_name: str, pr_data: Dict[str, Any], pr_diff:
         pr_state=pr_data.get("state", "open"),
         pr_draft=pr_data.get("draft", False),
         pr_mergeable=pr_data.get("mergeable", False),
-        diff_limit=config.MAX_PR_DIFF_SIZE,
+        diff_limit=diff_limit,
         pr_diff=pr_diff,
         commit_log=commit_log or "(No commit history)",
         linked_issues_context=linked_issues_context,
@@ -1424,6 +1451,13 @@ def _handle_pr_merge(
             actions.append(f"GitHub Actions checks are still in progress for PR #{pr_number}, skipping to next PR")
             return actions
 
+        # Release the worker while GitHub computes mergeability; the engine re-queues the PR once it is known
+        if mergeable_flag is None:
+            resolver = get_mergeability_resolver()
+            if resolver is not None and resolver.wait_for(repo_name, pr_number):
+                actions.append(f"Mergeability of PR #{pr_number} is still being computed, re-queueing once GitHub resolves it")
+                return actions
+
         # Step 3: Get detailed status for merge decision
         github_checks = _check_github_actions_status(repo_name, pr_data, config)
         if github_checks.error:
@@ -1451,6 +1485,16 @@ def _handle_pr_merge(
                 # 2. Trigger workflow_dispatch
                 from auto_coder.util.github_action import trigger_workflow_dispatch
 
+                # Hand the run to the central monitor when it is polling on the engine's loop
+                from .workflow_monitor import get_workflow_monitor_service
+
+                monitor_service = get_workflow_monitor_service()
+                if monitor_service is not None and not monitor_service.running:
+                    monitor_service = None
+                if monitor_service is not None and monitor_service.is_monitoring(repo_name, pr_number):
+                    logger.info(f"Monitor already active for PR #{pr_number}, skipping trigger")
+                    return actions
+
                 # Check if monitor is already active BEFORE triggering workflow
                 # This prevents duplicate workflow runs and duplicate monitors
                 with _active_monitors_lock:
@@ -1474,8 +1518,14 @@ def _handle_pr_merge(
                         head_sha = pr_data.get("head", {}).get("sha")
 
                         try:
-                            monitor_thread = threading.Thread(target=_run_async_monitor, args=(repo_name, pr_number, head_sha, workflow_id), daemon=True)
-                            monitor_thread.start()
+                            if monitor_service is not None:
+                                # The service tracks the PR from here on; no thread holds the slot
+                                with _active_monitors_lock:
+                                    _active_monitors.discard(pr_number)
+                                monitor_service.register(repo_name, pr_number, head_sha, workflow_id)
+                            else:
+                                monitor_thread = threading.Thread(target=_run_async_monitor, args=(repo_name, pr_number, head_sha, workflow_id), daemon=True)
+                                monitor_thread.start()
                             actions.append(f"Started async monitor for {workflow_id}")
                             get_trace_logger().log("CI Trigger", f"Started async monitor for PR #{pr_number}", item_type="pr", item_number=pr_number, details={"monitor": True})
                         except Exception as e:
@@ -1523,6 +1573,10 @@ def _handle_pr_merge(
                 return actions
 
             merge_result = _merge_pr(repo_name, pr_number, analysis, config, github_client=github_client)
+            if merge_result is None:
+                # Checks passed; the resolver re-queues the PR once GitHub has computed mergeability
+                actions.append(f"Merge of PR #{pr_number} deferred until GitHub resolves mergeability")
+                return actions
             if merge_result:
                 actions.append(f"Successfully merged PR #{pr_number}")
 
@@ -1773,10 +1827,13 @@ def _force_checkout_pr_manually(repo_name: str, pr_data: Dict[str, Any], config:
             log_action(f"Warning: git clean failed for PR #{pr_number}", False, clean_result.stderr)
 
         # Fetch the PR branch directly
-        fetch_result = cmd.run_command(["git", "fetch", "origin", f"{branch_name}:{branch_name}"])
+        start_point = branch_name
+        fetch_result = git_fetch([f"{branch_name}:{branch_name}"], run_command=cmd.run_command)
         if not fetch_result.success:
-            # Try fetching from pull request ref
-            fetch_result = cmd.run_command(["git", "fetch", "origin", f"pull/{pr_number}/head"])
+            # Try fetching from pull request ref. It goes to a ref of its own rather than
+            # FETCH_HEAD, which any later fetch (possibly skipped as fresh) overwrites.
+            start_point = f"refs/remotes/origin/pr/{pr_number}"
+            fetch_result = git_fetch([f"+pull/{pr_number}/head:{start_point}"], run_command=cmd.run_command)
             if not fetch_result.success:
                 log_action(f"Failed to fetch PR #{pr_number} branch", False, fetch_result.stderr)
                 return False
@@ -1786,7 +1843,7 @@ def _force_checkout_pr_manually(repo_name: str, pr_data: Dict[str, Any], config:
             checkout_result = cmd.run_command(["git", "checkout", branch_name])
             if not checkout_result.success:
                 # If branch doesn't exist locally, checkout from fetched ref
-                checkout_result = cmd.run_command(["git", "checkout", "-b", branch_name, "FETCH_HEAD"])
+                checkout_result = cmd.run_command(["git", "checkout", "-b", branch_name, start_point])
 
                 if not checkout_result.success:
                     log_action(
@@ -1798,7 +1855,7 @@ def _force_checkout_pr_manually(repo_name: str, pr_data: Dict[str, Any], config:
         else:
             # If not checking out, ensure the branch exists/updates from the fetched head
             # If we fetched to branch_name:branch_name, it's already updated.
-            # If we fetched to FETCH_HEAD (fallback), we need to update/create the local branch.
+            # If we fetched the pull request ref (fallback), we need to update/create the local branch.
             if not fetch_result.success and "FETCH_HEAD" in str(fetch_result.stdout or ""):
                 # This logic is tricky because we rely on previous fetch_result variable which might be from branch:branch attempt.
                 pass
@@ -1813,7 +1870,7 @@ def _force_checkout_pr_manually(repo_name: str, pr_data: Dict[str, Any], config:
         # NOTE: The block above was complex. Re-implementing clearer logic for finish.
 
         if not perform_checkout:
-            # Logic to ensure branch ref exists if we fetched to FETCH_HEAD
+            # Logic to ensure branch ref exists if we fetched the pull request ref
             # If branch:branch succeeded, the branch ref is updated.
             # If pull/N/head succeeded, we need to create/update local branch ptr.
 
@@ -1827,15 +1884,15 @@ def _force_checkout_pr_manually(repo_name: str, pr_data: Dict[str, Any], config:
 
             verify = cmd.run_command(["git", "rev-parse", "--verify", branch_name])
             if not verify.success:
-                # It must have been the FETCH_HEAD case or branch didn't exist before.
+                # It must have been the pull request ref case or branch didn't exist before.
                 # Create/Update it.
-                cmd.run_command(["git", "branch", "-f", branch_name, "FETCH_HEAD"])
+                cmd.run_command(["git", "branch", "-f", branch_name, start_point])
             return True
 
         checkout_result = cmd.run_command(["git", "checkout", branch_name])
         if not checkout_result.success:
             # If branch doesn't exist locally, checkout from fetched ref
-            checkout_result = cmd.run_command(["git", "checkout", "-b", branch_name, "FETCH_HEAD"])
+            checkout_result = cmd.run_command(["git", "checkout", "-b", branch_name, start_point])
 
             if not checkout_result.success:
                 log_action(
@@ -1870,8 +1927,8 @@ def _update_with_base_branch(
         # Determine target base branch for this PR
         target_branch = pr_data.get("base_branch") or pr_data.get("base", {}).get("ref") or config.MAIN_BRANCH
 
-        # Fetch latest changes from origin
-        result = cmd.run_command(["git", "fetch", "origin"])
+        # Fetch the base branch only (shared with concurrent workers)
+        result = git_fetch([target_branch], run_command=cmd.run_command)
         if not result.success:
             actions.append(f"Failed to fetch latest changes: {result.stderr}")
             return actions
@@ -1903,7 +1960,6 @@ def _update_with_base_branch(
             else:
                 # Push failed - try one more time after a brief pause
                 logger.warning(f"First push attempt failed: {push_result.stderr}, retrying...")
-                import time
 
                 time.sleep(2)
                 retry_push_result = git_push()
@@ -2583,7 +2639,7 @@ def _merge_pr(
     analysis: Dict[str, Any],
     config: AutomationConfig,
     github_client: Optional[Any] = None,
-) -> bool:
+) -> Optional[bool]:
     """Merge a PR using GitHub CLI with conflict resolution and simple fallbacks.
 
     Fallbacks (no LLM):
@@ -2592,6 +2648,10 @@ def _merge_pr(
 
     After successful merge, automatically closes any issues referenced in the PR body
     using GitHub's linking keywords (closes, fixes, resolves, etc.)
+
+    Returns:
+        True if merged, False if the merge failed, or None if the merge was
+        deferred until the mergeability resolver re-queues the PR
     """
     try:
         from auto_coder.util.gh_cache import get_ghapi_client
@@ -2690,6 +2750,13 @@ def _merge_pr(
 
             # Try to resolve merge conflicts
             if _resolve_pr_merge_conflicts(repo_name, pr_number, config):
+                # Under the engine, merge once the resolver re-queues the PR instead of waiting here
+                resolver = get_mergeability_resolver()
+                if resolver is not None and resolver.wait_for(repo_name, pr_number):
+                    logger.info(f"Conflicts resolved for PR #{pr_number}, merge deferred until GitHub updates mergeable state")
+                    log_action(f"Deferred merge of PR #{pr_number} until GitHub resolves mergeability")
+                    return None
+
                 # Poll for mergeability
                 logger.info(f"Conflicts resolved for PR #{pr_number}, waiting for GitHub to update mergeable state")
                 log_action(f"Polling mergeable state for PR #{pr_number} after conflict resolution")
@@ -2757,28 +2824,12 @@ def _poll_pr_mergeable(
     timeout_seconds: int = 60,
     interval: int = 5,
 ) -> bool:
-    """Poll PR mergeable state for a short period. Returns True if becomes mergeable.
-    Uses: gh pr view <num> --repo <repo> --json mergeable,mergeStateStatus
+    """Wait for GitHub to compute PR mergeability. Returns True if the PR is mergeable.
+    Queries mergeable via GraphQL, doubling the delay from interval between queries.
     """
     try:
-        from auto_coder.util.gh_cache import get_ghapi_client
-
-        token = GitHubClient.get_instance().token
-        api = get_ghapi_client(token)
-        owner, repo = repo_name.split("/")
-
-        deadline = datetime.now().timestamp() + timeout_seconds
-        while datetime.now().timestamp() < deadline:
-            try:
-                pr_info = api.pulls.get(owner, repo, pr_number)
-                if pr_info.get("mergeable") is True:
-                    return True
-            except Exception:
-                pass
-
-            # Sleep before next poll
-            time.sleep(max(1, interval))
-        return False
+        state = wait_until_resolved(repo_name, pr_number, timeout_seconds, initial_delay_seconds=max(1, interval), github_client=GitHubClient.get_instance())
+        return bool(state and state["mergeable"] is True)
     except Exception:
         return False
 
@@ -2787,27 +2838,10 @@ def _get_allowed_merge_methods(repo_name: str) -> List[str]:
     """Return list of allowed merge method flags for the repository.
     Maps GitHub repo settings to gh merge flags.
     """
-    allowed: List[str] = []
     try:
-        # Use GhApi to get allowed merge methods
-        from auto_coder.util.gh_cache import get_ghapi_client
-
-        token = GitHubClient.get_instance().token
-        api = get_ghapi_client(token)
-        owner, repo = repo_name.split("/")
-
-        repo_data = api.repos.get(owner, repo)
-
-        if repo_data.get("allow_squash_merge"):
-            allowed.append("--squash")
-        if repo_data.get("allow_merge_commit"):
-            allowed.append("--merge")
-        if repo_data.get("allow_rebase_merge"):
-            allowed.append("--rebase")
-
-        return allowed
+        return GitHubClient.get_instance().repo_metadata.get_allowed_merge_methods(repo_name)
     except Exception as e:
-        logger.warning(f"Failed to get allowed merge methods via GhApi: {e}")
+        logger.warning(f"Failed to get allowed merge methods: {e}")
         return []
 
 
@@ -2864,7 +2898,7 @@ def _resolve_pr_merge_conflicts(repo_name: str, pr_number: int, config: Automati
 
         # Step 3: Fetch the latest base branch
         logger.info(f"Fetching latest {base_branch} branch")
-        fetch_result = cmd.run_command(["git", "fetch", "origin", base_branch])
+        fetch_result = git_fetch([base_branch], run_command=cmd.run_command)
 
         if not fetch_result.success:
             logger.error(f"Failed to fetch {base_branch} branch: {fetch_result.stderr}")
@@ -2885,7 +2919,6 @@ def _resolve_pr_merge_conflicts(repo_name: str, pr_number: int, config: Automati
             else:
                 # Push failed - try one more time after a brief pause
                 logger.warning(f"First push attempt failed: {push_result.stderr}, retrying...")
-                import time
 
                 time.sleep(2)
                 retry_push_result = git_push()
@@ -2902,6 +2935,11 @@ def _resolve_pr_merge_conflicts(repo_name: str, pr_number: int, config: Automati
             # Get conflict information
             conflict_info = _get_merge_conflict_info()
 
+            # Lockfile and package.json dependency conflicts do not need the LLM
+            resolved = resolve_dependency_conflicts_without_llm({"number": pr_number, "base_branch": base_branch}, base_branch, conflict_info, config)
+            if resolved is not None:
+                return resolved
+
             # Use LLM to resolve conflicts
             resolve_actions = resolve_merge_conflicts_with_llm(
                 {"number": pr_number, "base_branch": base_branch},
@@ -13,6 +13,7 @@ import time
 from typing import Any, Literal, Optional, TextIO, cast
 
 from .logger_config import get_logger
+from .metrics import get_metrics_registry, normalize_stage
 
 logger = get_logger(__name__)
 
@@ -515,6 +516,7 @@ class ProgressStage:
 
     def __enter__(self) -> "ProgressStage":
         """Enter the context and push the stage."""
+        self._started = time.perf_counter()
         footer = get_progress_footer()
         if self.item_type and self.item_number:
             # Set item info and push stage
@@ -527,6 +529,7 @@ class ProgressStage:
 
     def __exit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> Literal[False]:
         """Exit the context and pop the stage."""
+        get_metrics_registry().observe("auto_coder_stage_seconds", time.perf_counter() - self._started, stage=normalize_stage(self.stage))
         footer = get_progress_footer()
         if self.item_type and self.item_number:
             # Pop stage and clear item info
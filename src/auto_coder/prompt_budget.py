@@ -0,0 +1,279 @@
+"""Token-budgeted prompt assembly.
+
+Prompt fields such as the PR diff, commit log, linked issue context and CI logs
+used to be passed to render_prompt whole or cut at a fixed character offset.
+PromptBudget estimates the tokens of every field, splits a total budget between
+them by weight (fields smaller than their share hand the surplus to the others)
+and shrinks oversized fields structurally:
+
+- diffs: lockfile/generated-file sections are replaced by a one-line stub,
+  unchanged context is collapsed, and files touching priority paths (e.g. the
+  failing tests) are kept before the rest;
+- logs: repeated lines are deduplicated and the middle of an overlong log is
+  dropped, keeping its head and tail.
+
+Budgeting is opt-in via [prompt_budget].enabled in config.toml.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Sequence
+
+from .logger_config import get_logger
+
+logger = get_logger(__name__)
+
+# Rough average for English text and code with the tokenizers in use
+CHARS_PER_TOKEN = 4
+DEFAULT_MAX_TOKENS = 12000
+
+_GENERATED_NAMES = {
+    "package-lock.json",
+    "yarn.lock",
+    "pnpm-lock.yaml",
+    "poetry.lock",
+    "uv.lock",
+    "Pipfile.lock",
+    "Cargo.lock",
+    "Gemfile.lock",
+    "composer.lock",
+    "go.sum",
+    "bun.lockb",
+}
+_GENERATED_RE = re.compile(r"(\.min\.(js|css)|\.map|\.snap|\.pb\.go|_pb2\.py|\.generated\.\w+)$|(^|/)(dist|build|vendor|node_modules|__snapshots__)/")
+_FILE_HEADER_RE = re.compile(r"^diff --git a/(\S+) b/(\S+)", re.MULTILINE)
+_NUMBER_RE = re.compile(r"\d+")
+_TEST_PATH_RE = re.compile(r"(^|/)(tests?|__tests__|spec)/|(^|/)test_[^/]+$|_test\.\w+$|\.(test|spec)\.\w+$")
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of tokens in text."""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def is_generated_path(path: str) -> bool:
+    """Return True for lockfiles and generated/vendored files whose diff is noise to an LLM."""
+    return path.rsplit("/", 1)[-1] in _GENERATED_NAMES or bool(_GENERATED_RE.search(path))
+
+
+@dataclass
+class _FileDiff:
+    path: str
+    text: str
+    added: int = 0
+    removed: int = 0
+
+    @property
+    def stub(self) -> str:
+        return f"diff --git a/{self.path} b/{self.path}\n[... diff omitted: {self.path} (+{self.added} -{self.removed} lines)]\n"
+
+
+def _split_diff(diff: str) -> List[_FileDiff]:
+    starts = [m.start() for m in _FILE_HEADER_RE.finditer(diff)]
+    if not starts:
+        return []
+    files = []
+    for i, start in enumerate(starts):
+        text = diff[start : starts[i + 1] if i + 1 < len(starts) else len(diff)]
+        match = _FILE_HEADER_RE.match(text)
+        path = match.group(2) if match else ""
+        added = sum(1 for line in text.splitlines() if line.startswith("+") and not line.startswith("+++"))
+        removed = sum(1 for line in text.splitlines() if line.startswith("-") and not line.startswith("---"))
+        files.append(_FileDiff(path, text if text.endswith("\n") else text + "\n", added, removed))
+    return files
+
+
+def _collapse_context(text: str, keep: int) -> str:
+    """Shrink runs of unchanged context lines in a file diff to keep lines on each side."""
+    out: List[str] = []
+    run: List[str] = []
+    in_hunk = False
+
+    def _flush() -> None:
+        if len(run) > 2 * keep + 1:
+            out.extend(run[:keep])
+            out.append(f" [... {len(run) - 2 * keep} unchanged lines ...]")
+            out.extend(run[len(run) - keep :] if keep else [])
+        else:
+            out.extend(run)
+        run.clear()
+
+    for line in text.splitlines():
+        if line.startswith("@@"):
+            _flush()
+            in_hunk = True
+            out.append(line)
+        elif in_hunk and line.startswith(" "):
+            run.append(line)
+        else:
+            _flush()
+            out.append(line)
+    _flush()
+    return "\n".join(out) + "\n"
+
+
+def compact_diff(diff: str, max_chars: int, priority_paths: Sequence[str] = ()) -> str:
+    """Shrink a unified diff to at most max_chars, keeping the most useful parts.
+
+    Args:
+        diff: Unified diff (as produced by git diff / the GitHub diff media type)
+        max_chars: Character budget
+        priority_paths: Paths (or path suffixes) whose file diffs are kept first
+
+    Returns:
+        The compacted diff
+    """
+    if len(diff) <= max_chars:
+        return diff
+    files = _split_diff(diff)
+    if not files:
+        return compact_log(diff, max_chars)
+
+    files = [f if not is_generated_path(f.path) else _FileDiff(f.path, f.stub, f.added, f.removed) for f in files]
+    for keep in (3, 1, 0):
+        if sum(len(f.text) for f in files) <= max_chars:
+            break
+        files = [_FileDiff(f.path, _collapse_context(f.text, keep), f.added, f.removed) for f in files]
+
+    def _is_priority(path: str) -> bool:
+        return any(path == p or path.endswith(p) or p.endswith(path) for p in priority_paths)
+
+    # Priority files first, then small files before large ones, so more files survive intact
+    ranked = sorted(range(len(files)), key=lambda i: (not _is_priority(files[i].path), len(files[i].text)))
+    kept: Dict[int, str] = {}
+    used = 0
+    for i in ranked:
+        text = files[i].text
+        if used + len(text) <= max_chars:
+            kept[i] = text
+        elif used + len(files[i].stub) <= max_chars:
+            kept[i] = files[i].stub
+        else:
+            continue
+        used += len(kept[i])
+
+    result = "".join(kept[i] for i in sorted(kept))
+    omitted = [files[i].path for i in range(len(files)) if i not in kept]
+    if omitted:
+        result += f"[... {len(omitted)} more files omitted: {', '.join(omitted[:20])}]\n"
+    return result[:max_chars] if len(result) > max_chars else result
+
+
+def compact_log(text: str, max_chars: int) -> str:
+    """Shrink a log to at most max_chars by deduplicating lines and dropping its middle.
+
+    Consecutive lines that only differ in numbers (timestamps, counters, PIDs)
+    are folded into one, and longer lines already seen verbatim are dropped.
+    """
+    if len(text) <= max_chars:
+        return text
+    lines: List[str] = []
+    seen = set()
+    previous_key: Optional[str] = None
+    repeats = 0
+    for line in text.splitlines():
+        key = _NUMBER_RE.sub("#", line.strip())
+        if key and key == previous_key:
+            repeats += 1
+            continue
+        if repeats:
+            lines.append(f"[... previous line repeated {repeats} more times]")
+            repeats = 0
+        previous_key = key
+        # Short lines ("}", "OK") legitimately recur; only drop longer verbatim repeats
+        if len(key) > 20 and line in seen:
+            continue
+        seen.add(line)
+        lines.append(line)
+    if repeats:
+        lines.append(f"[... previous line repeated {repeats} more times]")
+
+    result = "\n".join(lines)
+    if len(result) <= max_chars:
+        return result
+    # Errors usually sit at the end of a log, so keep more of the tail than the head
+    marker = "\n[... {} lines omitted ...]\n"
+    head_budget = max_chars // 3
+    tail_budget = max_chars - head_budget - len(marker.format(len(lines)))
+    head = result[:head_budget].rsplit("\n", 1)[0] if head_budget > 0 else ""
+    tail = result[len(result) - tail_budget :].split("\n", 1)[-1] if tail_budget > 0 else ""
+    omitted = result.count("\n") - head.count("\n") - tail.count("\n")
+    return (head + marker.format(max(omitted, 0)) + tail)[:max_chars]
+
+
+def truncate_text(text: str, max_chars: int) -> str:
+    """Cut plain text at max_chars, preferring a line boundary."""
+    if len(text) <= max_chars:
+        return text
+    cut = text[:max_chars]
+    newline = cut.rfind("\n")
+    return (cut[:newline] if newline > max_chars // 2 else cut) + "\n[... truncated]"
+
+
+@dataclass
+class PromptBudget:
+    """Splits a token budget between named prompt fields."""
+
+    max_tokens: int = DEFAULT_MAX_TOKENS
+    weights: Dict[str, float] = field(default_factory=dict)
+
+    def allocate(self, fields: Dict[str, str]) -> Dict[str, int]:
+        """Return a token budget per field.
+
+        Each field gets a share proportional to its weight (1.0 if unlisted);
+        shares not needed by small fields are redistributed to larger ones.
+        """
+        need = {name: estimate_tokens(text) for name, text in fields.items()}
+        budget: Dict[str, int] = {}
+        remaining = self.max_tokens
+        pending = set(fields)
+        while pending:
+            total_weight = sum(self.weights.get(name, 1.0) for name in pending)
+            shares = {name: remaining * self.weights.get(name, 1.0) / total_weight for name in pending}
+            fitting = [name for name in pending if need[name] <= shares[name]]
+            if not fitting:
+                for name in pending:
+                    budget[name] = int(shares[name])
+                break
+            for name in fitting:
+                budget[name] = need[name]
+                remaining -= need[name]
+                pending.discard(name)
+        return budget
+
+    def fit(self, fields: Dict[str, str], compactors: Optional[Dict[str, Callable[[str, int], str]]] = None) -> Dict[str, str]:
+        """Return fields shrunk to their allocated budgets.
+
+        Args:
+            fields: Field name to text
+            compactors: Field name to a (text, max_chars) -> text function;
+                fields without one are truncated at a line boundary
+
+        Returns:
+            Field name to (possibly compacted) text
+        """
+        compactors = compactors or {}
+        budgets = self.allocate(fields)
+        result: Dict[str, str] = {}
+        for name, text in fields.items():
+            max_chars = budgets[name] * CHARS_PER_TOKEN
+            if len(text) <= max_chars:
+                result[name] = text
+                continue
+            result[name] = compactors.get(name, truncate_text)(text, max_chars)
+            logger.debug(f"Compacted prompt field '{name}' from ~{estimate_tokens(text)} to ~{estimate_tokens(result[name])} tokens")
+        return result
+
+
+def diff_test_paths(diff: str) -> List[str]:
+    """Return the test file paths touched by a unified diff."""
+    return [m.group(2) for m in _FILE_HEADER_RE.finditer(diff) if _TEST_PATH_RE.search(m.group(2))]
+
+
+def get_prompt_budget(weights: Optional[Dict[str, float]] = None) -> Optional[PromptBudget]:
+    """Return a PromptBudget sized from config, or None when [prompt_budget].enabled is off."""
+    from .llm_backend_config import get_prompt_budget_enabled_from_config, get_prompt_budget_max_tokens_from_config
+
+    if not get_prompt_budget_enabled_from_config():
+        return None
+    return PromptBudget(max_tokens=get_prompt_budget_max_tokens_from_config(), weights=dict(weights or {}))
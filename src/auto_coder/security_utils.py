@@ -22,6 +22,16 @@ REDACTION_PATTERNS = [
 ]
 
 
+# All patterns compiled into a single alternation so a string is scanned once
+_REDACTION_REGEX = re.compile("|".join(f"(?:{pattern})" for pattern in REDACTION_PATTERNS))
+
+# Every pattern starts with one of these literals; text containing none of them
+# cannot match and skips the regex entirely (the common case for log lines).
+_REDACTION_PREFILTER_LITERALS = ("gh", "github_pat", "AIza", "sk-", "AKIA", "ASIA", "ABIA", "ACCA", "xox", "glpat")
+
+REDACTED_PLACEHOLDER = "[REDACTED]"
+
+
 def redact_string(text: str) -> str:
     """
     Redact sensitive information from a string.
@@ -35,10 +45,9 @@ def redact_string(text: str) -> str:
     if not text:
         return text
 
-    redacted = text
-    for pattern in REDACTION_PATTERNS:
-        redacted = re.sub(pattern, "[REDACTED]", redacted)
-    return redacted
+    if not any(literal in text for literal in _REDACTION_PREFILTER_LITERALS):
+        return text
+    return _REDACTION_REGEX.sub(REDACTED_PLACEHOLDER, text)
 
 
 def redact_data(data: Any) -> Any:
@@ -0,0 +1,267 @@
+"""Test impact selection for fix-to-pass-tests loops.
+
+Maps source files to the test files that exercise them so a fix attempt can be
+verified by running only the failing tests plus the tests affected by the
+attempt's diff. Two sources of truth are combined:
+
+- A static import graph built from Python (``import``/``from ... import``) and
+  TypeScript/JavaScript (``import``/``export ... from``/``require``) sources.
+- An optional coverage-derived map recorded from ``coverage json --show-contexts``
+  output produced by full test runs.
+"""
+
+import ast
+import json
+import os
+import re
+from collections import deque
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+
+from .logger_config import get_logger
+from .utils import CommandExecutor
+
+logger = get_logger(__name__)
+cmd = CommandExecutor()
+
+COVERAGE_MAP_PATH = Path(".auto-coder") / "test_impact_map.json"
+
+_PY_EXTENSIONS = (".py",)
+_JS_EXTENSIONS = (".ts", ".tsx", ".js", ".jsx", ".mjs", ".cjs")
+_SKIP_DIRS = {".git", "node_modules", "__pycache__", ".venv", "venv", "dist", "build", ".auto-coder"}
+
+_JS_IMPORT_PATTERN = re.compile(
+    r"""(?:import|export)\s[^'"`;]*?from\s*['"]([^'"]+)['"]"""
+    r"""|import\s*\(\s*['"]([^'"]+)['"]\s*\)"""
+    r"""|require\(\s*['"]([^'"]+)['"]\s*\)"""
+    r"""|import\s+['"]([^'"]+)['"]"""
+)
+
+
+def is_test_file(path: str) -> bool:
+    """Return True if the path looks like a pytest, Playwright or Vitest test file."""
+    name = os.path.basename(path)
+    if name.endswith(".py"):
+        return name.startswith("test_") or name.endswith("_test.py")
+    for ext in _JS_EXTENSIONS:
+        if name.endswith(f".spec{ext}") or name.endswith(f".test{ext}"):
+            return True
+    return False
+
+
+def _list_source_files(root: Path) -> List[str]:
+    """List tracked and untracked (non-ignored) source files relative to root."""
+    result = cmd.run_command(["git", "ls-files", "--cached", "--others", "--exclude-standard"], cwd=str(root))
+    files: List[str] = []
+    if result.success:
+        files = [line.strip() for line in result.stdout.splitlines() if line.strip()]
+    else:
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames[:] = [d for d in dirnames if d not in _SKIP_DIRS]
+            for filename in filenames:
+                files.append(os.path.relpath(os.path.join(dirpath, filename), root))
+    return [f.replace(os.sep, "/") for f in files if f.endswith(_PY_EXTENSIONS + _JS_EXTENSIONS)]
+
+
+def list_test_files(root: Optional[str] = None) -> List[str]:
+    """List the test files in the repository, sorted by path."""
+    root_path = Path(root) if root else Path.cwd()
+    return sorted(f for f in _list_source_files(root_path) if is_test_file(f))
+
+
+def _build_python_module_index(files: Iterable[str]) -> Dict[str, str]:
+    """Map dotted module names to file paths, for both repo-root and src/ layouts."""
+    index: Dict[str, str] = {}
+    for path in files:
+        if not path.endswith(".py"):
+            continue
+        parts = path[:-3].split("/")
+        if parts[-1] == "__init__":
+            parts = parts[:-1]
+        if not parts:
+            continue
+        index.setdefault(".".join(parts), path)
+        if parts[0] == "src" and len(parts) > 1:
+            index.setdefault(".".join(parts[1:]), path)
+    return index
+
+
+def _python_imports(path: str, source: str, module_index: Dict[str, str]) -> Set[str]:
+    """Resolve the repository files imported by a Python source file."""
+    try:
+        tree = ast.parse(source, filename=path)
+    except (SyntaxError, ValueError):
+        return set()
+
+    package_parts = path[:-3].split("/")[:-1]
+    if package_parts and package_parts[0] == "src":
+        package_parts = package_parts[1:]
+
+    deps: Set[str] = set()
+
+    def _add(module_name: str) -> None:
+        # Walk up dotted names so "pkg.mod.func" resolves to pkg/mod.py
+        parts = module_name.split(".")
+        while parts:
+            target = module_index.get(".".join(parts))
+            if target:
+                deps.add(target)
+                return
+            parts = parts[:-1]
+
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                _add(alias.name)
+        elif isinstance(node, ast.ImportFrom):
+            if node.level:
+                base = package_parts[: len(package_parts) - (node.level - 1)] if node.level > 1 else list(package_parts)
+                prefix = ".".join(base + ([node.module] if node.module else []))
+            else:
+                prefix = node.module or ""
+            if not prefix:
+                continue
+            for alias in node.names:
+                _add(f"{prefix}.{alias.name}")
+            _add(prefix)
+    return deps
+
+
+def _resolve_js_specifier(importer: str, specifier: str, known_files: Set[str]) -> Optional[str]:
+    """Resolve a relative JS/TS import specifier to a repository file."""
+    if not specifier.startswith("."):
+        return None
+    base = os.path.normpath(os.path.join(os.path.dirname(importer), specifier)).replace(os.sep, "/")
+    candidates = [base] + [base + ext for ext in _JS_EXTENSIONS] + [f"{base}/index{ext}" for ext in _JS_EXTENSIONS]
+    # TypeScript sources commonly import "./foo.js" while the file on disk is foo.ts
+    stem, ext = os.path.splitext(base)
+    if ext in _JS_EXTENSIONS:
+        candidates.extend(stem + alt for alt in _JS_EXTENSIONS)
+    for candidate in candidates:
+        if candidate in known_files:
+            return candidate
+    return None
+
+
+def _js_imports(path: str, source: str, known_files: Set[str]) -> Set[str]:
+    """Resolve the repository files imported by a JS/TS source file."""
+    deps: Set[str] = set()
+    for match in _JS_IMPORT_PATTERN.finditer(source):
+        specifier = next((g for g in match.groups() if g), None)
+        if not specifier:
+            continue
+        resolved = _resolve_js_specifier(path, specifier, known_files)
+        if resolved:
+            deps.add(resolved)
+    return deps
+
+
+def build_import_graph(root: Optional[str] = None) -> Dict[str, Set[str]]:
+    """Build a reverse import graph: file -> set of files that import it."""
+    root_path = Path(root) if root else Path.cwd()
+    files = _list_source_files(root_path)
+    known_files = set(files)
+    module_index = _build_python_module_index(files)
+
+    dependents: Dict[str, Set[str]] = {}
+    for path in files:
+        try:
+            source = (root_path / path).read_text(encoding="utf-8", errors="replace")
+        except OSError:
+            continue
+        if path.endswith(_PY_EXTENSIONS):
+            deps = _python_imports(path, source, module_index)
+        else:
+            deps = _js_imports(path, source, known_files)
+        for dep in deps:
+            if dep != path:
+                dependents.setdefault(dep, set()).add(path)
+    return dependents
+
+
+def load_coverage_map(path: Path = COVERAGE_MAP_PATH) -> Dict[str, Set[str]]:
+    """Load the recorded coverage-derived map (source file -> test files)."""
+    if not path.exists():
+        return {}
+    try:
+        with path.open("r", encoding="utf-8") as handle:
+            data = json.load(handle)
+        return {src: set(tests) for src, tests in data.get("files", {}).items()}
+    except Exception as e:
+        logger.warning(f"Failed to load test impact coverage map from {path}: {e}")
+        return {}
+
+
+def record_coverage_map(coverage_json_path: str, path: Path = COVERAGE_MAP_PATH) -> bool:
+    """Record a source -> tests map from a ``coverage json --show-contexts`` report.
+
+    Contexts are expected in pytest-cov's ``tests/test_x.py::test_name|run`` format.
+    Returns True when a map was written.
+    """
+    try:
+        with open(coverage_json_path, "r", encoding="utf-8") as handle:
+            report = json.load(handle)
+    except Exception as e:
+        logger.debug(f"Skipping coverage map recording, cannot read {coverage_json_path}: {e}")
+        return False
+
+    mapping: Dict[str, Set[str]] = {}
+    for src, info in report.get("files", {}).items():
+        contexts = info.get("contexts") or {}
+        for ctx_list in contexts.values():
+            for ctx in ctx_list:
+                test_path = ctx.split("::", 1)[0].split("|", 1)[0]
+                if test_path and is_test_file(test_path):
+                    mapping.setdefault(src.replace(os.sep, "/"), set()).add(test_path)
+
+    if not mapping:
+        return False
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8") as handle:
+        json.dump({"files": {src: sorted(tests) for src, tests in sorted(mapping.items())}}, handle, indent=2)
+    logger.info(f"Recorded test impact coverage map for {len(mapping)} source files")
+    return True
+
+
+def get_changed_files(cwd: Optional[str] = None) -> List[str]:
+    """Return files changed in the working tree relative to HEAD, including untracked files."""
+    changed: Set[str] = set()
+    diff = cmd.run_command(["git", "diff", "--name-only", "HEAD"], cwd=cwd)
+    if diff.success:
+        changed.update(line.strip() for line in diff.stdout.splitlines() if line.strip())
+    untracked = cmd.run_command(["git", "ls-files", "--others", "--exclude-standard"], cwd=cwd)
+    if untracked.success:
+        changed.update(line.strip() for line in untracked.stdout.splitlines() if line.strip())
+    return sorted(changed)
+
+
+def select_impacted_tests(
+    changed_files: Iterable[str],
+    root: Optional[str] = None,
+    import_graph: Optional[Dict[str, Set[str]]] = None,
+    coverage_map: Optional[Dict[str, Set[str]]] = None,
+) -> List[str]:
+    """Return the test files affected by the given changed files.
+
+    Changed test files are selected directly; other files are followed through the
+    reverse import graph transitively, and the coverage map is consulted as well.
+    """
+    graph = import_graph if import_graph is not None else build_import_graph(root)
+    coverage = coverage_map if coverage_map is not None else load_coverage_map()
+
+    selected: Set[str] = set()
+    seen: Set[str] = set()
+    queue = deque(f.replace(os.sep, "/") for f in changed_files)
+    while queue:
+        current = queue.popleft()
+        if current in seen:
+            continue
+        seen.add(current)
+        if is_test_file(current):
+            selected.add(current)
+        selected.update(coverage.get(current, set()))
+        queue.extend(graph.get(current, set()) - seen)
+
+    root_path = Path(root) if root else Path.cwd()
+    return sorted(t for t in selected if (root_path / t).exists())
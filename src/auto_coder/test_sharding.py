@@ -0,0 +1,147 @@
+"""Parallel sharded execution of the local test script.
+
+Splits the discovered test files into N shards balanced by historical durations,
+runs each shard as a separate TEST_SCRIPT_PATH process (or ``docker exec`` into the
+target container) concurrently, and merges the outputs and failure lists into a
+single result compatible with run_local_tests consumers.
+"""
+
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .automation_config import AutomationConfig
+from .logger_config import get_logger
+from .test_impact import list_test_files
+from .test_log_utils import extract_all_failed_tests
+from .utils import CommandExecutor, CommandResult, get_target_container
+
+logger = get_logger(__name__)
+cmd = CommandExecutor()
+
+DURATIONS_PATH = Path(".auto-coder") / "test_durations.json"
+
+# Estimated duration (seconds) for test files without recorded history
+DEFAULT_TEST_DURATION = 1.0
+
+
+@dataclass
+class ShardedTestResult(CommandResult):
+    """Merged result of a sharded test run."""
+
+    command: str = ""
+    failed_tests: List[str] = field(default_factory=list)
+    shard_count: int = 0
+
+
+def load_test_durations(path: Path = DURATIONS_PATH) -> Dict[str, float]:
+    """Load recorded per-file test durations (seconds)."""
+    if not path.exists():
+        return {}
+    try:
+        with path.open("r", encoding="utf-8") as handle:
+            data = json.load(handle)
+        return {str(k): float(v) for k, v in data.items()}
+    except Exception as e:
+        logger.warning(f"Failed to load test durations from {path}: {e}")
+        return {}
+
+
+def save_test_durations(durations: Dict[str, float], path: Path = DURATIONS_PATH) -> None:
+    """Persist per-file test durations (seconds)."""
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("w", encoding="utf-8") as handle:
+            json.dump({k: round(v, 3) for k, v in sorted(durations.items())}, handle, indent=2)
+    except Exception as e:
+        logger.warning(f"Failed to save test durations to {path}: {e}")
+
+
+def partition_shards(test_files: List[str], shard_count: int, durations: Optional[Dict[str, float]] = None) -> List[List[str]]:
+    """Split test files into at most shard_count shards with balanced total duration.
+
+    Uses longest-processing-time-first greedy assignment: the slowest files are
+    placed first, each into the currently lightest shard.
+    """
+    durations = durations or {}
+    shard_count = max(1, min(shard_count, len(test_files)))
+    shards: List[List[str]] = [[] for _ in range(shard_count)]
+    loads = [0.0] * shard_count
+
+    ordered = sorted(test_files, key=lambda f: (-durations.get(f, DEFAULT_TEST_DURATION), f))
+    for test_file in ordered:
+        index = loads.index(min(loads))
+        shards[index].append(test_file)
+        loads[index] += durations.get(test_file, DEFAULT_TEST_DURATION)
+
+    return [sorted(shard) for shard in shards if shard]
+
+
+def _update_durations(durations: Dict[str, float], shard: List[str], elapsed: float) -> None:
+    """Apportion a shard's elapsed time across its files, weighted by prior estimates."""
+    weights = {f: durations.get(f, DEFAULT_TEST_DURATION) for f in shard}
+    total = sum(weights.values()) or 1.0
+    for test_file, weight in weights.items():
+        durations[test_file] = elapsed * weight / total
+
+
+def run_sharded_tests(config: AutomationConfig, shard_count: int, test_files: Optional[List[str]] = None) -> Optional[ShardedTestResult]:
+    """Run the test script concurrently over shard_count shards and merge the results.
+
+    Returns None when there are fewer than two test files to split, so callers can
+    fall back to a single serial run.
+    """
+    files = test_files if test_files is not None else list_test_files()
+    if len(files) < 2 or shard_count < 2:
+        return None
+
+    durations = load_test_durations()
+    shards = partition_shards(files, shard_count, durations)
+    target_container = get_target_container(config)
+    logger.info(f"Running {len(files)} test files in {len(shards)} parallel shards")
+
+    def _run_shard(index: int, shard: List[str]) -> tuple[CommandResult, float]:
+        env_overrides = {"AUTO_CODER_TEST_SHARD": f"{index + 1}/{len(shards)}"}
+        if target_container:
+            cmd_list = ["docker", "exec", "-e", f"AUTO_CODER_TEST_SHARD={index + 1}/{len(shards)}", target_container, "bash", config.TEST_SCRIPT_PATH, *shard]
+        else:
+            cmd_list = ["bash", config.TEST_SCRIPT_PATH, *shard]
+        started = time.monotonic()
+        result = cmd.run_command(cmd_list, timeout=cmd.DEFAULT_TIMEOUTS["test"], env_overrides=env_overrides)
+        return result, time.monotonic() - started
+
+    with ThreadPoolExecutor(max_workers=len(shards), thread_name_prefix="TestShard") as pool:
+        futures = [pool.submit(_run_shard, i, shard) for i, shard in enumerate(shards)]
+        outcomes = [future.result() for future in futures]
+
+    stdout_parts: List[str] = []
+    stderr_parts: List[str] = []
+    failed_tests: List[str] = []
+    return_code = 0
+    for index, (shard, (result, elapsed)) in enumerate(zip(shards, outcomes)):
+        header = f"===== Test shard {index + 1}/{len(shards)} ({len(shard)} files, {elapsed:.1f}s): {'PASSED' if result.success else 'FAILED'} ====="
+        stdout_parts.append(f"{header}\n{result.stdout}")
+        if result.stderr:
+            stderr_parts.append(f"{header}\n{result.stderr}")
+        if not result.success:
+            if return_code == 0:
+                return_code = result.returncode or 1
+            for test_file in extract_all_failed_tests(result.stdout, result.stderr):
+                if test_file not in failed_tests:
+                    failed_tests.append(test_file)
+        _update_durations(durations, shard, elapsed)
+
+    save_test_durations(durations)
+
+    return ShardedTestResult(
+        success=return_code == 0,
+        stdout="\n".join(stdout_parts),
+        stderr="\n".join(stderr_parts),
+        returncode=return_code,
+        command=f"bash {config.TEST_SCRIPT_PATH} (sharded x{len(shards)})",
+        failed_tests=failed_tests,
+        shard_count=len(shards),
+    )
@@ -1,35 +1,65 @@
 """
 Test Watcher MCP Client for querying test results.
+
+The client keeps one long-lived connection to the test_watcher MCP server. A
+reader thread dispatches JSON-RPC responses by request id and forwards server
+notifications to result subscribers, so callers can block until the watcher
+finishes a run instead of polling it. Use get_shared_test_watcher_client() to
+share a single connection across the engine.
 """
 
+import atexit
+import itertools
 import json
+import os
 import subprocess
+import threading
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, List, Optional
 
 from .logger_config import get_logger
 
 logger = get_logger(__name__)
 
+MCP_PROTOCOL_VERSION = "2024-11-05"
+RESULTS_RESOURCE_URI = "test-watcher://status"
+DEFAULT_REQUEST_TIMEOUT = 30.0
+
 
 class TestWatcherClient:
     """Client for querying test_watcher MCP server."""
 
-    def __init__(self, mcp_server_path: Optional[str] = None, project_root: Optional[str] = None):
+    def __init__(
+        self,
+        mcp_server_path: Optional[str] = None,
+        project_root: Optional[str] = None,
+        request_timeout: float = DEFAULT_REQUEST_TIMEOUT,
+    ):
         """
         Initialize Test Watcher Client.
 
         Args:
             mcp_server_path: Path to test_watcher MCP server
             project_root: Project root directory
+            request_timeout: Seconds to wait for a response to a single request
         """
         self.mcp_server_path = mcp_server_path or str(Path.home() / "mcp_servers" / "test_watcher")
         self.project_root = project_root or str(Path.cwd())
+        self.request_timeout = request_timeout
         self.process: Optional[subprocess.Popen] = None
+        self.restart_count = 0
+
+        self._ids = itertools.count(1)
+        self._write_lock = threading.Lock()
+        self._pending: Dict[int, Dict[str, Any]] = {}
+        self._pending_lock = threading.Lock()
+        self._subscribers: List[Callable[[Dict[str, Any]], None]] = []
+        self._subscribed = False
+        self._results_ready = threading.Event()
 
     def start_server(self) -> bool:
         """
-        Start the MCP server if not already running.
+        Start the MCP server if not already running and complete the MCP handshake.
 
         Returns:
             True if server started successfully
@@ -47,8 +77,6 @@ class TestWatcherClient:
             else:
                 cmd = ["uv", "run", str(server_path / "server.py")]
 
-            import os
-
             env = os.environ.copy()
             env["TEST_WATCHER_PROJECT_ROOT"] = self.project_root
 
@@ -60,12 +88,20 @@ class TestWatcherClient:
                 env=env,
                 text=True,
             )
+            self._subscribed = False
+            threading.Thread(target=self._read_stdout, args=(self.process,), name="TestWatcherReader", daemon=True).start()
+            threading.Thread(target=self._drain_stderr, args=(self.process,), name="TestWatcherStderr", daemon=True).start()
+
+            self._initialize()
+            if self._subscribers:
+                self._subscribe()
 
             logger.info(f"Started test_watcher MCP server (PID: {self.process.pid})")
             return True
 
         except Exception as e:
             logger.error(f"Failed to start MCP server: {e}")
+            self.stop_server()
             return False
 
     def stop_server(self):
@@ -77,6 +113,173 @@ class TestWatcherClient:
             except subprocess.TimeoutExpired:
                 self.process.kill()
             logger.info("Stopped test_watcher MCP server")
+        self._fail_pending("MCP server stopped")
+
+    def is_healthy(self) -> bool:
+        """Return True if the server process is alive and answers a ping."""
+        if not self.process or self.process.poll() is not None:
+            return False
+        try:
+            self._request("ping", timeout=5)
+            return True
+        except Exception as e:
+            logger.warning(f"test_watcher MCP health check failed: {e}")
+            return False
+
+    def ensure_running(self) -> bool:
+        """Restart the server if it died or stopped responding.
+
+        Returns:
+            True if a healthy connection is available
+        """
+        if self.is_healthy():
+            return True
+        if self.process is not None:
+            logger.warning("test_watcher MCP server is unhealthy, restarting")
+            self.stop_server()
+            self.process = None
+            self.restart_count += 1
+        return self.start_server()
+
+    def subscribe_results(self, callback: Callable[[Dict[str, Any]], None]) -> None:
+        """Register a callback invoked whenever the watcher finishes a test run.
+
+        The callback receives the raw notification params. The subscription is
+        re-established automatically when the server is restarted.
+        """
+        self._subscribers.append(callback)
+        if self.process and self.process.poll() is None and not self._subscribed:
+            self._subscribe()
+
+    def expect_results(self) -> None:
+        """Subscribe to results and arm wait_for_results().
+
+        Call this before querying whether a run is in progress, so a run that
+        finishes between the query and the wait is not missed.
+        """
+        if not self._subscribed and self.process and self.process.poll() is None:
+            self._subscribe()
+        self._results_ready.clear()
+
+    def wait_for_results(self, timeout: float) -> bool:
+        """Block until the watcher reports a run finished since expect_results().
+
+        Returns:
+            True if a run finished within the timeout
+        """
+        return self._results_ready.wait(timeout)
+
+    def _initialize(self) -> None:
+        self._request(
+            "initialize",
+            {
+                "protocolVersion": MCP_PROTOCOL_VERSION,
+                "capabilities": {},
+                "clientInfo": {"name": "auto-coder", "version": "1.0"},
+            },
+        )
+        self._send({"jsonrpc": "2.0", "method": "notifications/initialized"})
+
+    def _subscribe(self) -> None:
+        try:
+            self._request("resources/subscribe", {"uri": RESULTS_RESOURCE_URI})
+            self._subscribed = True
+        except Exception as e:
+            logger.warning(f"Failed to subscribe to test_watcher results: {e}")
+
+    def _send(self, message: Dict[str, Any]) -> None:
+        if not self.process or self.process.poll() is not None:
+            raise RuntimeError("MCP server is not running")
+        with self._write_lock:
+            self.process.stdin.write(json.dumps(message) + "\n")  # type: ignore[union-attr]
+            self.process.stdin.flush()  # type: ignore[union-attr]
+
+    def _request(self, method: str, params: Optional[Dict[str, Any]] = None, timeout: Optional[float] = None) -> Dict[str, Any]:
+        request_id = next(self._ids)
+        slot: Dict[str, Any] = {"event": threading.Event()}
+        with self._pending_lock:
+            self._pending[request_id] = slot
+
+        try:
+            message: Dict[str, Any] = {"jsonrpc": "2.0", "id": request_id, "method": method}
+            if params is not None:
+                message["params"] = params
+            self._send(message)
+
+            if not slot["event"].wait(timeout or self.request_timeout):
+                raise TimeoutError(f"No response to {method} within {timeout or self.request_timeout}s")
+        finally:
+            with self._pending_lock:
+                self._pending.pop(request_id, None)
+
+        response = slot.get("response")
+        if response is None:
+            raise RuntimeError(slot.get("error", "MCP connection closed"))
+        if "error" in response:
+            raise RuntimeError(f"MCP error: {response['error']}")
+        return response.get("result", {})  # type: ignore[no-any-return]
+
+    def _read_stdout(self, process: subprocess.Popen) -> None:
+        for line in process.stdout:  # type: ignore[union-attr]
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                message = json.loads(line)
+            except json.JSONDecodeError:
+                logger.debug(f"Ignoring non-JSON output from test_watcher: {line[:200]}")
+                continue
+
+            if "id" in message and "method" not in message:
+                with self._pending_lock:
+                    slot = self._pending.get(message["id"])
+                if slot is not None:
+                    slot["response"] = message
+                    slot["event"].set()
+            elif message.get("method") == "notifications/resources/updated":
+                self._dispatch_results(message.get("params", {}))
+
+        if process is self.process:
+            self._fail_pending("MCP server exited")
+
+    def _drain_stderr(self, process: subprocess.Popen) -> None:
+        # A long-lived server would block once the stderr pipe buffer fills
+        for line in process.stderr:  # type: ignore[union-attr]
+            logger.debug(f"test_watcher: {line.rstrip()}")
+
+    def _dispatch_results(self, params: Dict[str, Any]) -> None:
+        self._results_ready.set()
+        for callback in list(self._subscribers):
+            try:
+                callback(params)
+            except Exception as e:
+                logger.warning(f"test_watcher result subscriber failed: {e}")
+
+    def _fail_pending(self, reason: str) -> None:
+        with self._pending_lock:
+            slots = list(self._pending.values())
+        for slot in slots:
+            slot["error"] = reason
+            slot["event"].set()
+
+    @staticmethod
+    def _unwrap_tool_result(result: Dict[str, Any]) -> Dict[str, Any]:
+        """Extract the tool's return value from an MCP tools/call result."""
+        if isinstance(result.get("structuredContent"), dict):
+            structured = result["structuredContent"]
+            # FastMCP wraps non-object return types as {"result": value}
+            if set(structured) == {"result"} and isinstance(structured["result"], dict):
+                return structured["result"]  # type: ignore[no-any-return]
+            return structured  # type: ignore[no-any-return]
+        content = result.get("content")
+        if isinstance(content, list) and content and content[0].get("type") == "text":
+            try:
+                parsed = json.loads(content[0].get("text", ""))
+                if isinstance(parsed, dict):
+                    return parsed
+            except json.JSONDecodeError:
+                pass
+        return result
 
     def _call_tool(self, tool_name: str, arguments: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
@@ -92,29 +295,9 @@ class TestWatcherClient:
         if not self.process or self.process.poll() is not None:
             raise RuntimeError("MCP server is not running")
 
-        # Build JSON-RPC request
-        request = {
-            "jsonrpc": "2.0",
-            "id": 1,
-            "method": "tools/call",
-            "params": {"name": tool_name, "arguments": arguments or {}},
-        }
-
         try:
-            # Send request
-            request_json = json.dumps(request) + "\n"
-            self.process.stdin.write(request_json)  # type: ignore[union-attr]
-            self.process.stdin.flush()  # type: ignore[union-attr]
-
-            # Read response
-            response_line = self.process.stdout.readline()  # type: ignore[union-attr]
-            response = json.loads(response_line)
-
-            if "error" in response:
-                raise RuntimeError(f"MCP error: {response['error']}")
-
-            return response.get("result", {})  # type: ignore[no-any-return]
-
+            result = self._request("tools/call", {"name": tool_name, "arguments": arguments or {}})
+            return self._unwrap_tool_result(result)
         except Exception as e:
             logger.error(f"Failed to call MCP tool {tool_name}: {e}")
             raise
@@ -166,3 +349,40 @@ class TestWatcherClient:
     def __exit__(self, exc_type, exc_val, exc_tb):
         """Context manager exit."""
         self.stop_server()
+
+
+_shared_client: Optional[TestWatcherClient] = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_test_watcher_client(mcp_server_path: str, project_root: Optional[str] = None) -> Optional[TestWatcherClient]:
+    """Return the engine-wide test_watcher connection, starting or restarting it as needed.
+
+    Returns:
+        A healthy client, or None if the server could not be started
+    """
+    global _shared_client
+    project_root = project_root or str(Path.cwd())
+    with _shared_lock:
+        client = _shared_client
+        if client is not None and (client.mcp_server_path != mcp_server_path or client.project_root != project_root):
+            client.stop_server()
+            client = None
+        if client is None:
+            client = TestWatcherClient(mcp_server_path=mcp_server_path, project_root=project_root)
+            _shared_client = client
+        if not client.ensure_running():
+            return None
+        return client
+
+
+def shutdown_shared_test_watcher_client() -> None:
+    """Stop the shared test_watcher connection if one was started."""
+    global _shared_client
+    with _shared_lock:
+        if _shared_client is not None:
+            _shared_client.stop_server()
+            _shared_client = None
+
+
+atexit.register(shutdown_shared_test_watcher_client)
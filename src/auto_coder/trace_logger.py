@@ -57,6 +57,10 @@ class TraceLogger:
     def clear(self) -> None:
         self.logs.clear()
 
+    def restore(self, entries: List[Dict[str, Any]]) -> None:
+        """Put entries from a previous process before the current ones."""
+        self.logs = collections.deque([*entries, *self.logs], maxlen=self.logs.maxlen)
+
 
 def get_trace_logger() -> TraceLogger:
     """Get the singleton TraceLogger instance."""
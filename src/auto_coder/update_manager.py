@@ -211,6 +211,14 @@ def restart_with_startup_options(
         logger.warning("Auto-update requested restart but no startup command is recorded")
         return
 
+    # Hand the work queue and caches over to the restarted process
+    try:
+        from .warm_restart import write_handoff
+
+        write_handoff()
+    except Exception as e:  # pragma: no cover - the handoff must never block the restart
+        logger.warning(f"Failed to write restart handoff: {e}")
+
     if os.environ.get(_CAPTURE_RESTART_ENV):  # pragma: no cover - path exercised via SystemExit in tests
         _capture_restart_event(command, restart_env)
         return
@@ -8,7 +8,7 @@ import time
 import types
 from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional, Tuple, cast
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple, cast
 
 import httpx
 from ghapi.all import GhApi
@@ -17,6 +17,10 @@ from hishel import SyncSqliteStorage
 from hishel.httpx import SyncCacheClient
 
 from ..logger_config import get_logger
+from ..metrics import get_metrics_registry
+
+if TYPE_CHECKING:
+    from .repo_metadata import RepoMetadataCache
 
 logger = get_logger(__name__)
 
@@ -160,6 +164,23 @@ class SafeGhApiProxy:
         return SafeGhApiProxy(attr)
 
 
+def _send_github_request(api: str, method: str, send: Callable[[], httpx.Response]) -> httpx.Response:
+    """Run send() and record latency, status class and HTTP cache result of the request."""
+    started = time.perf_counter()
+    response: Optional[httpx.Response] = None
+    try:
+        response = send()
+        return response
+    finally:
+        status_code = getattr(response, "status_code", None)
+        status = f"{status_code // 100}xx" if isinstance(status_code, int) else "error"
+        extensions = getattr(response, "extensions", None)
+        cached = isinstance(extensions, dict) and bool(extensions.get("hishel_from_cache"))
+        metrics = get_metrics_registry()
+        metrics.inc("auto_coder_github_requests_total", api=api, method=method.upper(), status=status, cache="hit" if cached else "miss")
+        metrics.observe("auto_coder_github_request_seconds", time.perf_counter() - started, api=api)
+
+
 def get_ghapi_client(token: str) -> GhApi:
     """
     Returns a GhApi instance configured with hishel caching for GET requests.
@@ -205,7 +226,11 @@ def get_ghapi_client(token: str) -> GhApi:
                     content_data = data
 
             # Use params=query for GET params
-            resp = client.request(method=verb, url=url, headers=headers, content=content_data, json=json_data, params=query, follow_redirects=True, timeout=timeout)
+            resp = _send_github_request(
+                "rest",
+                verb,
+                lambda: client.request(method=verb, url=url, headers=headers, content=content_data, json=json_data, params=query, follow_redirects=True, timeout=timeout),
+            )
 
             # Raise for status to ensure errors are caught (e.g. 404, 422)
             try:
@@ -347,7 +372,7 @@ class GitHubClient:
             payload["variables"] = variables
 
         try:
-            response = client.post(url, headers=headers, json=payload, timeout=30)
+            response = _send_github_request("graphql", "POST", lambda: client.post(url, headers=headers, json=payload, timeout=30))
             response.raise_for_status()
             data = response.json()
 
@@ -379,16 +404,37 @@ class GitHubClient:
             self._open_issues_cache_repo = None
             self._open_issues_cache_time = None
 
+    def export_open_issues_cache(self) -> Optional[Dict[str, Any]]:
+        """Return the open issues memory cache as plain data (for a restart handoff)."""
+        with self._open_issues_cache_lock:
+            if self._open_issues_cache is None or self._open_issues_cache_time is None:
+                return None
+            return {"repo_name": self._open_issues_cache_repo, "cached_at": self._open_issues_cache_time.timestamp(), "issues": list(self._open_issues_cache)}
+
+    def restore_open_issues_cache(self, exported: Dict[str, Any]) -> None:
+        """Restore export_open_issues_cache() output, keeping its original age."""
+        with self._open_issues_cache_lock:
+            self._open_issues_cache = list(exported["issues"])
+            self._open_issues_cache_repo = exported["repo_name"]
+            self._open_issues_cache_time = datetime.fromtimestamp(exported["cached_at"])
+
+    @property
+    def repo_metadata(self) -> "RepoMetadataCache":
+        """Cached repository settings, workflow job order, labels and branch protection."""
+        from .repo_metadata import RepoMetadataCache
+
+        return RepoMetadataCache.get_instance(self.token)
+
     def get_repository(self, repo_name: str) -> Any:
         """Get repository object by name (owner/repo).
 
-        DEPRECATED: Returns a dict-like object from GhApi instead of PyGithub Repository.
-        Prefer using direct API calls in other methods.
+        DEPRECATED: Returns a dict-like object (served from the repository metadata
+        cache) instead of PyGithub Repository. Prefer using direct API calls in other methods.
         """
         try:
-            owner, repo = repo_name.split("/")
-            api = get_ghapi_client(self.token)
-            return api.repos.get(owner, repo)
+            from fastcore.xtras import dict2obj
+
+            return dict2obj(self.repo_metadata.get_repository(repo_name))
         except Exception as e:
             logger.error(f"Failed to get repository {repo_name}: {e}")
             raise
@@ -468,7 +514,7 @@ class GitHubClient:
             per_page = min(limit, 100) if limit else 100
             url = f"https://api.github.com/repos/{owner}/{repo}/pulls?state=open&sort=created&direction=asc&per_page={per_page}"
 
-            resp = client.request("GET", url, headers=headers)
+            resp = _send_github_request("rest", "GET", lambda: client.request("GET", url, headers=headers))
             resp.raise_for_status()
             pr_list = resp.json()
 
@@ -495,7 +541,7 @@ class GitHubClient:
                 headers["Authorization"] = f"Bearer {self.token}"
 
             url = f"https://api.github.com/repos/{owner}/{repo}/pulls/{pr_number}"
-            resp = client.request("GET", url, headers=headers)
+            resp = _send_github_request("rest", "GET", lambda: client.request("GET", url, headers=headers))
             resp.raise_for_status()
             return resp.json()
         except Exception as e:
@@ -520,7 +566,7 @@ class GitHubClient:
             per_page = min(limit, 100) if limit else 100
             list_url = f"https://api.github.com/repos/{owner}/{repo}/pulls?state=open&per_page={per_page}"
 
-            list_resp = client.request("GET", list_url, headers=headers)
+            list_resp = _send_github_request("rest", "GET", lambda: client.request("GET", list_url, headers=headers))
             list_resp.raise_for_status()
             prs_summary = list_resp.json()
 
@@ -530,7 +576,7 @@ class GitHubClient:
                 try:
                     pr_num = pr_summary["number"] if isinstance(pr_summary, dict) else pr_summary.number
                     detail_url = f"https://api.github.com/repos/{owner}/{repo}/pulls/{pr_num}"
-                    detail_resp = client.request("GET", detail_url, headers=headers)
+                    detail_resp = _send_github_request("rest", "GET", lambda: client.request("GET", detail_url, headers=headers))
                     detail_resp.raise_for_status()
                     pr_details = detail_resp.json()
                 except Exception as e:
@@ -898,7 +944,7 @@ class GitHubClient:
 
             # Simple handling for now - assuming recent events are on first page or reasonable number.
             # If a PR is linked, it should be in the timeline.
-            response = client.get(url, headers=headers)
+            response = _send_github_request("rest", "GET", lambda: client.get(url, headers=headers))
             response.raise_for_status()
             return response.json()
 
@@ -1539,7 +1585,7 @@ class GitHubClient:
             client = get_caching_client()
             url = f"https://api.github.com/repos/{owner}/{repo}/pulls/{pr_number}"
             headers = {"Authorization": f"bearer {self.token}", "Accept": "application/vnd.github.v3.diff", "X-GitHub-Api-Version": "2022-11-28"}
-            response = client.get(url, headers=headers)
+            response = _send_github_request("rest", "GET", lambda: client.get(url, headers=headers))
             response.raise_for_status()
             return response.text
         except Exception as e:
@@ -1635,18 +1681,25 @@ class GitHubClient:
             logger.error(f"Failed to get open sub-issues for #{issue_number}: {e}")
             return []
 
+    def get_cached_marker_sub_issues(self, repo_name: str, issue_number: int) -> List[Dict[str, Any]]:
+        """Get open issues from the memory cache that name issue_number as their parent.
+
+        These include issues linked only by a 'Parent Issue:' body marker, which
+        the sub-issues endpoint does not know about.
+        """
+        with self._open_issues_cache_lock:
+            if self._open_issues_cache is None or self._open_issues_cache_repo != repo_name:
+                return []
+            return [dict(cached_issue) for cached_issue in self._open_issues_cache if cached_issue.get("parent_issue_number") == issue_number and isinstance(cached_issue.get("number"), int) and cached_issue["number"] != issue_number]
+
     def get_all_sub_issues(self, repo_name: str, issue_number: int) -> List[int]:
         """Get all sub-issues (open and closed) using GitHub REST API."""
         try:
             sub_issues_data = self._fetch_sub_issues_data(repo_name, issue_number)
             all_sub = [i["number"] for i in sub_issues_data if i.get("number") != issue_number]
-            with self._open_issues_cache_lock:
-                if self._open_issues_cache is not None and self._open_issues_cache_repo == repo_name:
-                    for cached_issue in self._open_issues_cache:
-                        if cached_issue.get("parent_issue_number") == issue_number:
-                            c_num = cached_issue.get("number")
-                            if isinstance(c_num, int) and c_num not in all_sub and c_num != issue_number:
-                                all_sub.append(c_num)
+            for cached_issue in self.get_cached_marker_sub_issues(repo_name, issue_number):
+                if cached_issue["number"] not in all_sub:
+                    all_sub.append(cached_issue["number"])
             all_sub.sort()
             return all_sub
         except Exception as e:
@@ -1699,7 +1752,7 @@ class GitHubClient:
             }
             payload = {"sub_issue_id": int(sub_issue_id)}
 
-            response = client.post(url, headers=headers, json=payload)
+            response = _send_github_request("rest", "POST", lambda: client.post(url, headers=headers, json=payload))
             if response.status_code in (200, 201):
                 logger.info(f"Successfully linked issue #{sub_issue_number} as sub-issue of #{parent_issue_number}")
                 self.clear_sub_issue_cache()
@@ -1729,7 +1782,7 @@ class GitHubClient:
             url = f"https://api.github.com/repos/{owner}/{repo}/issues/{issue_number}/sub_issues"
             headers = {"Authorization": f"bearer {self.token}", "Accept": "application/vnd.github.v3+json", "X-GitHub-Api-Version": "2022-11-28"}  # As hinted by user docs
 
-            response = client.get(url, headers=headers)
+            response = _send_github_request("rest", "GET", lambda: client.get(url, headers=headers))
 
             # If 404, it might simply mean no sub-issues or feature not enabled, return empty
             if response.status_code == 404:
@@ -32,6 +32,7 @@ from ..test_log_utils import generate_merged_playwright_report
 from ..utils import CommandExecutor, log_action
 from .gh_cache import GitHubClient, get_ghapi_client
 from .github_cache import get_github_cache
+from .repo_metadata import get_repo_metadata_cache
 
 
 def _clean_log_line(line: str) -> str:
@@ -2056,50 +2057,19 @@ def check_and_handle_closed_state(
 def _sort_jobs_by_workflow(jobs: list, owner: str, repo: str, run_id: int, token: str) -> list:
     """Sort jobs based on the order defined in the workflow file."""
     try:
-        import yaml
-
-        api = get_ghapi_client(token)
-
-        # Get run details to find workflow file path
-        run = api.actions.get_workflow_run(owner, repo, run_id)
-        workflow_path = run.get("path")  # e.g. .github/workflows/ci.yml
+        repo_metadata = get_repo_metadata_cache(token)
+        repo_name = f"{owner}/{repo}"
 
+        # Workflow file of the run, e.g. .github/workflows/ci.yml
+        workflow_path = repo_metadata.get_workflow_path(repo_name, run_id)
         if not workflow_path:
             return jobs
 
-        # Check if file exists locally
-        # We assume the user is running this in the repo
-        # (or at least has access to the workflow file we care about)
-        if not os.path.exists(workflow_path):
-            # Try absolute path from workspace root if implied
-            possible_path = os.path.join(os.getcwd(), workflow_path)
-            if os.path.exists(possible_path):
-                workflow_path = possible_path
-            else:
-                # Check if path starts with .github, maybe we are in root
-                if workflow_path.startswith(".github"):
-                    if os.path.exists(workflow_path):
-                        pass
-                    else:
-                        return jobs
-                else:
-                    return jobs
-
-        with open(workflow_path, "r") as f:
-            workflow_data = yaml.safe_load(f)
-
-        if not workflow_data or "jobs" not in workflow_data:
+        # Map of job name/key to index
+        job_order = repo_metadata.get_workflow_job_order(repo_name, workflow_path)
+        if not job_order:
             return jobs
 
-        # Create map of job name/key to index
-        job_order = {}
-        for idx, (job_key, job_def) in enumerate(workflow_data["jobs"].items()):
-            # Map key
-            job_order[job_key] = idx
-            # Map name if present
-            if isinstance(job_def, dict) and "name" in job_def:
-                job_order[job_def["name"]] = idx
-
         # Sort jobs
         def get_sort_index(job):
             name = job.get("name")
@@ -0,0 +1,86 @@
+"""JSON state files shared by the auto-coder processes of one host.
+
+Several engines can run on one host (the lock is per clone), and each one
+persists state under ~/.auto-coder. Writing a process's in-memory copy over the
+whole file drops whatever the other processes wrote since it was loaded, and a
+fixed temporary file name lets concurrent writers clobber each other.
+update_json_file() avoids both: under an exclusive lock it re-reads the file,
+lets the caller apply its own changes to the on-disk copy, and replaces the
+file through a temporary file of its own.
+"""
+
+import json
+import os
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Iterator, Optional
+
+from ..logger_config import get_logger
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None  # type: ignore
+
+logger = get_logger(__name__)
+
+
+@contextmanager
+def locked(path: Path) -> Iterator[None]:
+    """Hold an exclusive lock on path (through path.lock) across processes."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path.with_name(f"{path.name}.lock"), "a") as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+def read_json_file(path: Path) -> Optional[Any]:
+    """Return the content of path, or None when it is missing or unreadable."""
+    try:
+        return json.loads(path.read_text())
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.debug(f"Ignoring unreadable state file {path}: {e}")
+        return None
+
+
+def write_json_file(path: Path, data: Any) -> None:
+    """Replace path with data through a temporary file of this writer's own."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_name: Optional[str] = None
+    try:
+        with tempfile.NamedTemporaryFile("w", dir=path.parent, prefix=f"{path.name}.", suffix=".tmp", delete=False) as tmp:
+            tmp_name = tmp.name
+            json.dump(data, tmp)
+        os.replace(tmp_name, path)
+    except BaseException:
+        if tmp_name is not None:
+            try:
+                os.unlink(tmp_name)
+            except OSError:
+                pass
+        raise
+
+
+def update_json_file(path: Path, update: Callable[[Optional[Any]], Any]) -> Any:
+    """Apply update to the current content of path and write the result back.
+
+    Args:
+        path: State file to update
+        update: Receives the on-disk content (None when missing or unreadable)
+            and returns the content to write
+
+    Returns:
+        The content written
+    """
+    with locked(path):
+        data = update(read_json_file(path))
+        write_json_file(path, data)
+    return data
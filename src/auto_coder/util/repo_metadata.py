@@ -0,0 +1,325 @@
+"""Cache of slowly-changing repository metadata.
+
+Merge fallbacks called ``api.repos.get`` for the allowed merge methods every
+time, log collection looked up the workflow run and re-parsed the workflow
+YAML for every failed run, and feature analysis fetched the repository again
+on each pass. RepoMetadataCache keeps one copy of each of these per repository:
+
+- repository settings (merge methods, default branch, description, ...)
+- workflow definitions, reduced to their job order
+- branch protection (whether merge trains can merge several PRs per base)
+
+Each kind has a long TTL. Once it expires the entry is revalidated with
+``If-None-Match``; a 304 only refreshes the timestamp (and does not count
+against the REST rate limit). If revalidation fails the stale value is served.
+Entries and their ETags are persisted to ~/.auto-coder/repo_metadata.json, so a
+restart starts with conditional requests instead of full fetches. Each save
+merges this process's changes into the file, so other processes on the host
+keep the entries they stored.
+"""
+
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Union
+
+import httpx
+
+from ..logger_config import get_logger
+from .json_state import read_json_file, update_json_file
+
+logger = get_logger(__name__)
+
+GITHUB_API_URL = "https://api.github.com"
+
+REPOSITORY = "repository"
+WORKFLOW = "workflow"
+BRANCH_PROTECTION = "branch_protection"
+
+DEFAULT_TTLS: Dict[str, float] = {
+    REPOSITORY: 6 * 3600,
+    WORKFLOW: 6 * 3600,
+    BRANCH_PROTECTION: 3600,
+}
+
+_NOT_MODIFIED = object()
+
+Loaded = Union[object, Tuple[Any, Optional[str]]]
+
+
+def get_repo_metadata_path() -> Path:
+    """Return the path of the persisted repository metadata cache."""
+    return Path.home() / ".auto-coder" / "repo_metadata.json"
+
+
+def _entry_matches(key: str, repo_name: Optional[str], kind: Optional[str]) -> bool:
+    entry_kind, _, rest = key.partition(":")
+    entry_repo = rest.split(":", 1)[0]
+    return (kind is None or entry_kind == kind) and (repo_name is None or entry_repo == repo_name)
+
+
+def parse_job_order(workflow_yaml: str) -> Dict[str, int]:
+    """Map every job key and job name of a workflow definition to its position."""
+    import yaml
+
+    workflow = yaml.safe_load(workflow_yaml)
+    if not isinstance(workflow, dict) or not isinstance(workflow.get("jobs"), dict):
+        return {}
+    job_order: Dict[str, int] = {}
+    for idx, (job_key, job_def) in enumerate(workflow["jobs"].items()):
+        job_order[str(job_key)] = idx
+        if isinstance(job_def, dict) and "name" in job_def:
+            job_order[str(job_def["name"])] = idx
+    return job_order
+
+
+class RepoMetadataCache:
+    """Per-repository metadata with long TTLs and ETag revalidation."""
+
+    _instance: Optional["RepoMetadataCache"] = None
+    _instance_lock = threading.Lock()
+
+    def __init__(
+        self,
+        token: Optional[str] = None,
+        path: Optional[Path] = None,
+        ttls: Optional[Dict[str, float]] = None,
+        client: Optional[httpx.Client] = None,
+    ):
+        self.token = token
+        self.path = path or get_repo_metadata_path()
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.hits = 0
+        self.revalidations = 0
+        self.fetches = 0
+        self.stale_served = 0
+        self._client = client
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        # Changes not yet merged into the persisted file
+        self._dirty: Set[str] = set()
+        self._invalidations: List[Tuple[Optional[str], Optional[str]]] = []
+        # Workflow runs never change their workflow file, so these are kept without a TTL
+        self._run_paths: Dict[Tuple[str, int], Optional[str]] = {}
+        # Local workflow files, keyed by path and mtime
+        self._local_job_orders: Dict[Tuple[str, float], Dict[str, int]] = {}
+        self._load()
+
+    @classmethod
+    def get_instance(cls, token: Optional[str] = None) -> "RepoMetadataCache":
+        """Return the process-wide cache, updating its token if one is given."""
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = cls(token=token)
+        if token:
+            cls._instance.token = token
+        return cls._instance
+
+    @classmethod
+    def reset_instance(cls) -> None:
+        """Drop the singleton (used by tests)."""
+        with cls._instance_lock:
+            cls._instance = None
+
+    def _load(self) -> None:
+        entries = read_json_file(self.path)
+        if isinstance(entries, dict):
+            self._entries = {key: entry for key, entry in entries.items() if isinstance(entry, dict) and "fetched_at" in entry}
+
+    def _save(self) -> None:
+        changed = {key: self._entries[key] for key in self._dirty if key in self._entries}
+        invalidations = list(self._invalidations)
+
+        def update(data: Any) -> Dict[str, Dict[str, Any]]:
+            entries = {key: entry for key, entry in data.items() if isinstance(entry, dict) and "fetched_at" in entry} if isinstance(data, dict) else {}
+            for repo_name, kind in invalidations:
+                entries = {key: entry for key, entry in entries.items() if not _entry_matches(key, repo_name, kind)}
+            for key, entry in changed.items():
+                # Another process may have revalidated the entry more recently
+                if key not in entries or float(entries[key]["fetched_at"]) <= float(entry["fetched_at"]):
+                    entries[key] = entry
+            return entries
+
+        try:
+            update_json_file(self.path, update)
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(f"Failed to persist repository metadata cache: {e}")
+            return
+        self._dirty.clear()
+        self._invalidations.clear()
+
+    def _http_client(self) -> httpx.Client:
+        if self._client is None:
+            # Not the hishel client: revalidation is done here, and a 304 must reach us as a 304
+            self._client = httpx.Client(base_url=GITHUB_API_URL, timeout=30, follow_redirects=True)
+        return self._client
+
+    def _request(self, path: str, etag: Optional[str] = None, accept: str = "application/vnd.github+json", params: Optional[Dict[str, Any]] = None) -> httpx.Response:
+        from .gh_cache import GitHubClient, _send_github_request
+
+        token = self.token or GitHubClient.get_instance().token
+        headers = {"Authorization": f"token {token}", "Accept": accept, "X-GitHub-Api-Version": "2022-11-28"}
+        if etag:
+            headers["If-None-Match"] = etag
+        client = self._http_client()
+        return _send_github_request("rest", "GET", lambda: client.get(path, headers=headers, params=params))
+
+    def _cached(self, kind: str, key: str, load: Callable[[Optional[str]], Loaded]) -> Any:
+        """Return the entry for key, loading or revalidating it once its TTL has expired.
+
+        load(etag) returns _NOT_MODIFIED when etag is still current, otherwise (data, etag).
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.time() - float(entry["fetched_at"]) < self.ttls[kind]:
+                self.hits += 1
+                return entry["data"]
+
+        try:
+            loaded = load(entry.get("etag") if entry else None)
+        except Exception as e:
+            if entry is None:
+                raise
+            logger.warning(f"Failed to revalidate {key}, using cached value: {e}")
+            with self._lock:
+                self.stale_served += 1
+            return entry["data"]
+
+        with self._lock:
+            if loaded is _NOT_MODIFIED and entry is not None:
+                entry = {**entry, "fetched_at": time.time()}
+                self.revalidations += 1
+            else:
+                data, etag = loaded  # type: ignore[misc]
+                entry = {"data": data, "etag": etag, "fetched_at": time.time()}
+                self.fetches += 1
+            self._entries[key] = entry
+            self._dirty.add(key)
+            self._save()
+            return entry["data"]
+
+    def _load_json(self, path: str, missing_statuses: Tuple[int, ...] = ()) -> Callable[[Optional[str]], Loaded]:
+        def load(etag: Optional[str]) -> Loaded:
+            response = self._request(path, etag)
+            if response.status_code == 304 and etag:
+                return _NOT_MODIFIED
+            if response.status_code in missing_statuses:
+                return None, None
+            response.raise_for_status()
+            return response.json(), response.headers.get("etag")
+
+        return load
+
+    def get_repository(self, repo_name: str) -> Dict[str, Any]:
+        """Return the repository resource (GET /repos/{owner}/{repo})."""
+        return self._cached(REPOSITORY, f"{REPOSITORY}:{repo_name}", self._load_json(f"/repos/{repo_name}"))
+
+    def get_default_branch(self, repo_name: str) -> str:
+        return self.get_repository(repo_name).get("default_branch") or "main"
+
+    def get_allowed_merge_methods(self, repo_name: str) -> List[str]:
+        """Return the gh merge flags the repository settings allow."""
+        repo = self.get_repository(repo_name)
+        allowed: List[str] = []
+        if repo.get("allow_squash_merge"):
+            allowed.append("--squash")
+        if repo.get("allow_merge_commit"):
+            allowed.append("--merge")
+        if repo.get("allow_rebase_merge"):
+            allowed.append("--rebase")
+        return allowed
+
+    def get_branch_protection(self, repo_name: str, branch: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Return the protection settings of branch (default: the default branch).
+
+        Returns:
+            The protection resource, or None when the branch is unprotected or the
+            token may not read its protection
+        """
+        branch = branch or self.get_default_branch(repo_name)
+        return self._cached(
+            BRANCH_PROTECTION,
+            f"{BRANCH_PROTECTION}:{repo_name}:{branch}",
+            self._load_json(f"/repos/{repo_name}/branches/{branch}/protection", missing_statuses=(403, 404)),
+        )
+
+    def get_workflow_path(self, repo_name: str, run_id: int) -> Optional[str]:
+        """Return the workflow file of a run, e.g. .github/workflows/ci.yml."""
+        key = (repo_name, int(run_id))
+        with self._lock:
+            if key in self._run_paths:
+                self.hits += 1
+                return self._run_paths[key]
+        response = self._request(f"/repos/{repo_name}/actions/runs/{run_id}")
+        response.raise_for_status()
+        workflow_path = response.json().get("path")
+        with self._lock:
+            self._run_paths[key] = workflow_path
+            self.fetches += 1
+        return workflow_path
+
+    def get_workflow_job_order(self, repo_name: str, workflow_path: str) -> Dict[str, int]:
+        """Return {job key or name: position} for a workflow file.
+
+        A checked-out copy of the workflow (relative to the working directory) is
+        preferred, as it matches the branch being worked on; otherwise the
+        definition on the default branch is fetched.
+        """
+        local_path = workflow_path if os.path.isabs(workflow_path) else os.path.join(os.getcwd(), workflow_path)
+        try:
+            mtime = os.path.getmtime(local_path)
+        except OSError:
+            mtime = None
+        if mtime is not None:
+            key = (local_path, mtime)
+            with self._lock:
+                if key in self._local_job_orders:
+                    self.hits += 1
+                    return self._local_job_orders[key]
+            with open(local_path, "r") as f:
+                job_order = parse_job_order(f.read())
+            with self._lock:
+                self._local_job_orders[key] = job_order
+            return job_order
+
+        def load(etag: Optional[str]) -> Loaded:
+            response = self._request(f"/repos/{repo_name}/contents/{workflow_path}", etag, accept="application/vnd.github.raw")
+            if response.status_code == 304 and etag:
+                return _NOT_MODIFIED
+            if response.status_code == 404:
+                return {}, None
+            response.raise_for_status()
+            return parse_job_order(response.text), response.headers.get("etag")
+
+        return self._cached(WORKFLOW, f"{WORKFLOW}:{repo_name}:{workflow_path}", load)
+
+    def invalidate(self, repo_name: Optional[str] = None, kind: Optional[str] = None) -> None:
+        """Drop cached entries (all, or those of repo_name and/or kind), e.g. after changing a setting."""
+        with self._lock:
+            for key in list(self._entries):
+                if _entry_matches(key, repo_name, kind):
+                    del self._entries[key]
+                    self._dirty.discard(key)
+            self._invalidations.append((repo_name, kind))
+            if kind in (None, WORKFLOW):
+                self._run_paths = {k: v for k, v in self._run_paths.items() if repo_name is not None and k[0] != repo_name}
+                self._local_job_orders.clear()
+            self._save()
+
+    def stats(self) -> Dict[str, int]:
+        """Return entry, hit, revalidation and fetch counters."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "revalidations": self.revalidations,
+                "fetches": self.fetches,
+                "stale_served": self.stale_served,
+            }
+
+
+def get_repo_metadata_cache(token: Optional[str] = None) -> RepoMetadataCache:
+    """Return the process-wide :class:`RepoMetadataCache`."""
+    return RepoMetadataCache.get_instance(token)
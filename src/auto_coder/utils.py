@@ -2,6 +2,7 @@
 Utility classes for Auto-Coder automation engine.
 """
 
+import contextlib
 import os
 import queue
 import re
@@ -14,9 +15,10 @@ import sys
 import threading
 import time
 from dataclasses import dataclass
-from typing import Any, Callable, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 
 from .logger_config import get_logger
+from .metrics import get_metrics_registry
 from .progress_footer import get_progress_footer
 from .security_utils import redact_string
 from .test_log_utils import extract_first_failed_test
@@ -260,6 +262,30 @@ def is_running_in_container() -> bool:
     return False
 
 
+_cancel_scope = threading.local()
+
+
+class CommandCancelledError(RuntimeError):
+    """Raised inside CommandExecutor when the calling thread's cancel event is set."""
+
+
+@contextlib.contextmanager
+def command_cancel_scope(event: threading.Event) -> Iterator[None]:
+    """Kill commands run by this thread inside the block as soon as event is set."""
+    previous = getattr(_cancel_scope, "event", None)
+    _cancel_scope.event = event
+    try:
+        yield
+    finally:
+        _cancel_scope.event = previous
+
+
+def is_command_cancelled() -> bool:
+    """Return True if the calling thread runs inside a cancel scope whose event is set."""
+    event: Optional[threading.Event] = getattr(_cancel_scope, "event", None)
+    return event is not None and event.is_set()
+
+
 @dataclass
 class CommandResult:
     """Result of a command execution."""
@@ -270,6 +296,26 @@ class CommandResult:
     returncode: int
 
 
+# git/gh options that take a separate value, skipped when looking for the subcommand
+_OPTIONS_WITH_VALUE = {"-C", "-c", "-R", "--repo", "--git-dir", "--work-tree"}
+
+
+def _command_metric_label(cmd: List[str]) -> str:
+    """Return a low-cardinality label for cmd: the program, plus the subcommand for git/gh."""
+    if not cmd:
+        return "unknown"
+    program = os.path.basename(cmd[0])
+    if program not in ("git", "gh"):
+        return program
+    args = iter(cmd[1:])
+    for arg in args:
+        if arg in _OPTIONS_WITH_VALUE:
+            next(args, None)
+        elif not arg.startswith("-"):
+            return f"{program} {arg}"
+    return program
+
+
 class CommandExecutor:
     """Utility class for executing commands with consistent error handling."""
 
@@ -476,9 +522,13 @@ class CommandExecutor:
         start = time.monotonic()
         last_output_time = time.monotonic()
         dots_printed = 0
+        cancel_event: Optional[threading.Event] = getattr(_cancel_scope, "event", None)
 
         try:
             while True:
+                if cancel_event is not None and cancel_event.is_set():
+                    process.kill()
+                    raise CommandCancelledError(f"Command cancelled: {cmd[0] if cmd else ''}")
                 now = time.monotonic()
                 if timeout is not None:
                     elapsed = now - start
@@ -634,6 +684,28 @@ class CommandExecutor:
         use_pty: attach the command to a pseudo terminal, for CLIs that refuse to
         run without an interactive terminal.
         """
+        started = time.perf_counter()
+        result = cls._run_command(cmd, timeout, cwd, stream_output, env, env_overrides, on_stream, dot_format, idle_timeout, use_pty)
+        label = _command_metric_label(cmd)
+        metrics = get_metrics_registry()
+        metrics.inc("auto_coder_commands_total", command=label, outcome="success" if result.success else "failure")
+        metrics.observe("auto_coder_command_seconds", time.perf_counter() - started, command=label)
+        return result
+
+    @classmethod
+    def _run_command(
+        cls,
+        cmd: List[str],
+        timeout: Optional[int],
+        cwd: Optional[str],
+        stream_output: Optional[bool],
+        env: Optional[Dict[str, str]],
+        env_overrides: Optional[Dict[str, str]],
+        on_stream: Optional[Callable[[str, str], None]],
+        dot_format: bool,
+        idle_timeout: Optional[int],
+        use_pty: bool,
+    ) -> CommandResult:
         if timeout is None:
             # Auto-detect timeout based on command type
             cmd_type = cmd[0] if cmd else "default"
@@ -704,6 +776,9 @@ class CommandExecutor:
                 stderr=f"Command timed out after {timeout}s",
                 returncode=-1,
             )
+        except CommandCancelledError as e:
+            logger.info(str(e))
+            return CommandResult(success=False, stdout="", stderr=str(e), returncode=-1)
         except Exception as e:
             logger.error(f"Command execution failed: {' '.join(cmd)}: {e}")
             return CommandResult(success=False, stdout="", stderr=str(e), returncode=-1)
@@ -0,0 +1,149 @@
+"""State handoff across auto-update restarts.
+
+restart_with_startup_options() re-execs the process after an upgrade, which
+used to discard the work queue, the open PR/issue snapshots, the open issues
+memory cache and the trace history, so the first cycle after every update was
+a full cold crawl. Components that want to survive a restart register a state
+provider; write_handoff() serializes every provider's state to a versioned
+file just before the exec, and take_handoff() hands it back (once) on startup.
+
+Several engines on one host auto-update at about the same time, so the file is
+kept per repository (~/.auto-coder/<repo>/restart_handoff.json, see
+set_handoff_repo()). A process only takes, and removes, the handoff of its own
+repository. A handoff that is older than max_age_seconds, written with another
+SCHEMA_VERSION, or unreadable is discarded and the process starts cold.
+
+The handoff is opt-in via [warm_restart].enabled in config.toml.
+"""
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from .logger_config import get_logger
+from .util.json_state import write_json_file
+
+logger = get_logger(__name__)
+
+# Bump whenever the layout of a provider's state changes incompatibly
+SCHEMA_VERSION = 1
+DEFAULT_MAX_AGE_SECONDS = 600
+
+StateProvider = Callable[[], Dict[str, Any]]
+
+_providers: Dict[str, StateProvider] = {}
+_providers_lock = threading.Lock()
+_handoff_repo: Optional[str] = None
+
+
+def get_handoff_path(repo_name: Optional[str] = None) -> Path:
+    """Return the path of the restart handoff file of repo_name (or of a process without one)."""
+    base_dir = Path.home() / ".auto-coder"
+    return (base_dir / repo_name if repo_name else base_dir) / "restart_handoff.json"
+
+
+def set_handoff_repo(repo_name: Optional[str]) -> None:
+    """Write the next handoff for repo_name, so only the engine for that repository takes it."""
+    global _handoff_repo
+    with _providers_lock:
+        _handoff_repo = repo_name
+
+
+def register_state_provider(name: str, provider: StateProvider) -> None:
+    """Include provider()'s JSON-serializable state under name in the next handoff."""
+    with _providers_lock:
+        _providers[name] = provider
+
+
+def unregister_state_provider(name: str) -> None:
+    with _providers_lock:
+        _providers.pop(name, None)
+
+
+def write_handoff(path: Optional[Path] = None) -> bool:
+    """Serialize the state of every registered provider for the restarted process.
+
+    A provider that fails or returns state that is not JSON-serializable is left
+    out; the rest of the handoff is still written.
+
+    Returns:
+        True if a handoff file was written
+    """
+    with _providers_lock:
+        providers = dict(_providers)
+        repo_name = _handoff_repo
+    if not providers:
+        return False
+
+    state: Dict[str, Any] = {}
+    for name, provider in providers.items():
+        try:
+            section = provider()
+            json.dumps(section)
+            state[name] = section
+        except Exception as e:
+            logger.warning(f"Leaving '{name}' out of the restart handoff: {e}")
+    if not state:
+        return False
+
+    path = path or get_handoff_path(repo_name)
+    try:
+        write_json_file(path, {"schema_version": SCHEMA_VERSION, "created_at": time.time(), "pid": os.getpid(), "repo_name": repo_name, "state": state})
+    except OSError as e:
+        logger.warning(f"Failed to write restart handoff: {e}")
+        return False
+    logger.info(f"Wrote restart handoff ({', '.join(sorted(state))}) to {path}")
+    return True
+
+
+def take_handoff(path: Optional[Path] = None, max_age_seconds: float = DEFAULT_MAX_AGE_SECONDS, repo_name: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """Return the state left by the previous process, if it is usable.
+
+    A handoff written for another repository is left in place for the engine it
+    belongs to. Any other handoff is removed whether or not it is used, so it is
+    applied at most once.
+
+    Args:
+        path: Handoff file (default: the one of repo_name)
+        max_age_seconds: Oldest handoff that is still used
+        repo_name: Repository this process runs for
+
+    Returns:
+        State by provider name, or None to start cold
+    """
+    path = path or get_handoff_path(repo_name)
+    try:
+        raw = path.read_text()
+    except FileNotFoundError:
+        return None
+    except OSError as e:
+        logger.warning(f"Failed to read restart handoff: {e}")
+        return None
+
+    try:
+        handoff = json.loads(raw)
+    except ValueError as e:
+        handoff = None
+        logger.warning(f"Ignoring unreadable restart handoff: {e}")
+    if isinstance(handoff, dict) and repo_name and handoff.get("repo_name") not in (repo_name, None):
+        logger.info(f"Leaving restart handoff for {handoff.get('repo_name')} in place (running for {repo_name})")
+        return None
+    try:
+        path.unlink()
+    except OSError:
+        pass
+
+    if not isinstance(handoff, dict):
+        return None
+    if handoff.get("schema_version") != SCHEMA_VERSION:
+        logger.info(f"Ignoring restart handoff with schema {handoff.get('schema_version')} (expected {SCHEMA_VERSION}); starting cold")
+        return None
+    age = time.time() - float(handoff.get("created_at") or 0)
+    if age > max_age_seconds:
+        logger.info(f"Ignoring restart handoff written {age:.0f}s ago (max {max_age_seconds}s); starting cold")
+        return None
+    state = handoff.get("state")
+    return state if isinstance(state, dict) else None
@@ -4,12 +4,15 @@ import hmac
 from typing import Any, Dict, List, Optional, Union
 
 from fastapi import BackgroundTasks, FastAPI, Header, HTTPException, Request
+from fastapi.responses import PlainTextResponse
 from pydantic import BaseModel
 
 from .automation_config import Candidate
 from .automation_engine import AutomationEngine
 from .dashboard import init_dashboard
 from .logger_config import get_logger
+from .metrics import get_metrics_registry
+from .workflow_monitor import get_workflow_monitor_service
 
 logger = get_logger(__name__)
 
@@ -113,6 +116,12 @@ async def process_github_payload(event_type: Optional[str], payload: Dict[str, A
             workflow_run = payload.get("workflow_run", {})
             conclusion = workflow_run.get("conclusion")
 
+            monitor_service = get_workflow_monitor_service()
+            if monitor_service is not None:
+                # Completion callbacks call the GitHub API; keep them off the event loop
+                loop = asyncio.get_running_loop()
+                await loop.run_in_executor(None, monitor_service.handle_workflow_run_event, payload)
+
             if action == "completed" and conclusion == "failure":
                 pull_requests = workflow_run.get("pull_requests", [])
                 head_branch = workflow_run.get("head_branch")
@@ -174,6 +183,21 @@ def create_app(engine: AutomationEngine, repo_name: str, github_secret: Optional
     async def root():
         return {"status": "running", "repo": repo_name}
 
+    def _engine_gauges() -> List[Any]:
+        busy = sum(1 for candidate in engine.active_workers.values() if candidate)
+        return [
+            ("auto_coder_queue_depth", {}, float(engine.queue.qsize())),
+            ("auto_coder_workers_busy", {}, float(busy)),
+            ("auto_coder_workers", {}, float(len(engine.active_workers))),
+        ]
+
+    registry = get_metrics_registry()
+    registry.register_collector("engine", _engine_gauges)
+
+    @app.get("/metrics", response_class=PlainTextResponse)
+    async def metrics():
+        return PlainTextResponse(registry.render_prometheus(), media_type="text/plain; version=0.0.4")
+
     @app.post("/hooks/sentry")
     async def sentry_hook(request: Request, background_tasks: BackgroundTasks):
         if sentry_secret:
@@ -0,0 +1,336 @@
+"""Central monitor for workflow runs triggered by auto-coder.
+
+When _handle_pr_merge finds no checks for a PR head, it dispatches ci.yml and
+has to wait for the run to finish before it can publish a commit status and
+remove the @auto-coder label. Without this service every such PR got its own
+thread and event loop polling the checks API for up to an hour.
+
+WorkflowMonitorService tracks every pending run in one place:
+
+- run() executes on the automation engine's event loop and, each cycle, makes a
+  single workflow runs request per repository for all of its pending monitors.
+- handle_workflow_run_event() consumes workflow_run webhooks, so runs finish
+  without waiting for the next poll when the webhook server is in use.
+- Pending monitors are persisted to ~/.auto-coder/<repo>/workflow_monitors.json
+  and restored when the engine for that repository starts, so a restart no
+  longer leaves labels behind. Engines for other repositories on the same host
+  neither load nor overwrite them.
+- Completion callbacks publish the commit status and remove the label.
+
+The service is opt-in via [workflow_monitor].enabled in config.toml.
+"""
+
+import asyncio
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from .logger_config import get_logger
+from .util.gh_cache import GitHubClient, get_ghapi_client
+from .util.json_state import read_json_file, update_json_file
+
+logger = get_logger(__name__)
+
+DEFAULT_POLL_INTERVAL_SECONDS = 15
+DEFAULT_APPEAR_TIMEOUT_SECONDS = 120
+DEFAULT_COMPLETE_TIMEOUT_SECONDS = 3600
+# Runs listed per repository poll; a run older than this page is looked up by its commit
+RUNS_PER_PAGE = 100
+
+# Final states; all but NOT_FOUND are GitHub commit status states
+SUCCESS = "success"
+FAILURE = "failure"
+ERROR = "error"
+NOT_FOUND = "not_found"
+
+_IN_PROGRESS_STATUSES = {"queued", "in_progress", "pending", "waiting", "requested"}
+_PASSING_CONCLUSIONS = {"success", "skipped", "neutral"}
+
+
+@dataclass
+class PendingMonitor:
+    """A dispatched workflow waiting for its run to complete."""
+
+    repo_name: str
+    pr_number: int
+    head_sha: str
+    workflow_id: str
+    registered_at: float
+    run_id: Optional[int] = None
+
+    @property
+    def key(self) -> str:
+        return f"{self.repo_name}#{self.pr_number}"
+
+    def matches(self, run: Dict[str, Any]) -> bool:
+        """Whether a workflow run (API or webhook payload) belongs to this monitor."""
+        if run.get("head_sha", run.get("headSha")) != self.head_sha:
+            return False
+        # Runs from other workflows on the same commit are not ours to wait for
+        path = run.get("path") or ""
+        return not path or path.rsplit("/", 1)[-1].split("@", 1)[0] == self.workflow_id
+
+
+CompletionCallback = Callable[[PendingMonitor, str], None]
+
+
+def get_workflow_monitors_path(repo_name: str, base_dir: Optional[Path] = None) -> Path:
+    """Return the path of the persisted pending monitors of repo_name."""
+    return (base_dir or Path.home() / ".auto-coder") / repo_name / "workflow_monitors.json"
+
+
+def publish_commit_status(monitor: PendingMonitor, state: str) -> None:
+    """Completion callback: report the run result as an auto-coder/<workflow> commit status."""
+    if state == NOT_FOUND:
+        return
+    target_url = f"https://github.com/{monitor.repo_name}/actions/runs/{monitor.run_id}" if monitor.run_id else ""
+    GitHubClient.get_instance().create_commit_status(
+        repo_name=monitor.repo_name,
+        sha=monitor.head_sha,
+        state=state,
+        target_url=target_url,
+        description=f"Workflow {monitor.workflow_id} {state}",
+        context=f"auto-coder/{monitor.workflow_id}",
+    )
+
+
+def remove_monitor_label(monitor: PendingMonitor, state: str) -> None:
+    """Completion callback: remove the @auto-coder label kept while the run was pending."""
+    from .label_manager import LabelManager
+
+    with LabelManager(GitHubClient.get_instance(), monitor.repo_name, monitor.pr_number, item_type="pr", skip_label_add=True) as lm:
+        lm.remove_label()
+    logger.info(f"Removed @auto-coder label from PR #{monitor.pr_number}")
+
+
+class WorkflowMonitorService:
+    """Tracks dispatched workflow runs for every PR and fires callbacks when they finish."""
+
+    _instance: Optional["WorkflowMonitorService"] = None
+    _instance_lock = threading.Lock()
+
+    def __init__(
+        self,
+        base_dir: Optional[Path] = None,
+        poll_interval_seconds: float = DEFAULT_POLL_INTERVAL_SECONDS,
+        appear_timeout_seconds: float = DEFAULT_APPEAR_TIMEOUT_SECONDS,
+        complete_timeout_seconds: float = DEFAULT_COMPLETE_TIMEOUT_SECONDS,
+        callbacks: Optional[List[CompletionCallback]] = None,
+    ):
+        self.base_dir = base_dir
+        self.poll_interval_seconds = poll_interval_seconds
+        self.appear_timeout_seconds = appear_timeout_seconds
+        self.complete_timeout_seconds = complete_timeout_seconds
+        self.callbacks: List[CompletionCallback] = callbacks if callbacks is not None else [publish_commit_status, remove_monitor_label]
+        self.running = False
+        self.polls = 0
+        self.completed = 0
+        self._lock = threading.Lock()
+        self._monitors: Dict[str, PendingMonitor] = {}
+
+    @classmethod
+    def get_instance(cls) -> "WorkflowMonitorService":
+        """Return the process-wide service configured from config.toml."""
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    from .llm_backend_config import get_workflow_monitor_poll_interval_seconds_from_config
+
+                    cls._instance = cls(poll_interval_seconds=get_workflow_monitor_poll_interval_seconds_from_config())
+        return cls._instance
+
+    @classmethod
+    def reset_instance(cls) -> None:
+        """Drop the singleton (used by tests)."""
+        with cls._instance_lock:
+            cls._instance = None
+
+    def restore(self, repo_name: str) -> int:
+        """Load the monitors of repo_name persisted by a previous run.
+
+        Returns:
+            Number of monitors restored
+        """
+        path = get_workflow_monitors_path(repo_name, self.base_dir)
+        data = read_json_file(path)
+        restored = 0
+        with self._lock:
+            for value in data if isinstance(data, list) else []:
+                try:
+                    monitor = PendingMonitor(**value)
+                except TypeError as e:
+                    logger.debug(f"Ignoring malformed workflow monitor in {path}: {e}")
+                    continue
+                if monitor.repo_name == repo_name and monitor.key not in self._monitors:
+                    self._monitors[monitor.key] = monitor
+                    restored += 1
+        if restored:
+            logger.info(f"Restored {restored} pending workflow monitor(s) for {repo_name}")
+        return restored
+
+    def _persist(self, monitor: PendingMonitor, pending: bool) -> None:
+        """Add monitor to (or drop it from) its repository's file, keeping every other entry."""
+
+        def update(data: Any) -> List[Dict[str, Any]]:
+            monitors = [value for value in data if isinstance(value, dict)] if isinstance(data, list) else []
+            # A monitor registered since for a newer head of the same PR is left alone
+            kept = [value for value in monitors if value.get("pr_number") != monitor.pr_number or (not pending and value.get("head_sha") != monitor.head_sha)]
+            return kept + [asdict(monitor)] if pending else kept
+
+        try:
+            update_json_file(get_workflow_monitors_path(monitor.repo_name, self.base_dir), update)
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(f"Failed to persist workflow monitors: {e}")
+
+    def register(self, repo_name: str, pr_number: int, head_sha: str, workflow_id: str) -> bool:
+        """Start monitoring a dispatched workflow.
+
+        Returns:
+            False if the PR already has a pending monitor
+        """
+        monitor = PendingMonitor(repo_name, pr_number, head_sha, workflow_id, registered_at=time.time())
+        with self._lock:
+            if monitor.key in self._monitors:
+                return False
+            self._monitors[monitor.key] = monitor
+            self._persist(monitor, pending=True)
+        logger.info(f"Monitoring {workflow_id} for PR #{pr_number} ({head_sha[:8]})")
+        return True
+
+    def unregister(self, repo_name: str, pr_number: int) -> None:
+        """Stop monitoring a PR without firing callbacks."""
+        with self._lock:
+            monitor = self._monitors.pop(f"{repo_name}#{pr_number}", None)
+            if monitor is not None:
+                self._persist(monitor, pending=False)
+
+    def is_monitoring(self, repo_name: str, pr_number: int) -> bool:
+        with self._lock:
+            return f"{repo_name}#{pr_number}" in self._monitors
+
+    def pending(self) -> List[PendingMonitor]:
+        with self._lock:
+            return list(self._monitors.values())
+
+    def stats(self) -> Dict[str, int]:
+        """Return pending monitor and poll counters."""
+        with self._lock:
+            return {"pending": len(self._monitors), "polls": self.polls, "completed": self.completed}
+
+    def _complete(self, monitor: PendingMonitor, state: str) -> None:
+        with self._lock:
+            if self._monitors.pop(monitor.key, None) is None:
+                return  # finished concurrently by a webhook or another poll
+            self.completed += 1
+            self._persist(monitor, pending=False)
+        if state == NOT_FOUND:
+            logger.error(f"Timeout waiting for {monitor.workflow_id} run to appear for PR #{monitor.pr_number}")
+        else:
+            logger.info(f"Workflow run {monitor.run_id} for PR #{monitor.pr_number} completed with status: {state}")
+        for callback in self.callbacks:
+            try:
+                callback(monitor, state)
+            except Exception as e:
+                logger.error(f"Workflow monitor callback {getattr(callback, '__name__', callback)} failed for PR #{monitor.pr_number}: {e}")
+
+    def _evaluate(self, monitor: PendingMonitor, runs: List[Dict[str, Any]], now: float) -> Optional[str]:
+        """Return the final state of monitor given the runs for its commit, or None while pending."""
+        if not runs:
+            return NOT_FOUND if now - monitor.registered_at > self.appear_timeout_seconds else None
+        if monitor.run_id is None:
+            monitor.run_id = runs[0].get("id")
+        if any((run.get("status") or "").lower() in _IN_PROGRESS_STATUSES for run in runs):
+            return ERROR if now - monitor.registered_at > self.complete_timeout_seconds else None
+        if all((run.get("conclusion") or "").lower() in _PASSING_CONCLUSIONS for run in runs):
+            return SUCCESS
+        return FAILURE
+
+    def poll_once(self) -> int:
+        """Check every pending monitor with one workflow runs request per repository.
+
+        On a busy repository a tracked run can fall off that first page; such
+        monitors are checked with an extra request filtered by their head SHA.
+
+        Returns:
+            Number of monitors that completed
+        """
+        by_repo: Dict[str, List[PendingMonitor]] = {}
+        for monitor in self.pending():
+            by_repo.setdefault(monitor.repo_name, []).append(monitor)
+        if not by_repo:
+            return 0
+
+        api = get_ghapi_client(GitHubClient.get_instance().token)
+        finished = 0
+        now = time.time()
+        for repo_name, monitors in by_repo.items():
+            owner, repo = repo_name.split("/")
+            try:
+                response = api.actions.list_workflow_runs_for_repo(owner, repo, per_page=RUNS_PER_PAGE)
+            except Exception as e:
+                logger.warning(f"Failed to list workflow runs for {repo_name}: {e}")
+                continue
+            runs = response.get("workflow_runs", [])
+            runs_by_sha: Dict[str, List[Dict[str, Any]]] = {}
+            for monitor in monitors:
+                matching = [run for run in runs if monitor.matches(run)]
+                if not matching and len(runs) >= RUNS_PER_PAGE:
+                    if monitor.head_sha not in runs_by_sha:
+                        try:
+                            response = api.actions.list_workflow_runs_for_repo(owner, repo, head_sha=monitor.head_sha, per_page=RUNS_PER_PAGE)
+                        except Exception as e:
+                            logger.warning(f"Failed to list workflow runs for {monitor.head_sha[:8]} in {repo_name}: {e}")
+                            continue
+                        runs_by_sha[monitor.head_sha] = response.get("workflow_runs", [])
+                    matching = [run for run in runs_by_sha[monitor.head_sha] if monitor.matches(run)]
+                state = self._evaluate(monitor, matching, now)
+                if state is not None:
+                    self._complete(monitor, state)
+                    finished += 1
+        with self._lock:
+            self.polls += 1
+        return finished
+
+    def handle_workflow_run_event(self, payload: Dict[str, Any]) -> bool:
+        """Finish the monitor a completed workflow_run webhook belongs to.
+
+        Returns:
+            True if a pending monitor was completed
+        """
+        run = payload.get("workflow_run") or {}
+        repo_name = (payload.get("repository") or {}).get("full_name") or ""
+        for monitor in self.pending():
+            if monitor.repo_name != repo_name or not monitor.matches(run):
+                continue
+            monitor.run_id = run.get("id") or monitor.run_id
+            if payload.get("action") != "completed":
+                return False
+            conclusion = (run.get("conclusion") or "").lower()
+            self._complete(monitor, SUCCESS if conclusion in _PASSING_CONCLUSIONS else FAILURE)
+            return True
+        return False
+
+    async def run(self) -> None:
+        """Poll pending monitors until cancelled (runs on the engine's event loop)."""
+        self.running = True
+        try:
+            while True:
+                if self.pending():
+                    try:
+                        await asyncio.to_thread(self.poll_once)
+                    except Exception as e:
+                        logger.error(f"Workflow monitor poll failed: {e}")
+                await asyncio.sleep(self.poll_interval_seconds)
+        finally:
+            self.running = False
+
+
+def get_workflow_monitor_service() -> Optional[WorkflowMonitorService]:
+    """Return the service when [workflow_monitor].enabled is on, otherwise None."""
+    from .llm_backend_config import get_workflow_monitor_enabled_from_config
+
+    if not get_workflow_monitor_enabled_from_config():
+        return None
+    return WorkflowMonitorService.get_instance()
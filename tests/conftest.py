@@ -19,6 +19,7 @@ if str(_src_path) not in sys.path:
 from src.auto_coder.automation_engine import AutomationEngine
 from src.auto_coder.backend_manager import LLMBackendManager, get_llm_backend_manager
 from src.auto_coder.gemini_client import GeminiClient
+from src.auto_coder.git_fetch import GitFetchCoordinator
 from src.auto_coder.jules_client import invalidate_jules_sessions_cache
 from src.auto_coder.llm_backend_config import reset_llm_config
 from src.auto_coder.util.gh_cache import GitHubClient
@@ -82,12 +83,63 @@ def _reset_llm_config_singleton():
     reset_llm_config()
 
 
+@pytest.fixture(autouse=True)
+def _reset_git_fetch_coordinator():
+    """Reset the git fetch coordinator so fetch freshness does not leak between tests."""
+    GitFetchCoordinator.reset_instance()
+    yield
+    GitFetchCoordinator.reset_instance()
+
+
 @pytest.fixture(autouse=True)
 def _reset_jules_sessions_cache():
-    """Reset the cached Jules session listing between tests to ensure isolation."""
-    invalidate_jules_sessions_cache()
+    """Reset the cached Jules session listing and session registry between tests to ensure isolation."""
+
+    def reset():
+        invalidate_jules_sessions_cache()
+        # Modules are imported both as src.auto_coder and auto_coder; each copy has its own registry
+        for module_name in ("src.auto_coder.jules_session_registry", "auto_coder.jules_session_registry"):
+            module = sys.modules.get(module_name)
+            if module is not None:
+                module.JulesSessionRegistry.reset_instance()
+
+    reset()
+    yield
+    reset()
+
+
+@pytest.fixture(autouse=True)
+def _reset_repo_metadata_cache():
+    """Reset the repository metadata cache so cached repository settings do not leak between tests."""
+
+    def reset():
+        for module_name in ("src.auto_coder.util.repo_metadata", "auto_coder.util.repo_metadata"):
+            module = sys.modules.get(module_name)
+            if module is not None:
+                module.RepoMetadataCache.reset_instance()
+
+    reset()
+    yield
+    reset()
+
+
+@pytest.fixture(autouse=True)
+def _reset_mergeability_resolver():
+    """Reset the mergeability resolver and merge train yard so their state does not leak between tests."""
+
+    def reset():
+        for module_name in ("src.auto_coder.mergeability", "auto_coder.mergeability"):
+            module = sys.modules.get(module_name)
+            if module is not None:
+                module.MergeabilityResolver.reset_instance()
+        for module_name in ("src.auto_coder.merge_train", "auto_coder.merge_train"):
+            module = sys.modules.get(module_name)
+            if module is not None:
+                module.MergeTrainYard.reset_instance()
+
+    reset()
     yield
-    invalidate_jules_sessions_cache()
+    reset()
 
 
 @pytest.fixture(autouse=True)
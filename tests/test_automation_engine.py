@@ -972,7 +972,7 @@ class TestAutomationEngineExtended:
             # Mock all git commands to succeed
             # The _force_checkout_pr_manually function makes multiple git calls:
             # merge --abort, reset --hard, clean -fd, fetch (branch:branch), fetch (pull/N/head),
-            # checkout branch, checkout -b branch FETCH_HEAD
+            # checkout branch, checkout -b branch refs/remotes/origin/pr/N
             mock_run_command.return_value = Mock(success=True, stdout="", stderr="", returncode=0)
 
             # Execute
@@ -1545,6 +1545,43 @@ class TestGetCandidates:
         assert candidates[2].priority == 1
         assert candidates[2].data["number"] == 2
 
+    @patch("auto_coder.util.github_action._check_github_actions_status")
+    @patch("auto_coder.issue_context.extract_linked_issues_from_pr_body")
+    def test_get_candidates_dependency_only_conflicts_ahead_of_other_conflicts(
+        self,
+        mock_extract_issues,
+        mock_check_actions,
+        mock_github_client,
+        mock_gemini_client,
+        test_repo_name,
+    ):
+        """Conflicts the scan finds limited to lockfiles are resolved without the LLM, so they go first."""
+        from src.auto_coder.conflict_scanner import ConflictScanResult
+
+        engine = AutomationEngine(mock_github_client)
+        pr_data = {
+            number: {"number": number, "title": f"PR {number}", "body": "", "head": {"ref": f"pr-{number}"}, "labels": [], "mergeable": False, "created_at": f"2024-01-0{number}T00:00:00Z"}
+            for number in (1, 2)
+        }
+        mock_github_client.get_open_issues_json.return_value = []
+        mock_github_client.get_pr_comments.return_value = []
+        mock_github_client.get_pr_commits.return_value = []
+        mock_github_client.get_open_prs_json.return_value = list(pr_data.values())
+        mock_check_actions.return_value = GitHubActionsStatusResult(success=False, ids=[])
+        mock_extract_issues.return_value = []
+        mock_github_client.get_open_sub_issues.return_value = []
+        mock_github_client.has_linked_pr.return_value = False
+        scans = {
+            1: ConflictScanResult(pr_number=1, base_branch="main", conflicted_paths=["app.py"]),
+            2: ConflictScanResult(pr_number=2, base_branch="main", conflicted_paths=["package-lock.json"], lockfile_only=True),
+        }
+
+        with patch.object(engine, "_scan_pr_conflicts", return_value=scans):
+            candidates = engine._get_candidates(test_repo_name, max_items=10)
+
+        assert [(c.data["number"], c.priority) for c in candidates] == [(2, 3), (1, 2)]
+        assert candidates[0].data["conflict_scan"]["dependency_only"] is True
+
     @patch("auto_coder.util.github_action._check_github_actions_status")
     @patch("auto_coder.issue_context.extract_linked_issues_from_pr_body")
     def test_get_candidates_urgent_unmergeable_prs_highest_priority(
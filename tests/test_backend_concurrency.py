@@ -0,0 +1,128 @@
+"""Tests for the per-backend concurrency limiter."""
+
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.auto_coder.backend_concurrency import BackendConcurrencyGovernor, get_backend_concurrency_governor
+from src.auto_coder.backend_manager import BackendManager
+from src.auto_coder.exceptions import AutoCoderBackendBusyError
+
+
+def _wait_until(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "condition not reached"
+        time.sleep(0.01)
+
+
+def test_limits_in_flight_calls_per_backend():
+    governor = BackendConcurrencyGovernor(max_in_flight=2, max_queue=10)
+    running = []
+    peak = []
+    lock = threading.Lock()
+
+    def call():
+        with governor.admit("codex"):
+            with lock:
+                running.append(1)
+                peak.append(len(running))
+            threading.Event().wait(0.05)
+            with lock:
+                running.pop()
+
+    threads = [threading.Thread(target=call) for _ in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert max(peak) == 2
+    stats = governor.stats()["codex"]
+    assert stats["admitted"] == 6
+    assert stats["in_flight"] == 0
+    assert stats["max_wait_seconds"] > 0
+
+
+def test_waiters_are_admitted_in_arrival_order():
+    governor = BackendConcurrencyGovernor(max_in_flight=1, max_queue=10)
+    release = threading.Event()
+    order = []
+
+    def holder():
+        with governor.admit("codex"):
+            release.wait(5)
+
+    def waiter(n):
+        with governor.admit("codex"):
+            order.append(n)
+
+    threads = [threading.Thread(target=holder)]
+    threads[0].start()
+    _wait_until(lambda: governor.stats().get("codex", {}).get("in_flight") == 1)
+    for n in range(4):
+        t = threading.Thread(target=waiter, args=(n,))
+        t.start()
+        threads.append(t)
+        _wait_until(lambda n=n: governor.stats()["codex"]["queued"] == n + 1)
+    release.set()
+    for t in threads:
+        t.join()
+
+    assert order == [0, 1, 2, 3]
+
+
+def test_full_queue_spills_over():
+    governor = BackendConcurrencyGovernor(max_in_flight=1, max_queue=0)
+
+    with governor.admit("codex"):
+        with pytest.raises(AutoCoderBackendBusyError):
+            with governor.admit("codex"):
+                pass
+
+    assert governor.stats()["codex"]["spilled"] == 1
+    assert governor.stats()["codex"]["in_flight"] == 0
+
+
+def test_provider_limit_and_overrides():
+    governor = BackendConcurrencyGovernor(max_in_flight=5, provider_max_in_flight=1, max_queue=0, limits={"qwen": 3})
+
+    with governor.admit("qwen", "qwen-azure"):
+        with governor.admit("qwen", "qwen-open-router"):
+            with pytest.raises(AutoCoderBackendBusyError):
+                with governor.admit("qwen", "qwen-azure"):
+                    pass
+
+    stats = governor.stats()
+    assert stats["qwen"]["limit"] == 3
+    assert stats["qwen"]["in_flight"] == 0
+    assert stats["qwen:qwen-azure"]["spilled"] == 1
+
+
+def test_disabled_by_default():
+    assert get_backend_concurrency_governor() is None
+
+
+def test_backend_manager_spills_to_next_backend_when_busy():
+    governor = BackendConcurrencyGovernor(max_in_flight=1, max_queue=0)
+    clients = {}
+    for name in ("codex", "gemini"):
+        client = MagicMock()
+        client.model_name = name
+        client._run_llm_cli.return_value = f"{name} output"
+        client.get_last_session_id.return_value = None
+        clients[name] = client
+    manager = BackendManager(
+        default_backend="codex",
+        default_client=clients["codex"],
+        factories={"codex": lambda: clients["codex"], "gemini": lambda: clients["gemini"]},
+        order=["codex", "gemini"],
+    )
+
+    with patch("src.auto_coder.backend_manager.get_backend_concurrency_governor", return_value=governor):
+        with governor.admit("codex"):
+            assert manager._run_llm_cli("prompt") == "gemini output"
+
+    clients["codex"]._run_llm_cli.assert_not_called()
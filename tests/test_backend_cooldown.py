@@ -0,0 +1,148 @@
+"""Tests for the cross-process backend cooldown registry."""
+
+import time
+from datetime import datetime, timezone
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.auto_coder.backend_cooldown import BackendCooldownRegistry, parse_unavailable_until
+from src.auto_coder.backend_manager import BackendManager
+from src.auto_coder.exceptions import AutoCoderUsageLimitError
+
+NOW = datetime(2025, 1, 1, 12, 0, tzinfo=timezone.utc).timestamp()
+
+
+class TestParseUnavailableUntil:
+    def test_relative_duration(self):
+        assert parse_unavailable_until("You've hit your usage limit, try again in 2 hours 22 minutes.", NOW) == NOW + 2 * 3600 + 22 * 60
+
+    def test_compact_seconds(self):
+        assert parse_unavailable_until("Rate limited. Try again in 60s.", NOW) == NOW + 60
+
+    def test_retry_after_header(self):
+        assert parse_unavailable_until("HTTP 429\nRetry-After: 120", NOW) == NOW + 120
+
+    def test_iso_timestamp(self):
+        assert parse_unavailable_until("five_hour window resets at 2025-01-01T15:30:00Z", NOW) == NOW + 3.5 * 3600
+
+    def test_clock_time_with_zone_rolls_to_next_day(self):
+        # 12:00 UTC is 21:00 in Tokyo, so "2am" is five hours later
+        assert parse_unavailable_until("5-hour limit reached ∙ resets 2am (Asia/Tokyo)", NOW) == NOW + 5 * 3600
+
+    def test_unknown_message(self):
+        assert parse_unavailable_until("quota exceeded", NOW) is None
+
+
+@pytest.fixture
+def registry(tmp_path):
+    return BackendCooldownRegistry(db_path=tmp_path / "cooldowns.sqlite3", default_cooldown_seconds=300)
+
+
+def test_mark_unavailable_parses_reason(registry):
+    until = registry.mark_unavailable("codex", reason="try again in 10 minutes")
+
+    assert 590 < until - time.time() <= 600
+    assert registry.unavailable_until("codex") == until
+    assert registry.is_available("gemini")
+
+
+def test_fallback_seconds_when_reason_unparseable(registry):
+    until = registry.mark_unavailable("codex", reason="quota exceeded", fallback_seconds=30)
+
+    assert 25 < until - time.time() <= 30
+
+
+def test_provider_cooldowns_are_independent(registry):
+    registry.mark_unavailable("qwen", "qwen-azure", reason="retry in 60s")
+
+    assert not registry.is_available("qwen", "qwen-azure")
+    assert registry.is_available("qwen", "qwen-open-router")
+    assert registry.is_available("qwen")
+
+
+def test_later_expiry_is_kept(registry):
+    later = registry.mark_unavailable("codex", reason="try again in 2 hours")
+    registry.mark_unavailable("codex", reason="try again in 1 minute")
+
+    assert registry.unavailable_until("codex") == later
+
+
+def test_expired_cooldown_is_available(registry):
+    registry.mark_unavailable("codex", reason="retry in 60s")
+
+    with patch("src.auto_coder.backend_cooldown.time.time", return_value=time.time() + 120):
+        assert registry.is_available("codex")
+
+
+def test_registry_is_shared_between_instances(tmp_path):
+    first = BackendCooldownRegistry(db_path=tmp_path / "cooldowns.sqlite3")
+    second = BackendCooldownRegistry(db_path=tmp_path / "cooldowns.sqlite3")
+
+    first.mark_unavailable("claude", reason="try again in 5 minutes")
+
+    assert not second.is_available("claude")
+    assert [c["backend"] for c in second.active_cooldowns()] == ["claude"]
+
+
+class TestBackendManagerWithCooldowns:
+    def _manager(self):
+        codex = MagicMock()
+        codex.model_name = "gpt-5"
+        codex._run_llm_cli.side_effect = AutoCoderUsageLimitError("usage limit, try again in 30 minutes")
+        gemini = MagicMock()
+        gemini.model_name = "gemini-pro"
+        gemini._run_llm_cli.return_value = "ok"
+        gemini.get_last_session_id.return_value = None
+        manager = BackendManager(
+            default_backend="codex",
+            default_client=codex,
+            factories={"codex": lambda: codex, "gemini": lambda: gemini},
+            order=["codex", "gemini"],
+        )
+        return manager, codex, gemini
+
+    def test_limited_backend_is_skipped_by_other_managers(self, registry, mock_sleep_globally):
+        first, codex, gemini = self._manager()
+        second, codex2, gemini2 = self._manager()
+
+        with patch("src.auto_coder.backend_manager.get_backend_cooldown_registry", return_value=registry):
+            assert first._run_llm_cli("prompt") == "ok"
+            assert second._run_llm_cli("prompt") == "ok"
+
+        codex._run_llm_cli.assert_called_once()
+        codex2._run_llm_cli.assert_not_called()
+        assert not registry.is_available("codex")
+        mock_sleep_globally.assert_not_called()
+
+    def test_all_backends_cooling_down_fails_fast(self, registry):
+        manager, codex, gemini = self._manager()
+        registry.mark_unavailable("codex", reason="retry in 60s")
+        registry.mark_unavailable("gemini", reason="retry in 60s")
+
+        with patch("src.auto_coder.backend_manager.get_backend_cooldown_registry", return_value=registry):
+            with pytest.raises(AutoCoderUsageLimitError, match="cooling down"):
+                manager._run_llm_cli("prompt")
+
+        codex._run_llm_cli.assert_not_called()
+        gemini._run_llm_cli.assert_not_called()
+
+    def test_cooling_down_provider_is_skipped(self, registry):
+        manager, codex, gemini = self._manager()
+        providers = ["qwen-azure", "qwen-open-router"]
+        current = {"idx": 0}
+        provider_manager = MagicMock()
+        provider_manager.has_providers.return_value = True
+        provider_manager.get_provider_count.return_value = 2
+        provider_manager.create_env_context.return_value = {}
+        provider_manager.get_current_provider_name.side_effect = lambda backend: providers[current["idx"]]
+        provider_manager.advance_to_next_provider.side_effect = lambda backend: current.update(idx=(current["idx"] + 1) % 2) or True
+        manager._provider_manager = provider_manager
+        registry.mark_unavailable("gemini", "qwen-azure", reason="retry in 60s")
+
+        with patch("src.auto_coder.backend_manager.get_backend_cooldown_registry", return_value=registry):
+            result = manager._execute_backend_with_providers("gemini", gemini, "prompt", 1, MagicMock())
+
+        assert result == "ok"
+        gemini._run_llm_cli.assert_called_once()
+        provider_manager.mark_provider_used.assert_called_once_with("gemini", "qwen-open-router")
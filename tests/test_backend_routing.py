@@ -0,0 +1,161 @@
+"""Tests for latency- and success-aware backend routing."""
+
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.auto_coder.backend_manager import BackendManager
+from src.auto_coder.backend_routing import (
+    OUTCOME_ERROR,
+    OUTCOME_SUCCESS,
+    OUTCOME_TIMEOUT,
+    OUTCOME_USAGE_LIMIT,
+    BackendRoutingStats,
+    RoutingPolicy,
+    ScoreRoutingPolicy,
+    get_backend_routing_policy,
+)
+from src.auto_coder.exceptions import AutoCoderTimeoutError
+
+
+@pytest.fixture
+def stats(tmp_path):
+    return BackendRoutingStats(path=tmp_path / "stats.json", ewma_alpha=0.5)
+
+
+def test_ewma_latency_uses_successful_calls_only(stats):
+    stats.record_call("codex", None, "gpt-5", 10.0, OUTCOME_SUCCESS)
+    stats.record_call("codex", None, "gpt-5", 20.0, OUTCOME_SUCCESS)
+    stats.record_call("codex", None, "gpt-5", 600.0, OUTCOME_TIMEOUT)
+
+    result = stats.backend_stats("codex")
+    assert result.ewma_latency == 15.0
+    assert (result.calls, result.successes, result.timeouts) == (3, 2, 1)
+
+
+def test_backend_stats_aggregate_providers_and_models(stats):
+    stats.record_call("qwen", "qwen-azure", "qwen3", 4.0, OUTCOME_SUCCESS)
+    stats.record_call("qwen", "qwen-open-router", "qwen3", 8.0, OUTCOME_USAGE_LIMIT)
+    stats.record_task_outcome("qwen", "qwen-azure", "qwen3", True)
+
+    result = stats.backend_stats("qwen")
+    assert (result.calls, result.usage_limits, result.task_successes) == (2, 1, 1)
+    assert result.ewma_latency == 4.0
+    assert stats.backend_stats("codex").calls == 0
+
+
+def test_stats_are_persisted(tmp_path):
+    first = BackendRoutingStats(path=tmp_path / "stats.json")
+    first.record_call("gemini", None, "gemini-pro", 3.0, OUTCOME_ERROR)
+
+    second = BackendRoutingStats(path=tmp_path / "stats.json")
+    assert second.backend_stats("gemini").errors == 1
+
+
+def test_concurrent_writers_use_their_own_temporary_files(tmp_path):
+    path = tmp_path / "stats.json"
+    writers = [BackendRoutingStats(path=path) for _ in range(4)]
+
+    def record(writer):
+        for _ in range(25):
+            writer.record_call("codex", None, None, 1.0, OUTCOME_SUCCESS)
+
+    threads = [threading.Thread(target=record, args=(writer,)) for writer in writers]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert [p.name for p in tmp_path.iterdir()] == ["stats.json"]
+    assert BackendRoutingStats(path=path).backend_stats("codex").calls == 25
+
+
+def test_score_policy_explores_unmeasured_backends_first(stats):
+    for _ in range(3):
+        stats.record_call("codex", None, None, 5.0, OUTCOME_SUCCESS)
+
+    policy = ScoreRoutingPolicy(stats, min_samples=3)
+    assert policy.rank(["codex", "gemini"]) == ["gemini", "codex"]
+
+
+def test_score_policy_prefers_fast_reliable_backend(stats):
+    for _ in range(4):
+        stats.record_call("codex", None, None, 60.0, OUTCOME_SUCCESS)
+        stats.record_call("gemini", None, None, 10.0, OUTCOME_SUCCESS)
+    policy = ScoreRoutingPolicy(stats, min_samples=3)
+    assert policy.rank(["codex", "gemini"]) == ["gemini", "codex"]
+
+    # Edits that keep failing the tests outweigh raw speed
+    for _ in range(20):
+        stats.record_task_outcome("gemini", None, None, False)
+        stats.record_task_outcome("codex", None, None, True)
+    assert policy.rank(["codex", "gemini"]) == ["codex", "gemini"]
+
+
+def test_order_policy_is_default():
+    policy = get_backend_routing_policy()
+
+    assert type(policy) is RoutingPolicy
+    assert policy.rank(["codex", "gemini"]) == ["codex", "gemini"]
+
+
+class TestBackendManagerRouting:
+    def _manager(self, stats, policy):
+        clients = {}
+        for name in ("codex", "gemini"):
+            client = MagicMock()
+            client.model_name = f"{name}-model"
+            client._run_llm_cli.return_value = f"{name} output"
+            client.get_last_session_id.return_value = None
+            clients[name] = client
+        with patch("src.auto_coder.backend_manager.get_backend_routing_policy", return_value=policy):
+            manager = BackendManager(
+                default_backend="codex",
+                default_client=clients["codex"],
+                factories={name: (lambda c=client: c) for name, client in clients.items()},
+                order=["codex", "gemini"],
+            )
+        return manager, clients
+
+    def test_calls_are_recorded(self, stats):
+        manager, clients = self._manager(stats, ScoreRoutingPolicy(stats))
+        clients["codex"]._run_llm_cli.side_effect = AutoCoderTimeoutError("timed out")
+
+        with patch("src.auto_coder.backend_manager.get_backend_routing_stats", return_value=stats):
+            assert manager._run_llm_cli("prompt") == "gemini output"
+
+        assert stats.backend_stats("codex").timeouts == 1
+        assert stats.backend_stats("gemini").successes == 1
+
+    def test_order_policy_records_nothing(self, stats):
+        manager, _ = self._manager(stats, RoutingPolicy())
+
+        with patch("src.auto_coder.backend_manager.get_backend_routing_stats", return_value=stats):
+            assert manager._run_llm_cli("prompt") == "codex output"
+
+        assert stats.snapshot() == {}
+        assert not stats.path.exists()
+
+    def test_score_policy_routes_to_best_backend(self, stats):
+        for _ in range(3):
+            stats.record_call("codex", None, "codex-model", 90.0, OUTCOME_SUCCESS)
+            stats.record_call("gemini", None, "gemini-model", 5.0, OUTCOME_SUCCESS)
+        manager, clients = self._manager(stats, ScoreRoutingPolicy(stats))
+
+        with patch("src.auto_coder.backend_manager.get_backend_routing_stats", return_value=stats):
+            assert manager._run_llm_cli("prompt") == "gemini output"
+
+        clients["codex"]._run_llm_cli.assert_not_called()
+
+    def test_deliberate_rotation_is_not_rerouted(self, stats):
+        for _ in range(3):
+            stats.record_call("codex", None, "codex-model", 5.0, OUTCOME_SUCCESS)
+            stats.record_call("gemini", None, "gemini-model", 90.0, OUTCOME_SUCCESS)
+        manager, clients = self._manager(stats, ScoreRoutingPolicy(stats))
+        manager.switch_to_next_backend()
+        manager._routing_hold = True
+
+        with patch("src.auto_coder.backend_manager.get_backend_routing_stats", return_value=stats):
+            assert manager._run_llm_cli("prompt") == "gemini output"
+            assert manager._run_llm_cli("prompt") == "codex output"
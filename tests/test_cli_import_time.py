@@ -0,0 +1,73 @@
+"""Import-time checks for the CLI entry point.
+
+Subcommand modules are registered lazily in cli.py, so importing the entry
+point (and running light commands such as `unlock` or `config`) must not pull
+in AutomationEngine, the GitHub clients or the web server stack.
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parents[1] / "src"
+
+HEAVY_MODULES = ["auto_coder.automation_engine", "auto_coder.cli_commands_main", "auto_coder.util.gh_cache", "github", "ghapi", "httpx", "fastapi", "nicegui"]
+
+
+def _python(code, *flags):
+    env = {**os.environ, "PYTHONPATH": str(SRC_DIR), "AUTO_CODER_DISABLE_AUTO_UPDATE": "1"}
+    return subprocess.run([sys.executable, *flags, "-c", code], capture_output=True, text=True, env=env, cwd=SRC_DIR, timeout=60)
+
+
+def _importtime(module):
+    """Return {module: cumulative microseconds} from `python -X importtime -c 'import module'`."""
+    result = _python(f"import {module}", "-X", "importtime")
+    assert result.returncode == 0, result.stderr
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def test_cli_import_skips_heavy_modules(_use_real_commands):
+    times = _importtime("auto_coder.cli")
+
+    assert "auto_coder.cli" in times
+    assert [module for module in HEAVY_MODULES if module in times] == []
+
+
+def test_light_command_does_not_load_other_subcommands(_use_real_commands):
+    code = "\n".join(
+        [
+            "import sys",
+            "from auto_coder.cli import main",
+            "try:",
+            "    main(['config', '--help'])",
+            "except SystemExit:",
+            "    pass",
+            "print(sorted(m for m in sys.modules if m.startswith('auto_coder.cli_commands')))",
+        ]
+    )
+    result = _python(code)
+
+    assert result.returncode == 0, result.stderr
+    assert "Configuration management commands." in result.stdout
+    assert result.stdout.strip().splitlines()[-1] == "['auto_coder.cli_commands_config']"
+
+
+def test_lazy_commands_are_listed_and_importable():
+    from click.testing import CliRunner
+
+    from src.auto_coder import cli
+
+    result = CliRunner().invoke(cli.main, ["--help"])
+
+    assert result.exit_code == 0
+    for name in cli.LAZY_COMMANDS:
+        assert name in result.output
+    assert cli.process_issues.name == "process-issues"
+    assert callable(cli.qwen_help_has_flags)
@@ -393,3 +393,51 @@ def test_resolve_merge_conflicts_commit_message_uses_pr_number():
         mock_commit.assert_called_once_with("Resolve merge conflicts for PR #4809")
         assert "Committed resolved merge for PR #4809" in actions
         assert "Pushed resolved merge for PR #4809" in actions
+
+
+def test_dependency_conflicts_skip_the_llm(tmp_path, monkeypatch, _use_real_commands):
+    import subprocess
+
+    from src.auto_coder.conflict_resolver import _get_merge_conflict_info, resolve_dependency_conflicts_without_llm
+
+    def git(*args):
+        return subprocess.run(["git", *args], cwd=tmp_path, check=True, capture_output=True, text=True).stdout.strip()
+
+    def commit(deps, message):
+        (tmp_path / "package.json").write_text(json.dumps({"name": "app", "dependencies": deps}, indent=2))
+        git("commit", "-q", "-am", message)
+
+    git("init", "-q", "-b", "main")
+    git("config", "user.email", "t@example.com")
+    git("config", "user.name", "t")
+    (tmp_path / "package.json").write_text("{}")
+    git("add", "-A")
+    git("commit", "-q", "-m", "base")
+    git("checkout", "-q", "-b", "feature")
+    commit({"left-pad": "1.0.0"}, "feature deps")
+    git("checkout", "-q", "main")
+    commit({"lodash": "4.0.0"}, "main deps")
+    git("checkout", "-q", "feature")
+    monkeypatch.chdir(tmp_path)
+    assert subprocess.run(["git", "merge", "-q", "main"], cwd=tmp_path, capture_output=True).returncode != 0
+
+    with (
+        patch("src.auto_coder.conflict_resolver.git_push", return_value=CommandResult(True, stdout="", stderr="", returncode=0)) as mock_push,
+        patch("src.auto_coder.conflict_resolver.resolve_merge_conflicts_with_llm") as mock_llm,
+    ):
+        assert resolve_dependency_conflicts_without_llm({"number": 5}, "main", _get_merge_conflict_info(), AutomationConfig()) is True
+
+    mock_llm.assert_not_called()
+    mock_push.assert_called_once()
+    assert json.loads((tmp_path / "package.json").read_text())["dependencies"] == {"left-pad": "1.0.0", "lodash": "4.0.0"}
+    assert git("status", "--porcelain") == ""
+    assert git("log", "-1", "--format=%s") == "Auto-Coder: Merge main into PR #5"
+
+
+def test_source_conflicts_are_left_to_the_llm():
+    from src.auto_coder.conflict_resolver import resolve_dependency_conflicts_without_llm
+
+    with patch("src.auto_coder.conflict_resolver.cmd") as mock_cmd:
+        assert resolve_dependency_conflicts_without_llm({"number": 5}, "main", "UU package-lock.json\nUU app.py\n", AutomationConfig()) is None
+
+    mock_cmd.run_command.assert_not_called()
@@ -0,0 +1,92 @@
+"""Tests for the git merge-tree conflict scanner."""
+
+import json
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from src.auto_coder.conflict_scanner import _parse_merge_tree_output, scan_pr_conflicts
+from src.auto_coder.git_fetch import GitFetchCoordinator
+
+
+def _git(cwd, *args):
+    return subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True, text=True).stdout.strip()
+
+
+def _commit(repo, files, message):
+    for name, content in files.items():
+        path = Path(repo) / name
+        path.write_text(content if isinstance(content, str) else json.dumps(content, indent=2))
+    _git(repo, "add", "-A")
+    _git(repo, "commit", "-q", "-m", message)
+    return _git(repo, "rev-parse", "HEAD")
+
+
+def _package(version, deps):
+    return {"name": "app", "version": version, "dependencies": deps}
+
+
+@pytest.fixture
+def repos(tmp_path, _use_real_commands):
+    """An origin with main and four PR heads, and a clone to scan from."""
+    origin = tmp_path / "origin"
+    work = tmp_path / "work"
+    work.mkdir()
+    _git(work, "init", "-q", "-b", "main")
+    _git(work, "config", "user.email", "t@example.com")
+    _git(work, "config", "user.name", "t")
+    base = _commit(work, {"app.py": "a = 1\n", "package-lock.json": "{}\n", "package.json": _package("1.0.0", {"x": "1"})}, "base")
+
+    def pr_head(number, files):
+        _git(work, "checkout", "-q", "-b", f"pr{number}", base)
+        return _commit(work, files, f"pr {number}")
+
+    heads = {
+        1: pr_head(1, {"app.py": "a = 2\n"}),
+        2: pr_head(2, {"other.py": "b = 1\n"}),
+        3: pr_head(3, {"package-lock.json": '{"pr": 3}\n', "package.json": _package("1.5.0", {"x": "2"})}),
+        4: pr_head(4, {"package.json": _package("2.0.0", {"x": "1"})}),
+    }
+    _git(work, "checkout", "-q", "main")
+    _commit(work, {"app.py": "a = 3\n", "package-lock.json": '{"main": 1}\n', "package.json": _package("1.5.0", {"x": "3"})}, "main moves on")
+
+    _git(tmp_path, "clone", "-q", "--bare", str(work), str(origin))
+    for number, sha in heads.items():
+        _git(origin, "update-ref", f"refs/pull/{number}/head", sha)
+    clone = tmp_path / "clone"
+    _git(tmp_path, "clone", "-q", str(origin), str(clone))
+    return clone
+
+
+def test_scan_reports_conflicts_without_touching_worktree(repos):
+    head_before = _git(repos, "rev-parse", "HEAD")
+    prs = [{"number": n, "base_branch": "main"} for n in (1, 2, 3, 4)]
+
+    results = scan_pr_conflicts(prs, cwd=str(repos))
+
+    assert results[1].conflicted_paths == ["app.py"]
+    assert not results[1].dependency_only
+    assert not results[2].has_conflicts and results[2].error is None
+    assert results[3].conflicted_paths == ["package-lock.json", "package.json"]
+    assert results[3].package_json_deps_only == ["package.json"]
+    assert results[3].dependency_only and not results[3].lockfile_only
+    assert results[4].conflicted_paths == ["package.json"]
+    assert results[4].package_json_deps_only == []
+    assert _git(repos, "rev-parse", "HEAD") == head_before
+    assert _git(repos, "status", "--porcelain") == ""
+    # The fetch goes through the coordinator, so it is counted with the others
+    assert GitFetchCoordinator.get_instance().stats()["fetches"] == 1
+
+
+def test_failed_fetch_marks_every_pr(repos):
+    results = scan_pr_conflicts([{"number": 99, "base": {"ref": "main"}}], cwd=str(repos))
+
+    assert results[99].error and "git fetch failed" in results[99].error
+    assert not results[99].has_conflicts
+
+
+def test_parse_merge_tree_output():
+    stdout = "tree0\n100644 aaa 1\tpkg/package.json\n100644 bbb 2\tpkg/package.json\n100644 ccc 3\tpkg/package.json\n"
+
+    assert _parse_merge_tree_output(stdout) == {"pkg/package.json": {1: "aaa", 2: "bbb", 3: "ccc"}}
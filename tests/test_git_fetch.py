@@ -0,0 +1,115 @@
+"""Tests for the single-flight git fetch coordinator."""
+
+import subprocess
+import threading
+from unittest.mock import MagicMock, patch
+
+from src.auto_coder.git_fetch import GitFetchCoordinator, git_fetch
+from src.auto_coder.utils import CommandResult
+
+OK = CommandResult(success=True, stdout="", stderr="", returncode=0)
+
+
+def _runner(result=OK):
+    return MagicMock(return_value=result)
+
+
+def test_concurrent_fetches_share_one_run(tmp_path):
+    coordinator = GitFetchCoordinator(freshness_seconds=0)
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def slow_fetch(command, cwd=None):
+        calls.append(command)
+        started.set()
+        release.wait(5)
+        return OK
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(coordinator.fetch(["main"], cwd=str(tmp_path), run_command=slow_fetch)))
+    leader.start()
+    assert started.wait(5)
+    followers = [threading.Thread(target=lambda: results.append(coordinator.fetch(["main"], cwd=str(tmp_path), run_command=slow_fetch))) for _ in range(3)]
+    for follower in followers:
+        follower.start()
+    while coordinator.stats()["joined"] < 3:
+        threading.Event().wait(0.01)
+    release.set()
+    for thread in [leader, *followers]:
+        thread.join(5)
+
+    assert calls == [["git", "fetch", "origin", "main"]]
+    assert len(results) == 4 and all(result.success for result in results)
+    assert coordinator.stats() == {"fetches": 1, "joined": 3, "skipped_fresh": 0}
+
+
+def test_recent_fetch_is_skipped(tmp_path):
+    coordinator = GitFetchCoordinator(freshness_seconds=60)
+    run = _runner()
+
+    coordinator.fetch(["main"], cwd=str(tmp_path), run_command=run)
+    coordinator.fetch(["main"], cwd=str(tmp_path), run_command=run)
+    coordinator.fetch(["develop"], cwd=str(tmp_path), run_command=run)
+    coordinator.fetch(["main"], cwd=str(tmp_path), force=True, run_command=run)
+
+    assert [call.args[0][-1] for call in run.call_args_list] == ["main", "develop", "main"]
+    assert coordinator.stats()["skipped_fresh"] == 1
+
+
+def test_full_fetch_freshens_branches_but_not_pull_refs(tmp_path):
+    coordinator = GitFetchCoordinator(freshness_seconds=60)
+    run = _runner()
+
+    coordinator.fetch(extra_args=["--prune", "--tags"], cwd=str(tmp_path), run_command=run)
+    coordinator.fetch(["main"], cwd=str(tmp_path), run_command=run)
+    coordinator.fetch(["pull/5/head"], cwd=str(tmp_path), run_command=run)
+
+    assert [call.args[0] for call in run.call_args_list] == [
+        ["git", "fetch", "origin", "--prune", "--tags"],
+        ["git", "fetch", "origin", "pull/5/head"],
+    ]
+
+
+def test_failed_fetch_is_not_cached(tmp_path):
+    coordinator = GitFetchCoordinator(freshness_seconds=60)
+    run = _runner(CommandResult(success=False, stdout="", stderr="network", returncode=128))
+
+    assert not coordinator.fetch(["main"], cwd=str(tmp_path), run_command=run).success
+    coordinator.fetch(["main"], cwd=str(tmp_path), run_command=run)
+
+    assert run.call_count == 2
+
+
+def test_partial_clone_filter(tmp_path, _use_real_commands):
+    origin = tmp_path / "origin"
+    subprocess.run(["git", "init", "-q", "-b", "main", str(origin)], check=True)
+    subprocess.run(["git", "-C", str(origin), "-c", "user.email=t@example.com", "-c", "user.name=t", "commit", "-q", "--allow-empty", "-m", "init"], check=True)
+    clone = tmp_path / "clone"
+    subprocess.run(["git", "clone", "-q", str(origin), str(clone)], check=True)
+    GitFetchCoordinator._instance = GitFetchCoordinator(partial_clone_filter="blob:none")
+
+    result = git_fetch(["main"], cwd=str(clone))
+
+    assert result.success, result.stderr
+    promisor = subprocess.run(["git", "-C", str(clone), "config", "remote.origin.promisor"], capture_output=True, text=True)
+    assert promisor.stdout.strip() == "true"
+
+
+def test_manual_pr_checkout_starts_from_its_own_pull_ref():
+    from src.auto_coder import pr_processor
+    from src.auto_coder.automation_config import AutomationConfig
+
+    def run(command, cwd=None, **kwargs):
+        failed = command[:2] == ["git", "fetch"] and command[-1] == "feature:feature" or command == ["git", "checkout", "feature"]
+        return CommandResult(success=not failed, stdout="", stderr="", returncode=int(failed))
+
+    with patch.object(pr_processor.cmd, "run_command", side_effect=run) as mock_run:
+        assert pr_processor._force_checkout_pr_manually("owner/repo", {"number": 7, "head": {"ref": "feature"}}, AutomationConfig())
+        # A second checkout within the freshness window skips the fetch but not the ref
+        assert pr_processor._force_checkout_pr_manually("owner/repo", {"number": 7, "head": {"ref": "feature"}}, AutomationConfig())
+
+    commands = [call.args[0] for call in mock_run.call_args_list]
+    assert commands.count(["git", "fetch", "origin", "+pull/7/head:refs/remotes/origin/pr/7"]) == 1
+    assert ["git", "checkout", "-b", "feature", "refs/remotes/origin/pr/7"] in commands
+    assert not any("FETCH_HEAD" in command for command in commands)
@@ -32,14 +32,11 @@ class TestGitHubClient:
         client = GitHubClient.get_instance(mock_github_token)
         assert client.token == mock_github_token
 
-    @patch("src.auto_coder.util.gh_cache.get_ghapi_client")
-    def test_get_repository_success(self, mock_get_client, mock_github_token):
+    @patch("src.auto_coder.util.repo_metadata.RepoMetadataCache.get_repository")
+    def test_get_repository_success(self, mock_get_repository, mock_github_token):
         """Test successful repository retrieval."""
         # Setup
-        mock_api = Mock()
-        mock_repo = AttrDict({"name": "repo", "owner": {"login": "test"}})
-        mock_api.repos.get.return_value = mock_repo
-        mock_get_client.return_value = mock_api
+        mock_get_repository.return_value = {"name": "repo", "owner": {"login": "test"}}
 
         client = GitHubClient.get_instance(mock_github_token)
 
@@ -47,16 +44,15 @@ class TestGitHubClient:
         result = client.get_repository("test/repo")
 
         # Assert
-        assert result == mock_repo
-        mock_api.repos.get.assert_called_once_with("test", "repo")
+        assert result.name == "repo"
+        assert result.owner.login == "test"
+        mock_get_repository.assert_called_once_with("test/repo")
 
-    @patch("src.auto_coder.util.gh_cache.get_ghapi_client")
-    def test_get_repository_failure(self, mock_get_client, mock_github_token):
+    @patch("src.auto_coder.util.repo_metadata.RepoMetadataCache.get_repository")
+    def test_get_repository_failure(self, mock_get_repository, mock_github_token):
         """Test repository retrieval failure."""
         # Setup
-        mock_api = Mock()
-        mock_api.repos.get.side_effect = Exception("Not Found")
-        mock_get_client.return_value = mock_api
+        mock_get_repository.side_effect = Exception("Not Found")
 
         client = GitHubClient.get_instance(mock_github_token)
 
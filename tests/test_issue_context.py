@@ -57,3 +57,103 @@ def test_get_linked_issues_context_fetch_error():
 
     context = get_linked_issues_context(mock_client, "repo", "Fixes #123")
     assert context == ""  # Should handle exception gracefully and return empty or partial
+
+
+def _issue_node(number, body="", comments=None, sub_issues=None, parent=None, has_previous=False):
+    return {
+        "number": number,
+        "title": f"Issue {number}",
+        "body": body,
+        "state": "OPEN",
+        "comments": {"pageInfo": {"hasPreviousPage": has_previous, "startCursor": "c1"}, "nodes": comments or []},
+        "subIssues": {"nodes": sub_issues or []},
+        "parent": parent,
+        "timelineItems": {"nodes": [{"source": {"number": 7}}, {"subject": {"number": 7}}, {"source": {}}]},
+    }
+
+
+def test_load_issue_contexts_single_request():
+    from auto_coder.issue_context import load_issue_contexts
+
+    client = MagicMock()
+    client.graphql_query.return_value = {
+        "data": {
+            "repository": {
+                "issue_1": _issue_node(
+                    1,
+                    comments=[{"body": "Auto-Coder Attempt: 2", "createdAt": "2026-01-01T00:00:00Z"}],
+                    sub_issues=[{"number": 3, "title": "Child", "state": "CLOSED"}, {"number": 2, "title": "Other", "state": "OPEN"}],
+                    parent={"number": 9, "title": "Epic", "state": "OPEN", "body": "Epic body"},
+                ),
+                "issue_2": None,
+            }
+        }
+    }
+
+    bundles = load_issue_contexts(client, "owner/repo", [1, 2, 1])
+
+    assert client.graphql_query.call_count == 1
+    assert "issue_1: issue(number: 1)" in client.graphql_query.call_args[0][0]
+    assert list(bundles) == [1]
+    bundle = bundles[1]
+    assert bundle.sub_issues_summary == "- Sub-issue #2: Other (state: open)\n- Sub-issue #3: Child (state: closed)"
+    assert bundle.parent_body == "Epic body" and bundle.parent_resolved
+    assert bundle.linked_prs == [7]
+    assert bundle.current_attempt == 2
+    assert bundle.comments == [{"body": "Auto-Coder Attempt: 2", "created_at": "2026-01-01T00:00:00Z"}]
+
+
+def test_marker_linked_sub_issues_come_from_the_open_issues_cache():
+    from auto_coder.issue_context import load_issue_context
+    from auto_coder.util.gh_cache import GitHubClient
+
+    client = GitHubClient.get_instance("token")
+    cached = [
+        {"number": 4, "title": "Marker child", "state": "open", "parent_issue_number": 1},
+        {"number": 2, "title": "Native child", "state": "open", "parent_issue_number": 1},
+        {"number": 5, "title": "Unrelated", "state": "open", "parent_issue_number": None},
+    ]
+    client.restore_open_issues_cache({"repo_name": "owner/repo", "cached_at": 0, "issues": cached})
+    node = _issue_node(1, sub_issues=[{"number": 2, "title": "Native child", "state": "OPEN"}])
+
+    with patch.object(client, "graphql_query", return_value={"data": {"repository": {"issue_1": node}}}):
+        bundle = load_issue_context(client, "owner/repo", 1)
+
+    assert [sub["number"] for sub in bundle.sub_issues] == [2, 4]
+    assert bundle.sub_issues_summary.endswith("- Sub-issue #4: Marker child (state: open)")
+
+
+def test_load_issue_context_pages_older_comments():
+    from auto_coder.issue_context import load_issue_context
+
+    client = MagicMock()
+    older = {"data": {"repository": {"issue": {"comments": {"pageInfo": {"hasPreviousPage": False}, "nodes": [{"body": "first", "createdAt": "t0"}]}}}}}
+    client.graphql_query.side_effect = [
+        {"data": {"repository": {"issue_5": _issue_node(5, comments=[{"body": "last", "createdAt": "t1"}], has_previous=True)}}},
+        older,
+    ]
+
+    bundle = load_issue_context(client, "owner/repo", 5)
+
+    assert [c["body"] for c in bundle.comments] == ["first", "last"]
+    assert client.graphql_query.call_args[0][1]["before"] == "c1"
+
+
+def test_unlinked_parent_marker_is_not_resolved():
+    from auto_coder.issue_context import IssueContextBundle
+
+    assert not IssueContextBundle(number=4, body="Parent-Issue: #2").parent_resolved
+    assert IssueContextBundle(number=4, body="no marker").parent_resolved
+
+
+def test_get_linked_issues_context_uses_bundle():
+    client = MagicMock()
+    client.graphql_query.return_value = {"data": {"repository": {"issue_100": _issue_node(100, body="Fixing a bug.", parent={"number": 99, "title": "Epic Feature", "state": "OPEN", "body": "Big feature."})}}}
+
+    context = get_linked_issues_context(client, "owner/repo", "Fixes #100")
+
+    assert "Linked Issue #100: Issue 100" in context
+    assert "Parent Issue #99 (of #100): Epic Feature" in context
+    assert "Parent Issue Description:\nBig feature." in context
+    client.get_issue.assert_not_called()
+    client.get_parent_issue_details.assert_not_called()
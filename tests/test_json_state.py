@@ -0,0 +1,30 @@
+"""Tests for JSON state files shared across processes."""
+
+import threading
+
+from src.auto_coder.util.json_state import read_json_file, update_json_file
+
+
+def test_concurrent_updates_are_all_kept(tmp_path):
+    path = tmp_path / "state.json"
+
+    def add(value):
+        update_json_file(path, lambda data: (data or []) + [value])
+
+    threads = [threading.Thread(target=add, args=(i,)) for i in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(read_json_file(path)) == list(range(20))
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["state.json", "state.json.lock"]
+
+
+def test_unreadable_file_is_treated_as_missing(tmp_path):
+    path = tmp_path / "state.json"
+    path.write_text("{not json")
+
+    assert read_json_file(path) is None
+    assert update_json_file(path, lambda data: {"was": data}) == {"was": None}
+    assert read_json_file(path) == {"was": None}
@@ -0,0 +1,126 @@
+"""Tests for the indexed Jules session registry."""
+
+import threading
+from unittest.mock import MagicMock
+
+from src.auto_coder.jules_client import invalidate_jules_sessions_cache
+from src.auto_coder.jules_session_registry import JulesSessionRegistry
+
+PROMPT = '---\ntags: [jules, recurrent]\nname: ["Nightly Cleanup"]\n---\nClean up.'
+
+
+def _session(session_id, **fields):
+    return {"name": f"sessions/{session_id}", "sourceContext": {"source": "sources/github/owner/repo"}, **fields}
+
+
+def _client(listing, details=None):
+    client = MagicMock()
+    client.list_sessions.return_value = listing
+    client.get_session.side_effect = lambda session_id: {"prompt": (details or {})[session_id]}
+    return client
+
+
+def test_details_are_fetched_once_and_concurrently(tmp_path):
+    registry = JulesSessionRegistry(path=tmp_path / "sessions.json", detail_workers=4)
+    barrier = threading.Barrier(2, timeout=5)
+
+    def get_session(session_id):
+        barrier.wait()  # Both fetches must be in flight at once
+        return {"prompt": PROMPT if session_id == "s1" else "plain prompt"}
+
+    client = _client([_session("s1", state="IN_PROGRESS"), _session("s2", state="IN_PROGRESS")])
+    client.get_session.side_effect = get_session
+
+    registry.refresh(client, "owner/repo")
+    assert registry.fetch_missing_details(client) == 2
+
+    client.list_sessions.return_value = [_session("s1", state="COMPLETED"), _session("s2", state="IN_PROGRESS"), _session("s3", prompt="new")]
+    listed = registry.refresh(client, "owner/repo")
+
+    assert registry.fetch_missing_details(client) == 0
+    assert client.get_session.call_count == 2
+    assert [s["prompt"] for s in listed] == [PROMPT, "plain prompt", "new"]
+    assert registry.get("s1")["state"] == "COMPLETED"
+
+
+def test_name_prompt_and_pr_indexes(tmp_path):
+    registry = JulesSessionRegistry(path=tmp_path / "sessions.json")
+    client = _client(
+        [
+            _session("s1", prompt=PROMPT, outputs={"pullRequest": {"url": "https://github.com/owner/repo/pull/12"}}),
+            _session("s2", prompt="no front matter", outputs=[{"pullRequest": "https://github.com/owner/repo/pull/13"}]),
+        ]
+    )
+
+    registry.refresh(client, "owner/repo")
+
+    assert [s["name"] for s in registry.sessions_named([" nightly cleanup "])] == ["sessions/s1"]
+    assert registry.sessions_named(["other"]) == []
+    assert [s["name"] for s in registry.sessions_with_prompt("no front matter")] == ["sessions/s2"]
+    assert registry.session_for_pr("owner/repo", 13)["name"] == "sessions/s2"
+    assert registry.session_for_pr("owner/repo", 99) is None
+
+
+def test_sessions_leaving_the_listing_are_dropped(tmp_path):
+    registry = JulesSessionRegistry(path=tmp_path / "sessions.json")
+    other_repo = {"name": "sessions/o1", "prompt": PROMPT, "sourceContext": {"source": "sources/github/owner/other"}}
+    client = _client([_session("s1", prompt=PROMPT), other_repo])
+    registry.refresh(client)
+
+    client.list_sessions.return_value = []
+    registry.refresh(client, "owner/repo")
+
+    assert registry.get("s1") is None
+    assert [s["name"] for s in registry.sessions_named(["Nightly Cleanup"])] == ["sessions/o1"]
+
+
+def test_same_named_session_of_another_repo_is_not_returned(tmp_path):
+    registry = JulesSessionRegistry(path=tmp_path / "sessions.json")
+    registry.refresh(_client([_session("s1", prompt=PROMPT, state="IN_PROGRESS")]), "owner/repo")
+    registry.refresh(_client([]), "owner/other")
+
+    assert [s["name"] for s in registry.sessions_named(["Nightly Cleanup"], "owner/repo")] == ["sessions/s1"]
+    assert registry.sessions_named(["Nightly Cleanup"], "owner/other") == []
+    assert registry.sessions_with_prompt(PROMPT, "owner/other") == []
+
+
+def test_registry_survives_restart(tmp_path):
+    path = tmp_path / "sessions.json"
+    client = _client([_session("s1", state="IN_PROGRESS")], details={"s1": PROMPT})
+    first = JulesSessionRegistry(path=path)
+    first.refresh(client, "owner/repo")
+    first.fetch_missing_details(client)
+
+    restored = JulesSessionRegistry(path=path)
+    restored.refresh(client, "owner/repo")
+
+    assert restored.fetch_missing_details(client) == 0
+    assert client.get_session.call_count == 1
+    assert restored.sessions_named(["nightly cleanup"])[0]["state"] == "IN_PROGRESS"
+
+
+def test_processes_sharing_the_file_keep_each_others_sessions(tmp_path):
+    path = tmp_path / "sessions.json"
+    first = JulesSessionRegistry(path=path)
+    second = JulesSessionRegistry(path=path)
+    other = {"name": "sessions/o1", "prompt": PROMPT, "sourceContext": {"source": "sources/github/owner/other"}}
+    first.refresh(_client([_session("s1", prompt=PROMPT), _session("s2", prompt=PROMPT)]), "owner/repo")
+    second.refresh(_client([other]), "owner/other")
+    first.refresh(_client([_session("s1", prompt=PROMPT)]), "owner/repo")
+
+    restored = JulesSessionRegistry(path=path)
+
+    assert sorted(s["name"] for s in restored.sessions_named(["Nightly Cleanup"])) == ["sessions/o1", "sessions/s1"]
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["sessions.json", "sessions.json.lock"]
+
+
+def test_invalidating_the_listing_marks_registry_stale(tmp_path):
+    registry = JulesSessionRegistry.get_instance()
+    assert not registry.is_fresh_for("owner/repo")
+
+    registry.refresh(_client([]), "owner/repo")
+    assert registry.is_fresh_for("owner/repo")
+    assert not registry.is_fresh_for("owner/other")
+
+    invalidate_jules_sessions_cache()
+    assert not registry.is_fresh_for("owner/repo")
@@ -0,0 +1,140 @@
+"""Tests for the on-disk no-edit LLM response cache."""
+
+import sqlite3
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+
+from src.auto_coder.backend_manager import run_llm_noedit_prompt
+from src.auto_coder.llm_response_cache import LLMResponseCache, bypass_llm_response_cache, get_llm_response_cache, make_cache_key
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return LLMResponseCache(db_path=tmp_path / "cache.sqlite3", ttl_seconds=60, max_bytes=1024)
+
+
+def test_put_then_get_counts_hits_and_misses(cache):
+    key = make_cache_key("codex", "gpt-5", "prompt", ["--flag"])
+
+    assert cache.get(key) is None
+    cache.put(key, "response")
+
+    assert cache.get(key) == "response"
+    assert cache.stats() == {"hits": 1, "misses": 1, "evictions": 0, "hit_rate": 0.5}
+
+
+def test_key_depends_on_backend_model_prompt_and_options():
+    base = make_cache_key("codex", "gpt-5", "prompt", ["--flag"])
+
+    assert make_cache_key("codex", "gpt-5", "prompt", ["--flag"]) == base
+    assert make_cache_key("gemini", "gpt-5", "prompt", ["--flag"]) != base
+    assert make_cache_key("codex", "other", "prompt", ["--flag"]) != base
+    assert make_cache_key("codex", "gpt-5", "prompt!", ["--flag"]) != base
+    assert make_cache_key("codex", "gpt-5", "prompt", []) != base
+
+
+def test_expired_entries_are_misses(cache):
+    cache.put("k", "old")
+
+    with patch("src.auto_coder.llm_response_cache.time.time", return_value=time.time() + 120):
+        assert cache.get("k") is None
+
+
+def test_size_bound_evicts_least_recently_used(cache):
+    cache.put("a", "x" * 400)
+    cache.put("b", "y" * 400)
+    cache.get("a")
+    cache.put("c", "z" * 400)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "x" * 400
+    assert cache.get("c") == "z" * 400
+    assert cache.stats()["evictions"] == 1
+
+
+def test_database_errors_fall_through_to_a_miss(cache):
+    with patch.object(cache, "_connect", side_effect=sqlite3.OperationalError("database is locked")):
+        cache.put("k", "response")
+        assert cache.get("k") is None
+
+    assert cache.stats()["misses"] == 1
+
+
+def test_cache_disabled_by_default():
+    assert get_llm_response_cache() is None
+
+
+class TestRunLlmNoeditPromptCaching:
+    def _manager(self):
+        manager = Mock()
+        manager._current_backend_name.return_value = "codex"
+        manager._get_or_create_client.return_value = Mock(model_name="gpt-5", options=["--quiet"])
+        manager._last_backend = "codex"
+        manager._run_llm_cli.return_value = "feat: add cache"
+        return manager
+
+    def test_identical_prompt_is_served_from_cache(self, cache):
+        manager = self._manager()
+
+        with (
+            patch("src.auto_coder.backend_manager.LLMBackendManager.get_noedit_instance", return_value=manager),
+            patch("src.auto_coder.backend_manager.get_llm_response_cache", return_value=cache),
+        ):
+            first = run_llm_noedit_prompt("write a commit message")
+            second = run_llm_noedit_prompt("write a commit message")
+
+        assert first == second == "feat: add cache"
+        manager._run_llm_cli.assert_called_once()
+        assert cache.stats()["hits"] == 1
+
+    def test_bypass_skips_cache(self, cache):
+        manager = self._manager()
+
+        with (
+            patch("src.auto_coder.backend_manager.LLMBackendManager.get_noedit_instance", return_value=manager),
+            patch("src.auto_coder.llm_response_cache.LLMResponseCache.get_instance", return_value=cache),
+            patch("src.auto_coder.llm_backend_config.get_llm_response_cache_enabled_from_config", return_value=True),
+        ):
+            run_llm_noedit_prompt("write a commit message")
+            with bypass_llm_response_cache():
+                run_llm_noedit_prompt("write a commit message")
+
+        assert manager._run_llm_cli.call_count == 2
+        assert cache.stats()["hits"] == 0
+
+    def test_response_from_fallback_backend_is_not_cached(self, cache):
+        manager = self._manager()
+
+        def run_on_fallback(prompt):
+            manager._last_backend = "gemini"
+            return "fallback"
+
+        manager._run_llm_cli.side_effect = run_on_fallback
+
+        with (
+            patch("src.auto_coder.backend_manager.LLMBackendManager.get_noedit_instance", return_value=manager),
+            patch("src.auto_coder.backend_manager.get_llm_response_cache", return_value=cache),
+        ):
+            run_llm_noedit_prompt("p")
+            run_llm_noedit_prompt("p")
+
+        assert manager._run_llm_cli.call_count == 2
+
+    def test_commit_message_generation_uses_the_cache(self, cache):
+        from src.auto_coder.fix_to_pass_tests_runner import generate_commit_message_via_llm
+
+        manager = self._manager()
+        editing_manager = Mock()
+
+        with (
+            patch("src.auto_coder.backend_manager.get_llm_response_cache", return_value=cache),
+            patch("src.auto_coder.fix_to_pass_tests_runner.get_commit_log", return_value="abc fix"),
+        ):
+            first = generate_commit_message_via_llm(editing_manager, message_backend_manager=manager)
+            second = generate_commit_message_via_llm(editing_manager, message_backend_manager=manager)
+
+        assert first == second == "Auto-Coder: feat: add cache"
+        manager._run_llm_cli.assert_called_once()
+        editing_manager._run_llm_cli.assert_not_called()
@@ -0,0 +1,138 @@
+"""Tests for persistent LLM CLI sessions."""
+
+import json
+import sys
+import textwrap
+from unittest.mock import patch
+
+import pytest
+
+from src.auto_coder.claude_client import ClaudeClient
+from src.auto_coder.exceptions import AutoCoderUsageLimitError
+from src.auto_coder.llm_session_pool import LLMSessionPool, get_llm_session_pool, llm_session_scope, session_followup
+
+SESSION_ID = "123e4567-e89b-12d3-a456-426614174000"
+
+# Minimal stand-in for `claude --print --input-format stream-json --output-format stream-json`:
+# answers every user turn with "<pid> turn <n>: <prompt>"
+FAKE_CLI = textwrap.dedent(
+    f"""
+    import json, os, sys
+    if "--version" in sys.argv:
+        print("1.0.0 (fake)")
+        sys.exit(0)
+    print(json.dumps({{"type": "system", "subtype": "init", "session_id": "{SESSION_ID}"}}), flush=True)
+    turn = 0
+    for line in sys.stdin:
+        turn += 1
+        text = json.loads(line)["message"]["content"][0]["text"]
+        print(json.dumps({{"type": "assistant", "message": {{"content": [{{"type": "text", "text": "thinking"}}]}}}}), flush=True)
+        if "LIMIT" in text:
+            result = {{"type": "result", "subtype": "success", "is_error": False, "result": "5-hour limit reached"}}
+        else:
+            result = {{"type": "result", "subtype": "success", "is_error": False, "result": f"{{os.getpid()}} turn {{turn}}: {{text}}", "session_id": "{SESSION_ID}"}}
+        print(json.dumps(result), flush=True)
+    """
+)
+
+
+@pytest.fixture
+def fake_cli(tmp_path):
+    script = tmp_path / "fake_claude.py"
+    script.write_text(FAKE_CLI)
+    return [sys.executable, str(script)]
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    pool = LLMSessionPool(idle_timeout_seconds=60, max_turns=3)
+    # Installed as the singleton so scope exit releases its sessions
+    monkeypatch.setattr(LLMSessionPool, "_instance", pool)
+    yield pool
+    pool.close_all()
+
+
+def test_followup_turns_reuse_the_process(pool, fake_cli, _use_real_commands):
+    with llm_session_scope():
+        first, session_id = pool.run_turn("claude", fake_cli, "full prompt", followup="only new failures")
+        second, _ = pool.run_turn("claude", fake_cli, "full prompt", followup="only new failures")
+
+    pid = first.split()[0]
+    assert first == f"{pid} turn 1: full prompt"
+    assert second == f"{pid} turn 2: only new failures"
+    assert session_id == SESSION_ID
+    assert pool.stats() == {"live_sessions": 0, "sessions_started": 1, "turns_sent": 2}
+
+
+def test_sessions_are_recycled_after_max_turns(pool, fake_cli, _use_real_commands):
+    with llm_session_scope():
+        pids = {pool.run_turn("claude", fake_cli, "p")[0].split()[0] for _ in range(4)}
+
+    assert len(pids) == 2
+    assert pool.stats()["sessions_started"] == 2
+
+
+def test_scopes_do_not_share_sessions(pool, fake_cli, _use_real_commands):
+    with llm_session_scope():
+        first = pool.run_turn("claude", fake_cli, "p")[0]
+    with llm_session_scope():
+        second = pool.run_turn("claude", fake_cli, "p")[0]
+
+    assert first.split()[0] != second.split()[0]
+    assert second.endswith("turn 1: p")
+
+
+def test_run_turn_requires_scope(pool, fake_cli):
+    with pytest.raises(RuntimeError, match="llm_session_scope"):
+        pool.run_turn("claude", fake_cli, "p")
+
+
+def test_pool_disabled_by_default():
+    with llm_session_scope():
+        assert get_llm_session_pool() is None
+
+
+class TestClaudeClientSessions:
+    def _client(self, fake_cli, monkeypatch):
+        monkeypatch.setenv("AUTOCODER_CLAUDE_CLI", " ".join(fake_cli))
+        return ClaudeClient()
+
+    def test_fix_turns_run_in_persistent_session(self, pool, fake_cli, monkeypatch, _use_real_commands):
+        client = self._client(fake_cli, monkeypatch)
+
+        with (
+            patch("src.auto_coder.claude_client.check_claude_usage_or_raise"),
+            patch("src.auto_coder.claude_client.get_llm_session_pool", return_value=pool),
+            llm_session_scope(),
+        ):
+            first = client._run_llm_cli("fix the tests")
+            with session_followup("still failing: test_b"):
+                second = client._run_llm_cli("fix the tests")
+
+        assert first.endswith("turn 1: fix the tests")
+        assert second.endswith("turn 2: still failing: test_b")
+        assert client.get_last_session_id() == SESSION_ID
+
+    def test_usage_limit_in_session_raises(self, pool, fake_cli, monkeypatch, _use_real_commands):
+        client = self._client(fake_cli, monkeypatch)
+
+        with (
+            patch("src.auto_coder.claude_client.check_claude_usage_or_raise"),
+            patch("src.auto_coder.claude_client.get_llm_session_pool", return_value=pool),
+            llm_session_scope(),
+        ):
+            with pytest.raises(AutoCoderUsageLimitError):
+                client._run_llm_cli("LIMIT")
+
+    def test_session_command_drops_conflicting_options(self, fake_cli, monkeypatch, _use_real_commands):
+        client = self._client(fake_cli, monkeypatch)
+        client.config_backend = None
+        client.options = ["--print", "--output-format", "json", "--dangerously-skip-permissions", "--resume", "abc"]
+
+        cmd = client._session_command()
+
+        assert cmd.count("--print") == 1
+        assert cmd.count("--output-format") == 1
+        assert "--dangerously-skip-permissions" in cmd
+        assert "--resume" not in cmd
+        assert json.dumps(cmd)
@@ -252,3 +252,45 @@ class TestMCPServer:
         # Note: The exact way to check this depends on FastMCP's API
         # This is a basic check that the server object exists
         assert mcp is not None
+
+    @pytest.mark.skipif(not _mcp_available(), reason="MCP package not installed")
+    def test_status_subscribers_are_deduplicated_and_dropped(self):
+        """A session is notified once per run, and dropped on unsubscribe or a failed send."""
+        import asyncio
+        from unittest.mock import MagicMock, PropertyMock, patch
+
+        import server
+
+        sent = []
+
+        class Session:
+            def __init__(self, fail=False):
+                self.fail = fail
+
+            async def send_resource_updated(self, uri):
+                if self.fail:
+                    raise ConnectionError("client went away")
+                sent.append(self)
+
+        healthy, gone, leaving = Session(), Session(fail=True), Session()
+
+        async def scenario():
+            context = PropertyMock()
+            with patch.object(type(server.mcp._mcp_server), "request_context", context):
+                for session in (healthy, healthy, gone, leaving):
+                    context.return_value = MagicMock(session=session)
+                    await server.subscribe_resource(server.STATUS_RESOURCE_URI)
+                context.return_value = MagicMock(session=leaving)
+                await server.unsubscribe_resource(server.STATUS_RESOURCE_URI)
+            assert set(server._status_subscribers) == {healthy, gone}
+
+            await asyncio.to_thread(server._notify_status_subscribers)
+            for _ in range(10):
+                await asyncio.sleep(0)
+
+        try:
+            asyncio.run(scenario())
+            assert sent == [healthy]
+            assert set(server._status_subscribers) == {healthy}
+        finally:
+            server._status_subscribers.clear()
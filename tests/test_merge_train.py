@@ -0,0 +1,284 @@
+"""Tests for batched merging of green PRs."""
+
+import subprocess
+from contextlib import contextmanager
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.auto_coder import merge_train
+from src.auto_coder.automation_config import AutomationConfig, Candidate
+from src.auto_coder.merge_train import MergeTrain, MergeTrainYard, plan_merge_trains
+from src.auto_coder.util.github_action import GitHubActionsStatusResult
+
+REPO = "owner/repo"
+
+
+def _git(cwd, *args):
+    return subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True, text=True).stdout.strip()
+
+
+def _pr(number, base="main", sha=None, created_at="", labels=None):
+    return {"number": number, "base": {"ref": base}, "head": {"sha": sha or f"{number:040x}"}, "created_at": created_at, "labels": labels or []}
+
+
+def test_plan_groups_by_base_in_age_order():
+    prs = [
+        _pr(3, created_at="2024-01-03"),
+        _pr(1, created_at="2024-01-01"),
+        _pr(2, created_at="2024-01-02"),
+        _pr(4, base="release", created_at="2024-01-01"),
+        _pr(5, created_at="2024-01-05"),
+    ]
+
+    trains = plan_merge_trains(prs, max_size=2)
+
+    # One train per base, oldest first; release has a single PR, so it gets no train
+    assert [[pr["number"] for pr in train] for train in trains] == [[1, 2]]
+    assert [[pr["number"] for pr in train] for train in plan_merge_trains(prs, max_size=8)] == [[1, 2, 3, 5]]
+
+
+class FakeGitHub:
+    """Origin-side behaviour: CI fails for any tree containing broken.txt; merges move main."""
+
+    def __init__(self, origin):
+        self.origin = origin
+        self.ci_runs = []
+        self.merged = []
+        self.ci_running = False
+
+    def check_status(self, repo_name, pr_data, config):
+        tip = pr_data["head"]["sha"]
+        if self.ci_running:
+            return GitHubActionsStatusResult(success=False, ids=[1], in_progress=True)
+        self.ci_runs.append(tip)
+        broken = subprocess.run(["git", "cat-file", "-e", f"{tip}:broken.txt"], cwd=self.origin, capture_output=True).returncode == 0
+        return GitHubActionsStatusResult(success=not broken, ids=[1], in_progress=False)
+
+    def merge(self, owner, repo, number, merge_method, sha):
+        main = _git(self.origin, "rev-parse", "main")
+        tree = _git(self.origin, "merge-tree", "--write-tree", main, sha).splitlines()[0]
+        commit = _git(self.origin, "commit-tree", tree, "-p", main, "-p", sha, "-m", f"Merge #{number}")
+        _git(self.origin, "update-ref", "refs/heads/main", commit)
+        self.merged.append(number)
+        return {"merged": True}
+
+
+@pytest.fixture
+def train_env(tmp_path, monkeypatch, _use_real_commands):
+    """An origin with main and PR heads, a clone to build trains in, and a fake GitHub."""
+    monkeypatch.setenv("GIT_AUTHOR_NAME", "t")
+    monkeypatch.setenv("GIT_AUTHOR_EMAIL", "t@example.com")
+    monkeypatch.setenv("GIT_COMMITTER_NAME", "t")
+    monkeypatch.setenv("GIT_COMMITTER_EMAIL", "t@example.com")
+    work = tmp_path / "work"
+    work.mkdir()
+    _git(work, "init", "-q", "-b", "main")
+    (work / "app.py").write_text("a = 1\n")
+    _git(work, "add", "-A")
+    _git(work, "commit", "-q", "-m", "base")
+    base = _git(work, "rev-parse", "HEAD")
+
+    def pr_head(number, name, content="x\n"):
+        _git(work, "checkout", "-q", "-b", f"pr{number}", base)
+        Path(work, name).write_text(content)
+        _git(work, "add", "-A")
+        _git(work, "commit", "-q", "-m", f"pr {number}")
+        return _git(work, "rev-parse", "HEAD")
+
+    heads = {1: pr_head(1, "one.txt"), 2: pr_head(2, "two.txt"), 3: pr_head(3, "broken.txt"), 4: pr_head(4, "four.txt"), 5: pr_head(5, "app.py", "a = 5\n")}
+    _git(work, "checkout", "-q", "main")
+    origin = tmp_path / "origin"
+    _git(tmp_path, "clone", "-q", "--bare", str(work), str(origin))
+    for number, sha in heads.items():
+        _git(origin, "update-ref", f"refs/pull/{number}/head", sha)
+    clone = tmp_path / "clone"
+    _git(tmp_path, "clone", "-q", str(origin), str(clone))
+
+    github = FakeGitHub(origin)
+    api = MagicMock()
+    api.pulls.merge.side_effect = github.merge
+
+    held_labels = set()
+
+    @contextmanager
+    def label_manager(github_client, repo_name, number, **kwargs):
+        held_labels.add(number)
+        try:
+            yield MagicMock()
+        finally:
+            held_labels.discard(number)
+
+    monkeypatch.setattr(merge_train, "LabelManager", label_manager)
+    monkeypatch.setattr("src.auto_coder.util.github_action._check_github_actions_status", github.check_status)
+    monkeypatch.setattr("src.auto_coder.util.gh_cache.get_ghapi_client", lambda token: api)
+    monkeypatch.setattr("src.auto_coder.pr_processor.has_unresolved_review_threads", lambda *args: False)
+    monkeypatch.setattr("src.auto_coder.pr_processor._close_linked_issues", lambda *args: None)
+    monkeypatch.setattr("src.auto_coder.pr_processor._archive_jules_session", lambda *args: None)
+
+    def train(numbers):
+        config = AutomationConfig()
+        config.MERGE_METHOD = "--merge"
+        prs = [_pr(n, sha=heads[n]) for n in numbers]
+        return MergeTrain(REPO, "main", config, MagicMock(token="t"), poll_interval_seconds=0, cwd=str(clone)).run(prs)
+
+    train.held_labels = held_labels
+    return train, github, clone
+
+
+def test_green_train_runs_ci_once_and_merges_in_order(train_env):
+    train, github, clone = train_env
+    head_before = _git(clone, "rev-parse", "HEAD")
+
+    result = train([1, 2, 4])
+
+    assert result.merged == [1, 2, 4]
+    assert github.merged == [1, 2, 4]
+    assert result.ci_runs == 1 and len(github.ci_runs) == 1
+    # Built without a checkout, and the train branch and refs are cleaned up
+    assert _git(clone, "rev-parse", "HEAD") == head_before
+    assert _git(clone, "status", "--porcelain") == ""
+    assert _git(github.origin, "branch", "--list", "auto-coder/*") == ""
+    assert _git(clone, "for-each-ref", "refs/auto-coder") == ""
+
+
+def test_red_train_is_bisected(train_env):
+    train, github, _ = train_env
+
+    result = train([1, 2, 3, 4])
+
+    assert result.failed == [3]
+    assert result.merged == [1, 2, 4]
+    # [1,2,3,4] red -> [1,2] green, [3,4] red -> [3] red, [4] green
+    assert result.ci_runs == 5
+
+
+def test_conflicting_pr_is_left_out(train_env):
+    train, github, clone = train_env
+    # A second PR editing app.py conflicts with #5 once #5 is on the train
+    work = Path(github.origin).parent / "work"
+    _git(work, "checkout", "-q", "-b", "pr6", "main")
+    (work / "app.py").write_text("a = 6\n")
+    _git(work, "commit", "-q", "-am", "pr 6")
+    sha6 = _git(work, "rev-parse", "HEAD")
+    _git(work, "push", "-q", str(github.origin), f"{sha6}:refs/pull/6/head")
+
+    config = AutomationConfig()
+    prs = [_pr(5, sha=_git(github.origin, "rev-parse", "refs/pull/5/head")), _pr(6, sha=sha6), _pr(1, sha=_git(github.origin, "rev-parse", "refs/pull/1/head"))]
+    result = MergeTrain(REPO, "main", config, MagicMock(token="t"), poll_interval_seconds=0, cwd=str(clone)).run(prs)
+
+    assert result.excluded == [6]
+    assert result.merged == [5, 1]
+
+
+def test_train_down_to_one_pr_is_deferred(train_env):
+    train, github, _ = train_env
+
+    result = train([1])
+
+    assert result.deferred == [1]
+    assert github.ci_runs == [] and github.merged == []
+
+
+def test_train_parks_while_ci_runs_and_resumes_when_it_finishes(train_env):
+    train, github, clone = train_env
+    yard = MergeTrainYard.get_instance()
+    yard.running = True
+    finished = []
+    yard.callbacks.append(lambda repo_name, base: finished.append((repo_name, base)))
+    github.ci_running = True
+
+    result = train([1, 2])
+
+    # The worker returned with the train parked and the labels released
+    assert result.merged == [] and result.ci_runs == 1
+    assert train.held_labels == set()
+    assert yard.stats()["parked"] == 1
+    assert yard.riding(REPO) == {1, 2}
+    assert yard.poll_once() == 0 and finished == []
+
+    github.ci_running = False
+    assert yard.poll_once() == 1
+    assert finished == [(REPO, "main")]
+
+    resumed = merge_train.run_merge_train(REPO, "main", [], AutomationConfig(), MagicMock())
+
+    assert resumed.merged == [1, 2] and github.merged == [1, 2]
+    assert yard.stats() == {"trains": 0, "parked": 0, "polls": 2}
+    assert _git(clone, "for-each-ref", "refs/auto-coder") == ""
+
+
+def test_second_train_into_a_base_waits_and_cleanup_spares_other_refs(train_env):
+    train, github, clone = train_env
+    yard = MergeTrainYard.get_instance()
+    yard.running = True
+    github.ci_running = True
+    train([1, 2])
+    parked_refs = _git(clone, "for-each-ref", "--format=%(refname)", "refs/auto-coder")
+
+    second = train([4, 5])
+
+    assert second.deferred == [4, 5] and second.ci_runs == 0
+    assert _git(clone, "for-each-ref", "--format=%(refname)", "refs/auto-coder") == parked_refs
+
+    # A train into another base only removes its own refs
+    release = MergeTrain(REPO, "release", AutomationConfig(), MagicMock(token="t"), cwd=str(clone))
+    release._refs.add("refs/auto-coder/merge-train/base/release")
+    release._cleanup()
+    assert _git(clone, "for-each-ref", "--format=%(refname)", "refs/auto-coder") == parked_refs
+
+
+def test_engine_replaces_green_prs_with_a_train(monkeypatch):
+    from src.auto_coder import automation_engine
+    from src.auto_coder.automation_engine import AutomationEngine
+
+    monkeypatch.setattr(automation_engine, "get_merge_train_max_size_from_config", lambda: 8)
+    engine = AutomationEngine(MagicMock())
+    candidates = [Candidate(type="pr", data=_pr(n), priority=2) for n in (1, 2, 3)] + [Candidate(type="issue", data={"number": 9}, priority=0)]
+
+    formed = engine._form_merge_trains(REPO, candidates, {1, 3})
+
+    assert [(c.type, c.data["number"]) for c in formed] == [("pr", 2), ("issue", 9), ("merge_train", 1)]
+    assert [pr["number"] for pr in formed[-1].data["prs"]] == [1, 3]
+    engine.queue.put_nowait(formed[-1])
+    status = engine.get_status()
+    engine.open_prs_snapshot = [_pr(3)]
+    assert [item["status"] for item in engine.get_status()["open_items"]] == ["Queued (Priority 2)"]
+    assert status["queue_items"][0]["type"] == "merge_train"
+
+
+def test_engine_forms_no_second_train_into_a_busy_base(monkeypatch):
+    from src.auto_coder import automation_engine
+    from src.auto_coder.automation_engine import AutomationEngine
+
+    monkeypatch.setattr(automation_engine, "get_merge_train_max_size_from_config", lambda: 8)
+    in_flight = MergeTrain(REPO, "main", AutomationConfig(), MagicMock())
+    in_flight._legs = [([_pr(1)], False)]
+    assert MergeTrainYard.get_instance().claim(in_flight)
+    engine = AutomationEngine(MagicMock())
+    candidates = [Candidate(type="pr", data=_pr(n), priority=2) for n in (1, 2, 3)]
+
+    formed = engine._form_merge_trains(REPO, candidates, {1, 2, 3})
+
+    # #1 rides the train in flight; #2 and #3 wait for it instead of forming a second train
+    assert [(c.type, c.data["number"]) for c in formed] == [("pr", 2), ("pr", 3)]
+
+
+def test_engine_forms_no_train_into_a_base_requiring_up_to_date_branches(monkeypatch):
+    from src.auto_coder import automation_engine
+    from src.auto_coder.automation_engine import AutomationEngine
+
+    monkeypatch.setattr(automation_engine, "get_merge_train_max_size_from_config", lambda: 8)
+    github = MagicMock()
+    github.repo_metadata.get_branch_protection.return_value = {"required_status_checks": {"strict": True, "contexts": ["ci"]}}
+    engine = AutomationEngine(github)
+    candidates = [Candidate(type="pr", data=_pr(n), priority=2) for n in (1, 2)]
+
+    formed = engine._form_merge_trains(REPO, candidates, {1, 2})
+
+    assert [(c.type, c.data["number"]) for c in formed] == [("pr", 1), ("pr", 2)]
+    github.repo_metadata.get_branch_protection.assert_called_once_with(REPO, "main")
+
+    github.repo_metadata.get_branch_protection.return_value = {"required_status_checks": {"strict": False}}
+    assert [c.type for c in engine._form_merge_trains(REPO, candidates, {1, 2})] == ["merge_train"]
@@ -0,0 +1,161 @@
+"""Tests for non-blocking PR mergeability resolution."""
+
+import asyncio
+from unittest.mock import MagicMock
+
+from src.auto_coder.automation_config import AutomationConfig, Candidate
+from src.auto_coder.mergeability import MergeabilityResolver, fetch_mergeability, get_mergeability_resolver
+
+REPO = "owner/repo"
+
+
+class FakeGraphQL:
+    """Answers aliased pullRequest queries from a number -> MergeableState map."""
+
+    def __init__(self, states):
+        self.states = states
+        self.queries = []
+
+    def graphql_query(self, query, variables=None):
+        numbers = [n for n in self.states if f"pr{n}: pullRequest(number: {n})" in query]
+        self.queries.append(numbers)
+        return {"data": {"repository": {f"pr{n}": {"number": n, "mergeable": self.states[n], "mergeStateStatus": "CLEAN" if self.states[n] == "MERGEABLE" else "UNKNOWN", "headRefOid": "abc"} for n in numbers}}}
+
+
+def test_fetch_batches_prs_into_one_query():
+    github = FakeGraphQL({1: "MERGEABLE", 2: "CONFLICTING", 3: "UNKNOWN"})
+
+    states = fetch_mergeability(REPO, [3, 1, 2], github)
+
+    assert github.queries == [[1, 2, 3]]
+    assert {n: state["mergeable"] for n, state in states.items()} == {1: True, 2: False, 3: None}
+
+
+def test_unresolved_prs_back_off_until_github_resolves_them():
+    github = FakeGraphQL({1: "UNKNOWN", 2: "UNKNOWN"})
+    resolved = []
+    resolver = MergeabilityResolver(initial_delay_seconds=2, max_delay_seconds=5, callbacks=[lambda repo, n, state: resolved.append((n, state["mergeable"]))], github_client=github)
+    resolver.wait_for(REPO, 1)
+    resolver.wait_for(REPO, 2)
+    now = max(w.registered_at for w in resolver.pending())
+
+    assert resolver.poll_once(now) == 0  # not due yet
+    assert resolver.poll_once(now + 2) == 0
+    assert [w.next_check_at - (now + 2) for w in resolver.pending()] == [4, 4]
+
+    github.states[1] = "MERGEABLE"
+    assert resolver.poll_once(now + 4) == 0  # still backing off
+    assert resolver.poll_once(now + 6) == 1
+
+    assert resolved == [(1, True)]
+    assert [w.pr_number for w in resolver.pending()] == [2]
+    assert resolver.pending()[0].next_check_at == now + 6 + 5  # capped at max_delay_seconds
+    assert github.queries == [[1, 2], [1, 2]]
+    assert resolver.stats() == {"pending": 1, "polls": 2, "resolved": 1, "gave_up": 0}
+
+
+def test_pr_that_never_resolves_is_released_once():
+    resolved = []
+    resolver = MergeabilityResolver(give_up_seconds=30, callbacks=[lambda repo, n, state: resolved.append(state["mergeable"])], github_client=FakeGraphQL({1: "UNKNOWN"}))
+    resolver.wait_for(REPO, 1)
+
+    resolver.poll_once(resolver.pending()[0].registered_at + 30)
+
+    assert resolved == [None]
+    assert resolver.stats()["gave_up"] == 1
+    # The re-queued worker carries on instead of waiting again
+    assert resolver.wait_for(REPO, 1) is False
+
+
+def test_query_failure_keeps_prs_waiting():
+    github = MagicMock()
+    github.graphql_query.side_effect = ValueError("GraphQL errors")
+    resolver = MergeabilityResolver(github_client=github)
+    resolver.wait_for(REPO, 1)
+
+    assert resolver.poll_once(resolver.pending()[0].next_check_at) == 0
+    assert resolver.is_waiting(REPO, 1)
+
+
+def test_worker_releases_pr_with_unknown_mergeability(monkeypatch):
+    from src.auto_coder import pr_processor
+
+    resolver = MergeabilityResolver.get_instance()
+    resolver.running = True
+    ci_status = MagicMock()
+    monkeypatch.setattr(pr_processor, "check_github_actions_and_exit_if_in_progress", lambda **kwargs: True)
+    monkeypatch.setattr(pr_processor, "_get_mergeable_state", lambda *args: {"mergeable": None, "merge_state_status": "UNKNOWN"})
+    monkeypatch.setattr(pr_processor, "_check_github_actions_status", ci_status)
+
+    actions = pr_processor._handle_pr_merge(MagicMock(), REPO, {"number": 5}, AutomationConfig(), {})
+
+    assert actions == ["Mergeability of PR #5 is still being computed, re-queueing once GitHub resolves it"]
+    assert resolver.is_waiting(REPO, 5)
+    ci_status.assert_not_called()
+    assert get_mergeability_resolver() is resolver
+
+
+def test_engine_requeues_resolved_pr_once():
+    from src.auto_coder.automation_engine import AutomationEngine
+
+    engine = AutomationEngine(MagicMock())
+    engine._create_candidate_from_single = MagicMock(side_effect=lambda repo, kind, n: Candidate(type=kind, data={"number": n}, priority=0))
+
+    async def requeue():
+        await engine._requeue_pr(REPO, 5)
+        await engine._requeue_pr(REPO, 5)
+
+    asyncio.run(requeue())
+
+    assert engine.queue.qsize() == 1
+    assert engine.queue.get_nowait().data["number"] == 5
+    engine._create_candidate_from_single.assert_called_once_with(REPO, "pr", 5)
+
+
+def test_resolver_is_not_used_outside_the_engine():
+    assert MergeabilityResolver.get_instance().running is False
+    assert get_mergeability_resolver() is None
+
+
+def test_merge_after_conflict_resolution_is_deferred(monkeypatch):
+    from src.auto_coder import pr_processor
+
+    resolver = MergeabilityResolver.get_instance()
+    resolver.running = True
+    api = MagicMock()
+    api.pulls.merge.return_value = {"merged": False}
+    api.pulls.get.return_value = {"mergeable": False, "user": {"login": "dev"}, "body": ""}
+    monkeypatch.setattr("auto_coder.util.gh_cache.get_ghapi_client", lambda token: api)
+    monkeypatch.setattr(pr_processor, "has_unresolved_review_threads", lambda *args: False)
+    monkeypatch.setattr(pr_processor, "_get_allowed_merge_methods", lambda repo: ["--squash"])
+    monkeypatch.setattr(pr_processor, "_resolve_pr_merge_conflicts", lambda *args: True)
+    fallback = MagicMock()
+    monkeypatch.setattr(pr_processor, "_trigger_fallback_for_pr_failure", fallback)
+    config = AutomationConfig()
+    config.MERGE_METHOD = "--squash"
+
+    assert pr_processor._merge_pr(REPO, 5, {}, config, github_client=MagicMock()) is None
+    assert resolver.is_waiting(REPO, 5)
+    assert api.pulls.merge.call_count == 1
+    fallback.assert_not_called()
+
+
+def test_deferred_merge_does_not_enter_the_failed_checks_path(monkeypatch):
+    from src.auto_coder import pr_processor
+    from src.auto_coder.util.github_action import GitHubActionsStatusResult
+
+    monkeypatch.setattr(pr_processor, "check_github_actions_and_exit_if_in_progress", lambda **kwargs: True)
+    monkeypatch.setattr(pr_processor, "_get_mergeable_state", lambda *args: {"mergeable": True, "merge_state_status": "CLEAN"})
+    monkeypatch.setattr(pr_processor, "_check_github_actions_status", lambda *args: GitHubActionsStatusResult(success=True, ids=[1]))
+    monkeypatch.setattr(pr_processor, "has_unresolved_review_threads", lambda *args: False)
+    monkeypatch.setattr(pr_processor, "_merge_pr", lambda *args, **kwargs: None)
+    detailed_checks = MagicMock()
+    monkeypatch.setattr(pr_processor, "get_detailed_checks_from_history", detailed_checks)
+    config = AutomationConfig()
+    config.AUTO_MERGE = True
+
+    actions = pr_processor._handle_pr_merge(MagicMock(), REPO, {"number": 5, "labels": []}, config, {})
+
+    assert actions[-1] == "Merge of PR #5 deferred until GitHub resolves mergeability"
+    assert not any("Failed to merge" in action for action in actions)
+    detailed_checks.assert_not_called()
@@ -0,0 +1,147 @@
+"""Tests for the metrics registry and its exposition."""
+
+import json
+import sys
+from unittest.mock import MagicMock, patch
+
+import pytest
+from click.testing import CliRunner
+from starlette.testclient import TestClient
+
+from src.auto_coder.backend_manager import BackendManager
+from src.auto_coder.cli_commands_health import health
+from src.auto_coder.exceptions import AutoCoderUsageLimitError
+from src.auto_coder.metrics import MetricsRegistry, get_metrics_registry, normalize_stage
+from src.auto_coder.progress_footer import ProgressStage
+from src.auto_coder.utils import CommandExecutor, _command_metric_label
+from src.auto_coder.webhook_server import create_app
+
+
+@pytest.fixture(autouse=True)
+def fresh_registry():
+    MetricsRegistry.reset_instance()
+    yield
+    MetricsRegistry.reset_instance()
+
+
+def _series(name, **labels):
+    snapshot = get_metrics_registry().snapshot()
+    for series in snapshot["metrics"].get(name, {}).get("series", []):
+        if all(series["labels"].get(k) == v for k, v in labels.items()):
+            return series
+    return None
+
+
+def test_prometheus_exposition():
+    registry = MetricsRegistry(enabled=True)
+    registry.inc("auto_coder_llm_calls_total", backend="codex", outcome="success")
+    registry.inc("auto_coder_llm_calls_total", backend="codex", outcome="success")
+    registry.observe("auto_coder_llm_call_seconds", 0.3, backend="codex")
+    registry.observe("auto_coder_llm_call_seconds", 4000, backend="codex")
+
+    text = registry.render_prometheus()
+
+    assert "# TYPE auto_coder_llm_calls_total counter" in text
+    assert 'auto_coder_llm_calls_total{backend="codex",outcome="success"} 2' in text
+    assert 'auto_coder_llm_call_seconds_bucket{backend="codex",le="0.25"} 0' in text
+    assert 'auto_coder_llm_call_seconds_bucket{backend="codex",le="0.5"} 1' in text
+    assert 'auto_coder_llm_call_seconds_bucket{backend="codex",le="+Inf"} 2' in text
+    assert 'auto_coder_llm_call_seconds_count{backend="codex"} 2' in text
+
+
+def test_disabled_registry_records_nothing(monkeypatch):
+    monkeypatch.setenv("AUTO_CODER_METRICS_ENABLED", "0")
+    MetricsRegistry.reset_instance()
+
+    get_metrics_registry().inc("auto_coder_llm_calls_total", backend="codex")
+
+    assert "auto_coder_llm_calls_total" not in get_metrics_registry().snapshot()["metrics"]
+
+
+def test_normalize_stage():
+    assert normalize_stage("Running LLM: codex (provider: x), attempt 2") == "Running LLM"
+    assert normalize_stage("Low-failure fix attempt 3") == "Low-failure fix attempt N"
+
+
+def test_command_metric_label():
+    assert _command_metric_label(["git", "-C", "/repo", "fetch", "origin"]) == "git fetch"
+    assert _command_metric_label(["gh", "pr", "view", "1"]) == "gh pr"
+    assert _command_metric_label(["/usr/bin/python3", "-c", "pass"]) == "python3"
+
+
+def test_command_executor_records_commands(_use_real_commands):
+    CommandExecutor.run_command([sys.executable, "-c", "raise SystemExit(1)"])
+
+    label = _command_metric_label([sys.executable])
+    assert _series("auto_coder_commands_total", command=label, outcome="failure")["value"] == 1
+    assert _series("auto_coder_command_seconds", command=label)["count"] == 1
+
+
+def test_progress_stage_records_duration():
+    with ProgressStage("PR", 12, "First pass"):
+        with ProgressStage("Running LLM: codex, attempt 1"):
+            pass
+
+    assert _series("auto_coder_stage_seconds", stage="First pass")["count"] == 1
+    assert _series("auto_coder_stage_seconds", stage="Running LLM")["count"] == 1
+
+
+def test_backend_manager_records_calls_and_rotations():
+    limited = MagicMock(model_name="codex-model")
+    limited._run_llm_cli.side_effect = AutoCoderUsageLimitError("limit")
+    working = MagicMock(model_name="gemini-model")
+    working._run_llm_cli.return_value = "done"
+    working.get_last_session_id.return_value = None
+    manager = BackendManager(
+        default_backend="codex",
+        default_client=limited,
+        factories={"codex": lambda: limited, "gemini": lambda: working},
+        order=["codex", "gemini"],
+    )
+
+    assert manager._run_llm_cli("p" * 100) == "done"
+
+    assert _series("auto_coder_llm_calls_total", backend="codex", outcome="usage_limit")["value"] == 1
+    assert _series("auto_coder_llm_calls_total", backend="gemini", outcome="success")["value"] == 1
+    assert _series("auto_coder_llm_prompt_chars", backend="gemini")["sum"] == 100
+    assert _series("auto_coder_llm_response_chars", backend="gemini")["sum"] == 4
+    assert _series("auto_coder_llm_backend_rotations_total", backend="codex")["value"] >= 1
+
+
+@patch("src.auto_coder.webhook_server.init_dashboard")
+def test_metrics_endpoint(mock_init_dashboard):
+    engine = MagicMock()
+    engine.queue.qsize.return_value = 3
+    engine.active_workers = {0: object(), 1: None}
+    get_metrics_registry().inc("auto_coder_items_processed_total", type="pr", outcome="success")
+
+    with TestClient(create_app(engine, "owner/repo")) as client:
+        response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'auto_coder_items_processed_total{outcome="success",type="pr"} 1' in response.text
+    assert "auto_coder_queue_depth 3" in response.text
+    assert "auto_coder_workers_busy 1" in response.text
+
+
+def test_health_metrics_command(tmp_path):
+    registry = get_metrics_registry()
+    registry.observe("auto_coder_stage_seconds", 2.0, stage="First pass")
+    registry.write_snapshot(tmp_path / "metrics.json")
+
+    summary = CliRunner().invoke(health, ["metrics", "--log-dir", str(tmp_path)])
+    prometheus = CliRunner().invoke(health, ["metrics", "--log-dir", str(tmp_path), "--format", "prometheus"])
+    raw = CliRunner().invoke(health, ["metrics", "--log-dir", str(tmp_path), "--format", "json"])
+
+    assert summary.exit_code == 0
+    assert "auto_coder_stage_seconds{stage=First pass} count=1 sum=2.00 avg=2.00" in summary.output
+    assert 'auto_coder_stage_seconds_count{stage="First pass"} 1' in prometheus.output
+    assert json.loads(raw.output)["metrics"]["auto_coder_stage_seconds"]["type"] == "histogram"
+
+
+def test_health_metrics_command_without_snapshot(tmp_path):
+    result = CliRunner().invoke(health, ["metrics", "--log-dir", str(tmp_path)])
+
+    assert result.exit_code == 0
+    assert "No metrics snapshot found" in result.output
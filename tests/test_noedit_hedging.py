@@ -0,0 +1,132 @@
+"""Tests for hedged no-edit execution."""
+
+import sys
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+from src.auto_coder.backend_manager import BackendManager, run_llm_noedit_prompt
+from src.auto_coder.noedit_hedging import NoeditHedger, get_noedit_hedger
+from src.auto_coder.utils import CommandExecutor, command_cancel_scope
+
+
+def _client(name, run):
+    client = MagicMock()
+    client.model_name = f"{name}-model"
+    client._run_llm_cli.side_effect = run
+    client.get_last_session_id.return_value = None
+    return client
+
+
+def _manager(clients):
+    manager = BackendManager(
+        default_backend="codex",
+        default_client=clients["codex"],
+        factories={name: (lambda c=client: c) for name, client in clients.items()},
+        order=list(clients),
+    )
+    manager._is_noedit = True
+    return manager
+
+
+def test_hedge_delay_uses_percentile_of_recent_latencies():
+    hedger = NoeditHedger(percentile=0.9, min_delay_seconds=1.0, initial_delay_seconds=30.0)
+    assert hedger.hedge_delay("codex") == 30.0
+
+    for seconds in range(1, 11):
+        hedger.record_latency("codex", float(seconds))
+    assert hedger.hedge_delay("codex") == 10.0
+
+    hedger.record_latency("gemini", 0.1)
+    assert hedger.hedge_delay("gemini") == 30.0
+
+
+def test_fast_primary_is_not_hedged():
+    clients = {"codex": _client("codex", lambda prompt, is_noedit=False: "primary"), "gemini": _client("gemini", lambda prompt, is_noedit=False: "hedge")}
+    hedger = NoeditHedger(initial_delay_seconds=5.0)
+
+    assert hedger.run(_manager(clients), "prompt") == "primary"
+    clients["gemini"]._run_llm_cli.assert_not_called()
+    assert hedger.stats() == {"hedges_started": 0, "hedges_won": 0}
+
+
+def test_slow_primary_loses_to_hedge_and_is_cancelled():
+    cancelled = threading.Event()
+
+    def slow(prompt, is_noedit=False):
+        # Stands in for a CLI process killed through the cancel scope
+        from src.auto_coder import utils
+
+        while not utils.is_command_cancelled():
+            threading.Event().wait(0.01)
+        cancelled.set()
+        raise RuntimeError("codex exited")
+
+    clients = {"codex": _client("codex", slow), "gemini": _client("gemini", lambda prompt, is_noedit=False: "hedge")}
+    manager = _manager(clients)
+    hedger = NoeditHedger(initial_delay_seconds=0.05)
+
+    assert hedger.run(manager, "prompt") == "hedge"
+    assert cancelled.is_set()
+    assert manager.get_last_backend_and_model() == ("gemini", "gemini-model")
+    clients["gemini"]._run_llm_cli.assert_called_once_with("prompt", is_noedit=True)
+    assert hedger.stats() == {"hedges_started": 1, "hedges_won": 1}
+
+
+def test_invalid_hedge_response_waits_for_primary():
+    release = threading.Event()
+
+    def slow(prompt, is_noedit=False):
+        release.wait(5)
+        return "primary"
+
+    def empty(prompt, is_noedit=False):
+        release.set()
+        return "  "
+
+    clients = {"codex": _client("codex", slow), "gemini": _client("gemini", empty)}
+    hedger = NoeditHedger(initial_delay_seconds=0.05)
+
+    assert hedger.run(_manager(clients), "prompt") == "primary"
+    assert hedger.stats()["hedges_won"] == 0
+
+
+def test_backends_with_providers_are_not_hedge_targets():
+    clients = {"codex": _client("codex", lambda prompt, is_noedit=False: "primary"), "qwen": _client("qwen", lambda prompt, is_noedit=False: "hedge")}
+    manager = _manager(clients)
+    manager._provider_manager = MagicMock()
+    manager._provider_manager.has_providers.side_effect = lambda name: name == "qwen"
+
+    assert NoeditHedger()._pick_hedge_backend(manager, "codex") is None
+
+
+def test_disabled_by_default():
+    assert get_noedit_hedger() is None
+
+
+def test_run_llm_noedit_prompt_uses_hedger_when_enabled():
+    hedger = MagicMock()
+    hedger.run.return_value = "hedged"
+    manager = MagicMock()
+
+    with (
+        patch("src.auto_coder.backend_manager.LLMBackendManager.get_noedit_instance", return_value=manager),
+        patch("src.auto_coder.backend_manager.get_noedit_hedger", return_value=hedger),
+    ):
+        assert run_llm_noedit_prompt("prompt") == "hedged"
+
+    hedger.run.assert_called_once_with(manager, "prompt")
+
+
+def test_cancel_scope_kills_running_command(_use_real_commands):
+    event = threading.Event()
+    timer = threading.Timer(0.2, event.set)
+    timer.start()
+    started = time.monotonic()
+
+    with command_cancel_scope(event):
+        result = CommandExecutor.run_command([sys.executable, "-c", "import time; time.sleep(30)"], timeout=60)
+
+    assert not result.success
+    assert "cancelled" in result.stderr
+    assert time.monotonic() - started < 10
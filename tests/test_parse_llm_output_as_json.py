@@ -0,0 +1,123 @@
+"""Tests for parse_llm_output_as_json and its linear-time JSON extractor."""
+
+import json
+from unittest.mock import patch
+
+import pytest
+
+from src.auto_coder import backend_manager
+from src.auto_coder.backend_manager import parse_llm_output_as_json
+
+
+def test_pure_json_dict():
+    assert parse_llm_output_as_json('{"title": "Fix", "body": "x"}') == {"title": "Fix", "body": "x"}
+
+
+def test_conversation_list_returns_last_message_content():
+    output = json.dumps([{"role": "user", "content": "hi"}, {"role": "assistant", "content": "done"}])
+    assert parse_llm_output_as_json(output) == "done"
+
+
+def test_fenced_json_block():
+    output = 'Here you go:\n```json\n{"title": "A"}\n```\nThanks'
+    assert parse_llm_output_as_json(output) == {"title": "A"}
+
+
+def test_text_around_json_returns_last_block():
+    output = 'Prompt: respond like {"title": "example"}\nAnswer: {"title": "real", "body": "b"}\nEnd'
+    assert parse_llm_output_as_json(output) == {"title": "real", "body": "b"}
+
+
+def test_braces_inside_strings_are_ignored():
+    output = 'log } ] noise\n{"title": "use {braces} and [brackets]", "body": "quote \\" } here"}'
+    assert parse_llm_output_as_json(output) == {"title": "use {braces} and [brackets]", "body": 'quote " } here'}
+
+
+def test_stray_quotes_and_closers_after_json():
+    output = '{"title": "T", "body": "B"}\nHe said "bye } ]'
+    assert parse_llm_output_as_json(output) == {"title": "T", "body": "B"}
+
+
+@pytest.mark.parametrize(
+    "output, expected",
+    [
+        ('Answer: {"ok": true} (see "a]b")', {"ok": True}),
+        ('{"x": "y}"}"]', {"x": "y}"}),
+        ('{"ok": true}"}', {"ok": True}),
+        ('[1, 2]"k"{"ok": true}"}\\}\n],{', {"ok": True}),
+        (r'"a]b" done. {"a": "q\"a", "[": [[null]]} ) ( see "a]b" see', {"a": 'q"a', "[": [[None]]}),
+        ('{"title": "a [b] {c}"} trailing "quote ] and } text', {"title": "a [b] {c}"}),
+    ],
+)
+def test_brackets_in_strings_and_trailing_text_match_forward_scan(output, expected):
+    # The last value decoded left to right wins, as it always has
+    assert parse_llm_output_as_json(output) == expected
+
+
+def test_invalid_balanced_block_after_valid_json():
+    output = '{"title": "ok"}\nfunction f() { return x; }'
+    assert parse_llm_output_as_json(output) == {"title": "ok"}
+
+
+def test_result_wrapper_with_fenced_string():
+    output = 'agent log\n{"type": "result", "result": "Done.\\n```json\\n{\\"title\\": \\"Inner\\"}\\n```"}'
+    assert parse_llm_output_as_json(output) == {"title": "Inner"}
+
+
+def test_result_wrapper_with_nested_dict():
+    output = 'prefix {"result": {"title": "Nested"}}'
+    assert parse_llm_output_as_json(output) == {"title": "Nested"}
+
+
+def test_no_json_raises_value_error():
+    with pytest.raises(ValueError):
+        parse_llm_output_as_json("no json here { at all")
+
+
+def _count_decodes():
+    """Record every decode attempt and every slice handed to the JSON decoder."""
+    return (
+        patch.object(backend_manager, "_decode_json_at", wraps=backend_manager._decode_json_at),
+        patch.object(backend_manager._JSON_DECODER, "raw_decode", wraps=backend_manager._JSON_DECODER.raw_decode),
+    )
+
+
+def test_large_brace_heavy_transcript_is_linear():
+    code_line = "def f(x): return {k: [v for v in x] for k in {1, 2}}  # {not json}\n"
+    transcript = code_line * 50000 + '{"title": "Final", "body": "ok"}\n'
+
+    attempts, decodes = _count_decodes()
+    with attempts as mock_attempts, decodes:
+        result = parse_llm_output_as_json(transcript)
+
+    assert result == {"title": "Final", "body": "ok"}
+    # Brackets that cannot start a JSON value never reach the decoder
+    assert mock_attempts.call_count == 1
+
+
+def test_failed_candidates_decode_bounded_slices():
+    code_line = 'row = ["a", b]  # {"k": oops}\n'
+    transcript = code_line * 50000 + '{"title": "Final"}\n'
+
+    attempts, decodes = _count_decodes()
+    with attempts as mock_attempts, decodes as mock_decodes:
+        result = parse_llm_output_as_json(transcript)
+
+    assert result == {"title": "Final"}
+    assert mock_attempts.call_count == 2 * 50000 + 1
+    # No failed candidate is decoded against the rest of the output
+    assert max(len(call.args[0]) for call in mock_decodes.call_args_list) <= backend_manager._JSON_DECODE_WINDOW
+
+
+def test_large_transcript_with_json_first_is_linear():
+    code_line = 'print({k: [v for v in x] for k in {1, 2}})  # {not json} "quoted\n'
+    transcript = '{"title": "First"}\n' + code_line * 50000
+
+    attempts, decodes = _count_decodes()
+    with attempts as mock_attempts, decodes as mock_decodes:
+        result = parse_llm_output_as_json(transcript)
+
+    assert result == {"title": "First"}
+    # One bounded slice is decoded, however much text follows the value
+    assert mock_attempts.call_count == 1
+    assert [len(call.args[0]) for call in mock_decodes.call_args_list] == [backend_manager._JSON_DECODE_WINDOW]
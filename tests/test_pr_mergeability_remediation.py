@@ -165,17 +165,20 @@ def test_get_mergeable_state_refreshes_when_unknown(mock_github_client, mock_get
     mock_get_ghapi_client.return_value = mock_api
     mock_github_client.get_instance.return_value.token = "token"
 
-    mock_api.pulls.get.return_value = {"mergeable": False, "mergeStateStatus": "DIRTY"}
+    mock_github_client.get_instance.return_value.graphql_query.return_value = {
+        "data": {"repository": {"pr7": {"number": 7, "mergeable": "CONFLICTING", "mergeStateStatus": "DIRTY", "headRefOid": "abc"}}}
+    }
 
     config = AutomationConfig()
-    pr_data = {"mergeable": None, "mergeStateStatus": None}
+    pr_data = {"number": 7, "mergeable": None, "mergeStateStatus": None}
 
     result = _get_mergeable_state("owner/repo", pr_data, config)
 
     assert result["mergeable"] is False
     assert result["merge_state_status"] == "DIRTY"
-    # Verify GitHub API was called
-    mock_api.pulls.get.assert_called_once()
+    # Refreshed through GraphQL, which reports mergeStateStatus
+    mock_github_client.get_instance.return_value.graphql_query.assert_called_once()
+    mock_api.pulls.get.assert_not_called()
 
 
 @patch("src.auto_coder.pr_processor.get_ghapi_client")
@@ -186,10 +189,10 @@ def test_get_mergeable_state_handles_api_failure(mock_github_client, mock_get_gh
     mock_get_ghapi_client.return_value = mock_api
     mock_github_client.get_instance.return_value.token = "token"
 
-    mock_api.pulls.get.side_effect = Exception("API error")
+    mock_github_client.get_instance.return_value.graphql_query.side_effect = Exception("API error")
 
     config = AutomationConfig()
-    pr_data = {"mergeable": None, "mergeStateStatus": None}
+    pr_data = {"number": 7, "mergeable": None, "mergeStateStatus": None}
 
     # Should not raise exception
     result = _get_mergeable_state("owner/repo", pr_data, config)
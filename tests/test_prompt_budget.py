@@ -0,0 +1,124 @@
+"""Tests for token-budgeted prompt assembly."""
+
+from unittest.mock import patch
+
+from src.auto_coder.automation_config import AutomationConfig
+from src.auto_coder.pr_processor import _create_pr_analysis_prompt
+from src.auto_coder.prompt_budget import PromptBudget, compact_diff, compact_log, diff_test_paths, estimate_tokens, get_prompt_budget, is_generated_path
+
+
+def _file_diff(path, changed=2, context=0):
+    lines = [f"diff --git a/{path} b/{path}", f"--- a/{path}", f"+++ b/{path}", "@@ -1,10 +1,10 @@"]
+    lines += [f" context line {i}" for i in range(context)]
+    lines += [f"-old {path} {i}" for i in range(changed)]
+    lines += [f"+new {path} {i}" for i in range(changed)]
+    lines += [f" trailing context {i}" for i in range(context)]
+    return "\n".join(lines) + "\n"
+
+
+def test_generated_paths():
+    assert is_generated_path("package-lock.json")
+    assert is_generated_path("web/yarn.lock")
+    assert is_generated_path("static/app.min.js")
+    assert is_generated_path("frontend/dist/bundle.js")
+    assert not is_generated_path("src/auto_coder/cli.py")
+
+
+def test_small_diff_is_unchanged():
+    diff = _file_diff("src/app.py")
+    assert compact_diff(diff, 10_000) == diff
+
+
+def test_lockfile_hunks_are_stubbed():
+    diff = _file_diff("src/app.py") + _file_diff("package-lock.json", changed=500)
+
+    result = compact_diff(diff, 2_000)
+
+    assert "+new src/app.py 0" in result
+    assert "+new package-lock.json" not in result
+    assert "diff omitted: package-lock.json (+500 -500 lines)" in result
+
+
+def test_unchanged_context_is_collapsed():
+    diff = _file_diff("src/app.py", changed=1, context=200)
+
+    result = compact_diff(diff, 2_000)
+
+    assert "unchanged lines" in result
+    assert "+new src/app.py 0" in result
+    assert len(result) <= 2_000
+
+
+def test_priority_paths_survive_over_larger_files():
+    diff = _file_diff("src/big.py", changed=100) + _file_diff("tests/test_app.py", changed=60)
+
+    result = compact_diff(diff, 3_500, priority_paths=["tests/test_app.py"])
+
+    assert "+new tests/test_app.py 59" in result
+    assert "+new src/big.py 0" not in result
+    assert "src/big.py" in result
+
+
+def test_diff_test_paths():
+    diff = _file_diff("src/app.py") + _file_diff("tests/test_app.py") + _file_diff("web/app.spec.ts")
+    assert diff_test_paths(diff) == ["tests/test_app.py", "web/app.spec.ts"]
+
+
+def test_compact_log_deduplicates_repeated_lines():
+    log = "\n".join(f"2025-01-01 12:00:{i:02d} WARN retrying connection attempt {i}" for i in range(50)) + "\nFAILED tests/test_app.py::test_x"
+
+    result = compact_log(log, 400)
+
+    assert result.count("WARN retrying") == 1
+    assert "repeated 49 more times" in result
+    assert result.endswith("FAILED tests/test_app.py::test_x")
+
+
+def test_compact_log_keeps_head_and_tail():
+    # Lines that differ in letters, not just numbers, so none are folded together
+    words = [a + b + c for a in "abcdefghij" for b in "klmnopqrst" for c in "uvwxyzABCD"]
+    log = "\n".join(f"entry {word} " + "x" * 40 for word in words) + "\nAssertionError: boom"
+
+    result = compact_log(log, 1_000)
+
+    assert len(result) <= 1_000
+    assert result.startswith("entry aku")
+    assert result.endswith("AssertionError: boom")
+    assert "lines omitted" in result
+
+
+def test_allocate_redistributes_unused_share():
+    budget = PromptBudget(max_tokens=1_000, weights={"diff": 1.0, "body": 1.0})
+
+    allocation = budget.allocate({"diff": "x" * 8_000, "body": "short"})
+
+    assert allocation["body"] == estimate_tokens("short")
+    assert allocation["diff"] == 1_000 - allocation["body"]
+
+
+def test_fit_compacts_to_budget():
+    budget = PromptBudget(max_tokens=500, weights={"pr_diff": 3.0, "commit_log": 1.0})
+
+    fitted = budget.fit({"pr_diff": _file_diff("src/app.py", changed=300), "commit_log": "abc fix\n" * 400}, compactors={"pr_diff": compact_diff, "commit_log": compact_log})
+
+    assert estimate_tokens(fitted["pr_diff"]) + estimate_tokens(fitted["commit_log"]) <= 500
+
+
+def test_disabled_by_default():
+    assert get_prompt_budget() is None
+
+
+def test_pr_analysis_prompt_compacts_diff_when_enabled():
+    config = AutomationConfig()
+    diff = _file_diff("src/app.py") + _file_diff("package-lock.json", changed=5_000)
+    pr_data = {"number": 7, "title": "Bump deps", "body": "", "user": {"login": "dev"}}
+
+    with (
+        patch("src.auto_coder.pr_processor.get_prompt_budget", return_value=PromptBudget(max_tokens=2_000)),
+        patch("src.auto_coder.pr_processor.get_commit_log", return_value="abc Bump deps"),
+    ):
+        prompt = _create_pr_analysis_prompt("owner/repo", pr_data, diff, config)
+
+    assert "+new src/app.py 0" in prompt
+    assert "diff omitted: package-lock.json" in prompt
+    assert estimate_tokens(prompt) < 4_000
@@ -0,0 +1,154 @@
+"""Tests for the repository metadata cache."""
+
+import httpx
+import pytest
+
+from src.auto_coder.util.repo_metadata import BRANCH_PROTECTION, REPOSITORY, WORKFLOW, RepoMetadataCache
+
+REPO = "owner/repo"
+WORKFLOW_YAML = "jobs:\n  lint:\n    runs-on: ubuntu-latest\n  test:\n    name: Unit tests\n    runs-on: ubuntu-latest\n"
+
+
+class FakeGitHub:
+    """Serves fixed resources with ETags and records every request."""
+
+    def __init__(self, resources):
+        self.resources = resources
+        self.requests = []
+
+    def handler(self, request):
+        self.requests.append((request.url.path, request.headers.get("if-none-match")))
+        if request.url.path not in self.resources:
+            return httpx.Response(404, json={"message": "Not Found"})
+        status, body, etag = self.resources[request.url.path]
+        if etag and request.headers.get("if-none-match") == etag:
+            return httpx.Response(304)
+        headers = {"etag": etag} if etag else {}
+        if isinstance(body, str):
+            return httpx.Response(status, text=body, headers=headers)
+        return httpx.Response(status, json=body, headers=headers)
+
+
+def _cache(tmp_path, github, **kwargs):
+    client = httpx.Client(base_url="https://api.github.com", transport=httpx.MockTransport(github.handler))
+    return RepoMetadataCache(token="test-token", path=tmp_path / "repo_metadata.json", client=client, **kwargs)
+
+
+def test_settings_are_fetched_once_within_ttl(tmp_path):
+    github = FakeGitHub({"/repos/owner/repo": (200, {"allow_squash_merge": True, "allow_rebase_merge": True, "default_branch": "develop"}, '"v1"')})
+    cache = _cache(tmp_path, github)
+
+    assert cache.get_allowed_merge_methods(REPO) == ["--squash", "--rebase"]
+    assert cache.get_default_branch(REPO) == "develop"
+
+    assert github.requests == [("/repos/owner/repo", None)]
+    assert cache.stats()["hits"] == 1
+
+
+def test_expired_entry_is_revalidated_with_etag(tmp_path):
+    github = FakeGitHub({"/repos/owner/repo": (200, {"allow_merge_commit": True}, '"v1"')})
+    cache = _cache(tmp_path, github, ttls={REPOSITORY: 0})
+
+    cache.get_allowed_merge_methods(REPO)
+    assert cache.get_allowed_merge_methods(REPO) == ["--merge"]
+    assert github.requests[-1] == ("/repos/owner/repo", '"v1"')
+    assert cache.stats()["revalidations"] == 1
+
+    github.resources["/repos/owner/repo"] = (200, {"allow_squash_merge": True}, '"v2"')
+    assert cache.get_allowed_merge_methods(REPO) == ["--squash"]
+    assert cache.stats()["fetches"] == 2
+
+
+def test_stale_value_is_served_when_revalidation_fails(tmp_path):
+    github = FakeGitHub({"/repos/owner/repo": (200, {"allow_squash_merge": True}, '"v1"')})
+    cache = _cache(tmp_path, github, ttls={REPOSITORY: 0})
+    cache.get_repository(REPO)
+
+    github.resources["/repos/owner/repo"] = (500, {"message": "boom"}, None)
+
+    assert cache.get_allowed_merge_methods(REPO) == ["--squash"]
+    assert cache.stats()["stale_served"] == 1
+
+
+def test_missing_repository_raises(tmp_path):
+    cache = _cache(tmp_path, FakeGitHub({}))
+
+    with pytest.raises(httpx.HTTPStatusError):
+        cache.get_repository(REPO)
+
+
+def test_entries_survive_restart_as_conditional_requests(tmp_path):
+    github = FakeGitHub({"/repos/owner/repo": (200, {"default_branch": "trunk"}, '"r1"')})
+    _cache(tmp_path, github).get_repository(REPO)
+
+    restored = _cache(tmp_path, github, ttls={REPOSITORY: 0})
+
+    assert restored.get_default_branch(REPO) == "trunk"
+    assert github.requests == [("/repos/owner/repo", None), ("/repos/owner/repo", '"r1"')]
+
+
+def test_processes_sharing_the_file_keep_each_others_entries(tmp_path):
+    github = FakeGitHub({"/repos/owner/repo": (200, {"default_branch": "main"}, '"r1"'), "/repos/owner/other": (200, {"default_branch": "dev"}, '"o1"')})
+    first = _cache(tmp_path, github)
+    second = _cache(tmp_path, github)
+    first.get_repository(REPO)
+    second.get_repository("owner/other")
+
+    restored = _cache(tmp_path, github)
+    assert restored.stats()["entries"] == 2
+
+    # Invalidation also drops the entries another process stored
+    second.invalidate(REPO)
+    assert _cache(tmp_path, github).stats()["entries"] == 1
+
+
+def test_unprotected_branch_is_cached_as_none(tmp_path):
+    github = FakeGitHub({"/repos/owner/repo": (200, {"default_branch": "main"}, '"v1"')})
+    cache = _cache(tmp_path, github)
+
+    assert cache.get_branch_protection(REPO) is None
+    assert cache.get_branch_protection(REPO, "main") is None
+    assert [path for path, _ in github.requests] == ["/repos/owner/repo", "/repos/owner/repo/branches/main/protection"]
+
+    cache.invalidate(REPO, kind=BRANCH_PROTECTION)
+    assert cache.stats()["entries"] == 1
+
+
+def test_workflow_job_order_from_run(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    github = FakeGitHub(
+        {
+            "/repos/owner/repo/actions/runs/42": (200, {"path": ".github/workflows/ci.yml"}, None),
+            "/repos/owner/repo/contents/.github/workflows/ci.yml": (200, WORKFLOW_YAML, '"w1"'),
+        }
+    )
+    cache = _cache(tmp_path, github, ttls={WORKFLOW: 3600})
+
+    for _ in range(2):
+        path = cache.get_workflow_path(REPO, 42)
+        assert cache.get_workflow_job_order(REPO, path) == {"lint": 0, "test": 1, "Unit tests": 1}
+    assert len(github.requests) == 2
+
+    # A checked-out copy of the workflow takes precedence over the default branch
+    (tmp_path / ".github" / "workflows").mkdir(parents=True)
+    (tmp_path / ".github" / "workflows" / "ci.yml").write_text("jobs:\n  build: {}\n")
+    assert cache.get_workflow_job_order(REPO, path) == {"build": 0}
+
+
+def test_sort_jobs_by_workflow_uses_cache(tmp_path, monkeypatch):
+    from src.auto_coder.util import github_action
+
+    monkeypatch.chdir(tmp_path)
+    github = FakeGitHub(
+        {
+            "/repos/owner/repo/actions/runs/42": (200, {"path": ".github/workflows/ci.yml"}, None),
+            "/repos/owner/repo/contents/.github/workflows/ci.yml": (200, WORKFLOW_YAML, '"w1"'),
+        }
+    )
+    cache = _cache(tmp_path, github)
+    monkeypatch.setattr(github_action, "get_repo_metadata_cache", lambda token: cache)
+    jobs = [{"name": "Unit tests"}, {"name": "other"}, {"name": "lint"}]
+
+    for _ in range(3):
+        assert [job["name"] for job in github_action._sort_jobs_by_workflow(jobs, "owner", "repo", 42, "token")] == ["lint", "Unit tests", "other"]
+    assert len(github.requests) == 2
@@ -0,0 +1,126 @@
+"""
+Tests for the Test Watcher run scheduler: coalescing, spec mapping and reruns.
+"""
+
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+# Add the test_watcher module to the path
+test_watcher_path = Path(__file__).parent.parent / "src" / "auto_coder" / "mcp_servers" / "test_watcher"
+sys.path.insert(0, str(test_watcher_path))
+
+from test_watcher_tool import TestWatcherTool
+
+
+def _wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        threading.Event().wait(0.01)
+    return condition()
+
+
+@pytest.fixture
+def project(tmp_path):
+    (tmp_path / "src").mkdir()
+    (tmp_path / "e2e").mkdir()
+    (tmp_path / "src" / "login.ts").write_text("export const login = 1;\n")
+    (tmp_path / "src" / "cart.ts").write_text("export const cart = 1;\n")
+    (tmp_path / "src" / "theme.css").write_text("body {}\n")
+    (tmp_path / "e2e" / "login.spec.ts").write_text("import { login } from '../src/login';\n")
+    (tmp_path / "e2e" / "checkout.spec.ts").write_text("import { cart } from '../src/cart';\n")
+    (tmp_path / "node_modules").mkdir()
+    (tmp_path / "node_modules" / "lib.spec.ts").write_text("")
+    return tmp_path
+
+
+def _changed(tool, path):
+    # The watcher handles events synchronously under pytest; exercise the real path
+    with patch.dict(os.environ):
+        os.environ.pop("PYTEST_CURRENT_TEST", None)
+        tool._on_file_changed(path)
+
+
+@pytest.fixture
+def tool(project):
+    tool = TestWatcherTool(project_root=str(project))
+    tool.quiet_seconds = 0.1
+    yield tool
+    tool._stop_scheduler()
+
+
+class TestSpecMapping:
+    def test_spec_files_exclude_ignored_directories(self, tool):
+        assert sorted(tool._find_spec_files()) == ["e2e/checkout.spec.ts", "e2e/login.spec.ts"]
+
+    def test_changed_spec_maps_to_itself(self, tool):
+        assert tool._affected_spec_files(["e2e/login.spec.ts"]) == ["e2e/login.spec.ts"]
+
+    def test_source_maps_to_importing_specs(self, tool, project):
+        assert tool._affected_spec_files([str(project / "src" / "login.ts"), "src/cart.ts"]) == ["e2e/checkout.spec.ts", "e2e/login.spec.ts"]
+
+    def test_unattributable_change_needs_broad_run(self, tool):
+        assert tool._affected_spec_files(["src/login.ts", "src/theme.css"]) is None
+
+
+class TestScheduler:
+    def test_burst_of_changes_runs_once(self, tool):
+        with patch.object(tool, "_run_playwright_tests") as mock_run_tests:
+            for _ in range(20):
+                _changed(tool, "src/login.ts")
+                _changed(tool, "e2e/checkout.spec.ts")
+
+            assert _wait_for(lambda: mock_run_tests.call_count == 1)
+            threading.Event().wait(0.3)
+
+        assert mock_run_tests.call_count == 1
+        mock_run_tests.assert_called_once_with(True, spec_files=["e2e/checkout.spec.ts", "e2e/login.spec.ts"])
+
+    def test_changes_during_a_run_trigger_one_rerun(self, tool):
+        release = threading.Event()
+        running = threading.Event()
+        calls = []
+
+        def run(last_failed, spec_files=None):
+            calls.append(spec_files)
+            running.set()
+            release.wait(5)
+
+        with patch.object(tool, "_run_playwright_tests", side_effect=run):
+            _changed(tool, "src/login.ts")
+            assert running.wait(5)
+            for _ in range(10):
+                _changed(tool, "src/cart.ts")
+            threading.Event().wait(0.3)
+            assert len(calls) == 1
+            release.set()
+
+            assert _wait_for(lambda: len(calls) == 2)
+            threading.Event().wait(0.3)
+
+        assert calls == [["e2e/login.spec.ts"], ["e2e/checkout.spec.ts"]]
+
+    def test_full_run_request(self, tool):
+        with patch.object(tool, "_run_playwright_tests") as mock_run_tests:
+            tool._schedule_run(full=True)
+
+            assert _wait_for(lambda: mock_run_tests.call_count == 1)
+
+        mock_run_tests.assert_called_once_with(False)
+
+    def test_stop_drops_pending_changes(self, tool):
+        tool.quiet_seconds = 5.0
+        with patch.object(tool, "_run_playwright_tests") as mock_run_tests:
+            _changed(tool, "src/login.ts")
+            assert tool.get_status()["pending_changes"] == 1
+            tool._stop_scheduler()
+
+            assert _wait_for(lambda: not tool._scheduler_thread.is_alive())
+
+        mock_run_tests.assert_not_called()
+        assert tool.get_status()["pending_changes"] == 0
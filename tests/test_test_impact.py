@@ -0,0 +1,120 @@
+import json
+from unittest.mock import patch
+
+from src.auto_coder.automation_config import AutomationConfig
+from src.auto_coder.fix_to_pass_tests_runner import _select_attempt_test_targets, run_local_tests
+from src.auto_coder.test_impact import build_import_graph, is_test_file, load_coverage_map, record_coverage_map, select_impacted_tests
+from src.auto_coder.utils import CommandResult
+
+
+def _write(root, rel, content=""):
+    path = root / rel
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+    return path
+
+
+def test_is_test_file_recognizes_frameworks():
+    assert is_test_file("tests/test_foo.py")
+    assert is_test_file("pkg/foo_test.py")
+    assert is_test_file("e2e/login.spec.ts")
+    assert is_test_file("src/util.test.tsx")
+    assert not is_test_file("src/pkg/foo.py")
+    assert not is_test_file("src/util.ts")
+
+
+def test_python_import_graph_selects_transitive_dependents(tmp_path, _use_real_commands):
+    _write(tmp_path, "src/pkg/__init__.py")
+    _write(tmp_path, "src/pkg/core.py", "VALUE = 1\n")
+    _write(tmp_path, "src/pkg/service.py", "from .core import VALUE\n")
+    _write(tmp_path, "tests/test_service.py", "from src.pkg.service import VALUE\n")
+    _write(tmp_path, "tests/test_other.py", "import os\n")
+
+    graph = build_import_graph(str(tmp_path))
+    selected = select_impacted_tests(["src/pkg/core.py"], root=str(tmp_path), import_graph=graph, coverage_map={})
+
+    assert selected == ["tests/test_service.py"]
+
+
+def test_ts_import_graph_resolves_relative_specifiers(tmp_path, _use_real_commands):
+    _write(tmp_path, "src/util.ts", "export const x = 1;\n")
+    _write(tmp_path, "src/index.ts", "export { x } from './util';\n")
+    _write(tmp_path, "e2e/app.spec.ts", "import { x } from '../src/index.js';\n")
+    _write(tmp_path, "e2e/unrelated.spec.ts", "import { test } from '@playwright/test';\n")
+
+    graph = build_import_graph(str(tmp_path))
+    selected = select_impacted_tests(["src/util.ts"], root=str(tmp_path), import_graph=graph, coverage_map={})
+
+    assert selected == ["e2e/app.spec.ts"]
+
+
+def test_changed_test_file_is_selected_directly(tmp_path):
+    _write(tmp_path, "tests/test_a.py", "def test_a():\n    pass\n")
+
+    selected = select_impacted_tests(["tests/test_a.py"], root=str(tmp_path), import_graph={}, coverage_map={})
+
+    assert selected == ["tests/test_a.py"]
+
+
+def test_record_and_use_coverage_map(tmp_path):
+    _write(tmp_path, "tests/test_dynamic.py")
+    report = {
+        "files": {
+            "src/plugin.py": {"contexts": {"3": ["tests/test_dynamic.py::test_load|run"], "4": [""]}},
+            "src/unused.py": {"contexts": {}},
+        }
+    }
+    report_path = _write(tmp_path, "coverage.json", json.dumps(report))
+    map_path = tmp_path / ".auto-coder" / "test_impact_map.json"
+
+    assert record_coverage_map(str(report_path), path=map_path) is True
+    coverage_map = load_coverage_map(map_path)
+    assert coverage_map == {"src/plugin.py": {"tests/test_dynamic.py"}}
+
+    selected = select_impacted_tests(["src/plugin.py"], root=str(tmp_path), import_graph={}, coverage_map=coverage_map)
+    assert selected == ["tests/test_dynamic.py"]
+
+
+def test_record_coverage_map_without_contexts_is_noop(tmp_path):
+    report_path = _write(tmp_path, "coverage.json", json.dumps({"files": {"src/a.py": {"executed_lines": [1]}}}))
+    map_path = tmp_path / "map.json"
+
+    assert record_coverage_map(str(report_path), path=map_path) is False
+    assert not map_path.exists()
+
+
+def test_select_attempt_targets_combines_failures_and_impacted(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    _write(tmp_path, "tests/test_failing.py")
+    test_result = {"success": False, "output": "FAILED tests/test_failing.py::test_x - AssertionError", "errors": ""}
+
+    with (
+        patch("src.auto_coder.fix_to_pass_tests_runner.get_changed_files", return_value=["src/a.py"]),
+        patch("src.auto_coder.fix_to_pass_tests_runner.select_impacted_tests", return_value=["tests/test_a.py"]),
+    ):
+        targets = _select_attempt_test_targets(test_result)
+
+    assert targets == ["tests/test_a.py", "tests/test_failing.py"]
+
+
+def test_select_attempt_targets_falls_back_when_failures_unknown(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    test_result = {"success": False, "output": "Segmentation fault", "errors": ""}
+
+    with patch("src.auto_coder.fix_to_pass_tests_runner.select_impacted_tests") as mock_select:
+        assert _select_attempt_test_targets(test_result) == []
+        mock_select.assert_not_called()
+
+
+def test_run_local_tests_with_test_files_passes_all_files_to_script():
+    config = AutomationConfig()
+
+    with (
+        patch("src.auto_coder.fix_to_pass_tests_runner.get_target_container", return_value=None),
+        patch("src.auto_coder.fix_to_pass_tests_runner.cmd.run_command", return_value=CommandResult(True, "ok", "", 0)) as mock_run,
+    ):
+        result = run_local_tests(config, test_files=["tests/test_a.py", "tests/test_b.py"])
+
+    assert mock_run.call_args[0][0] == ["bash", config.TEST_SCRIPT_PATH, "tests/test_a.py", "tests/test_b.py"]
+    assert result["success"] is True
+    assert result["test_files"] == ["tests/test_a.py", "tests/test_b.py"]
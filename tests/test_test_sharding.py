@@ -0,0 +1,55 @@
+from unittest.mock import patch
+
+from src.auto_coder.automation_config import AutomationConfig
+from src.auto_coder.test_sharding import load_test_durations, partition_shards, run_sharded_tests
+from src.auto_coder.utils import CommandResult
+
+
+def test_partition_shards_balances_by_duration():
+    durations = {"tests/test_slow.py": 100.0, "tests/test_mid.py": 60.0, "tests/test_a.py": 30.0, "tests/test_b.py": 30.0}
+
+    shards = partition_shards(sorted(durations), 2, durations)
+
+    assert len(shards) == 2
+    totals = sorted(sum(durations[f] for f in shard) for shard in shards)
+    assert totals == [100.0, 120.0]
+    assert ["tests/test_slow.py"] in shards
+
+
+def test_partition_shards_never_creates_empty_shards():
+    shards = partition_shards(["tests/test_a.py", "tests/test_b.py"], 8)
+
+    assert shards == [["tests/test_a.py"], ["tests/test_b.py"]]
+
+
+def test_run_sharded_tests_returns_none_for_single_file():
+    assert run_sharded_tests(AutomationConfig(), 4, test_files=["tests/test_a.py"]) is None
+
+
+def test_run_sharded_tests_merges_results_and_records_durations(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    config = AutomationConfig()
+    files = ["tests/test_a.py", "tests/test_b.py", "tests/test_c.py"]
+
+    def fake_run(cmd_list, timeout=None, env_overrides=None, **kwargs):
+        assert env_overrides["AUTO_CODER_TEST_SHARD"].endswith("/3")
+        if "tests/test_b.py" in cmd_list:
+            return CommandResult(False, "FAILED tests/test_b.py::test_x - AssertionError\n", "boom\n", 1)
+        return CommandResult(True, "1 passed\n", "", 0)
+
+    with (
+        patch("src.auto_coder.test_sharding.get_target_container", return_value=None),
+        patch("src.auto_coder.test_sharding.cmd.run_command", side_effect=fake_run) as mock_run,
+    ):
+        result = run_sharded_tests(config, 3, test_files=files)
+
+    assert result is not None
+    assert mock_run.call_count == 3
+    assert result.success is False
+    assert result.returncode == 1
+    assert result.shard_count == 3
+    assert result.failed_tests == ["tests/test_b.py"]
+    assert "Test shard 2/3" in result.stdout
+    assert "FAILED tests/test_b.py::test_x" in result.stdout
+    assert "boom" in result.stderr
+    assert set(load_test_durations(tmp_path / ".auto-coder" / "test_durations.json")) == set(files)
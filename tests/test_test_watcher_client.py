@@ -0,0 +1,145 @@
+"""Tests for the persistent test_watcher MCP client connection."""
+
+import json
+import sys
+import textwrap
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import pytest
+
+from src.auto_coder.automation_config import AutomationConfig
+from src.auto_coder.test_watcher_client import TestWatcherClient, get_shared_test_watcher_client, shutdown_shared_test_watcher_client
+
+FAKE_SERVER = textwrap.dedent(
+    """
+    import json
+    import sys
+
+    RESULTS = {"status": "completed", "summary": {"total": 2, "passed": 2, "failed": 0}, "failed_tests": {"tests": []}}
+
+    def send(message):
+        sys.stdout.write(json.dumps(message) + "\\n")
+        sys.stdout.flush()
+
+    initialized = False
+    for line in sys.stdin:
+        request = json.loads(line)
+        method = request.get("method")
+        if method == "initialize":
+            send({"jsonrpc": "2.0", "id": request["id"], "result": {"protocolVersion": "2024-11-05", "capabilities": {}}})
+        elif method == "notifications/initialized":
+            initialized = True
+        elif not initialized:
+            send({"jsonrpc": "2.0", "id": request["id"], "error": {"code": -32600, "message": "not initialized"}})
+        elif method == "ping":
+            send({"jsonrpc": "2.0", "id": request["id"], "result": {}})
+        elif method == "resources/subscribe":
+            send({"jsonrpc": "2.0", "id": request["id"], "result": {}})
+        elif method == "tools/call" and request["params"]["name"] == "start_watching":
+            send({"jsonrpc": "2.0", "id": request["id"], "result": {"structuredContent": {"status": "started"}}})
+            send({"jsonrpc": "2.0", "method": "notifications/resources/updated", "params": {"uri": "test-watcher://status"}})
+        elif method == "tools/call":
+            text = json.dumps(RESULTS)
+            send({"jsonrpc": "2.0", "id": request["id"], "result": {"content": [{"type": "text", "text": text}], "isError": False}})
+    """
+)
+
+
+@pytest.fixture
+def fake_server_path(tmp_path, _use_real_commands):
+    server_dir = tmp_path / "test_watcher"
+    server_dir.mkdir()
+    (server_dir / "fake_server.py").write_text(FAKE_SERVER)
+    run_script = server_dir / "run_server.sh"
+    run_script.write_text(f'#!/bin/bash\nexec "{sys.executable}" "{server_dir / "fake_server.py"}"\n')
+    run_script.chmod(0o755)
+    yield str(server_dir)
+    shutdown_shared_test_watcher_client()
+
+
+def test_handshake_and_query_over_one_connection(fake_server_path, tmp_path):
+    client = TestWatcherClient(mcp_server_path=fake_server_path, project_root=str(tmp_path))
+    assert client.start_server() is True
+    try:
+        pid = client.process.pid
+        first = client.query_test_results()
+        second = client.query_test_results()
+
+        assert first["status"] == "completed"
+        assert second["summary"]["passed"] == 2
+        assert client.process.pid == pid
+    finally:
+        client.stop_server()
+
+
+def test_result_subscription_is_notified(fake_server_path, tmp_path):
+    client = TestWatcherClient(mcp_server_path=fake_server_path, project_root=str(tmp_path))
+    received = []
+    client.subscribe_results(received.append)
+    assert client.start_server() is True
+    try:
+        client.expect_results()
+        assert client.start_watching() == {"status": "started"}
+        assert client.wait_for_results(5) or received
+        assert received == [{"uri": "test-watcher://status"}]
+    finally:
+        client.stop_server()
+
+
+def test_shared_client_is_reused_and_restarted(fake_server_path, tmp_path):
+    client = get_shared_test_watcher_client(fake_server_path, project_root=str(tmp_path))
+    assert client is not None
+    assert get_shared_test_watcher_client(fake_server_path, project_root=str(tmp_path)) is client
+
+    client.process.kill()
+    client.process.wait()
+
+    restarted = get_shared_test_watcher_client(fake_server_path, project_root=str(tmp_path))
+    assert restarted is client
+    assert restarted.restart_count == 1
+    assert restarted.query_test_results()["status"] == "completed"
+
+
+def test_unwrap_tool_result_prefers_structured_content():
+    assert TestWatcherClient._unwrap_tool_result({"structuredContent": {"result": {"status": "idle"}}}) == {"status": "idle"}
+    assert TestWatcherClient._unwrap_tool_result({"content": [{"type": "text", "text": '{"status": "running"}'}]}) == {"status": "running"}
+
+
+def test_run_local_tests_waits_for_running_watcher(tmp_path):
+    from src.auto_coder import fix_to_pass_tests_runner as runner
+
+    client = Mock()
+    client.query_test_results.side_effect = [
+        {"status": "running"},
+        {"status": "completed", "summary": {"total": 1, "passed": 1, "failed": 0}, "failed_tests": {"tests": []}},
+    ]
+
+    with (
+        patch.object(runner, "USE_TEST_WATCHER_MCP", True),
+        patch.dict("os.environ", {"TEST_WATCHER_MCP_SERVER_PATH": str(tmp_path)}),
+        patch("src.auto_coder.test_watcher_client.get_shared_test_watcher_client", return_value=client),
+        patch.object(runner.cmd, "run_command") as mock_run,
+    ):
+        result = runner.run_local_tests(AutomationConfig())
+
+    client.wait_for_results.assert_called_once_with(runner.TEST_WATCHER_RESULT_WAIT_SECONDS)
+    # Armed before the status query, so a run finishing in between still wakes the wait
+    assert [call[0] for call in client.method_calls][:2] == ["expect_results", "query_test_results"]
+    mock_run.assert_not_called()
+    assert result["success"] is True
+    assert result["command"] == "test_watcher_mcp_query"
+
+
+def test_run_finishing_before_the_wait_is_not_missed(fake_server_path, tmp_path):
+    client = TestWatcherClient(mcp_server_path=fake_server_path, project_root=str(tmp_path))
+    assert client.start_server() is True
+    try:
+        client.expect_results()
+        client.start_watching()
+        # The notification arrives before anyone waits for it
+        assert client._results_ready.wait(5)
+
+        assert client.wait_for_results(0) is True
+    finally:
+        client.stop_server()
@@ -0,0 +1,152 @@
+"""Tests for the auto-update restart state handoff."""
+
+import json
+import time
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.auto_coder import warm_restart
+from src.auto_coder.automation_config import Candidate
+from src.auto_coder.automation_engine import AutomationEngine
+from src.auto_coder.trace_logger import get_trace_logger
+from src.auto_coder.util.gh_cache import GitHubClient
+from src.auto_coder.warm_restart import SCHEMA_VERSION, register_state_provider, set_handoff_repo, take_handoff, unregister_state_provider, write_handoff
+
+REPO = "owner/repo"
+
+
+@pytest.fixture
+def handoff_path(tmp_path):
+    yield tmp_path / "handoff.json"
+    for name in list(warm_restart._providers):
+        unregister_state_provider(name)
+    set_handoff_repo(None)
+
+
+def test_handoff_round_trip_is_taken_once(handoff_path):
+    register_state_provider("engine", lambda: {"queue": [1, 2]})
+
+    assert write_handoff(handoff_path) is True
+
+    assert take_handoff(handoff_path) == {"engine": {"queue": [1, 2]}}
+    assert not handoff_path.exists()
+    assert take_handoff(handoff_path) is None
+
+
+def test_nothing_is_written_without_providers(handoff_path):
+    assert write_handoff(handoff_path) is False
+    assert not handoff_path.exists()
+
+
+def test_broken_provider_is_left_out(handoff_path):
+    register_state_provider("engine", lambda: {"ok": True})
+    register_state_provider("broken", MagicMock(side_effect=RuntimeError("boom")))
+    register_state_provider("unserializable", lambda: {"value": object()})
+
+    write_handoff(handoff_path)
+
+    assert take_handoff(handoff_path) == {"engine": {"ok": True}}
+
+
+@pytest.mark.parametrize(
+    "handoff",
+    [
+        {"schema_version": SCHEMA_VERSION + 1, "created_at": time.time(), "state": {"engine": {}}},
+        {"schema_version": SCHEMA_VERSION, "created_at": time.time() - 3600, "state": {"engine": {}}},
+        "not a handoff",
+    ],
+)
+def test_mismatched_or_stale_handoff_starts_cold(handoff_path, handoff):
+    handoff_path.write_text(json.dumps(handoff) if isinstance(handoff, dict) else handoff)
+
+    assert take_handoff(handoff_path, max_age_seconds=600) is None
+    assert not handoff_path.exists()
+
+
+def test_engines_for_different_repositories_keep_their_own_handoff(handoff_path, tmp_path, monkeypatch):
+    monkeypatch.setattr(warm_restart.Path, "home", lambda: tmp_path)
+    for repo_name in (REPO, "owner/other"):
+        set_handoff_repo(repo_name)
+        register_state_provider("engine", lambda repo_name=repo_name: {"repo_name": repo_name})
+        assert write_handoff() is True
+
+    assert take_handoff(repo_name="owner/other") == {"engine": {"repo_name": "owner/other"}}
+    assert take_handoff(repo_name=REPO) == {"engine": {"repo_name": REPO}}
+    assert not (tmp_path / REPO / "restart_handoff.json").exists()
+
+
+def test_handoff_of_another_repository_is_left_in_place(handoff_path):
+    set_handoff_repo("owner/other")
+    register_state_provider("engine", lambda: {"repo_name": "owner/other"})
+    write_handoff(handoff_path)
+
+    assert take_handoff(handoff_path, repo_name=REPO) is None
+    assert take_handoff(handoff_path, repo_name="owner/other") == {"engine": {"repo_name": "owner/other"}}
+    assert not handoff_path.exists()
+
+
+def _candidate(kind, number, priority=1):
+    return Candidate(type=kind, data={"number": number, "title": f"{kind} {number}"}, priority=priority)
+
+
+def test_engine_state_survives_restart():
+    github = MagicMock()
+    github.export_open_issues_cache.return_value = {"repo_name": REPO, "cached_at": 1.0, "issues": [{"number": 3}]}
+    engine = AutomationEngine(github)
+    engine.active_workers = {0: _candidate("pr", 7), 1: None}
+    engine.queue.put_nowait(_candidate("issue", 3))
+    engine.queue.put_nowait(_candidate("pr", 7))
+    engine.open_prs_snapshot = [{"number": 7}]
+    engine.open_issues_snapshot = [{"number": 3}]
+    get_trace_logger().clear()
+    get_trace_logger().log("Queue", "Queued issue #3")
+    state = json.loads(json.dumps(engine.export_restart_state(REPO)))
+    get_trace_logger().clear()
+
+    restarted = AutomationEngine(MagicMock())
+    get_trace_logger().log("System", "Producer started")
+    assert restarted.restore_restart_state(REPO, state) is True
+
+    queued = [restarted.queue.get_nowait() for _ in range(restarted.queue.qsize())]
+    assert [(c.type, c.data["number"]) for c in queued] == [("pr", 7), ("issue", 3)]
+    assert restarted.open_prs_snapshot == [{"number": 7}]
+    assert restarted.open_issues_snapshot == [{"number": 3}]
+    restarted.github.restore_open_issues_cache.assert_called_once_with({"repo_name": REPO, "cached_at": 1.0, "issues": [{"number": 3}]})
+    assert [entry["message"] for entry in get_trace_logger().get_logs()] == ["Queued issue #3", "Producer started"]
+    get_trace_logger().clear()
+
+
+def test_engine_ignores_state_for_another_repository():
+    engine = AutomationEngine(MagicMock())
+
+    assert engine.restore_restart_state(REPO, {"repo_name": "owner/other", "queue": [{"type": "pr", "data": {"number": 1}, "priority": 1}]}) is False
+    assert engine.queue.qsize() == 0
+
+
+def test_open_issues_cache_keeps_its_age():
+    client = GitHubClient.get_instance(token="test-token")
+    cached_at = datetime.now() - timedelta(minutes=2)
+    client.restore_open_issues_cache({"repo_name": REPO, "cached_at": cached_at.timestamp(), "issues": [{"number": 1}]})
+
+    exported = client.export_open_issues_cache()
+
+    assert exported == {"repo_name": REPO, "cached_at": pytest.approx(cached_at.timestamp()), "issues": [{"number": 1}]}
+    assert client.get_open_issues_json(REPO) == [{"number": 1}]
+
+
+def test_restart_writes_handoff_before_exec(handoff_path, monkeypatch):
+    from src.auto_coder import update_manager
+
+    monkeypatch.setattr(warm_restart, "get_handoff_path", lambda repo_name=None: handoff_path)
+    monkeypatch.delenv("AUTO_CODER_TEST_CAPTURE_RESTART", raising=False)
+    register_state_provider("engine", lambda: {"repo_name": REPO})
+    update_manager.record_startup_options(["auto-coder", "process-issues"], {})
+    exec_calls = []
+    monkeypatch.setattr(update_manager.os, "execvpe", lambda *args: exec_calls.append(handoff_path.exists()))
+
+    update_manager.restart_with_startup_options()
+
+    assert exec_calls == [True]
+    assert take_handoff(handoff_path) == {"engine": {"repo_name": REPO}}
@@ -0,0 +1,183 @@
+"""Tests for the central workflow monitor service."""
+
+import asyncio
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.auto_coder.workflow_monitor import FAILURE, NOT_FOUND, SUCCESS, WorkflowMonitorService, get_workflow_monitor_service
+
+REPO = "owner/repo"
+
+
+def _run(sha, status="completed", conclusion="success", run_id=1, path=".github/workflows/ci.yml"):
+    return {"id": run_id, "head_sha": sha, "status": status, "conclusion": conclusion, "path": path}
+
+
+@pytest.fixture
+def api():
+    api = MagicMock()
+    api.actions.list_workflow_runs_for_repo.return_value = {"workflow_runs": []}
+    with (
+        patch("src.auto_coder.workflow_monitor.get_ghapi_client", return_value=api),
+        patch("src.auto_coder.workflow_monitor.GitHubClient"),
+    ):
+        yield api
+
+
+@pytest.fixture
+def completions():
+    return []
+
+
+@pytest.fixture
+def service(tmp_path, completions):
+    return WorkflowMonitorService(base_dir=tmp_path, callbacks=[lambda monitor, state: completions.append((monitor.pr_number, monitor.run_id, state))])
+
+
+def test_register_deduplicates(service):
+    assert service.register(REPO, 1, "sha1", "ci.yml") is True
+    assert service.register(REPO, 1, "sha1", "ci.yml") is False
+    assert service.is_monitoring(REPO, 1)
+
+
+def test_one_request_per_repo_for_all_pending_runs(service, api, completions):
+    service.register(REPO, 1, "sha1", "ci.yml")
+    service.register(REPO, 2, "sha2", "ci.yml")
+    service.register(REPO, 3, "sha3", "ci.yml")
+    api.actions.list_workflow_runs_for_repo.return_value = {
+        "workflow_runs": [
+            _run("sha1", run_id=11),
+            _run("sha2", conclusion="failure", run_id=12),
+            _run("sha3", status="in_progress", conclusion=None, run_id=13),
+            _run("sha3", conclusion="failure", run_id=14, path=".github/workflows/lint.yml"),
+        ]
+    }
+
+    assert service.poll_once() == 2
+
+    api.actions.list_workflow_runs_for_repo.assert_called_once_with("owner", "repo", per_page=100)
+    assert completions == [(1, 11, SUCCESS), (2, 12, FAILURE)]
+    assert [m.pr_number for m in service.pending()] == [3]
+
+
+def test_run_beyond_the_first_page_is_looked_up_by_commit(service, api, completions):
+    service.register(REPO, 1, "sha1", "ci.yml")
+    service.register(REPO, 2, "sha2", "ci.yml")
+    busy_page = {"workflow_runs": [_run("other", run_id=100 + i) for i in range(99)] + [_run("sha2", run_id=12)]}
+    api.actions.list_workflow_runs_for_repo.side_effect = lambda owner, repo, head_sha=None, per_page=None: {"workflow_runs": [_run("sha1", run_id=11)]} if head_sha == "sha1" else busy_page
+
+    assert service.poll_once() == 2
+
+    assert completions == [(1, 11, SUCCESS), (2, 12, SUCCESS)]
+    assert [call.kwargs.get("head_sha") for call in api.actions.list_workflow_runs_for_repo.call_args_list] == [None, "sha1"]
+
+
+def test_run_that_never_appears_times_out(service, api, completions):
+    service.appear_timeout_seconds = 0
+    service.register(REPO, 1, "sha1", "ci.yml")
+
+    service.poll_once()
+
+    assert completions == [(1, None, NOT_FOUND)]
+
+
+def test_pending_monitors_survive_restart(tmp_path, api, completions):
+    WorkflowMonitorService(base_dir=tmp_path).register(REPO, 7, "sha7", "ci.yml")
+
+    restored = WorkflowMonitorService(base_dir=tmp_path, callbacks=[lambda monitor, state: completions.append((monitor.pr_number, state))])
+    assert restored.restore(REPO) == 1
+    api.actions.list_workflow_runs_for_repo.return_value = {"workflow_runs": [_run("sha7")]}
+    restored.poll_once()
+
+    assert completions == [(7, SUCCESS)]
+    after = WorkflowMonitorService(base_dir=tmp_path)
+    assert after.restore(REPO) == 0
+    assert after.pending() == []
+
+
+def test_processes_keep_each_others_monitors(tmp_path, api, completions):
+    # Two engines on one host: one per repository, and two for the same repository
+    first = WorkflowMonitorService(base_dir=tmp_path, callbacks=[])
+    second = WorkflowMonitorService(base_dir=tmp_path, callbacks=[])
+    other_repo = WorkflowMonitorService(base_dir=tmp_path, callbacks=[])
+    first.register(REPO, 1, "sha1", "ci.yml")
+    second.register(REPO, 2, "sha2", "ci.yml")
+    other_repo.register("owner/other", 3, "sha3", "ci.yml")
+    second.unregister(REPO, 2)
+    second.register(REPO, 4, "sha4", "ci.yml")
+
+    restored = WorkflowMonitorService(base_dir=tmp_path)
+    assert restored.restore(REPO) == 2
+
+    assert sorted(m.pr_number for m in restored.pending()) == [1, 4]
+    assert (tmp_path / "owner" / "other" / "workflow_monitors.json").exists()
+
+
+def test_workflow_run_webhook_completes_monitor(service, completions):
+    service.register(REPO, 4, "sha4", "ci.yml")
+    payload = {"action": "completed", "repository": {"full_name": REPO}, "workflow_run": _run("sha4", run_id=44)}
+
+    assert service.handle_workflow_run_event({**payload, "repository": {"full_name": "other/repo"}}) is False
+    assert service.handle_workflow_run_event(payload) is True
+    assert service.handle_workflow_run_event(payload) is False
+
+    assert completions == [(4, 44, SUCCESS)]
+
+
+def test_failing_callback_does_not_block_others(tmp_path, api):
+    calls = []
+    service = WorkflowMonitorService(base_dir=tmp_path, callbacks=[MagicMock(side_effect=RuntimeError("boom")), lambda monitor, state: calls.append(state)])
+    service.register(REPO, 1, "sha1", "ci.yml")
+    api.actions.list_workflow_runs_for_repo.return_value = {"workflow_runs": [_run("sha1")]}
+
+    service.poll_once()
+
+    assert calls == [SUCCESS]
+
+
+def test_run_loop_polls_on_event_loop(service, api, completions):
+    service.poll_interval_seconds = 0.01
+    service.register(REPO, 1, "sha1", "ci.yml")
+    api.actions.list_workflow_runs_for_repo.return_value = {"workflow_runs": [_run("sha1")]}
+
+    async def scenario():
+        task = asyncio.create_task(service.run())
+        while not completions:
+            await asyncio.sleep(0.01)
+        assert service.running
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(asyncio.wait_for(scenario(), timeout=5))
+
+    assert completions == [(1, 1, SUCCESS)]
+    assert not service.running
+
+
+def test_service_disabled_by_default():
+    assert get_workflow_monitor_service() is None
+
+
+def test_handle_pr_merge_registers_with_running_service(service):
+    from src.auto_coder.automation_config import AutomationConfig
+    from src.auto_coder.pr_processor import _active_monitors, _handle_pr_merge
+    from src.auto_coder.util.github_action import GitHubActionsStatusResult
+
+    service.running = True
+    pr_data = {"number": 55, "head": {"sha": "sha55", "ref": "feature"}, "labels": []}
+
+    with (
+        patch("src.auto_coder.workflow_monitor.get_workflow_monitor_service", return_value=service),
+        patch("src.auto_coder.pr_processor._check_github_actions_status", return_value=GitHubActionsStatusResult(success=False, ids=[], in_progress=False)),
+        patch("auto_coder.util.github_action.trigger_workflow_dispatch", return_value=True),
+        patch("src.auto_coder.pr_processor.LabelManager"),
+        patch("src.auto_coder.pr_processor.threading.Thread") as mock_thread,
+    ):
+        actions = _handle_pr_merge(MagicMock(), REPO, pr_data, AutomationConfig(), {})
+
+    mock_thread.assert_not_called()
+    assert service.is_monitoring(REPO, 55)
+    assert 55 not in _active_monitors
+    assert "Started async monitor for ci.yml" in actions